@@ -0,0 +1,57 @@
+"""chat participant unread count
+
+Revision ID: 3f2a9c1d7e40
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2a9c1d7e40"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # Tables may already carry the column when created by init_db()
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("chat_participants")}
+    if "unread_count" in columns:
+        return
+
+    op.add_column(
+        "chat_participants",
+        sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Seed counters from the messages each participant has not read yet
+    op.execute(
+        """
+        UPDATE chat_participants AS cp
+        SET unread_count = sub.unread
+        FROM (
+            SELECT p.id, COUNT(m.id) AS unread
+            FROM chat_participants AS p
+            JOIN messages AS m
+              ON m.room_id = p.room_id
+             AND m.sender_id <> p.user_id
+             AND m.is_deleted = false
+             AND (p.last_seen_at IS NULL OR m.created_at > p.last_seen_at)
+            WHERE p.left_at IS NULL
+            GROUP BY p.id
+        ) AS sub
+        WHERE cp.id = sub.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_column("chat_participants", "unread_count")
@@ -0,0 +1,82 @@
+"""chat room last message snapshot
+
+Revision ID: 8b41d6e2c5a7
+Revises: 3f2a9c1d7e40
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b41d6e2c5a7"
+down_revision: Union[str, None] = "3f2a9c1d7e40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SNAPSHOT_COLUMNS = [
+    sa.Column("last_message_id", postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column("last_message_sender_id", postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column("last_message_sender_name", sa.String(50), nullable=True),
+    sa.Column("last_message_preview", sa.String(100), nullable=True),
+    sa.Column("last_message_type", sa.String(20), nullable=True),
+    sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column(
+        "last_activity_at",
+        sa.DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=False,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = {c["name"] for c in inspector.get_columns("chat_rooms")}
+    for column in SNAPSHOT_COLUMNS:
+        if column.name not in existing:
+            op.add_column("chat_rooms", column)
+
+    # Backfill from the newest visible message of each room (uses idx_messages_room_time)
+    op.execute(
+        """
+        UPDATE chat_rooms AS r
+        SET last_message_id = m.id,
+            last_message_sender_id = m.sender_id,
+            last_message_sender_name = u.username,
+            last_message_preview = LEFT(m.content, 100),
+            last_message_type = m.type,
+            last_message_at = m.created_at
+        FROM chat_rooms AS src
+        CROSS JOIN LATERAL (
+            SELECT id, sender_id, content, type, created_at
+            FROM messages
+            WHERE room_id = src.id AND is_deleted = false
+            ORDER BY created_at DESC
+            LIMIT 1
+        ) AS m
+        LEFT JOIN users AS u ON u.id = m.sender_id
+        WHERE r.id = src.id
+        """
+    )
+    op.execute(
+        "UPDATE chat_rooms SET last_activity_at = COALESCE(last_message_at, updated_at, created_at)"
+    )
+
+    existing_indexes = {i["name"] for i in inspector.get_indexes("chat_rooms")}
+    if "idx_chat_rooms_last_activity" not in existing_indexes:
+        op.create_index("idx_chat_rooms_last_activity", "chat_rooms", ["last_activity_at"])
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index("idx_chat_rooms_last_activity", table_name="chat_rooms")
+    for column in reversed(SNAPSHOT_COLUMNS):
+        op.drop_column("chat_rooms", column.name)
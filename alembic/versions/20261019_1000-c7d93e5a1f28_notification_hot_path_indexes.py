@@ -0,0 +1,73 @@
+"""notification hot path indexes
+
+Revision ID: c7d93e5a1f28
+Revises: 8b41d6e2c5a7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d93e5a1f28"
+down_revision: Union[str, None] = "8b41d6e2c5a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column and superseded indexes, including the ix_* ones created by
+# index=True on the columns
+OLD_INDEXES = {
+    "idx_notifications_user_id": ["user_id"],
+    "idx_notifications_type": ["type"],
+    "idx_notifications_is_read": ["is_read"],
+    "idx_notifications_created_at": ["created_at"],
+    "idx_notifications_user_read": ["user_id", "is_read", "created_at"],
+    "ix_notifications_user_id": ["user_id"],
+    "ix_notifications_type": ["type"],
+    "ix_notifications_is_read": ["is_read"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = {i["name"] for i in inspector.get_indexes("notifications")}
+
+    # Build the replacements first and without blocking writes
+    with op.get_context().autocommit_block():
+        if "idx_notifications_user_created" not in existing:
+            op.create_index(
+                "idx_notifications_user_created",
+                "notifications",
+                ["user_id", sa.text("created_at DESC")],
+                postgresql_concurrently=True,
+            )
+        if "idx_notifications_user_unread" not in existing:
+            op.create_index(
+                "idx_notifications_user_unread",
+                "notifications",
+                ["user_id", sa.text("created_at DESC")],
+                postgresql_where=sa.text("is_read = false"),
+                postgresql_concurrently=True,
+            )
+
+    for name in OLD_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="notifications")
+
+    op.execute("ANALYZE notifications")
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for name, columns in OLD_INDEXES.items():
+        if not name.startswith("ix_"):
+            op.create_index(name, "notifications", columns)
+
+    op.drop_index("idx_notifications_user_unread", table_name="notifications")
+    op.drop_index("idx_notifications_user_created", table_name="notifications")
@@ -0,0 +1,173 @@
+"""monthly partitions for messages, notifications, login history and security events
+
+Revision ID: 5e0b8f3a9d62
+Revises: c7d93e5a1f28
+Create Date: 2026-10-19 10:30:00.000000
+
+Each table is rebuilt as a RANGE-partitioned table with one partition per
+month (from its oldest row to PREMAKE_MONTHS ahead) plus a default
+partition, and the existing rows are copied over. The copy holds an
+exclusive lock on the table, so run this in a maintenance window.
+
+Partitioned tables cannot be referenced by foreign keys, so
+message_attachments.message_id and messages.reply_to_message_id lose
+theirs.
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0b8f3a9d62"
+down_revision: Union[str, None] = "c7d93e5a1f28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PREMAKE_MONTHS = 3
+
+# Table -> partition key column
+TABLES = {
+    "messages": "created_at",
+    "notifications": "created_at",
+    "login_history": "timestamp",
+    "security_events": "timestamp",
+}
+
+# Duplicates of the idx_* timestamp indexes that the models no longer declare
+DROPPED_INDEXES = {"ix_login_history_timestamp", "ix_security_events_timestamp"}
+
+NEW_INDEXES = {
+    "login_history": [("idx_login_history_user_time", ["user_id", "timestamp"])],
+    "security_events": [
+        ("idx_security_events_user_type_time", ["user_id", "event_type", "timestamp"])
+    ],
+}
+
+# Foreign keys into messages, restored on downgrade
+INCOMING_FOREIGN_KEYS = {
+    "messages": [
+        (
+            "message_attachments",
+            "message_attachments_message_id_fkey",
+            "FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE",
+        ),
+        (
+            "messages",
+            "messages_reply_to_message_id_fkey",
+            "FOREIGN KEY (reply_to_message_id) REFERENCES messages(id)",
+        ),
+    ],
+}
+
+
+def _month(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _is_partitioned(bind, table: str) -> bool:
+    relkind = bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar()
+    return relkind == "p"
+
+
+def _rebuild(table: str, column: str, partitioned: bool) -> None:
+    """Recreate a table as (non-)partitioned, keeping its rows, indexes and foreign keys."""
+    bind = op.get_bind()
+    legacy = f"{table}_legacy"
+
+    indexes = bind.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = :table "
+            "AND indexname <> :pkey"
+        ),
+        {"table": table, "pkey": f"{table}_pkey"},
+    ).all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND confrelid <> to_regclass(:table) "
+            "AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+    incoming = bind.execute(
+        sa.text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE confrelid = to_regclass(:table) AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+
+    for referencing_table, name in incoming:
+        op.execute(f"ALTER TABLE {referencing_table} DROP CONSTRAINT {name}")
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({column})"
+        )
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {column})")
+
+        oldest = bind.execute(sa.text(f"SELECT min({column}) FROM {legacy}")).scalar()
+        now = datetime.now(timezone.utc)
+        first = (oldest or now).year * 12 + (oldest or now).month - 1
+        last = now.year * 12 + now.month - 1 + PREMAKE_MONTHS
+        for index in range(first, last + 1):
+            month, next_month = _month(index), _month(index + 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy} CASCADE")
+
+    for name, definition in indexes:
+        if name not in DROPPED_INDEXES:
+            op.execute(definition)
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    bind = op.get_bind()
+    for table, column in TABLES.items():
+        if _is_partitioned(bind, table):
+            continue
+        _rebuild(table, column, partitioned=True)
+
+        existing = {i["name"] for i in sa.inspect(bind).get_indexes(table)}
+        for name, columns in NEW_INDEXES.get(table, []):
+            if name not in existing:
+                op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    bind = op.get_bind()
+    for table, column in TABLES.items():
+        if not _is_partitioned(bind, table):
+            continue
+        for name, _ in NEW_INDEXES.get(table, []):
+            op.drop_index(name, table_name=table)
+        _rebuild(table, column, partitioned=False)
+
+        for referencing_table, name, definition in INCOMING_FOREIGN_KEYS.get(table, []):
+            op.execute(f"ALTER TABLE {referencing_table} ADD CONSTRAINT {name} {definition}")
@@ -0,0 +1,39 @@
+"""view flushes
+
+Revision ID: 9d1e4b7a2c63
+Revises: 5e0b8f3a9d62
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d1e4b7a2c63"
+down_revision: Union[str, None] = "5e0b8f3a9d62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # The table may already exist when created by init_db()
+    if sa.inspect(op.get_bind()).has_table("view_flushes"):
+        return
+
+    op.create_table(
+        "view_flushes",
+        sa.Column("token", sa.String(32), primary_key=True),
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("idx_view_flushes_applied_at", "view_flushes", ["applied_at"])
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index("idx_view_flushes_applied_at", table_name="view_flushes")
+    op.drop_table("view_flushes")
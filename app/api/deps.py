@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db as async_get_db
+from app.core.database import get_read_db as async_get_read_db
 from app.core.redis import get_redis as async_get_redis
 from app.core.security import decode_token
 from app.models.user import User
@@ -25,6 +26,27 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get database session for read-only endpoints.
+
+    Uses the read replica unless it is lagging or the caller wrote
+    something within the read-your-writes window.
+
+    Args:
+        credentials: HTTP Bearer credentials (optional)
+    """
+    subject = None
+    if credentials is not None:
+        payload = decode_token(credentials.credentials)
+        subject = str(payload["sub"]) if payload and payload.get("sub") else None
+
+    async for session in async_get_read_db(subject):
+        yield session
+
+
 async def get_redis() -> Redis | None:
     """Get Redis client."""
     return await async_get_redis()
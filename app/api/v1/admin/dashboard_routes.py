@@ -10,7 +10,7 @@ from logging import getLogger
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_read_db
 from app.core.exceptions import AppException, ForbiddenException
 from app.models.user import User
 from app.schemas.admin import AnalyticsResponse, DashboardStatsResponse
@@ -64,7 +64,7 @@ async def get_current_admin(current_user: User = Depends(get_current_user)) -> U
     summary="Get dashboard overview statistics",
 )
 async def get_dashboard_stats(
-    current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_db)
+    current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_read_db)
 ) -> APIResponse[DashboardStatsResponse]:
     """
     Get dashboard overview statistics.
@@ -106,7 +106,7 @@ async def get_dashboard_stats(
 async def get_analytics(
     period: str = Query("week", pattern="^(day|week|month|year)$", description="Time period"),
     current_admin: User = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsResponse]:
     """
     Get detailed analytics for a time period.
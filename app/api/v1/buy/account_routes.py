@@ -8,11 +8,12 @@ and finding similar accounts.
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi import status as http_status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import get_optional_user, get_read_db
+from app.models.user import User
 from app.schemas.account import (
     AccountDetailResponse,
     AccountsBrowseResponse,
@@ -39,7 +40,7 @@ async def browse_accounts(
     sort: str = Query("newest", description="Sort: newest, price_asc, price_desc, rating"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AccountsBrowseResponse]:
     """
     Browse available game accounts with filtering and sorting.
@@ -85,7 +86,10 @@ async def browse_accounts(
     description="Get full details of a specific game account",
 )
 async def get_account_details(
-    account_id: str, db: AsyncSession = Depends(get_db)
+    account_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_optional_user),
 ) -> APIResponse[AccountDetailResponse]:
     """
     Retrieve detailed information about a specific account.
@@ -98,7 +102,13 @@ async def get_account_details(
     """
     try:
         service = BuyService(db)
-        result = await service.get_account_details(account_id)
+        # Anonymous viewers are told apart by address for unique view counting
+        viewer: Optional[str]
+        if current_user is not None:
+            viewer = str(current_user.id)
+        else:
+            viewer = f"ip:{request.client.host}" if request.client else None
+        result = await service.get_account_details(account_id, viewer)
         return APIResponse.success_response(data=result)
     except ValueError as e:
         raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -118,7 +128,7 @@ async def get_account_details(
 async def get_similar_accounts(
     account_id: str,
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[SimilarAccountsResponse]:
     """
     Get accounts similar to the specified account.
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.core.exceptions import ForbiddenException
+from app.core.exceptions import AppException, ForbiddenException
 from app.models.deal import Deal
 from app.models.user import User
 from app.schemas.common import APIResponse
@@ -49,6 +49,7 @@ async def create_deal(
     Create a new deal to purchase an account.
 
     This will:
+    - Reserve the account (409 if another buyer got it first)
     - Create a deal with PENDING status
     - Create a chat room with buyer, seller, and mediator
     - Send notifications to all parties
@@ -65,6 +66,10 @@ async def create_deal(
             notes=request.notes,
         )
         return APIResponse.success_response(data=result, message="Deal created successfully")
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
     except ValueError as e:
         raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
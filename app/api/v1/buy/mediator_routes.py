@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi import status as http_status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import get_read_db
 from app.schemas.common import APIResponse
 from app.schemas.mediator import MediatorDetailResponse, MediatorReviewsResponse
 from app.services.buy import BuyService
@@ -32,7 +32,7 @@ async def list_mediators(
     sort: str = Query("rating", description="Sort: rating, transactions, tier"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[dict]:
     """
     List available mediators for transaction facilitation.
@@ -62,7 +62,7 @@ async def list_mediators(
     description="Get full mediator profile with statistics",
 )
 async def get_mediator_details(
-    mediator_id: str, db: AsyncSession = Depends(get_db)
+    mediator_id: str, db: AsyncSession = Depends(get_read_db)
 ) -> APIResponse[MediatorDetailResponse]:
     """
     Retrieve detailed mediator information.
@@ -96,7 +96,7 @@ async def get_mediator_reviews(
     mediator_id: str,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[MediatorReviewsResponse]:
     """
     Get reviews for a specific mediator.
@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.core.exceptions import AppException
+from app.core.serialization import ModelResponse
 from app.models.user import User
 from app.schemas.chat import (
     ChatRoomDetailResponse,
@@ -27,7 +28,7 @@ from app.schemas.chat import (
     UnreadCountResponse,
 )
 from app.schemas.common import APIResponse, SuccessResponse
-from app.services.chat_service import ChatService
+from app.services.chat import ChatService
 from app.utils.rate_limit import rate_limit_chat_message
 
 logger = getLogger(__name__)
@@ -55,7 +56,7 @@ async def get_chat_rooms(
     """
     try:
         chat_service = ChatService(db)
-        result = await chat_service.get_user_chat_rooms(
+        result: APIResponse[ChatRoomsListResponse] = await chat_service.get_user_chat_rooms(
             user_id=current_user.id, room_type=room_type, page=page, limit=limit
         )
 
@@ -116,7 +117,7 @@ async def get_room_messages(
     limit: int = Query(50, ge=1, le=100, description="Number of messages"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> APIResponse[MessagesListResponse]:
+) -> ModelResponse:
     """
     Get messages for a specific chat room.
 
@@ -143,7 +144,8 @@ async def get_room_messages(
         )
 
         logger.info(f"User {current_user.username} fetched messages for room {room_id}")
-        return APIResponse.success_response(data=result)
+        # The service builds MessagesListResponse itself; skip re-validating it
+        return ModelResponse(APIResponse.success_response(data=result))
 
     except AppException as e:
         logger.warning(f"Failed to fetch messages: {e.message}")
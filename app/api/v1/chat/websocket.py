@@ -3,44 +3,129 @@ WebSocket connection manager for real-time chat.
 Handles room-based connections, broadcasting, and message routing.
 """
 
-import json
+import asyncio
+import itertools
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Set
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional, Set
+from uuid import uuid4
 
 from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+# Identifies this instance in the cluster-wide room membership view
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+# Redis keys for the cluster-wide view
+ROOM_USERS_KEY = "ws:room:{room_id}:users"  # hash: user_id -> number of nodes holding the user
+NODE_MEMBERS_KEY = "ws:node:{node_id}:members"  # set: "room_id|user_id" held by a node
+NODES_KEY = "ws:nodes"  # zset: node_id -> last liveness heartbeat
+
+# Per-user notification stream, subscribed like a room
+NOTIFICATION_STREAM_PREFIX = "notifications_"
+
+# Pseudo-room every connected user holds, so the cluster view counts connected users
+CONNECTED_ROOM = "connected"
+
+NODE_HEARTBEAT_SECONDS = 15
+NODE_DEAD_AFTER_SECONDS = 60
+
+# Atomically record a (room, user) pair gained by a node
+_CLUSTER_JOIN_SCRIPT = """
+if redis.call('SADD', KEYS[2], ARGV[2]) == 1 then
+    return redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+end
+return 0
+"""
+
+# Atomically release a (room, user) pair held by a node
+_CLUSTER_LEAVE_SCRIPT = """
+if redis.call('SREM', KEYS[2], ARGV[2]) == 1 then
+    local n = redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+    if n <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return n
+end
+return 0
+"""
+
+
+def notification_stream(user_id: str) -> str:
+    """Get the room key of a user's notification stream."""
+    return f"{NOTIFICATION_STREAM_PREFIX}{user_id}"
+
+
+def is_notification_stream(room_id: str) -> bool:
+    """Check whether a room key is a notification stream rather than a chat room."""
+    return room_id.startswith(NOTIFICATION_STREAM_PREFIX)
+
+
+class Connection:
+    """A single WebSocket connection and the rooms it is subscribed to."""
+
+    __slots__ = ("connection_id", "websocket", "user_id", "rooms", "connected_at")
+
+    def __init__(self, connection_id: str, websocket: WebSocket, user_id: str) -> None:
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.user_id = user_id
+        self.rooms: Set[str] = set()
+        self.connected_at = time.time()
+
 
 class ConnectionManager:
     """
     Manages WebSocket connections for chat rooms.
     Supports room-based messaging and user tracking.
+
+    Membership queries are answered from per-room user refcounts, so
+    "is user X in room Y" is O(1) and listing a room's users is O(k).
+    Room membership is mirrored to Redis on 0 <-> 1 refcount transitions,
+    giving every instance a cluster-wide view. A user's first and last
+    connection on an instance are mirrored the same way under CONNECTED_ROOM.
     """
 
     def __init__(self) -> None:
-        # room_id -> {connection_ids: set}
+        # room_id -> {connection_ids}
         self.active_rooms: Dict[str, Set[str]] = {}
-        # connection_id -> {websocket, user_id, room_id}
-        self.active_connections: Dict[str, dict] = {}
+        # connection_id -> Connection
+        self.active_connections: Dict[str, Connection] = {}
         # user_id -> {connection_ids}
         self.user_connections: Dict[str, Set[str]] = {}
-        self._connection_counter = 0
+        # room_id -> {user_id: number of the user's connections in the room}
+        self.room_users: Dict[str, Dict[str, int]] = {}
+        self._connection_counter = itertools.count(1)
+        # Lua scripts registered lazily on the current Redis client
+        self._scripts: Dict[str, Any] = {}
+        self._script_client: Any = None
+
+    def _script(self, redis_client: Any, source: str) -> Any:
+        # Re-register when the client is replaced (tests, reconnects)
+        if self._script_client is not redis_client:
+            self._scripts = {}
+            self._script_client = redis_client
+        if source not in self._scripts:
+            self._scripts[source] = redis_client.register_script(source)
+        return self._scripts[source]
 
     def _generate_connection_id(self) -> str:
         """Generate unique connection identifier."""
-        self._connection_counter += 1
-        return f"conn_{datetime.utcnow().timestamp()}_{self._connection_counter}"
+        return f"conn_{time.time()}_{next(self._connection_counter)}"
 
-    async def connect(self, websocket: WebSocket, user_id: str, room_id: str) -> str:
+    async def connect(
+        self, websocket: WebSocket, user_id: str, room_id: Optional[str] = None
+    ) -> str:
         """
         Accept and track a new WebSocket connection.
 
         Args:
             websocket: The WebSocket connection
             user_id: User identifier
-            room_id: Room identifier
+            room_id: Optional room to subscribe immediately
 
         Returns:
             Connection ID for tracking
@@ -48,25 +133,15 @@ class ConnectionManager:
         await websocket.accept()
 
         connection_id = self._generate_connection_id()
-
-        # Track connection
-        self.active_connections[connection_id] = {
-            "websocket": websocket,
-            "user_id": user_id,
-            "room_id": room_id,
-            "connected_at": datetime.utcnow(),
-        }
-
-        # Add to room
-        if room_id not in self.active_rooms:
-            self.active_rooms[room_id] = set()
-        self.active_rooms[room_id].add(connection_id)
-
-        # Track user connections
+        self.active_connections[connection_id] = Connection(connection_id, websocket, user_id)
         if user_id not in self.user_connections:
             self.user_connections[user_id] = set()
+            await self._cluster_join(CONNECTED_ROOM, user_id)
         self.user_connections[user_id].add(connection_id)
 
+        if room_id:
+            await self.join_room(connection_id, room_id)
+
         logger.info(f"Connection {connection_id} established: user={user_id}, room={room_id}")
 
         return connection_id
@@ -78,30 +153,88 @@ class ConnectionManager:
         Args:
             connection_id: Connection identifier to remove
         """
-        if connection_id not in self.active_connections:
+        conn = self.active_connections.get(connection_id)
+        if conn is None:
             return
 
-        conn_data = self.active_connections[connection_id]
-        user_id = conn_data["user_id"]
-        room_id = conn_data["room_id"]
-
-        # Remove from room
-        if room_id in self.active_rooms:
-            self.active_rooms[room_id].discard(connection_id)
-            # Clean up empty rooms
-            if not self.active_rooms[room_id]:
-                del self.active_rooms[room_id]
+        for room_id in list(conn.rooms):
+            await self.leave_room(connection_id, room_id)
 
         # Remove from user connections
-        if user_id in self.user_connections:
-            self.user_connections[user_id].discard(connection_id)
-            if not self.user_connections[user_id]:
-                del self.user_connections[user_id]
+        user_connections = self.user_connections.get(conn.user_id)
+        if user_connections is not None:
+            user_connections.discard(connection_id)
+            if not user_connections:
+                del self.user_connections[conn.user_id]
+                await self._cluster_leave(CONNECTED_ROOM, conn.user_id)
 
         # Remove connection
         del self.active_connections[connection_id]
 
-        logger.info(f"Connection {connection_id} closed: user={user_id}, room={room_id}")
+        logger.info(f"Connection {connection_id} closed: user={conn.user_id}")
+
+    async def join_room(self, connection_id: str, room_id: str) -> bool:
+        """
+        Subscribe an existing connection to a room.
+
+        Args:
+            connection_id: Connection identifier
+            room_id: Room identifier
+
+        Returns:
+            True if the connection was added, False if unknown or already subscribed
+        """
+        conn = self.active_connections.get(connection_id)
+        if conn is None or room_id in conn.rooms:
+            return False
+
+        conn.rooms.add(room_id)
+        self.active_rooms.setdefault(room_id, set()).add(connection_id)
+
+        users = self.room_users.setdefault(room_id, {})
+        count = users.get(conn.user_id, 0)
+        users[conn.user_id] = count + 1
+        if count == 0:
+            await self._cluster_join(room_id, conn.user_id)
+
+        return True
+
+    async def leave_room(self, connection_id: str, room_id: str) -> bool:
+        """
+        Unsubscribe a connection from a room.
+
+        Args:
+            connection_id: Connection identifier
+            room_id: Room identifier
+
+        Returns:
+            True if the connection was removed, False if it was not subscribed
+        """
+        conn = self.active_connections.get(connection_id)
+        if conn is None or room_id not in conn.rooms:
+            return False
+
+        conn.rooms.discard(room_id)
+
+        room_connections = self.active_rooms.get(room_id)
+        if room_connections is not None:
+            room_connections.discard(connection_id)
+            # Clean up empty rooms
+            if not room_connections:
+                del self.active_rooms[room_id]
+
+        users = self.room_users.get(room_id)
+        if users is not None:
+            count = users.get(conn.user_id, 0) - 1
+            if count > 0:
+                users[conn.user_id] = count
+            else:
+                users.pop(conn.user_id, None)
+                if not users:
+                    del self.room_users[room_id]
+                await self._cluster_leave(room_id, conn.user_id)
+
+        return True
 
     async def send_personal_message(self, message: dict, connection_id: str) -> None:
         """
@@ -111,13 +244,13 @@ class ConnectionManager:
             message: Message dictionary to send
             connection_id: Target connection identifier
         """
-        if connection_id not in self.active_connections:
+        conn = self.active_connections.get(connection_id)
+        if conn is None:
             logger.warning(f"Connection {connection_id} not found")
             return
 
-        websocket = self.active_connections[connection_id]["websocket"]
         try:
-            await websocket.send_json(message)
+            await conn.websocket.send_json(message)
         except Exception as e:
             logger.error(f"Error sending to {connection_id}: {e}")
             await self.disconnect(connection_id)
@@ -133,26 +266,28 @@ class ConnectionManager:
             room_id: Target room identifier
             exclude_connection_id: Optional connection to exclude
         """
-        if room_id not in self.active_rooms:
+        room_connections = self.active_rooms.get(room_id)
+        if not room_connections:
             logger.debug(f"Room {room_id} has no active connections")
             return
 
-        disconnected = set()
+        disconnected = []
 
-        for connection_id in self.active_rooms[room_id]:
-            if exclude_connection_id and connection_id == exclude_connection_id:
+        # Snapshot: sends yield to the loop and the room may change meanwhile
+        for connection_id in tuple(room_connections):
+            if connection_id == exclude_connection_id:
                 continue
 
-            if connection_id not in self.active_connections:
-                disconnected.add(connection_id)
+            conn = self.active_connections.get(connection_id)
+            if conn is None:
+                disconnected.append(connection_id)
                 continue
 
-            websocket = self.active_connections[connection_id]["websocket"]
             try:
-                await websocket.send_json(message)
+                await conn.websocket.send_json(message)
             except Exception as e:
                 logger.error(f"Error broadcasting to {connection_id}: {e}")
-                disconnected.add(connection_id)
+                disconnected.append(connection_id)
 
         # Clean up disconnected connections
         for conn_id in disconnected:
@@ -166,11 +301,12 @@ class ConnectionManager:
             message: Message dictionary to send
             user_id: Target user identifier
         """
-        if user_id not in self.user_connections:
+        user_connections = self.user_connections.get(user_id)
+        if not user_connections:
             logger.debug(f"User {user_id} has no active connections")
             return
 
-        for connection_id in self.user_connections[user_id]:
+        for connection_id in tuple(user_connections):
             await self.send_personal_message(message, connection_id)
 
     def get_room_connections(self, room_id: str) -> List[dict]:
@@ -183,23 +319,24 @@ class ConnectionManager:
         Returns:
             List of connection dictionaries
         """
-        if room_id not in self.active_rooms:
-            return []
-
         connections = []
-        for conn_id in self.active_rooms[room_id]:
-            if conn_id in self.active_connections:
-                conn_data = self.active_connections[conn_id].copy()
-                conn_data["connection_id"] = conn_id
-                # Remove websocket from return data
-                conn_data.pop("websocket", None)
-                connections.append(conn_data)
+        for conn_id in self.active_rooms.get(room_id, ()):
+            conn = self.active_connections.get(conn_id)
+            if conn is not None:
+                connections.append(
+                    {
+                        "connection_id": conn_id,
+                        "user_id": conn.user_id,
+                        "room_id": room_id,
+                        "connected_at": conn.connected_at,
+                    }
+                )
 
         return connections
 
     def get_active_users_in_room(self, room_id: str) -> Set[str]:
         """
-        Get unique active users in a room.
+        Get unique active users in a room on this instance.
 
         Args:
             room_id: Room identifier
@@ -207,12 +344,11 @@ class ConnectionManager:
         Returns:
             Set of user IDs
         """
-        connections = self.get_room_connections(room_id)
-        return {conn["user_id"] for conn in connections}
+        return set(self.room_users.get(room_id, ()))
 
     def is_user_in_room(self, user_id: str, room_id: str) -> bool:
         """
-        Check if user has active connection in room.
+        Check if user has active connection in room on this instance.
 
         Args:
             user_id: User identifier
@@ -221,8 +357,157 @@ class ConnectionManager:
         Returns:
             True if user is active in room
         """
-        active_users = self.get_active_users_in_room(room_id)
-        return user_id in active_users
+        users = self.room_users.get(room_id)
+        return users is not None and user_id in users
+
+    async def is_user_in_room_cluster(self, user_id: str, room_id: str) -> bool:
+        """
+        Check if user has an active connection in room on any instance.
+
+        Args:
+            user_id: User identifier
+            room_id: Room identifier
+
+        Returns:
+            True if user is active in room anywhere in the cluster
+        """
+        if self.is_user_in_room(user_id, room_id):
+            return True
+
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return False
+
+        try:
+            return await awaitable(
+                redis_client.hexists(ROOM_USERS_KEY.format(room_id=room_id), user_id)
+            )
+        except Exception as e:
+            logger.error(f"Cluster membership lookup failed for room {room_id}: {e}")
+            return False
+
+    async def is_user_connected_cluster(self, user_id: str) -> bool:
+        """
+        Check if user has an active connection on any instance.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            True if user is connected anywhere in the cluster
+        """
+        if user_id in self.user_connections:
+            return True
+        return await self.is_user_in_room_cluster(user_id, CONNECTED_ROOM)
+
+    async def get_cluster_users_in_room(self, room_id: str) -> Set[str]:
+        """
+        Get unique active users in a room across all instances.
+
+        Args:
+            room_id: Room identifier
+
+        Returns:
+            Set of user IDs
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return self.get_active_users_in_room(room_id)
+
+        try:
+            users = await awaitable(redis_client.hkeys(ROOM_USERS_KEY.format(room_id=room_id)))
+            return set(users)
+        except Exception as e:
+            logger.error(f"Cluster room lookup failed for room {room_id}: {e}")
+            return self.get_active_users_in_room(room_id)
+
+    async def _cluster_join(self, room_id: str, user_id: str) -> None:
+        """Record that this node now holds user in room."""
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await self._script(redis_client, _CLUSTER_JOIN_SCRIPT)(
+                keys=[
+                    ROOM_USERS_KEY.format(room_id=room_id),
+                    NODE_MEMBERS_KEY.format(node_id=NODE_ID),
+                ],
+                args=[user_id, f"{room_id}|{user_id}"],
+            )
+        except Exception as e:
+            logger.error(f"Failed to publish membership for room {room_id}: {e}")
+
+    async def _cluster_leave(self, room_id: str, user_id: str, node_id: str = NODE_ID) -> None:
+        """Record that a node no longer holds user in room."""
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await self._script(redis_client, _CLUSTER_LEAVE_SCRIPT)(
+                keys=[
+                    ROOM_USERS_KEY.format(room_id=room_id),
+                    NODE_MEMBERS_KEY.format(node_id=node_id),
+                ],
+                args=[user_id, f"{room_id}|{user_id}"],
+            )
+        except Exception as e:
+            logger.error(f"Failed to release membership for room {room_id}: {e}")
+
+    async def release_node(self, node_id: str = NODE_ID) -> None:
+        """
+        Release every room membership a node holds in the cluster view.
+
+        Called for this node on shutdown and for dead nodes by the reaper.
+
+        Args:
+            node_id: Node whose memberships to release
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return
+
+        members_key = NODE_MEMBERS_KEY.format(node_id=node_id)
+        try:
+            for member in await awaitable(redis_client.smembers(members_key)):
+                room_id, _, user_id = member.partition("|")
+                await self._cluster_leave(room_id, user_id, node_id=node_id)
+            await redis_client.delete(members_key)
+            await redis_client.zrem(NODES_KEY, node_id)
+        except Exception as e:
+            logger.error(f"Failed to release node {node_id}: {e}")
+
+    async def run_node_heartbeat(self) -> None:
+        """
+        Keep this node marked alive and reap nodes that stopped heart-beating.
+
+        Runs until cancelled. Dead nodes' memberships are released so the
+        cluster view does not keep users that crashed instances held.
+        """
+        from app.core import redis as redis_module
+
+        while True:
+            client = redis_module.redis_client
+            if client is not None:
+                try:
+                    now = time.time()
+                    await client.zadd(NODES_KEY, {NODE_ID: now})
+                    dead_nodes = await client.zrangebyscore(
+                        NODES_KEY, "-inf", now - NODE_DEAD_AFTER_SECONDS
+                    )
+                    for node_id in dead_nodes:
+                        logger.warning(f"Reaping memberships of dead node {node_id}")
+                        await self.release_node(node_id)
+                except Exception as e:
+                    logger.error(f"Node heartbeat failed: {e}")
+
+            await asyncio.sleep(NODE_HEARTBEAT_SECONDS)
 
 
 # Global connection manager instance
@@ -6,20 +6,46 @@ Handles message events, typing indicators, and room management.
 import logging
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
 
-from app.api.v1.chat.websocket import manager
+from app.api.v1.chat.websocket import is_notification_stream, manager, notification_stream
 from app.core.security import decode_token
 from app.models.chat import ChatRoom
 from app.models.user import User
+from app.services.chat.access_cache import room_access_cache
+from app.services.chat.unread_counter import unread_counter
+from app.utils.presence import RoomSignalCoalescer, presence_tracker
 from app.utils.redis_pubsub import publish_to_channel
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Client events that target a single room and are routed by their room_id
+ROOM_SCOPED_EVENTS = frozenset({"message", "typing", "read"})
+
+
+async def flush_room_signals(room_id: str, payload: dict) -> None:
+    """
+    Deliver a coalesced presence update for a room.
+
+    Broadcasts to this instance's sockets and publishes once to Redis for
+    the other instances; the listener here skips its own publication.
+
+    Args:
+        room_id: Room identifier
+        payload: Coalesced typing/joined/left signals
+    """
+    message = {"event": "presence", "data": payload}
+    await manager.broadcast_to_room(message, room_id)
+    await publish_to_channel(f"chat:{room_id}", message, skip_local=True)
+
+
+# Global typing/join/leave coalescer
+room_signals = RoomSignalCoalescer(flush_room_signals)
+
 
 async def get_websocket_user(token: str) -> User:
     """
@@ -56,93 +82,100 @@ async def verify_room_access(user_id: str, room_id: str) -> bool:
     """
     Verify user has access to the chat room.
 
+    Answered from the room access cache, which is loaded in bulk when the
+    socket connects, so per-frame checks do not query the database.
+
     Args:
         user_id: User identifier
         room_id: Room identifier
 
     Returns:
-        True if user can access room
+        True if user is an active participant of the room
     """
-    # In production, check database for room membership
-    # For now, allow access
-    return True
+    try:
+        uuid.UUID(room_id)
+    except (TypeError, ValueError):
+        return False
+
+    return await room_access_cache.has_access(user_id, room_id)
 
 
 @router.get("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(..., description="JWT access token"),
-    room_id: str = Query(..., description="Chat room ID"),
+    room_id: Optional[str] = Query(None, description="Chat room ID to subscribe on connect"),
+    notifications: bool = Query(False, description="Subscribe to the notification stream"),
 ) -> None:
     """
-    WebSocket endpoint for real-time chat.
+    Multiplexed WebSocket endpoint for real-time chat and notifications.
+
+    One socket per client can subscribe to any number of chat rooms and to
+    the user's notification stream. Room-scoped frames carry their own
+    room_id and are routed per frame.
 
     Query Parameters:
         token: JWT access token for authentication
-        room_id: Chat room identifier to join
+        room_id: Optional chat room to subscribe on connect
+        notifications: Subscribe to the notification stream on connect
 
     Events Accepted (Client -> Server):
+        - subscribe: Subscribe to one or more rooms
+          {"event": "subscribe", "room_ids": ["...", "..."]}
+        - unsubscribe: Unsubscribe from one or more rooms (socket stays open)
+          {"event": "unsubscribe", "room_ids": ["..."]}
+        - join_room / leave_room: Single-room aliases of subscribe / unsubscribe
+          {"event": "join_room", "room_id": "..."}
+        - subscribe_notifications / unsubscribe_notifications: Toggle notification stream
+          {"event": "subscribe_notifications"}
         - message: Send chat message
           {"event": "message", "room_id": "...", "content": "...", "type": "text"}
         - typing: Typing indicator
           {"event": "typing", "room_id": "..."}
         - read: Mark message as read
           {"event": "read", "room_id": "...", "message_id": "..."}
-        - join_room: Join additional room
-          {"event": "join_room", "room_id": "..."}
-        - leave_room: Leave room
-          {"event": "leave_room", "room_id": "..."
+        - heartbeat: Keep online status alive (send every ~20s)
+          {"event": "heartbeat"}
+
+        message, typing and read may omit room_id when the socket is
+        subscribed to exactly one room.
 
     Events Sent (Server -> Client):
         - message: New chat message
           {"event": "message", "data": {...}}
-        - typing: User typing indicator
-          {"event": "typing", "data": {"user_id": "...", "room_id": "..."}}
-        - user_joined: User joined room
-          {"event": "user_joined", "data": {"user_id": "...", "room_id": "..."}}
-        - user_left: User left room
-          {"event": "user_left", "data": {"user_id": "...", "room_id": "..."}}
+        - presence: Coalesced typing/join/leave signals, at most one per room per interval
+          {"event": "presence", "data": {"room_id": "...", "typing": [...],
+                                         "joined": [...], "left": [...], "timestamp": "..."}}
+          Clients should ignore their own user ID in "typing".
+        - subscribed / unsubscribed: Acknowledge room subscription changes
+          {"event": "subscribed", "data": {"room_ids": [...]}}
+        - notification / badge_update / notification_read / notifications_cleared:
+          Notification stream events (see notifications WebSocket)
         - error: Error occurred
-          {"event": "error", "data": {"message": "..."}}
+          {"event": "error", "data": {"message": "...", "room_id": "..."}}
     """
     # Authenticate user
     user = await get_websocket_user(token)
     user_id = str(user.id)
 
+    # Warm the access cache with every room membership in one query
+    await room_access_cache.load_user_rooms(user_id)
+
     # Verify room access
-    if not await verify_room_access(user_id, room_id):
+    if room_id and not await verify_room_access(user_id, room_id):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Room access denied")
         return
 
     # Accept connection and add to manager
     connection_id = await manager.connect(websocket, user_id, room_id)
 
-    # Notify others in room
-    await manager.broadcast_to_room(
-        {
-            "event": "user_joined",
-            "data": {
-                "user_id": user_id,
-                "room_id": room_id,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-        },
-        room_id,
-        exclude_connection_id=connection_id,
-    )
+    # Mark online and notify room on the next coalesced flush
+    await presence_tracker.heartbeat(user_id, force=True)
+    if room_id:
+        room_signals.joined(user_id, room_id)
 
-    # Publish join event to Redis for other instances
-    await publish_to_channel(
-        f"chat:{room_id}",
-        {
-            "event": "user_joined",
-            "data": {
-                "user_id": user_id,
-                "room_id": room_id,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-        },
-    )
+    if notifications:
+        await handle_subscribe_notifications(user_id, connection_id)
 
     try:
         while True:
@@ -158,25 +191,70 @@ async def websocket_endpoint(
                 )
                 continue
 
+            # Any client frame keeps the user online (writes are throttled)
+            await presence_tracker.heartbeat(user_id)
+
             # Handle different event types
-            if event == "message":
-                await handle_message_event(user_id, room_id, data, connection_id)
+            if event == "heartbeat":
+                continue
 
-            elif event == "typing":
-                await handle_typing_event(user_id, room_id, connection_id)
+            elif event in ROOM_SCOPED_EVENTS:
+                frame_room_id = resolve_frame_room(connection_id, data.get("room_id"))
+                if frame_room_id is None:
+                    await manager.send_personal_message(
+                        {
+                            "event": "error",
+                            "data": {
+                                "message": "Not subscribed to room",
+                                "room_id": data.get("room_id"),
+                            },
+                        },
+                        connection_id,
+                    )
+
+                elif not await verify_room_access(user_id, frame_room_id):
+                    # Membership was revoked after subscribing
+                    await handle_leave_room(user_id, frame_room_id, connection_id)
+                    await manager.send_personal_message(
+                        {
+                            "event": "error",
+                            "data": {"message": "Room access denied", "room_id": frame_room_id},
+                        },
+                        connection_id,
+                    )
+
+                elif event == "message":
+                    await handle_message_event(user_id, frame_room_id, data, connection_id)
+
+                elif event == "typing":
+                    await handle_typing_event(user_id, frame_room_id, connection_id)
+
+                elif event == "read":
+                    await handle_read_event(user_id, frame_room_id, data.get("message_id"))
+
+            elif event in ("subscribe", "join_room"):
+                joined = []
+                for new_room_id in frame_room_ids(data):
+                    if await handle_join_room(user_id, new_room_id, connection_id):
+                        joined.append(new_room_id)
+                await manager.send_personal_message(
+                    {"event": "subscribed", "data": {"room_ids": joined}}, connection_id
+                )
 
-            elif event == "read":
-                await handle_read_event(user_id, room_id, data.get("message_id"))
+            elif event in ("unsubscribe", "leave_room"):
+                left = []
+                for old_room_id in frame_room_ids(data):
+                    if await handle_leave_room(user_id, old_room_id, connection_id):
+                        left.append(old_room_id)
+                await manager.send_personal_message(
+                    {"event": "unsubscribed", "data": {"room_ids": left}}, connection_id
+                )
 
-            elif event == "join_room":
-                new_room_id = data.get("room_id")
-                if new_room_id and new_room_id != room_id:
-                    await handle_join_room(user_id, new_room_id, connection_id)
+            elif event == "subscribe_notifications":
+                await handle_subscribe_notifications(user_id, connection_id)
 
-            elif event == "leave_room":
-                await handle_leave_room(user_id, room_id, connection_id)
-                # Break loop to disconnect after leaving
-                break
+            elif event == "unsubscribe_notifications":
+                await manager.leave_room(connection_id, notification_stream(user_id))
 
             else:
                 await websocket.send_json(
@@ -191,28 +269,78 @@ async def websocket_endpoint(
         await websocket.send_json({"event": "error", "data": {"message": "Internal server error"}})
 
     finally:
-        # Notify others user left
-        await manager.broadcast_to_room(
-            {
-                "event": "user_left",
-                "data": {
-                    "user_id": user_id,
-                    "room_id": room_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-            },
-            room_id,
-        )
-
-        # Publish leave event to Redis
-        await publish_to_channel(
-            f"chat:{room_id}",
-            {"event": "user_left", "data": {"user_id": user_id, "room_id": room_id}},
-        )
+        # Notify every chat room the connection was in on the next coalesced flush
+        conn = manager.active_connections.get(connection_id)
+        for joined_room_id in conn.rooms if conn else ():
+            if not is_notification_stream(joined_room_id):
+                room_signals.left(user_id, joined_room_id)
 
         # Clean up connection
         await manager.disconnect(connection_id)
 
+        # Last connection anywhere in the cluster closed - drop from online set
+        if not await manager.is_user_connected_cluster(user_id):
+            await presence_tracker.mark_offline(user_id)
+
+
+def frame_room_ids(data: dict) -> List[str]:
+    """
+    Extract room IDs from a subscribe/unsubscribe frame.
+
+    Args:
+        data: Client frame
+
+    Returns:
+        Room IDs from "room_ids" and/or "room_id"
+    """
+    room_ids = data.get("room_ids") or []
+    if not isinstance(room_ids, list):
+        room_ids = []
+    if data.get("room_id"):
+        room_ids = [*room_ids, data["room_id"]]
+    return [str(rid) for rid in room_ids if rid and not is_notification_stream(str(rid))]
+
+
+def resolve_frame_room(connection_id: str, room_id: Optional[str]) -> Optional[str]:
+    """
+    Resolve the target room of a room-scoped frame.
+
+    Args:
+        connection_id: Sender's connection ID
+        room_id: Room ID carried by the frame, if any
+
+    Returns:
+        Room ID if the connection is subscribed to it, otherwise None
+    """
+    conn = manager.active_connections.get(connection_id)
+    if conn is None:
+        return None
+
+    if room_id:
+        return room_id if room_id in conn.rooms else None
+
+    chat_rooms = [rid for rid in conn.rooms if not is_notification_stream(rid)]
+    return chat_rooms[0] if len(chat_rooms) == 1 else None
+
+
+async def handle_subscribe_notifications(user_id: str, connection_id: str) -> None:
+    """
+    Subscribe a connection to the user's notification stream.
+
+    Sends the current unread badge on subscription.
+
+    Args:
+        user_id: User ID
+        connection_id: Connection ID
+    """
+    from app.api.v1.notifications.websocket import get_unread_notification_count
+
+    if await manager.join_room(connection_id, notification_stream(user_id)):
+        count = await get_unread_notification_count(user_id)
+        await manager.send_personal_message(
+            {"event": "badge_update", "data": {"count": count}}, connection_id
+        )
+
 
 async def handle_message_event(user_id: str, room_id: str, data: dict, connection_id: str) -> None:
     """
@@ -251,32 +379,24 @@ async def handle_message_event(user_id: str, room_id: str, data: dict, connectio
     await manager.broadcast_to_room({"event": "message", "data": message}, room_id)
 
     # Publish to Redis for other instances
-    await publish_to_channel(f"chat:{room_id}", {"event": "message", "data": message})
+    await publish_to_channel(
+        f"chat:{room_id}", {"event": "message", "data": message}, skip_local=True
+    )
 
 
 async def handle_typing_event(user_id: str, room_id: str, connection_id: str) -> None:
     """
     Handle typing indicator event.
 
+    Typing frames are throttled per (user, room) and coalesced with other
+    typers into a single presence update per interval.
+
     Args:
         user_id: Typing user ID
         room_id: Target room ID
         connection_id: Sender's connection ID
     """
-    typing_message = {
-        "event": "typing",
-        "data": {
-            "user_id": user_id,
-            "room_id": room_id,
-            "timestamp": datetime.utcnow().isoformat(),
-        },
-    }
-
-    # Broadcast to room (excluding sender)
-    await manager.broadcast_to_room(typing_message, room_id, exclude_connection_id=connection_id)
-
-    # Publish to Redis
-    await publish_to_channel(f"chat:{room_id}", typing_message)
+    room_signals.typing(user_id, room_id)
 
 
 async def handle_read_event(user_id: str, room_id: str, message_id: Optional[str]) -> None:
@@ -291,8 +411,8 @@ async def handle_read_event(user_id: str, room_id: str, message_id: Optional[str
     if not message_id:
         return
 
-    # In production, update read receipts in database
-    # await mark_message_as_read(user_id, message_id)
+    # Reading a message reads the room up to now
+    await unread_counter.mark_read(user_id, room_id)
 
     # Notify room members
     read_message = {
@@ -306,10 +426,10 @@ async def handle_read_event(user_id: str, room_id: str, message_id: Optional[str
     }
 
     await manager.broadcast_to_room(read_message, room_id)
-    await publish_to_channel(f"chat:{room_id}", read_message)
+    await publish_to_channel(f"chat:{room_id}", read_message, skip_local=True)
 
 
-async def handle_join_room(user_id: str, new_room_id: str, connection_id: str) -> None:
+async def handle_join_room(user_id: str, new_room_id: str, connection_id: str) -> bool:
     """
     Handle user joining additional room.
 
@@ -317,44 +437,29 @@ async def handle_join_room(user_id: str, new_room_id: str, connection_id: str) -
         user_id: User ID
         new_room_id: Room to join
         connection_id: Connection ID
+
+    Returns:
+        True if the connection is now subscribed to the room
     """
     # Verify access
     if not await verify_room_access(user_id, new_room_id):
         await manager.send_personal_message(
-            {"event": "error", "data": {"message": "Room access denied"}}, connection_id
+            {"event": "error", "data": {"message": "Room access denied", "room_id": new_room_id}},
+            connection_id,
         )
-        return
+        return False
 
     # Add connection to new room
-    current_conn = manager.active_connections.get(connection_id)
-    if current_conn:
-        # Add to new room
-        if new_room_id not in manager.active_rooms:
-            manager.active_rooms[new_room_id] = set()
-        manager.active_rooms[new_room_id].add(connection_id)
-
-        # Notify new room
-        await manager.broadcast_to_room(
-            {
-                "event": "user_joined",
-                "data": {
-                    "user_id": user_id,
-                    "room_id": new_room_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-            },
-            new_room_id,
-            exclude_connection_id=connection_id,
-        )
+    if not await manager.join_room(connection_id, new_room_id):
+        conn = manager.active_connections.get(connection_id)
+        return conn is not None and new_room_id in conn.rooms
 
-        # Publish to Redis
-        await publish_to_channel(
-            f"chat:{new_room_id}",
-            {"event": "user_joined", "data": {"user_id": user_id, "room_id": new_room_id}},
-        )
+    # Notify new room on the next coalesced flush
+    room_signals.joined(user_id, new_room_id)
+    return True
 
 
-async def handle_leave_room(user_id: str, room_id: str, connection_id: str) -> None:
+async def handle_leave_room(user_id: str, room_id: str, connection_id: str) -> bool:
     """
     Handle user leaving room.
 
@@ -362,25 +467,14 @@ async def handle_leave_room(user_id: str, room_id: str, connection_id: str) -> N
         user_id: User ID
         room_id: Room to leave
         connection_id: Connection ID
+
+    Returns:
+        True if the connection was subscribed to the room
     """
     # Remove from room
-    if room_id in manager.active_rooms:
-        manager.active_rooms[room_id].discard(connection_id)
-
-    # Notify remaining users
-    await manager.broadcast_to_room(
-        {
-            "event": "user_left",
-            "data": {
-                "user_id": user_id,
-                "room_id": room_id,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-        },
-        room_id,
-    )
+    if not await manager.leave_room(connection_id, room_id):
+        return False
 
-    # Publish to Redis
-    await publish_to_channel(
-        f"chat:{room_id}", {"event": "user_left", "data": {"user_id": user_id, "room_id": room_id}}
-    )
+    # Notify remaining users on the next coalesced flush
+    room_signals.left(user_id, room_id)
+    return True
@@ -3,13 +3,14 @@
 from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, paginate, PaginationParams
+from app.api.deps import get_read_db, paginate, PaginationParams
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.serialization import ModelResponse
 from app.schemas.common import APIResponse
 from app.schemas.home import (
     CategoriesResponse,
@@ -21,44 +22,65 @@ from app.schemas.home import (
     PromoBannersResponse,
     SearchResponse,
 )
+from app.services.home.feed_snapshot import home_feed_snapshots
 from app.services.home_service import HomeService
+from app.utils.http_cache import CachePolicy, cached_json_response
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
 router = APIRouter()
 
+# Cache-Control policies of the cacheable catalog endpoints
+FEED_CACHE = CachePolicy(max_age=15, stale_while_revalidate=60)
+FEATURED_CACHE = CachePolicy(max_age=60, stale_while_revalidate=300)
+CATEGORIES_CACHE = CachePolicy(max_age=300, stale_while_revalidate=3600)
+PROMO_CACHE = CachePolicy(max_age=60, stale_while_revalidate=600)
+FAQ_CACHE = CachePolicy(max_age=3600, stale_while_revalidate=86400)
+GAMES_CACHE = CachePolicy(max_age=300, stale_while_revalidate=3600)
+
 
 @router.get("/feed", response_model=APIResponse[HomeFeedResponse])
 async def get_home_feed(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     game: Optional[str] = Query(None, description="Filter by game name"),
     pagination: PaginationParams = Depends(paginate),
-    db: AsyncSession = Depends(get_db),
-) -> APIResponse[HomeFeedResponse]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
     """
     Get main home feed.
 
     Returns mixed content including featured accounts, regular accounts, and categories.
     All content is public - no authentication required.
 
+    The first pages at the default page size are served from a precomputed
+    snapshot (one Redis read) with an ETag, so unchanged pages revalidate with a 304.
+
     - **category**: Optional category filter
     - **game**: Optional game filter
     - **page**: Page number (default: 1)
     - **limit**: Items per page (default: 20, max: 100)
     """
+    if home_feed_snapshots.eligible(pagination.page, pagination.limit):
+        body = await home_feed_snapshots.get_or_build(db, category, game, pagination.page)
+        if body is not None:
+            return cached_json_response(request, body, FEED_CACHE)
+
     service = HomeService(db)
     feed = await service.get_home_feed(
         category=category, game=game, page=pagination.page, limit=pagination.limit
     )
-    return APIResponse.success_response(data=feed)
+    # The service builds HomeFeedResponse itself; skip re-validating it
+    return ModelResponse(APIResponse.success_response(data=feed))
 
 
 @router.get("/featured", response_model=APIResponse[FeaturedAccountsResponse])
 async def get_featured_accounts(
+    request: Request,
     limit: int = Query(10, ge=1, le=20, description="Number of accounts (max: 20)"),
-    db: AsyncSession = Depends(get_db),
-) -> APIResponse[FeaturedAccountsResponse]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """
     Get featured/premium accounts.
 
@@ -67,11 +89,13 @@ async def get_featured_accounts(
     """
     service = HomeService(db)
     featured = await service.get_featured_accounts(limit=limit)
-    return APIResponse.success_response(data=featured)
+    return cached_json_response(
+        request, APIResponse.success_response(data=featured), FEATURED_CACHE
+    )
 
 
 @router.get("/categories", response_model=APIResponse[CategoriesResponse])
-async def get_categories(db: AsyncSession = Depends(get_db)) -> APIResponse[CategoriesResponse]:
+async def get_categories(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
     """
     Get all available categories.
 
@@ -80,11 +104,13 @@ async def get_categories(db: AsyncSession = Depends(get_db)) -> APIResponse[Cate
     """
     service = HomeService(db)
     categories = await service.get_categories()
-    return APIResponse.success_response(data=categories)
+    return cached_json_response(
+        request, APIResponse.success_response(data=categories), CATEGORIES_CACHE
+    )
 
 
 @router.get("/promo", response_model=APIResponse[PromoBannersResponse])
-async def get_promo_banners(db: AsyncSession = Depends(get_db)) -> APIResponse[PromoBannersResponse]:
+async def get_promo_banners(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
     """
     Get promotional banners.
 
@@ -93,11 +119,11 @@ async def get_promo_banners(db: AsyncSession = Depends(get_db)) -> APIResponse[P
     """
     service = HomeService(db)
     banners = await service.get_promo_banners()
-    return APIResponse.success_response(data=banners)
+    return cached_json_response(request, APIResponse.success_response(data=banners), PROMO_CACHE)
 
 
 @router.get("/faq", response_model=APIResponse[FAQResponse])
-async def get_faq(db: AsyncSession = Depends(get_db)) -> APIResponse[FAQResponse]:
+async def get_faq(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
     """
     Get FAQ items.
 
@@ -106,7 +132,7 @@ async def get_faq(db: AsyncSession = Depends(get_db)) -> APIResponse[FAQResponse
     """
     service = HomeService(db)
     faq = await service.get_faq()
-    return APIResponse.success_response(data=faq)
+    return cached_json_response(request, APIResponse.success_response(data=faq), FAQ_CACHE)
 
 
 @router.get("/search", response_model=APIResponse[SearchResponse])
@@ -121,7 +147,7 @@ async def search_accounts(
         "relevance", description="Sort: relevance, newest, price_asc, price_desc, rating"
     ),
     pagination: PaginationParams = Depends(paginate),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[SearchResponse]:
     """
     Search accounts with filters.
@@ -157,10 +183,11 @@ async def search_accounts(
 
 @router.get("/games", response_model=APIResponse[GamesResponse])
 async def get_games(
+    request: Request,
     sort: str = Query("name", description="Sort: name, popularity, newest"),
     limit: int = Query(50, ge=1, le=100, description="Maximum games to return"),
-    db: AsyncSession = Depends(get_db),
-) -> APIResponse[GamesResponse]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """
     Get all supported games.
 
@@ -168,7 +195,7 @@ async def get_games(
     """
     service = HomeService(db)
     games = await service.get_games(sort=sort, limit=limit)
-    return APIResponse.success_response(data=games)
+    return cached_json_response(request, APIResponse.success_response(data=games), GAMES_CACHE)
 
 
 @router.get("/games/{gameId}/accounts", response_model=APIResponse[GameAccountsResponse])
@@ -176,7 +203,7 @@ async def get_game_accounts(
     gameId: UUID,
     sort: str = Query("newest", description="Sort: newest, price_asc, price_desc, rating"),
     pagination: PaginationParams = Depends(paginate),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[GameAccountsResponse]:
     """
     Get accounts for a specific game.
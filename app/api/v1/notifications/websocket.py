@@ -5,11 +5,12 @@ Pushes notifications directly to user's connected clients.
 
 import json
 import logging
+import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
 
-from app.api.v1.chat.websocket import manager
+from app.api.v1.chat.websocket import manager, notification_stream
 from app.core.security import decode_token
 from app.models.user import User
 
@@ -54,6 +55,10 @@ async def notifications_websocket(
     """
     WebSocket endpoint for real-time notifications.
 
+    Kept for clients that hold a dedicated notifications socket. New clients
+    should subscribe to the notification stream on the multiplexed chat
+    socket instead (/chat/ws?notifications=true).
+
     Query Parameters:
         token: JWT access token for authentication
 
@@ -90,17 +95,12 @@ async def notifications_websocket(
     user = await get_notification_user(token)
     user_id = str(user.id)
 
-    # Accept connection
-    await websocket.accept()
-
-    # Create special connection ID for notifications
-    # Use room_id as "notifications" to separate from chat connections
-    connection_id = await manager.connect(websocket, user_id, room_id=f"notifications_{user_id}")
+    # Accept connection and subscribe it to the user's notification stream
+    connection_id = await manager.connect(websocket, user_id, room_id=notification_stream(user_id))
 
     logger.info(f"Notification WebSocket connected: {connection_id}")
 
     # Send initial unread count
-    # In production, fetch from database
     initial_count = await get_unread_notification_count(user_id)
     await websocket.send_json({"event": "badge_update", "data": {"count": initial_count}})
 
@@ -146,6 +146,9 @@ async def handle_mark_read(user_id: str, notification_id: Optional[str]) -> None
     """
     Handle marking notification as read.
 
+    Persists the change, then sends the confirmation and updated count to
+    the user's notification stream.
+
     Args:
         user_id: User ID
         notification_id: Notification ID to mark as read
@@ -153,19 +156,29 @@ async def handle_mark_read(user_id: str, notification_id: Optional[str]) -> None
     if not notification_id:
         return
 
-    # In production, update database
-    # await mark_notification_read(user_id, notification_id)
+    from app.core.database import async_session_maker
+    from app.core.exceptions import ForbiddenException, NotFoundException
+    from app.services.notifications import NotificationCrudService
+
+    try:
+        async with async_session_maker() as db:
+            await NotificationCrudService.mark_as_read(
+                db, uuid.UUID(notification_id), uuid.UUID(user_id), publish=False
+            )
+    except (ValueError, NotFoundException, ForbiddenException) as e:
+        logger.warning(f"Ignoring mark_read of {notification_id} by {user_id}: {e}")
+        return
 
     # Update unread count
     new_count = await get_unread_notification_count(user_id)
 
     # Send confirmation and updated count to all user's connections
-    await manager.broadcast_to_user(
-        {"event": "notification_read", "data": {"notification_id": notification_id}}, user_id
+    await send_to_notification_stream(
+        user_id, {"event": "notification_read", "data": {"notification_id": notification_id}}
     )
 
-    await manager.broadcast_to_user(
-        {"event": "badge_update", "data": {"count": new_count}}, user_id
+    await send_to_notification_stream(
+        user_id, {"event": "badge_update", "data": {"count": new_count}}
     )
 
 
@@ -173,16 +186,39 @@ async def handle_clear_all(user_id: str) -> None:
     """
     Handle clearing all notifications.
 
+    Persists the change, then sends the confirmation and updated count to
+    the user's notification stream.
+
     Args:
         user_id: User ID
     """
-    # In production, update database
-    # await clear_all_notifications(user_id)
+    from app.core.database import async_session_maker
+    from app.services.notifications import NotificationCrudService
+
+    async with async_session_maker() as db:
+        await NotificationCrudService.mark_all_as_read(db, uuid.UUID(user_id), publish=False)
 
     # Send confirmation and updated count
-    await manager.broadcast_to_user({"event": "notifications_cleared", "data": {}}, user_id)
+    await send_to_notification_stream(user_id, {"event": "notifications_cleared", "data": {}})
 
-    await manager.broadcast_to_user({"event": "badge_update", "data": {"count": 0}}, user_id)
+    await send_to_notification_stream(user_id, {"event": "badge_update", "data": {"count": 0}})
+
+
+async def send_to_notification_stream(user_id: str, message: dict) -> None:
+    """
+    Send an event to every connection on the user's notification stream.
+
+    Delivered to this instance's sockets directly, so it does not depend on
+    Redis, and published for the user's sockets on other instances.
+
+    Args:
+        user_id: User ID
+        message: Event to send
+    """
+    from app.utils.redis_pubsub import publish_to_channel
+
+    await manager.broadcast_to_room(message, notification_stream(user_id))
+    await publish_to_channel(f"notifications:{user_id}", message, skip_local=True)
 
 
 async def get_unread_notification_count(user_id: str) -> int:
@@ -193,11 +229,11 @@ async def get_unread_notification_count(user_id: str) -> int:
         user_id: User ID
 
     Returns:
-        Unread count
+        Unread count from the maintained counter
     """
-    # In production, fetch from database
-    # return await db.query(Notification).filter_by(user_id=user_id, read=False).count()
-    return 0
+    from app.services.notifications.unread_counter import notification_unread_counter
+
+    return await notification_unread_counter.get(user_id)
 
 
 async def push_notification(user_id: str, notification: dict) -> None:
@@ -221,14 +257,13 @@ async def push_notification(user_id: str, notification: dict) -> None:
         },
     }
 
-    # Broadcast to user's connections
-    await manager.broadcast_to_user(message, user_id)
+    # Broadcast to the user's notification stream
+    stream = notification_stream(user_id)
+    await manager.broadcast_to_room(message, stream)
 
     # Update badge count
     new_count = await get_unread_notification_count(user_id)
-    await manager.broadcast_to_user(
-        {"event": "badge_update", "data": {"count": new_count}}, user_id
-    )
+    await manager.broadcast_to_room({"event": "badge_update", "data": {"count": new_count}}, stream)
 
 
 # Required imports
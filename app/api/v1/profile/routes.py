@@ -7,9 +7,15 @@ from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile,
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
-from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
+from app.core.exceptions import AppException, ForbiddenError, NotFoundError, ValidationError
 from app.models.user import User
-from app.schemas.common import APIResponse, PaginationSchema
+from app.schemas.common import (
+    APIResponse,
+    CompleteUploadRequest,
+    PaginationSchema,
+    PresignedUploadRequest,
+    PresignedUploadResponse,
+)
 from app.schemas.listing import (
     ProfileCreateListingRequest,
     ProfileUpdateListingRequest,
@@ -28,6 +34,7 @@ from app.schemas.profile import (
     UserProfileResponse,
     UserStatsResponse,
 )
+from app.services.profile import ListingManagementService, ProfileManagementService
 from app.services.profile_service import ProfileService
 
 router = APIRouter()
@@ -144,6 +151,51 @@ async def upload_avatar(
     return APIResponse.success_response(data=result, message="Avatar uploaded successfully")
 
 
+@router.post(
+    "/avatar/upload-url", response_model=APIResponse[PresignedUploadResponse], status_code=201
+)
+async def create_avatar_upload(
+    data: PresignedUploadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> APIResponse[PresignedUploadResponse]:
+    """
+    Request a direct avatar upload.
+
+    Returns presigned URLs to upload the avatar straight to storage; call
+    /avatar/complete afterwards. Max file size: 2MB. Allowed formats: JPG, JPEG, PNG.
+    """
+    try:
+        service = ProfileManagementService(db)
+        upload = await service.create_avatar_upload(current_user.id, data)
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+    return APIResponse.success_response(data=upload)
+
+
+@router.post("/avatar/complete", response_model=APIResponse[UploadAvatarResponse])
+async def complete_avatar_upload(
+    data: CompleteUploadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> APIResponse[UploadAvatarResponse]:
+    """
+    Complete a direct avatar upload.
+
+    Verifies the uploaded object and sets it as the user's avatar.
+    """
+    try:
+        service = ProfileManagementService(db)
+        result = await service.complete_avatar_upload(current_user.id, data.object_name)
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+    return APIResponse.success_response(data=result, message="Avatar uploaded successfully")
+
+
 @router.get("/{userId}", response_model=APIResponse[PublicProfileResponse])
 async def get_public_profile(
     userId: UUID, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
@@ -214,7 +266,7 @@ async def get_listing_details(
     Returns detailed information about a specific listing.
     """
     service = ProfileService(db)
-    listing = await service.get_listing_details(id)
+    listing = await service.get_listing_details(id, current_user.id)
     return APIResponse.success_response(data=listing)
 
 
@@ -302,3 +354,50 @@ async def upload_listing_image(
     image_filename = image.filename or "image.jpg"
     result = await service.upload_listing_image(file_data, image_filename)
     return APIResponse.success_response(data=result, message="Image uploaded successfully")
+
+
+@router.post(
+    "/listings/upload-url", response_model=APIResponse[PresignedUploadResponse], status_code=201
+)
+async def create_listing_image_upload(
+    data: PresignedUploadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> APIResponse[PresignedUploadResponse]:
+    """
+    Request a direct listing image upload.
+
+    Returns presigned URLs to upload the image straight to storage; call
+    /listings/upload-complete afterwards. Max file size: 5MB.
+    """
+    try:
+        service = ListingManagementService(db)
+        upload = await service.create_listing_image_upload(current_user.id, data)
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+    return APIResponse.success_response(data=upload)
+
+
+@router.post(
+    "/listings/upload-complete", response_model=APIResponse[UploadImageResponse], status_code=201
+)
+async def complete_listing_image_upload(
+    data: CompleteUploadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> APIResponse[UploadImageResponse]:
+    """
+    Complete a direct listing image upload.
+
+    Verifies the uploaded object; the returned image can be attached to a listing.
+    """
+    try:
+        service = ListingManagementService(db)
+        result = await service.complete_listing_image_upload(current_user.id, data.object_name)
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+    return APIResponse.success_response(data=result, message="Image uploaded successfully")
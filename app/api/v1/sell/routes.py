@@ -5,6 +5,7 @@ Handles listing creation, preview, image upload, category/game management,
 publishing, and seller analytics.
 """
 
+import os
 from typing import List
 from uuid import UUID
 
@@ -20,7 +21,12 @@ from app.core.exceptions import (
     RateLimitException,
     ValidationException,
 )
-from app.schemas.common import APIResponse
+from app.schemas.common import (
+    APIResponse,
+    CompleteUploadBatchRequest,
+    PresignedUploadBatchRequest,
+    PresignedUploadBatchResponse,
+)
 from app.schemas.listing import (
     CategoryResponse,
     CreateListingRequest,
@@ -190,7 +196,6 @@ async def upload_images(
         allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
         max_size = 5 * 1024 * 1024  # 5MB
 
-        files_data = []
         filenames: list[str] = []
 
         for image in images:
@@ -200,20 +205,83 @@ async def upload_images(
                     f"Invalid file type: {image.content_type}. " f"Allowed: jpg, jpeg, png, webp"
                 )
 
-            # Read file content
-            content = await image.read()
-
-            # Check file size
-            if len(content) > max_size:
+            # Check file size without reading the spooled file into memory
+            if image.size is None:
+                image.size = image.file.seek(0, os.SEEK_END)
+                await image.seek(0)
+            if image.size > max_size:
                 raise ValidationException(f"File {image.filename} exceeds 5MB limit")
 
             # Use a default filename if image.filename is None
-            filename = image.filename or f"upload_{len(filenames)}"
-            files_data.append((filename, content, image.content_type))
-            filenames.append(filename)
+            filenames.append(image.filename or f"upload_{len(filenames)}")
 
         # Upload images
-        uploaded_images = await service.upload_images(user_id, files_data, filenames)
+        uploaded_images = await service.upload_images(user_id, images, filenames)
+
+        return APIResponse.success_response(
+            data={"images": uploaded_images},
+            message=f"Successfully uploaded {len(uploaded_images)} image(s)",
+        )
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+
+
+@router.post(
+    "/upload-urls",
+    response_model=APIResponse[PresignedUploadBatchResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Request direct image uploads",
+    description="Get presigned URLs to upload listing images straight to storage (max 10)",
+)
+async def create_image_uploads(
+    data: PresignedUploadBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+) -> APIResponse[PresignedUploadBatchResponse]:
+    """
+    Request presigned listing image uploads.
+
+    - **files**: Filename, content type and size of each image (max 10, 5MB each)
+    - Upload each file with its POST form or PUT URL, then call /upload-complete
+    """
+    try:
+        service = SellService(db)
+        user_id = UUID(current_user["sub"])
+
+        uploads = await service.create_image_uploads(user_id, data.files)
+
+        return APIResponse.success_response(data=uploads)
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status_code, detail={"error_code": e.error_code, "message": e.message}
+        )
+
+
+@router.post(
+    "/upload-complete",
+    response_model=APIResponse[dict],
+    status_code=status.HTTP_201_CREATED,
+    summary="Complete direct image uploads",
+    description="Verify listing images uploaded with presigned URLs",
+)
+async def complete_image_uploads(
+    data: CompleteUploadBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+) -> APIResponse[dict]:
+    """
+    Complete presigned listing image uploads.
+
+    - **object_names**: Object names returned by /upload-urls
+    - Invalid uploads are deleted from storage and rejected
+    """
+    try:
+        service = SellService(db)
+        user_id = UUID(current_user["sub"])
+
+        uploaded_images = await service.complete_image_uploads(user_id, data.object_names)
 
         return APIResponse.success_response(
             data={"images": uploaded_images},
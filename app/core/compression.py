@@ -0,0 +1,126 @@
+"""
+Content encodings for HTTP response compression.
+
+gzip is always available. Brotli ("br") and Zstandard ("zstd") are offered
+when the brotli and zstandard packages are installed. Every encoding is
+exposed as a stream that compresses a body in one or more chunks, flushing
+after each chunk so streamed responses reach the client progressively.
+"""
+
+import zlib
+from typing import Callable, Dict, Optional, Protocol
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class CompressionStream(Protocol):
+    """Incremental compressor of one response body."""
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk; `final` ends the stream."""
+        ...
+
+
+class GzipStream:
+    """gzip stream (zlib with a gzip header)."""
+
+    def __init__(self, level: int = settings.COMPRESSION_GZIP_LEVEL) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.compress(data)
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliStream:
+    """Brotli stream."""
+
+    def __init__(self, quality: int = settings.COMPRESSION_BROTLI_QUALITY) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output: bytes = self._compressor.process(data)
+        tail: bytes = self._compressor.finish() if final else self._compressor.flush()
+        return output + tail
+
+
+class ZstdStream:
+    """Zstandard stream."""
+
+    def __init__(self, level: int = settings.COMPRESSION_ZSTD_LEVEL) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        output: bytes = self._compressor.compress(data)
+        tail: bytes = self._compressor.flush(mode)
+        return output + tail
+
+
+def available_encodings() -> Dict[str, Callable[[], CompressionStream]]:
+    """
+    Get the installed encodings, most preferred first.
+
+    Returns:
+        Mapping of Content-Encoding token to stream factory
+    """
+    encodings: Dict[str, Callable[[], CompressionStream]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = ZstdStream
+    if brotli is not None:
+        encodings["br"] = BrotliStream
+    encodings["gzip"] = GzipStream
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str], offered: list[str]) -> Optional[str]:
+    """
+    Pick a content encoding from an Accept-Encoding header.
+
+    The highest q-value wins; ties go to the server's preference order.
+    Encodings with q=0 are refused, and "*" stands for any encoding not
+    listed explicitly.
+
+    Args:
+        accept_encoding: Request header value
+        offered: Encodings the server supports, most preferred first
+
+    Returns:
+        Chosen encoding, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[token] = quality
+
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in offered:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
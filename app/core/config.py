@@ -39,6 +39,13 @@ class Settings(BaseSettings):
         description="PostgreSQL database connection URL",
     )
     DATABASE_ECHO: bool = False
+    DB_FANOUT_MAX_CONCURRENCY: int = 4  # Pooled connections one request may fan out to
+
+    # Read replica (empty URL = every read goes to the primary)
+    DATABASE_REPLICA_URL: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0  # More lag sends reads back to the primary
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 2.0  # How often replica lag is measured
+    DB_READ_YOUR_WRITES_SECONDS: int = 10  # A user's reads stay on the primary after a write
 
     # Redis
     REDIS_URL: str = Field(
@@ -47,6 +54,67 @@ class Settings(BaseSettings):
     )
     REDIS_EXPIRE_SECONDS: int = 3600
 
+    # Real-time presence
+    PRESENCE_ONLINE_WINDOW_SECONDS: int = 60
+    PRESENCE_HEARTBEAT_INTERVAL_SECONDS: int = 20
+    PRESENCE_COALESCE_INTERVAL_MS: int = 500
+    TYPING_THROTTLE_SECONDS: float = 3.0
+
+    # Chat authorization
+    CHAT_ACCESS_CACHE_TTL_SECONDS: int = 3600
+    CHAT_UNREAD_RECONCILE_SECONDS: int = 60
+    CHAT_UNREAD_RECONCILE_BATCH_SIZE: int = 500
+    CHAT_UNREAD_TTL_SECONDS: int = 86400  # Idle per-user unread hashes expire (reconciled first)
+
+    # Notifications
+    NOTIFICATION_COUNTER_RECONCILE_SECONDS: int = 900
+    NOTIFICATION_DELIVERY_QUEUED: bool = True
+    NOTIFICATION_PREFERENCE_CACHE_TTL_SECONDS: int = 86400
+    NOTIFICATION_PREFERENCE_LOCAL_TTL_SECONDS: int = 30
+
+    # Write-behind view counters
+    VIEW_COUNT_UNIQUE: bool = True  # Count each viewer once per window (HyperLogLog)
+    VIEW_UNIQUE_WINDOW_SECONDS: int = 86400
+    VIEW_FLUSH_SECONDS: int = 60
+    VIEW_FLUSH_BATCH_SIZE: int = 1000
+    VIEW_FLUSH_LOCK_SECONDS: int = 300  # Longest a flush may hold the flush lock
+    VIEW_FLUSH_RETENTION_DAYS: int = 7  # How long applied flush tokens are kept
+
+    # Precomputed similar accounts
+    SIMILAR_ACCOUNTS_K: int = 20  # Neighbors stored per account
+    SIMILAR_ACCOUNTS_PRICE_BAND: float = 0.3  # Neighbors within +/-30% of the price
+    SIMILAR_ACCOUNTS_CANDIDATES: int = 200  # Price-nearest accounts scored per account
+    SIMILAR_ACCOUNTS_REFRESH_SECONDS: int = 300  # Rebuild games whose accounts changed
+    SIMILAR_ACCOUNTS_REBUILD_SECONDS: int = 86400  # Rebuild every game
+    SIMILAR_ACCOUNTS_TTL_SECONDS: int = 172800
+
+    # Browse/search facet counts (also dropped on any account status change)
+    FACET_CACHE_TTL_SECONDS: int = 300
+
+    # Materialized home feed snapshots
+    HOME_FEED_SNAPSHOT_PAGES: int = 3  # Pages snapshotted per (category, game)
+    HOME_FEED_SNAPSHOT_LIMIT: int = 20  # Only the default page size is snapshotted
+    HOME_FEED_SNAPSHOT_MAX_KEYS: int = 200
+    HOME_FEED_SNAPSHOT_TTL_SECONDS: int = 900
+    HOME_FEED_SNAPSHOT_DEBOUNCE_SECONDS: int = 10  # Coalesces rebuilds after changes
+    HOME_FEED_SNAPSHOT_REFRESH_SECONDS: int = 300
+
+    # Monthly table partitioning (retention 0 = keep forever)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_MAINTENANCE_SECONDS: int = 86400
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"  # empty = drop expired partitions
+    MESSAGES_RETENTION_MONTHS: int = 0
+    NOTIFICATIONS_RETENTION_MONTHS: int = 6
+    LOGIN_HISTORY_RETENTION_MONTHS: int = 12
+    SECURITY_EVENTS_RETENTION_MONTHS: int = 24
+
+    # Response compression (br/zstd are used when brotli/zstandard are installed)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller bodies are sent as-is
+    COMPRESSION_THREAD_THRESHOLD: int = 65536  # Larger chunks compress in a worker thread
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
     # CORS
     CORS_ORIGINS: List[str] = Field(
         default=["http://localhost:3000", "http://localhost:8000"],
@@ -63,6 +131,19 @@ class Settings(BaseSettings):
     MINIO_SECURE: bool = False
     MINIO_BUCKET: str = "gamemarket"
     MINIO_REGION: str = "us-east-1"
+    STORAGE_MAX_CONNECTIONS: int = 20
+    STORAGE_UPLOAD_WORKERS: int = 8
+    STORAGE_PART_SIZE: int = 10 * 1024 * 1024  # Multipart chunk size (minimum 5 MiB)
+    STORAGE_UPLOAD_URL_EXPIRE_SECONDS: int = 900  # Lifetime of presigned upload URLs
+
+    # Listing image variants (generated by Celery workers)
+    IMAGE_THUMBNAIL_SIZE: int = 320  # Bounding box of the feed card thumbnail
+    IMAGE_VARIANT_WIDTHS: List[int] = [640, 1280]  # Responsive widths (never upscaled)
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_AVIF_QUALITY: int = 55
+    IMAGE_AVIF_ENABLED: bool = True
+    IMAGE_BACKFILL_SECONDS: int = 300
+    IMAGE_BACKFILL_BATCH_SIZE: int = 200
 
     # Email (SMTP)
     SMTP_HOST: str = Field(default="smtp.gmail.com", description="SMTP server host")
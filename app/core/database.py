@@ -1,22 +1,191 @@
 """
 Database connection and session management.
 
-Provides async SQLAlchemy engine, session factory, and init/close helpers
-for the Game Account Marketplace.
+Provides async SQLAlchemy engine, session factory, init/close helpers,
+read-replica routing and concurrent read fan-out for the Game Account
+Marketplace.
+
+Read-only endpoints take their session from get_read_db, which uses the
+replica when one is configured (DATABASE_REPLICA_URL), its replication lag
+is within DB_REPLICA_MAX_LAG_SECONDS, and the caller has not written
+anything in the last DB_READ_YOUR_WRITES_SECONDS. Everything else uses the
+primary.
 """
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+import time
+from typing import Any, AsyncGenerator, Awaitable, Callable, List, Optional
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create async engine
 engine = create_async_engine(settings.DATABASE_URL, echo=settings.DATABASE_ECHO, future=True)
 
 # Create async session maker
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read replica engine and session maker (None when no replica is configured)
+replica_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, echo=settings.DATABASE_ECHO, future=True)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+replica_session_maker = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+# Replication delay of a hot standby in seconds; a standby that has replayed
+# everything it received is current even if the primary has been idle
+REPLICA_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaRouter:
+    """Chooses between the replica and the primary for read-only sessions."""
+
+    RECENT_WRITE_KEY = "db:recent_write:{subject}"
+
+    def __init__(
+        self,
+        max_lag_seconds: float = settings.DB_REPLICA_MAX_LAG_SECONDS,
+        lag_check_seconds: float = settings.DB_REPLICA_LAG_CHECK_SECONDS,
+        sticky_seconds: int = settings.DB_READ_YOUR_WRITES_SECONDS,
+    ) -> None:
+        """
+        Initialize replica router.
+
+        Args:
+            max_lag_seconds: Most replication lag the replica may have
+            lag_check_seconds: How long a lag measurement is trusted
+            sticky_seconds: How long a user's reads stay on the primary after a write
+        """
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.sticky_seconds = sticky_seconds
+        self._replica_current = False
+        self._checked_at = float("-inf")
+        self._checking = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a replica is configured."""
+        return replica_session_maker is not None
+
+    async def session_maker(self, subject: Optional[str] = None) -> async_sessionmaker:
+        """
+        Get the session maker a read-only request should use.
+
+        Args:
+            subject: Authenticated user ID, if any
+
+        Returns:
+            Replica session maker, or the primary one when the replica is
+            missing, lagging or the user wrote recently
+        """
+        if replica_session_maker is None or not await self.replica_current():
+            return async_session_maker
+        if subject and await self.recently_wrote(subject):
+            return async_session_maker
+        return replica_session_maker
+
+    async def replica_current(self) -> bool:
+        """
+        Check whether the replica's lag is acceptable.
+
+        Lag is measured at most every lag_check_seconds, by one request at a
+        time; other requests use the last result meanwhile. A replica that
+        cannot be measured counts as lagging.
+
+        Returns:
+            True if reads may go to the replica
+        """
+        if replica_engine is None:
+            return False
+        if self._checking or time.monotonic() - self._checked_at < self.lag_check_seconds:
+            return self._replica_current
+
+        self._checking = True
+        try:
+            lag = await asyncio.wait_for(self._measure_lag(), timeout=self.max_lag_seconds)
+            self._replica_current = lag <= self.max_lag_seconds
+            if not self._replica_current:
+                logger.warning(f"Replica lag {lag:.1f}s; routing reads to the primary")
+        except Exception as e:
+            logger.error(f"Failed to measure replica lag: {e}")
+            self._replica_current = False
+        finally:
+            self._checked_at = time.monotonic()
+            self._checking = False
+        return self._replica_current
+
+    async def mark_write(self, subject: str) -> None:
+        """
+        Keep a user's reads on the primary after they changed something.
+
+        Args:
+            subject: Authenticated user ID
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None or self.sticky_seconds <= 0:
+            return
+
+        try:
+            await redis_client.set(
+                self.RECENT_WRITE_KEY.format(subject=subject), 1, ex=self.sticky_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to mark recent write of {subject}: {e}")
+
+    async def recently_wrote(self, subject: str) -> bool:
+        """
+        Check whether a user is inside their read-your-writes window.
+
+        Without Redis this cannot be known, so the answer is yes.
+
+        Args:
+            subject: Authenticated user ID
+
+        Returns:
+            True if the user's reads must go to the primary
+        """
+        from app.core.redis import redis_client
+
+        if self.sticky_seconds <= 0:
+            return False
+        if redis_client is None:
+            return True
+
+        try:
+            return bool(await redis_client.exists(self.RECENT_WRITE_KEY.format(subject=subject)))
+        except Exception as e:
+            logger.error(f"Failed to read recent write of {subject}: {e}")
+            return True
+
+    @staticmethod
+    async def _measure_lag() -> float:
+        assert replica_engine is not None
+        async with replica_engine.connect() as conn:
+            return float((await conn.execute(REPLICA_LAG_SQL)).scalar() or 0)
+
+
+# Global replica router instance
+replica_router = ReplicaRouter()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -29,21 +198,129 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db(subject: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a database session for read-only work, on the replica when possible.
+
+    Args:
+        subject: Authenticated user ID, for read-your-writes
+
+    Yields:
+        AsyncSession: Replica or primary session
+    """
+    session_maker = await replica_router.session_maker(subject)
+    async with session_maker() as session:
+        yield session
+
+
+async def fan_out(
+    db: AsyncSession,
+    *queries: Callable[[AsyncSession], Awaitable[Any]],
+    max_concurrency: int = settings.DB_FANOUT_MAX_CONCURRENCY,
+) -> List[Any]:
+    """
+    Run independent read queries concurrently, each on its own pooled session.
+
+    An AsyncSession runs one statement at a time, so composite pages that
+    await several independent queries on the request session pay for the
+    sum of their latencies. Each query here gets a short-lived session from
+    the pool of the request session's engine, primary or replica (at most
+    max_concurrency at once), so the page waits roughly as long as its
+    slowest query.
+
+    Queries fall back to running one after another on `db` when fan-out is
+    disabled (max_concurrency <= 1) or `db` is not a session of this engine
+    or has unflushed changes, or flushed or executed writes in its open
+    transaction, that other connections could not see. Only use this for
+    reads: the side sessions never commit.
+
+    Args:
+        db: Request session
+        queries: Callables taking a session and returning the query result;
+            results must not rely on lazy loading once their session closes
+        max_concurrency: Most sessions used at once
+
+    Returns:
+        Query results, in argument order
+
+    Raises:
+        Exception: The first query failure; the other queries are cancelled
+    """
+    if max_concurrency <= 1 or len(queries) <= 1 or not _can_fan_out(db):
+        return [await query(db) for query in queries]
+
+    session_maker = (
+        replica_session_maker
+        if replica_session_maker is not None and db.bind is replica_engine
+        else async_session_maker
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            async with session_maker() as session:
+                return await query(session)
+
+    tasks = [asyncio.ensure_future(run(query)) for query in queries]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+# Session.info flag: the open transaction holds writes other connections cannot see yet
+UNCOMMITTED_WRITES_KEY = "uncommitted_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session: Session, flush_context: Any) -> None:
+    session.info[UNCOMMITTED_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_executed_writes(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[UNCOMMITTED_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_writes(session: Session, transaction: SessionTransaction) -> None:
+    # Committed or rolled back: nothing is left that only this session sees
+    if transaction.parent is None:
+        session.info.pop(UNCOMMITTED_WRITES_KEY, None)
+
+
+def _can_fan_out(db: AsyncSession) -> bool:
+    return (
+        isinstance(db, AsyncSession)
+        and (db.bind is engine or (replica_engine is not None and db.bind is replica_engine))
+        and not (db.new or db.dirty or db.deleted)
+        and not db.info.get(UNCOMMITTED_WRITES_KEY)
+    )
+
+
 async def init_db() -> None:
     """
     Initialize database tables.
 
     Imports all models so they register on the shared Base.metadata,
-    then creates all tables if they don't exist.
+    then creates all tables if they don't exist and the current monthly
+    partitions of partitioned tables.
     """
     try:
         # Import all models to register their metadata on Base
         import app.models  # noqa: F401
 
+        from app.core.partitions import partition_manager
         from app.models.base import Base
 
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "postgresql":
+            async with engine.connect() as conn:
+                await partition_manager.maintain(conn, retire=False)
         print("[OK] Database initialized successfully")
     except Exception as e:
         print(f"[WARNING] Database initialization failed: {e}")
@@ -52,6 +329,8 @@ async def init_db() -> None:
 
 async def close_db() -> None:
     """
-    Close database connection.
+    Close database connections.
     """
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
@@ -2,19 +2,24 @@
 Custom ASGI middleware for request tracking, timing, and error handling.
 
 Provides RequestID for distributed tracing, TimingMiddleware for performance monitoring,
-and global error handling middleware.
+global error handling middleware, response compression and read-your-writes marking.
 """
 
+import asyncio
 import time
 import uuid
-from typing import Awaitable, Callable
+from typing import Awaitable, Callable, Optional
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.compression import CompressionStream, available_encodings, negotiate_encoding
+from app.core.config import settings
 from app.core.exceptions import AppException
+from app.core.security import decode_token
 
 # ==============================================================================
 # Request ID Middleware
@@ -277,3 +282,205 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         self.logger(log_message)
 
         return response
+
+
+# ==============================================================================
+# Compression Middleware
+# ==============================================================================
+
+# Content types worth compressing (JSON, text, SVG, JavaScript)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "image/svg+xml", "application/javascript")
+
+
+class CompressionMiddleware:
+    """
+    Content-negotiated response compression (zstd, br or gzip).
+
+    Pure ASGI middleware, so streamed responses stay streamed: each body
+    chunk is compressed and flushed as it arrives. Complete bodies smaller
+    than minimum_size are sent as-is, and chunks of thread_threshold bytes
+    or more are compressed in a worker thread to keep the event loop free.
+
+    Compressed responses get Vary: Accept-Encoding and a weak ETag, since
+    the compressed bytes are a different representation of the same body.
+
+    Attributes:
+        app: ASGI application
+        minimum_size: Smallest complete body that is compressed
+        thread_threshold: Chunk size from which compression leaves the event loop
+
+    Example:
+        >>> app = FastAPI()
+        >>> app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        thread_threshold: int = settings.COMPRESSION_THREAD_THRESHOLD,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_threshold = thread_threshold
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), list(self.encodings)
+        )
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Rewrites the response messages of one request."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._stream: Optional[CompressionStream] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._stream is not None:
+            await self._send_chunk(message)
+            return
+
+        assert self._start is not None
+        # Copy the headers: the Response object may be sent again
+        start = {**self._start, "headers": list(self._start["headers"])}
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._compressible(start["status"], headers):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or (not more_body and len(body) < self.middleware.minimum_size):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self._stream = self.middleware.encodings[self.encoding]()
+
+        if more_body:
+            # Length of the compressed stream is unknown up front
+            del headers["Content-Length"]
+            await self._send(start)
+            await self._send_chunk(message)
+            return
+
+        compressed = await self._compress(body, final=True)
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        compressed = await self._compress(message.get("body", b""), final=not more_body)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        assert self._stream is not None
+        if len(data) >= self.middleware.thread_threshold:
+            return await asyncio.to_thread(self._stream.compress, data, final)
+        return self._stream.compress(data, final)
+
+    @staticmethod
+    def _compressible(status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# ==============================================================================
+# Read-Your-Writes Middleware
+# ==============================================================================
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keeps a user's reads on the primary database right after they write.
+
+    When an authenticated request with a mutating method succeeds, the user
+    is marked in Redis for DB_READ_YOUR_WRITES_SECONDS before the response
+    is sent, so get_read_db sends their next reads to the primary instead
+    of a replica that may not have the change yet. Does nothing when no
+    replica is configured.
+
+    Attributes:
+        app: ASGI application
+
+    Example:
+        >>> app = FastAPI()
+        >>> app.add_middleware(ReadYourWritesMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        from app.core.database import replica_router
+
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        subject = bearer_subject(Headers(scope=scope).get("authorization"))
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await replica_router.mark_write(subject)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    Get the user ID from a Bearer Authorization header.
+
+    Args:
+        authorization: Authorization header value
+
+    Returns:
+        Token subject, or None if the header is missing or the token invalid
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token.strip())
+    subject = payload.get("sub") if payload else None
+    return str(subject) if subject is not None else None
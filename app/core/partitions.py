@@ -0,0 +1,268 @@
+"""
+Monthly range partitions for append-heavy tables.
+
+messages, notifications, login_history and security_events are range
+partitioned by month on their timestamp column. Each table has:
+
+    {table}_p{YYYYMM}  one partition per month
+    {table}_default    catch-all for rows outside every monthly partition
+
+The partition manager keeps PARTITION_PREMAKE_MONTHS future partitions in
+place and retires partitions older than each table's retention, either by
+moving them to the archive schema or by dropping them. Recent-data queries
+are pruned to the newest partitions and vacuum works on small tables.
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionedTable(NamedTuple):
+    """A monthly range-partitioned table."""
+
+    name: str
+    column: str
+    retention_months: int
+    # Run before an expired partition is dropped; {partition} is its name
+    on_drop: Optional[str] = None
+
+
+PARTITIONED_TABLES = (
+    PartitionedTable(
+        "messages",
+        "created_at",
+        settings.MESSAGES_RETENTION_MONTHS,
+        on_drop=(
+            "DELETE FROM message_attachments " "WHERE message_id IN (SELECT id FROM {partition})"
+        ),
+    ),
+    PartitionedTable("notifications", "created_at", settings.NOTIFICATIONS_RETENTION_MONTHS),
+    PartitionedTable("login_history", "timestamp", settings.LOGIN_HISTORY_RETENTION_MONTHS),
+    PartitionedTable("security_events", "timestamp", settings.SECURITY_EVENTS_RETENTION_MONTHS),
+)
+
+
+def month_start(value: datetime, offset: int = 0) -> datetime:
+    """
+    Get the first instant of a month in UTC.
+
+    Args:
+        value: Any instant in the month
+        offset: Number of months to move forward (negative for backward)
+
+    Returns:
+        Start of the resulting month
+    """
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """
+    Get the name of a table's partition for a month.
+
+    Args:
+        table: Parent table name
+        month: Start of the month
+
+    Returns:
+        Partition table name
+    """
+    return f"{table}_p{month:%Y%m}"
+
+
+class PartitionManager:
+    """
+    Creates future partitions and retires expired ones.
+
+    Every method takes an AsyncSession or AsyncConnection and is a no-op
+    for tables that are not partitioned (e.g. before the migration ran).
+    """
+
+    def __init__(
+        self,
+        tables: tuple = PARTITIONED_TABLES,
+        premake_months: int = settings.PARTITION_PREMAKE_MONTHS,
+        archive_schema: str = settings.PARTITION_ARCHIVE_SCHEMA,
+    ) -> None:
+        """
+        Initialize partition manager.
+
+        Args:
+            tables: Partitioned tables to manage
+            premake_months: Number of future months to create partitions for
+            archive_schema: Schema expired partitions are moved to ("" = drop them)
+        """
+        self.tables = tables
+        self.premake_months = premake_months
+        self.archive_schema = archive_schema
+
+    async def maintain(
+        self, db: Any, now: Optional[datetime] = None, retire: bool = True
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Create upcoming partitions and retire expired ones for every table.
+
+        Each table is committed separately.
+
+        Args:
+            db: Database session or connection
+            now: Current time (defaults to now)
+            retire: Whether to retire expired partitions
+
+        Returns:
+            Per table, the partitions that were created and retired
+        """
+        now = now or datetime.now(timezone.utc)
+        report = {}
+        for table in self.tables:
+            if not await self._is_partitioned(db, table.name):
+                continue
+            created = await self.create_partitions(db, table, now)
+            retired = await self.retire_partitions(db, table, now) if retire else []
+            await db.commit()
+            report[table.name] = {"created": created, "retired": retired}
+
+        logger.info(f"Partition maintenance finished: {report}")
+        return report
+
+    async def create_partitions(
+        self, db: Any, table: PartitionedTable, now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Make sure the current and the next premake_months partitions exist.
+
+        Rows that already landed in the default partition for a new month
+        are moved into it.
+
+        Args:
+            db: Database session or connection
+            table: Partitioned table
+            now: Current time (defaults to now)
+
+        Returns:
+            Names of the partitions that were created
+        """
+        now = now or datetime.now(timezone.utc)
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT"
+            )
+        )
+
+        existing = await self._partition_months(db, table.name)
+        created = []
+        for offset in range(self.premake_months + 1):
+            month = month_start(now, offset)
+            if month in existing:
+                continue
+            await self._create_partition(db, table, month)
+            created.append(partition_name(table.name, month))
+
+        return created
+
+    async def retire_partitions(
+        self, db: Any, table: PartitionedTable, now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Detach partitions older than the table's retention and archive or drop them.
+
+        Args:
+            db: Database session or connection
+            table: Partitioned table
+            now: Current time (defaults to now)
+
+        Returns:
+            Names of the partitions that were retired
+        """
+        if table.retention_months <= 0:
+            return []
+
+        cutoff = month_start(now or datetime.now(timezone.utc), -table.retention_months)
+        retired = []
+        for month in sorted(await self._partition_months(db, table.name)):
+            # Only partitions that end before the cutoff hold nothing worth keeping
+            if month_start(month, 1) > cutoff:
+                break
+
+            partition = partition_name(table.name, month)
+            await db.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {partition}"))
+            if self.archive_schema:
+                await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}"))
+                await db.execute(text(f"ALTER TABLE {partition} SET SCHEMA {self.archive_schema}"))
+            else:
+                if table.on_drop:
+                    await db.execute(text(table.on_drop.format(partition=partition)))
+                await db.execute(text(f"DROP TABLE {partition}"))
+            retired.append(partition)
+
+        if retired:
+            action = f"archived to {self.archive_schema}" if self.archive_schema else "dropped"
+            logger.info(f"Retired {table.name} partitions ({action}): {retired}")
+        return retired
+
+    async def _create_partition(self, db: Any, table: PartitionedTable, month: datetime) -> None:
+        partition = partition_name(table.name, month)
+        lower = f"'{month.isoformat()}'"
+        upper = f"'{month_start(month, 1).isoformat()}'"
+
+        # Built detached so rows parked in the default partition can be moved in first
+        await db.execute(
+            text(
+                f"CREATE TABLE {partition} "
+                f"(LIKE {table.name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await db.execute(
+            text(
+                f"WITH moved AS ("
+                f"DELETE FROM {table.name}_default "
+                f"WHERE {table.column} >= {lower} AND {table.column} < {upper} "
+                f"RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved"
+            )
+        )
+        await db.execute(
+            text(
+                f"ALTER TABLE {table.name} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+        )
+
+    async def _partition_months(self, db: Any, table: str) -> List[datetime]:
+        result = await db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.oid = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+        pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+        months = []
+        for (name,) in result.all():
+            match = pattern.match(name)
+            if match:
+                months.append(datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc))
+        return months
+
+    async def _is_partitioned(self, db: Any, table: str) -> bool:
+        result = await db.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        relkind: Optional[str] = result.scalar()
+        return relkind == "p"
+
+
+# Global partition manager instance
+partition_manager = PartitionManager()
@@ -2,12 +2,14 @@
 Redis client configuration and initialization.
 """
 
-from typing import Optional
+from typing import Awaitable, Optional, TypeVar, Union, cast
 
 import redis.asyncio as redis
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 # Global Redis client instance
 redis_client: Optional[redis.Redis] = None
 
@@ -60,3 +62,19 @@ async def get_redis() -> Optional[redis.Redis]:
         Redis client or None if not connected
     """
     return redis_client
+
+
+def awaitable(result: Union[Awaitable[T], T]) -> Awaitable[T]:
+    """
+    Narrow a Redis command result to its awaitable for type checking.
+
+    redis-py annotates commands for both its sync and asyncio clients; on
+    the asyncio client every command returns an awaitable.
+
+    Args:
+        result: Return value of an asyncio client command
+
+    Returns:
+        The same value, typed as an awaitable
+    """
+    return cast(Awaitable[T], result)
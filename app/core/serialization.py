@@ -0,0 +1,110 @@
+"""
+JSON serialization built on orjson.
+
+Used for HTTP responses, the Redis cache and pub/sub payloads. orjson
+encodes datetime, date, UUID, Enum and dataclasses natively; the default
+hook below adds Decimal (as a number, like FastAPI's jsonable_encoder),
+Pydantic models and sets.
+
+Two response classes are provided:
+
+- ORJSONResponse is the application's default response class, so routes
+  that return models still get FastAPI's response_model validation but are
+  encoded with orjson instead of the stdlib json.
+- ModelResponse writes a model with model_dump_json() as-is. Pydantic
+  serializes it in Rust and FastAPI skips response_model validation and
+  jsonable_encoder entirely, so it is only for outputs the service built
+  from the response schema itself.
+"""
+
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        # NaN and Infinity have no integral value; orjson writes their float as null
+        if obj.is_finite() and obj == obj.to_integral_value():
+            return int(obj)
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+
+    Raises:
+        TypeError: If the object contains an unsupported type
+    """
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON.
+
+    Args:
+        data: JSON as str, bytes, bytearray or memoryview
+
+    Returns:
+        Deserialized object
+
+    Raises:
+        JSONDecodeError: If the data is not valid JSON
+    """
+    return orjson.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """
+    Response that writes a Pydantic model with model_dump_json().
+
+    Returning one from a route bypasses response_model validation, so only
+    use it for models built from the declared response schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        super().__init__(
+            content=content, status_code=status_code, headers=headers, background=background
+        )
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return super().render(content)
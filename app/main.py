@@ -7,12 +7,13 @@ from typing import Any
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.v1 import api_router
 from app.core.config import settings
+from app.core.middleware import CompressionMiddleware, ReadYourWritesMiddleware
+from app.core.serialization import ORJSONResponse
 from app.schemas.common import ErrorResponse
 
 # Configure logging
@@ -49,29 +50,63 @@ async def lifespan(app: FastAPI) -> Any:
     await init_redis()
     logger.info("Redis initialized")
 
+    # Create the shared object storage client
+    from app.utils.storage import init_storage
+
+    init_storage()
+    logger.info("Storage client initialized")
+
     # Start Redis pub/sub listener for WebSocket sync
     from app.utils.redis_pubsub import start_redis_listener
 
     await start_redis_listener()
     logger.info("Redis pub/sub listener started")
 
+    # Keep this node registered in the cluster-wide WebSocket membership view
+    import asyncio
+
+    from app.api.v1.chat.websocket import manager as ws_manager
+
+    node_heartbeat = asyncio.create_task(ws_manager.run_node_heartbeat())
+
     yield
 
     # Shutdown
     logger.info("Shutting down Game Account Marketplace API...")
 
+    # Deliver any pending coalesced presence updates
+    from app.api.v1.chat.websocket_routes import room_signals
+
+    await room_signals.flush_all()
+
+    # Release this node's WebSocket room memberships
+    node_heartbeat.cancel()
+    await ws_manager.release_node()
+
     # Stop Redis pub/sub listener
     from app.utils.redis_pubsub import stop_redis_listener
 
     await stop_redis_listener()
     logger.info("Redis pub/sub listener stopped")
 
+    # Close database connections (primary and replica pools)
+    from app.core.database import close_db
+
+    await close_db()
+    logger.info("Database connections closed")
+
     # Close Redis connection
     from app.core.redis import close_redis
 
     await close_redis()
     logger.info("Redis connection closed")
 
+    # Close object storage connections
+    from app.utils.storage import close_storage
+
+    close_storage()
+    logger.info("Storage client closed")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -81,6 +116,7 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -93,6 +129,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (negotiated from Accept-Encoding)
+app.add_middleware(CompressionMiddleware)
+
+# Keep a user's reads on the primary database right after they write
+app.add_middleware(ReadYourWritesMiddleware)
+
 
 # Custom middleware for request timing and logging
 @app.middleware("http")
@@ -126,11 +168,11 @@ async def request_middleware(request: Request, call_next: Any) -> Any:
 
 # Exception handlers
 @app.exception_handler(StarletteHTTPException)
-async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ORJSONResponse:
     """
     Handle HTTP exceptions.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse.create(
             error_code=f"HTTP_{exc.status_code}", message=exc.detail
@@ -139,7 +181,9 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
 
 
 @app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(
+    request: Request, exc: RequestValidationError
+) -> ORJSONResponse:
     """
     Handle validation errors.
     """
@@ -151,7 +195,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             details[field] = []
         details[field].append(error["msg"])
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=ErrorResponse.create(
             error_code="VALIDATION_ERROR", message="Request validation failed", details=details
@@ -160,13 +204,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 
 @app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     Handle general exceptions.
     """
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse.create(
             error_code="INTERNAL_ERROR",
@@ -32,6 +32,9 @@ from app.models.review import Review
 # User-related models
 from app.models.user import Session, User, UserProfile
 
+# View counter model
+from app.models.view import ViewFlush
+
 __all__ = [
     # Base
     "Base",
@@ -67,4 +70,6 @@ __all__ = [
     "Category",
     "PromoBanner",
     "FAQItem",
+    # View counter model
+    "ViewFlush",
 ]
@@ -6,7 +6,17 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -34,6 +44,22 @@ class ChatRoom(Base, TimestampMixin):
         ForeignKey("deals.id"), index=True, nullable=True
     )
 
+    # Last-message snapshot, maintained on send so room lists never load history
+    last_message_id: Mapped[Optional[UUID]] = mapped_column(nullable=True)
+    last_message_sender_id: Mapped[Optional[UUID]] = mapped_column(nullable=True)
+    last_message_sender_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    last_message_preview: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_message_type: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    last_message_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
+
     # Relationships
     participants: Mapped[List["ChatParticipant"]] = relationship(
         "ChatParticipant", back_populates="room", cascade="all, delete-orphan"
@@ -51,6 +77,7 @@ class ChatRoom(Base, TimestampMixin):
     __table_args__ = (
         Index("idx_chat_rooms_type", "type"),
         Index("idx_chat_rooms_deal_id", "deal_id"),
+        Index("idx_chat_rooms_last_activity", "last_activity_at"),
     )
 
 
@@ -75,6 +102,10 @@ class ChatParticipant(Base):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
     last_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Durable copy of the Redis unread counter, reconciled periodically
+    unread_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     left_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
@@ -92,7 +123,10 @@ class Message(Base):
     """
     Chat messages.
 
-    Represents individual messages sent in a chat room.
+    Represents individual messages sent in a chat room. The table is range
+    partitioned by month on created_at, so the primary key in the database
+    is (id, created_at) and nothing can reference messages with a foreign
+    key; the ORM still identifies rows by id alone.
     """
 
     __tablename__ = "messages"
@@ -104,12 +138,13 @@ class Message(Base):
     sender_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     type: Mapped[str] = mapped_column(String(20), default="text", nullable=False)
-    reply_to_message_id: Mapped[Optional[UUID]] = mapped_column(
-        ForeignKey("messages.id"), nullable=True
-    )
+    reply_to_message_id: Mapped[Optional[UUID]] = mapped_column(nullable=True)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
     )
 
     # Relationships
@@ -118,10 +153,16 @@ class Message(Base):
         "User", back_populates="sent_messages", foreign_keys=[sender_id]
     )
     reply_to: Mapped[Optional["Message"]] = relationship(
-        "Message", remote_side=[id], backref="replies"
+        "Message",
+        primaryjoin="foreign(Message.reply_to_message_id) == Message.id",
+        remote_side=[id],
+        backref="replies",
     )
     attachments: Mapped[List["MessageAttachment"]] = relationship(
-        "MessageAttachment", back_populates="message", cascade="all, delete-orphan"
+        "MessageAttachment",
+        primaryjoin="Message.id == foreign(MessageAttachment.message_id)",
+        back_populates="message",
+        cascade="all, delete-orphan",
     )
 
     __table_args__ = (
@@ -129,7 +170,9 @@ class Message(Base):
         Index("idx_messages_sender_id", "sender_id"),
         Index("idx_messages_created_at", "created_at"),
         Index("idx_messages_room_time", "room_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
 
 class MessageAttachment(Base):
@@ -142,9 +185,9 @@ class MessageAttachment(Base):
     __tablename__ = "message_attachments"
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    message_id: Mapped[UUID] = mapped_column(
-        ForeignKey("messages.id", ondelete="CASCADE"), index=True, nullable=False
-    )
+    # No foreign key: messages is partitioned. Attachments of messages removed
+    # by partition retention are deleted by the partition manager.
+    message_id: Mapped[UUID] = mapped_column(index=True, nullable=False)
     url: Mapped[str] = mapped_column(String(500), nullable=False)
     filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -154,6 +197,10 @@ class MessageAttachment(Base):
     )
 
     # Relationships
-    message: Mapped["Message"] = relationship("Message", back_populates="attachments")
+    message: Mapped["Message"] = relationship(
+        "Message",
+        primaryjoin="Message.id == foreign(MessageAttachment.message_id)",
+        back_populates="attachments",
+    )
 
     __table_args__ = (Index("idx_message_attachments_message_id", "message_id"),)
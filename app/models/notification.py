@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -19,37 +19,49 @@ class Notification(Base):
     """
     User notifications.
 
-    Represents notifications sent to users about various events.
+    Represents notifications sent to users about various events. Range
+    partitioned by month on created_at; the database primary key is
+    (id, created_at) while the ORM identifies rows by id.
     """
 
     __tablename__ = "notifications"
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    type: Mapped[str] = mapped_column(String(30), index=True, nullable=False)
-    is_read: Mapped[bool] = mapped_column(Boolean, index=True, default=False, nullable=False)
+    type: Mapped[str] = mapped_column(String(30), nullable=False)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     icon: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     action_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     meta_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
     )
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="notifications")
 
+    # Every query is scoped to one user: the list newest first, and unread
+    # rows for counts and "mark all read". Queries must compare is_read with
+    # a literal false so the partial index matches under generic plans.
     __table_args__ = (
-        Index("idx_notifications_user_id", "user_id"),
-        Index("idx_notifications_type", "type"),
-        Index("idx_notifications_is_read", "is_read"),
-        Index("idx_notifications_created_at", "created_at"),
-        Index("idx_notifications_user_read", "user_id", "is_read", "created_at"),
+        Index("idx_notifications_user_created", "user_id", text("created_at DESC")),
+        Index(
+            "idx_notifications_user_unread",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_read = false"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
 
 class NotificationPreference(Base, TimestampMixin):
@@ -202,7 +202,8 @@ class SecurityEvent(Base):
     """
     Security events and audit log.
 
-    Tracks security-related events for user accounts.
+    Tracks security-related events for user accounts. Range partitioned by
+    month on timestamp; the database primary key is (id, timestamp).
     """
 
     __tablename__ = "security_events"
@@ -219,8 +220,8 @@ class SecurityEvent(Base):
     )
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         default=lambda: datetime.now(timezone.utc),
-        index=True,
         nullable=False,
     )
 
@@ -228,7 +229,10 @@ class SecurityEvent(Base):
         Index("idx_security_events_user_id", "user_id"),
         Index("idx_security_events_event_type", "event_type"),
         Index("idx_security_events_timestamp", "timestamp"),
+        Index("idx_security_events_user_type_time", "user_id", "event_type", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
 
 class LoginHistory(Base):
@@ -236,6 +240,8 @@ class LoginHistory(Base):
     Login history tracking.
 
     Tracks all login attempts including successful, failed, and suspicious logins.
+    Range partitioned by month on timestamp; the database primary key is
+    (id, timestamp).
     """
 
     __tablename__ = "login_history"
@@ -246,8 +252,8 @@ class LoginHistory(Base):
     )
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         default=lambda: datetime.now(timezone.utc),
-        index=True,
         nullable=False,
     )
     ip_address: Mapped[str] = mapped_column(String(45), nullable=False)
@@ -259,7 +265,10 @@ class LoginHistory(Base):
         Index("idx_login_history_user_id", "user_id"),
         Index("idx_login_history_timestamp", "timestamp"),
         Index("idx_login_history_status", "status"),
+        Index("idx_login_history_user_time", "user_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
 
 class TrustedDevice(Base):
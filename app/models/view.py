@@ -0,0 +1,28 @@
+"""
+View counter models: ViewFlush.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ViewFlush(Base):
+    """
+    Applied view counter flushes.
+
+    Written in the same transaction as the views_count updates of a flush,
+    so a flush retried after its commit is recognized and not applied twice.
+    """
+
+    __tablename__ = "view_flushes"
+
+    token: Mapped[str] = mapped_column(String(32), primary_key=True)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    __table_args__ = (Index("idx_view_flushes_applied_at", "applied_at"),)
@@ -89,6 +89,14 @@ class PriceRangeSchema(BaseModel):
     label: str = Field(..., description="Display label for price range")
     min: Optional[float] = Field(None, description="Minimum price")
     max: Optional[float] = Field(None, description="Maximum price")
+    count: Optional[int] = Field(None, description="Matching accounts in this range")
+
+
+class FacetCountSchema(BaseModel):
+    """Number of matching accounts for one filter value."""
+
+    value: str = Field(..., description="Filter value")
+    count: int = Field(..., ge=0, description="Matching accounts")
 
 
 class AccountFiltersSchema(BaseModel):
@@ -101,6 +109,12 @@ class AccountFiltersSchema(BaseModel):
     available_levels: List[str] = Field(
         default_factory=list, description="Available rank/level filters"
     )
+    game_counts: List[FacetCountSchema] = Field(
+        default_factory=list, description="Matching accounts per game"
+    )
+    level_counts: List[FacetCountSchema] = Field(
+        default_factory=list, description="Matching accounts per rank/level"
+    )
 
 
 class AccountsBrowseResponse(BaseModel):
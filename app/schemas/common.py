@@ -1,6 +1,7 @@
 """Common schemas used across the API."""
 
-from typing import Any, Dict, Generic, Optional, TypeVar
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -147,3 +148,52 @@ class SuccessResponse(BaseModel):
             SuccessResponse: Success response
         """
         return cls(success=True, message=message)
+
+
+class PresignedUploadRequest(BaseModel):
+    """Request for a direct-to-storage upload of one file."""
+
+    filename: str = Field(..., min_length=1, max_length=255, description="Original filename")
+    content_type: str = Field(..., description="MIME type the file will be uploaded with")
+    size: int = Field(..., gt=0, description="File size in bytes")
+
+
+class PresignedUploadResponse(BaseModel):
+    """
+    Presigned upload for one file.
+
+    POST multipart/form-data to upload_url with every entry of fields
+    followed by the file, or PUT the bytes to put_url with the same
+    Content-Type. Then call the matching completion endpoint with
+    object_name.
+    """
+
+    object_name: str = Field(..., description="Object name to pass to the completion call")
+    upload_url: str = Field(..., description="URL for the presigned POST upload")
+    fields: Dict[str, str] = Field(..., description="Form fields for the presigned POST upload")
+    put_url: str = Field(..., description="URL for a presigned PUT upload")
+    expires_at: datetime = Field(..., description="When the upload URLs expire (UTC)")
+
+
+class PresignedUploadBatchRequest(BaseModel):
+    """Request for direct-to-storage uploads of several files."""
+
+    files: List[PresignedUploadRequest] = Field(..., min_length=1, max_length=10)
+
+
+class PresignedUploadBatchResponse(BaseModel):
+    """Presigned uploads, in request order."""
+
+    uploads: List[PresignedUploadResponse]
+
+
+class CompleteUploadRequest(BaseModel):
+    """Completion callback for a direct upload."""
+
+    object_name: str = Field(..., min_length=1, description="Object name of the finished upload")
+
+
+class CompleteUploadBatchRequest(BaseModel):
+    """Completion callback for several direct uploads."""
+
+    object_names: List[str] = Field(..., min_length=1, max_length=10)
@@ -6,6 +6,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.schemas.account import FacetCountSchema, PriceRangeSchema
+
 
 class AccountTier(str, Enum):
     """Account tier levels."""
@@ -188,6 +190,12 @@ class SearchFilters(BaseModel):
         default_factory=list, description="Available games to filter by"
     )
     price_range: dict = Field(default_factory=dict, description="Available price range {min, max}")
+    game_counts: List[FacetCountSchema] = Field(
+        default_factory=list, description="Matching accounts per game"
+    )
+    price_buckets: List[PriceRangeSchema] = Field(
+        default_factory=list, description="Matching accounts per price range"
+    )
 
 
 class SearchData(BaseModel):
@@ -0,0 +1,236 @@
+"""
+Faceted filter counts for account browse and search.
+
+Game counts, rank counts, the price histogram and the price range of active
+accounts come from one GROUP BY GROUPING SETS query. Each facet is counted
+with the other selected filters applied but not its own (a count(*) FILTER
+per facet), so picking a game still shows how many accounts every other
+game has.
+
+Results are cached in Redis per normalized filter signature. The cache key
+carries a version number that is bumped whenever an account's status
+changes, which drops every cached signature at once.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import ColumnElement, and_, case, func, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import serialization
+from app.core.config import settings
+from app.models.account import Account
+
+logger = logging.getLogger(__name__)
+
+# (label, min, max) of the price histogram buckets
+PRICE_BUCKETS = [
+    ("Under $100", 0, 100),
+    ("$100 - $300", 100, 300),
+    ("$300 - $500", 300, 500),
+    ("Over $500", 500, None),
+]
+
+# grouping(game, rank, bucket) of each grouping set
+_GAME_SET, _RANK_SET, _BUCKET_SET, _TOTAL_SET = 0b011, 0b101, 0b110, 0b111
+
+
+def filter_signature(
+    game: Optional[str] = None,
+    level: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Normalize facet filters so equivalent requests share a cache entry.
+
+    Game and level match case-insensitively, so they are stripped and
+    lowercased; prices are rounded to cents; unset filters are dropped.
+
+    Returns:
+        Normalized filters
+    """
+    signature: Dict[str, Any] = {}
+    if game and game.strip():
+        signature["game"] = game.strip().lower()
+    if level and level.strip():
+        signature["level"] = level.strip().lower()
+    if price_min is not None:
+        signature["price_min"] = round(float(price_min), 2)
+    if price_max is not None:
+        signature["price_max"] = round(float(price_max), 2)
+    return signature
+
+
+class AccountFacets:
+    """Computes and caches facet counts of active accounts."""
+
+    KEY = "facets:accounts:{version}:{digest}"
+    VERSION_KEY = "facets:accounts:version"
+
+    def __init__(self, ttl_seconds: int = settings.FACET_CACHE_TTL_SECONDS) -> None:
+        """
+        Initialize account facets.
+
+        Args:
+            ttl_seconds: Lifetime of a cached facet result
+        """
+        self.ttl_seconds = ttl_seconds
+
+    async def get(
+        self,
+        db: AsyncSession,
+        game: Optional[str] = None,
+        level: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get facet counts for a set of filters, from cache when possible.
+
+        Args:
+            db: Database session
+            game: Selected game (substring match, as in browse)
+            level: Selected rank (substring match)
+            price_min: Minimum price
+            price_max: Maximum price
+
+        Returns:
+            Dict with games and levels ([{"value", "count"}] sorted by value),
+            price_buckets ([{"label", "min", "max", "count"}]), price_min,
+            price_max and total
+        """
+        from app.core.redis import redis_client
+
+        signature = filter_signature(game, level, price_min, price_max)
+        key = None
+        if redis_client is not None:
+            try:
+                version = await redis_client.get(self.VERSION_KEY) or 0
+                key = self.KEY.format(version=version, digest=self._digest(signature))
+                cached = await redis_client.get(key)
+                if cached:
+                    hit: Dict[str, Any] = serialization.loads(cached)
+                    return hit
+            except Exception as e:
+                logger.error(f"Failed to read cached facets: {e}")
+
+        facets = await self.compute(db, signature)
+
+        if redis_client is not None and key is not None:
+            try:
+                await redis_client.set(key, serialization.dumps(facets), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.error(f"Failed to cache facets: {e}")
+        return facets
+
+    async def invalidate(self) -> None:
+        """Drop every cached facet result after an account status change."""
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.incr(self.VERSION_KEY)
+        except Exception as e:
+            logger.error(f"Failed to invalidate facets: {e}")
+
+    @staticmethod
+    async def compute(db: AsyncSession, signature: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute facet counts in one grouped query.
+
+        Args:
+            db: Database session
+            signature: Normalized filters from filter_signature
+
+        Returns:
+            Facet counts (see get)
+        """
+        conditions: Dict[str, ColumnElement[bool]] = {
+            "game": true(),
+            "level": true(),
+            "price": true(),
+        }
+        if "game" in signature:
+            conditions["game"] = Account.game.ilike(f"%{signature['game']}%")
+        if "level" in signature:
+            conditions["level"] = Account.rank.ilike(f"%{signature['level']}%")
+        price_filters = []
+        if "price_min" in signature:
+            price_filters.append(Account.price >= signature["price_min"])
+        if "price_max" in signature:
+            price_filters.append(Account.price <= signature["price_max"])
+        if price_filters:
+            conditions["price"] = and_(*price_filters)
+
+        def applied(*names: str) -> Any:
+            return and_(*(conditions[name] for name in names))
+
+        bucket = case(
+            *(
+                (Account.price < upper, index)
+                for index, (_, _, upper) in enumerate(PRICE_BUCKETS)
+                if upper is not None
+            ),
+            else_=len(PRICE_BUCKETS) - 1,
+        ).label("bucket")
+
+        query = (
+            select(
+                Account.game,
+                Account.rank,
+                bucket,
+                func.grouping(Account.game, Account.rank, bucket).label("grouping_set"),
+                func.count().filter(applied("level", "price")).label("game_count"),
+                func.count().filter(applied("game", "price")).label("level_count"),
+                func.count().filter(applied("game", "level")).label("bucket_count"),
+                func.count().filter(applied("game", "level", "price")).label("total"),
+                func.min(Account.price).filter(applied("game", "level")).label("price_min"),
+                func.max(Account.price).filter(applied("game", "level")).label("price_max"),
+            )
+            .where(Account.status == "active")
+            .group_by(
+                func.grouping_sets(
+                    tuple_(Account.game), tuple_(Account.rank), tuple_(bucket), tuple_()
+                )
+            )
+        )
+        rows = (await db.execute(query)).all()
+
+        games: List[Dict[str, Any]] = []
+        levels: List[Dict[str, Any]] = []
+        bucket_counts = [0] * len(PRICE_BUCKETS)
+        facets: Dict[str, Any] = {"price_min": None, "price_max": None, "total": 0}
+        for row in rows:
+            if row.grouping_set == _GAME_SET and row.game_count:
+                games.append({"value": row.game, "count": row.game_count})
+            elif row.grouping_set == _RANK_SET and row.rank and row.level_count:
+                levels.append({"value": row.rank, "count": row.level_count})
+            elif row.grouping_set == _BUCKET_SET:
+                bucket_counts[row.bucket] = row.bucket_count
+            elif row.grouping_set == _TOTAL_SET:
+                facets["total"] = row.total
+                facets["price_min"] = float(row.price_min) if row.price_min is not None else None
+                facets["price_max"] = float(row.price_max) if row.price_max is not None else None
+
+        facets["games"] = sorted(games, key=lambda item: item["value"])
+        facets["levels"] = sorted(levels, key=lambda item: item["value"])
+        facets["price_buckets"] = [
+            {"label": label, "min": lower, "max": upper, "count": count}
+            for (label, lower, upper), count in zip(PRICE_BUCKETS, bucket_counts)
+        ]
+        return facets
+
+    @staticmethod
+    def _digest(signature: Dict[str, Any]) -> str:
+        encoded = json.dumps(signature, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+# Global account facets instance
+account_facets = AccountFacets()
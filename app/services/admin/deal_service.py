@@ -17,6 +17,7 @@ from sqlalchemy.orm import selectinload
 from app.core.exceptions import NotFoundException
 from app.models.deal import Deal
 from app.schemas.admin import DealInAdminList, DealListResponse
+from app.services.buy.deal_service import account_status_changed, settle_account_reservation
 
 logger = logging.getLogger(__name__)
 
@@ -238,8 +239,10 @@ class DealManagementService:
         deal.status = "cancelled"
         deal.cancelled_at = datetime.now(timezone.utc)
         deal.cancellation_reason = reason
+        game = await settle_account_reservation(self.db, deal.account_id, deal.status)
 
         await self.db.commit()
+        await account_status_changed(game)
 
         # Log admin action
         await self._log_admin_action("cancel_deal", deal_id, f"Reason: {reason}")
@@ -12,7 +12,7 @@ Usage:
     from app.services.buy import BuyService
 """
 
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -113,9 +113,11 @@ class BuyService:
             limit=limit,
         )
 
-    async def get_account_details(self, account_id: str) -> AccountDetailResponse:
+    async def get_account_details(
+        self, account_id: str, viewer: Optional[str] = None
+    ) -> AccountDetailResponse:
         """Get detailed account information."""
-        return await self.accounts.get_account_details(account_id)
+        return await self.accounts.get_account_details(account_id, viewer)
 
     async def get_similar_accounts(
         self, account_id: str, limit: int = 5
@@ -19,11 +19,15 @@ from app.schemas.account import (
     AccountFiltersSchema,
     AccountResponse,
     AccountsBrowseResponse,
+    FacetCountSchema,
     PriceRangeSchema,
     SellerInfoSchema,
     SimilarAccountsResponse,
 )
 from app.schemas.common import PaginationSchema
+from app.services.account_facets import account_facets
+from app.services.buy.similar_accounts import similar_accounts_index
+from app.services.view_counter import view_counter
 
 
 class AccountBrowsingService:
@@ -148,7 +152,7 @@ class AccountBrowsingService:
             )
 
         # Get available filters
-        filters = await self._get_account_filters()
+        filters = await self._get_account_filters(game, level, price_min, price_max)
 
         # Create pagination
         pagination = PaginationSchema.create(page=page, limit=limit, total=total)
@@ -164,12 +168,17 @@ class AccountBrowsingService:
             },
         )
 
-    async def get_account_details(self, account_id: str) -> AccountDetailResponse:
+    async def get_account_details(
+        self, account_id: str, viewer: Optional[str] = None
+    ) -> AccountDetailResponse:
         """
         Get detailed account information.
 
+        Counts a view unless the viewer is the seller.
+
         Args:
             account_id: Account ID
+            viewer: Viewer identity (user ID or "ip:<address>") for view counting
 
         Returns:
             AccountDetailResponse with full account details
@@ -190,6 +199,9 @@ class AccountBrowsingService:
         if not account:
             raise ValueError("Account not found")
 
+        if viewer != str(account.seller_id):
+            await view_counter.record("accounts", account.id, viewer)
+
         # Build seller info
         seller_profile = account.seller.profile if account.seller else None
         seller_info = SellerInfoSchema(
@@ -231,7 +243,11 @@ class AccountBrowsingService:
         self, account_id: str, limit: int = 10
     ) -> SimilarAccountsResponse:
         """
-        Get similar accounts based on game, price, or rank.
+        Get similar accounts from the precomputed neighbor index.
+
+        Neighbors are scored on price, rank and features within the same game
+        (see similar_accounts); an account missing from the index is indexed
+        on the spot.
 
         Args:
             account_id: Original account ID
@@ -243,24 +259,19 @@ class AccountBrowsingService:
         Raises:
             ValueError: If account not found
         """
-        # Get original account
-        account_query = select(Account).where(Account.id == uuid.UUID(account_id))
-        result = await self.db.execute(account_query)
-        original_account = result.scalar_one_or_none()
+        account_uuid = uuid.UUID(account_id)
+        neighbor_ids = await similar_accounts_index.get(account_uuid)
+        if neighbor_ids is None:
+            neighbor_ids = await similar_accounts_index.refresh_account(self.db, account_uuid)
+            if neighbor_ids is None:
+                raise ValueError("Account not found")
 
-        if not original_account:
-            raise ValueError("Account not found")
+        if not neighbor_ids:
+            return SimilarAccountsResponse(accounts=[])
 
-        # Find similar accounts
-        price_range = original_account.price * 0.3  # 30% price variance
+        # Neighbors sold or reserved since the last rebuild drop out here
         query = select(Account).where(
-            and_(
-                Account.id != uuid.UUID(account_id),
-                Account.status == "active",
-                Account.game == original_account.game,
-                Account.price >= original_account.price - price_range,
-                Account.price <= original_account.price + price_range,
-            )
+            and_(Account.id.in_(neighbor_ids), Account.status == "active")
         )
 
         query = query.options(
@@ -269,9 +280,9 @@ class AccountBrowsingService:
             selectinload(Account.seller),
         )
 
-        query = query.limit(limit)
         result = await self.db.execute(query)
-        similar_accounts = result.scalars().all()
+        by_id = {account.id: account for account in result.scalars().all()}
+        similar_accounts = [by_id[n] for n in neighbor_ids if n in by_id][:limit]
 
         # Convert to response
         account_responses = []
@@ -305,35 +316,36 @@ class AccountBrowsingService:
 
         return SimilarAccountsResponse(accounts=account_responses)
 
-    async def _get_account_filters(self) -> AccountFiltersSchema:
+    async def _get_account_filters(
+        self,
+        game: Optional[str] = None,
+        level: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> AccountFiltersSchema:
         """
-        Get available filters for account browsing.
+        Get available filters for account browsing with per-facet counts.
+
+        Counts come from the cached facet query (see account_facets); each
+        facet is counted with the other selected filters applied.
+
+        Args:
+            game: Selected game filter
+            level: Selected rank/level filter
+            price_min: Selected minimum price
+            price_max: Selected maximum price
 
         Returns:
             AccountFiltersSchema with available filter options
         """
-        # Get unique games
-        games_query = select(Account.game).distinct().where(Account.status == "active")
-        games_result = await self.db.execute(games_query)
-        games = [g[0] for g in games_result.all()]
-
-        # Get unique levels/ranks
-        levels_query = (
-            select(Account.rank)
-            .distinct()
-            .where(and_(Account.status == "active", Account.rank.isnot(None)))
+        facets = await account_facets.get(
+            self.db, game=game, level=level, price_min=price_min, price_max=price_max
         )
-        levels_result = await self.db.execute(levels_query)
-        levels = [l[0] for l in levels_result.all() if l[0]]
-
-        # Default price ranges - can be made configurable via admin panel
-        price_ranges = [
-            PriceRangeSchema(label="Under $100", min=0, max=100),
-            PriceRangeSchema(label="$100 - $300", min=100, max=300),
-            PriceRangeSchema(label="$300 - $500", min=300, max=500),
-            PriceRangeSchema(label="Over $500", min=500, max=None),
-        ]
 
         return AccountFiltersSchema(
-            available_games=games, price_ranges=price_ranges, available_levels=levels
+            available_games=[item["value"] for item in facets["games"]],
+            price_ranges=[PriceRangeSchema(**bucket) for bucket in facets["price_buckets"]],
+            available_levels=[item["value"] for item in facets["levels"]],
+            game_counts=[FacetCountSchema(**item) for item in facets["games"]],
+            level_counts=[FacetCountSchema(**item) for item in facets["levels"]],
         )
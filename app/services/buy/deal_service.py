@@ -6,13 +6,14 @@ Extracted from buy_service.py for better separation of concerns.
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.exceptions import AppException
 from app.models.account import Account
 from app.models.chat import ChatParticipant, ChatRoom
 from app.models.deal import Deal
@@ -30,6 +31,68 @@ from app.schemas.deal import (
     PaymentStatus,
     UserSummarySchema,
 )
+from app.services.account_facets import account_facets
+from app.services.buy.similar_accounts import similar_accounts_index
+from app.services.chat.access_cache import room_access_cache
+from app.services.home.feed_snapshot import home_feed_snapshots
+
+ACCOUNT_ACTIVE = "active"
+ACCOUNT_RESERVED = "reserved"
+
+# Where a reserved account goes when its deal ends
+ACCOUNT_STATUS_ON_DEAL_END = {
+    DealStatus.COMPLETED: "sold",
+    DealStatus.CANCELLED: ACCOUNT_ACTIVE,
+    DealStatus.REJECTED: ACCOUNT_ACTIVE,
+}
+
+
+async def settle_account_reservation(
+    db: AsyncSession, account_id: Optional[uuid.UUID], deal_status: Any
+) -> Optional[str]:
+    """
+    Release or finalize a deal's account reservation for a new deal status.
+
+    Only touches accounts still marked reserved, so deals created before
+    reservations existed leave their account alone. Does not commit; pass
+    the returned game to account_status_changed once committed.
+
+    Args:
+        db: Database session
+        account_id: The deal's account ID
+        deal_status: New deal status
+
+    Returns:
+        Game of the account whose status changed, if any
+    """
+    account_status = ACCOUNT_STATUS_ON_DEAL_END.get(DealStatus(deal_status))
+    if account_id is None or account_status is None:
+        return None
+    result = await db.execute(
+        update(Account)
+        .where(Account.id == account_id, Account.status == ACCOUNT_RESERVED)
+        .values(status=account_status)
+        .returning(Account.game)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def account_status_changed(game: Optional[str]) -> None:
+    """
+    Refresh data derived from the set of active accounts after a committed status change.
+
+    Drops cached browse/search facet counts, queues the game for a
+    similar-accounts rebuild and schedules a home feed snapshot rebuild.
+
+    Args:
+        game: Game of the changed account (None if nothing changed)
+    """
+    if game is None:
+        return
+    await account_facets.invalidate()
+    await similar_accounts_index.mark_dirty(game)
+    await home_feed_snapshots.schedule_rebuild()
 
 
 class BuyDealService:
@@ -65,11 +128,14 @@ class BuyDealService:
         Create a new deal with mediator assignment.
 
         This method:
-        1. Validates account availability
-        2. Validates mediator exists
-        3. Creates a chat room for deal communication
-        4. Creates the deal record
-        5. Adds all participants (buyer, seller, mediator) to the chat room
+        1. Validates mediator exists and is neither the buyer nor the seller
+        2. Reserves the account with one conditional UPDATE; concurrent buyers
+           skip the locked row instead of waiting on it and get a 409, and an
+           account whose seller is the buyer or the mediator is never reserved
+        3. Inserts the deal, its chat room and the buyer, seller and mediator
+           participants in a single statement, then commits
+
+        Any failure after the reservation rolls it back with the transaction.
 
         Args:
             user_id: Buyer user ID
@@ -82,67 +148,106 @@ class BuyDealService:
             DealResponse with created deal details
 
         Raises:
-            ValueError: If account not found, not available, or mediator not found
+            ValueError: If account or mediator not found
+            AppException: If the buyer, seller and mediator are not three distinct
+                users (400), or the account is reserved or no longer active (409)
         """
-        # Get account
-        account_query = select(Account).where(Account.id == uuid.UUID(account_id))
-        account_result = await self.db.execute(account_query)
-        account = account_result.scalar_one_or_none()
+        buyer_id = uuid.UUID(user_id)
+        mediator_user_id = uuid.UUID(mediator_id)
 
-        if not account or account.status != "active":
-            raise ValueError("Account not found or not available")
+        # Each party needs its own participant row in the deal room
+        if mediator_user_id == buyer_id:
+            raise AppException(
+                "INVALID_DEAL_PARTIES", "You cannot mediate your own purchase", status_code=400
+            )
 
-        # Get mediator
-        mediator_query = select(Mediator).where(Mediator.user_id == uuid.UUID(mediator_id))
+        # Get mediator before reserving so a bad mediator never holds the account
+        mediator_query = (
+            select(Mediator)
+            .where(Mediator.user_id == mediator_user_id)
+            .options(selectinload(Mediator.user).selectinload(User.profile))
+        )
         mediator_result = await self.db.execute(mediator_query)
         mediator = mediator_result.scalar_one_or_none()
 
         if not mediator:
             raise ValueError("Mediator not found")
 
-        # Create chat room
-        chat_room = ChatRoom(deal_id=None, room_type="deal")  # Will be updated after deal creation
-        self.db.add(chat_room)
-        await self.db.flush()
-
-        # Create deal
-        deal = Deal(
-            buyer_id=uuid.UUID(user_id),
-            seller_id=account.seller_id,
-            mediator_id=uuid.UUID(mediator_id),
-            account_id=uuid.UUID(account_id),
-            status=DealStatus.PENDING,
-            total_amount=account.price * quantity,
-            quantity=quantity,
-            notes=notes,
-            chat_room_id=chat_room.id,
-        )
-        self.db.add(deal)
-        await self.db.flush()
-
-        # Update chat room with deal ID
-        chat_room.deal_id = deal.id
-
-        # Add participants to chat room
-        buyer_participant = ChatParticipant(
-            chat_room_id=chat_room.id, user_id=uuid.UUID(user_id), role="buyer"
+        account = await self._reserve_account(uuid.UUID(account_id), buyer_id, mediator_user_id)
+
+        now = datetime.now(timezone.utc)
+        deal_id = uuid.uuid4()
+        chat_room_id = uuid.uuid4()
+        total_amount = account.price * quantity
+        members = {buyer_id: "buyer", account.seller_id: "seller", mediator_user_id: "mediator"}
+
+        new_deal = (
+            insert(Deal)
+            .values(
+                id=deal_id,
+                buyer_id=buyer_id,
+                seller_id=account.seller_id,
+                mediator_id=mediator_user_id,
+                account_id=account.id,
+                status=DealStatus.PENDING.value,
+                total_amount=total_amount,
+                currency="EGP",
+                notes=notes,
+                chat_room_id=chat_room_id,
+                created_at=now,
+                updated_at=now,
+            )
+            .cte("new_deal")
         )
-        seller_participant = ChatParticipant(
-            chat_room_id=chat_room.id, user_id=account.seller_id, role="seller"
+        new_room = (
+            insert(ChatRoom)
+            .values(
+                id=chat_room_id,
+                type="deal",
+                is_active=True,
+                deal_id=deal_id,
+                created_at=now,
+                updated_at=now,
+                last_activity_at=now,
+            )
+            .cte("new_room")
         )
-        mediator_participant = ChatParticipant(
-            chat_room_id=chat_room.id, user_id=uuid.UUID(mediator_id), role="mediator"
+        new_participants = (
+            insert(ChatParticipant)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "room_id": chat_room_id,
+                        "user_id": member_id,
+                        "role": role,
+                        "joined_at": now,
+                        "unread_count": 0,
+                    }
+                    for member_id, role in members.items()
+                ]
+            )
+            .add_cte(new_deal)
+            .add_cte(new_room)
         )
-        self.db.add_all([buyer_participant, seller_participant, mediator_participant])
 
-        await self.db.commit()
+        try:
+            await self.db.execute(new_participants)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        await room_access_cache.invalidate(*members, room_id=chat_room_id)
+        # The account left the active set
+        await account_status_changed(account.game)
 
         # Create response
         mediator_user = mediator.user
         mediator_profile = mediator_user.profile if mediator_user else None
         return DealResponse(
-            id=str(deal.id),
-            status=DealStatus(deal.status) if isinstance(deal.status, str) else deal.status,
+            id=str(deal_id),
+            status=DealStatus.PENDING,
             account=AccountSummarySchema(
                 id=str(account.id),
                 title=account.title,
@@ -155,11 +260,75 @@ class BuyDealService:
                 avatar=mediator_profile.avatar_url if mediator_profile and mediator_profile.avatar_url else "",
                 rating=float(mediator.rating or 0),
             ),
-            buyer_id=str(deal.buyer_id),
-            seller_id=str(deal.seller_id),
-            total_amount=float(deal.total_amount),
-            created_at=deal.created_at,
-            chat_room_id=str(chat_room.id),
+            buyer_id=str(buyer_id),
+            seller_id=str(account.seller_id),
+            total_amount=float(total_amount),
+            created_at=now,
+            chat_room_id=str(chat_room_id),
+        )
+
+    async def _reserve_account(
+        self, account_id: uuid.UUID, buyer_id: uuid.UUID, mediator_id: uuid.UUID
+    ) -> Any:
+        """
+        Move an active account to reserved, or fail fast if another buyer has it.
+
+        The row is picked with FOR UPDATE SKIP LOCKED, so while a competing
+        reservation is still committing this returns immediately instead of
+        queueing on the row lock. Accounts sold by the buyer or the mediator
+        are not picked at all.
+
+        Args:
+            account_id: Account UUID
+            buyer_id: Buyer user UUID
+            mediator_id: Mediator user UUID
+
+        Returns:
+            Row with the reserved account's id, seller_id, price, title and game
+
+        Raises:
+            ValueError: If the account does not exist
+            AppException: If the seller is the buyer or the mediator (400), or the
+                account is reserved or no longer active (409)
+        """
+        candidate = (
+            select(Account.id)
+            .where(
+                Account.id == account_id,
+                Account.status == ACCOUNT_ACTIVE,
+                Account.seller_id.notin_([buyer_id, mediator_id]),
+            )
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(Account)
+            .where(Account.id == candidate)
+            .values(status=ACCOUNT_RESERVED)
+            .returning(Account.id, Account.seller_id, Account.price, Account.title, Account.game)
+            .execution_options(synchronize_session=False)
+        )
+        account = result.one_or_none()
+        if account is not None:
+            return account
+
+        seller_id = await self.db.scalar(select(Account.seller_id).where(Account.id == account_id))
+        if seller_id is None:
+            raise ValueError("Account not found or not available")
+        if seller_id == buyer_id:
+            raise AppException(
+                "INVALID_DEAL_PARTIES", "You cannot buy your own account", status_code=400
+            )
+        if seller_id == mediator_id:
+            raise AppException(
+                "INVALID_DEAL_PARTIES",
+                "The seller cannot mediate their own sale",
+                status_code=400,
+            )
+        raise AppException(
+            "ACCOUNT_UNAVAILABLE",
+            "Account is reserved by another buyer or no longer available",
+            status_code=409,
         )
 
     async def get_deal_details(self, deal_id: str, user_id: str) -> DealDetailResponse:
@@ -304,7 +473,10 @@ class BuyDealService:
         if status == DealStatus.COMPLETED:
             deal.completed_at = datetime.utcnow()
 
+        game = await settle_account_reservation(self.db, deal.account_id, status)
+
         await self.db.commit()
+        await account_status_changed(game)
 
         # Return updated deal
         return await self._get_deal_response(deal.id)
@@ -0,0 +1,347 @@
+"""
+Precomputed "similar accounts" index.
+
+Neighbors are scored offline per game: every active account is compared
+with the active accounts of the same game inside its price band, scored on
+price closeness, rank match and feature overlap, and its top-K neighbor IDs
+are stored in Redis (similar:accounts:{id}). Detail pages read the list by
+key and load those accounts by ID.
+
+Scoring a game sorts its accounts by price once and, for each account, only
+walks outward from its own position to the SIMILAR_ACCOUNTS_CANDIDATES
+nearest prices inside the band, so a rebuild is O(n * candidates) rather
+than a full pairwise comparison.
+
+Account changes only mark their game dirty; a Celery beat task rebuilds
+dirty games and periodically the whole index. A missing list is computed
+for that one account on read.
+"""
+
+import bisect
+import heapq
+import logging
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, cast
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.account import Account, AccountFeature
+
+logger = logging.getLogger(__name__)
+
+# Score weights (sum to 1)
+PRICE_WEIGHT = 0.5
+RANK_WEIGHT = 0.25
+FEATURE_WEIGHT = 0.25
+
+
+class AccountVector(NamedTuple):
+    """The attributes of an account that similarity is scored on."""
+
+    id: UUID
+    price: float
+    rank: Optional[str]
+    features: FrozenSet[str]
+    created_at: Optional[datetime]
+
+
+def similarity(
+    target: AccountVector,
+    other: AccountVector,
+    price_band: float = settings.SIMILAR_ACCOUNTS_PRICE_BAND,
+) -> float:
+    """
+    Score how similar two accounts of the same game are.
+
+    Args:
+        target: Account being matched
+        other: Candidate neighbor
+        price_band: Relative price distance at which the price score reaches 0
+
+    Returns:
+        Score between 0 and 1
+    """
+    width = target.price * price_band
+    if width > 0:
+        price_score = max(0.0, 1.0 - abs(other.price - target.price) / width)
+    else:
+        price_score = 1.0 if other.price == target.price else 0.0
+
+    rank_score = (
+        1.0 if target.rank and other.rank and target.rank.lower() == other.rank.lower() else 0.0
+    )
+
+    union = target.features | other.features
+    feature_score = len(target.features & other.features) / len(union) if union else 0.0
+
+    return PRICE_WEIGHT * price_score + RANK_WEIGHT * rank_score + FEATURE_WEIGHT * feature_score
+
+
+def nearest_neighbors(
+    accounts: Sequence[AccountVector],
+    k: int = settings.SIMILAR_ACCOUNTS_K,
+    price_band: float = settings.SIMILAR_ACCOUNTS_PRICE_BAND,
+    candidates: int = settings.SIMILAR_ACCOUNTS_CANDIDATES,
+    targets: Optional[Iterable[AccountVector]] = None,
+) -> Dict[UUID, List[UUID]]:
+    """
+    Compute the top-K neighbors of accounts of one game.
+
+    Args:
+        accounts: Every active account of the game
+        k: Neighbors kept per account
+        price_band: Relative price band a neighbor must fall in
+        candidates: Most price-nearest accounts scored per target
+        targets: Accounts to compute neighbors for (defaults to all)
+
+    Returns:
+        Mapping of account ID to neighbor IDs, best first
+    """
+    ordered = sorted(accounts, key=lambda account: account.price)
+    prices = [account.price for account in ordered]
+    oldest = datetime.min
+
+    result = {}
+    for target in ordered if targets is None else targets:
+        low = bisect.bisect_left(prices, target.price * (1 - price_band))
+        high = bisect.bisect_right(prices, target.price * (1 + price_band))
+        center = bisect.bisect_left(prices, target.price, low, high)
+
+        # Walk outward from the target's price, nearest first
+        left, right = center - 1, center
+        window: List[AccountVector] = []
+        while len(window) < candidates and (left >= low or right < high):
+            take_right = left < low or (
+                right < high and prices[right] - target.price <= target.price - prices[left]
+            )
+            if take_right:
+                other = ordered[right]
+                right += 1
+            else:
+                other = ordered[left]
+                left -= 1
+            if other.id != target.id:
+                window.append(other)
+
+        best = heapq.nlargest(
+            k,
+            window,
+            key=lambda other: (
+                similarity(target, other, price_band),
+                (other.created_at or oldest).replace(tzinfo=None),
+            ),
+        )
+        result[target.id] = [other.id for other in best]
+    return result
+
+
+class SimilarAccountsIndex:
+    """Redis-backed store of precomputed account neighbors."""
+
+    KEY = "similar:accounts:{account_id}"
+    DIRTY_KEY = "similar:accounts:dirty"
+
+    def __init__(
+        self,
+        k: int = settings.SIMILAR_ACCOUNTS_K,
+        ttl_seconds: int = settings.SIMILAR_ACCOUNTS_TTL_SECONDS,
+    ) -> None:
+        """
+        Initialize similar accounts index.
+
+        Args:
+            k: Neighbors stored per account
+            ttl_seconds: Lifetime of a stored neighbor list
+        """
+        self.k = k
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, account_id: Any) -> Optional[List[UUID]]:
+        """
+        Get the stored neighbors of an account.
+
+        Args:
+            account_id: Account ID
+
+        Returns:
+            Neighbor IDs, best first, or None if not indexed
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return None
+
+        try:
+            raw = await redis_client.get(self.KEY.format(account_id=account_id))
+        except Exception as e:
+            logger.error(f"Failed to read similar accounts of {account_id}: {e}")
+            return None
+
+        if raw is None:
+            return None
+        return [UUID(neighbor) for neighbor in raw.split(",") if neighbor]
+
+    async def mark_dirty(self, *games: str) -> None:
+        """
+        Queue games for a neighbor rebuild after their accounts changed.
+
+        Args:
+            games: Game names
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None or not games:
+            return
+
+        try:
+            await awaitable(redis_client.sadd(self.DIRTY_KEY, *games))
+        except Exception as e:
+            logger.error(f"Failed to mark similar accounts dirty for {games}: {e}")
+
+    async def refresh_account(self, db: AsyncSession, account_id: UUID) -> Optional[List[UUID]]:
+        """
+        Compute and store the neighbors of one account.
+
+        Only the account itself and the SIMILAR_ACCOUNTS_CANDIDATES
+        price-nearest accounts of the game are loaded.
+
+        Args:
+            db: Database session
+            account_id: Account ID
+
+        Returns:
+            Neighbor IDs, best first, or None if the account does not exist
+        """
+        account = (
+            await db.execute(select(Account.game, Account.price).where(Account.id == account_id))
+        ).one_or_none()
+        if account is None:
+            return None
+
+        price = float(account.price)
+        band = settings.SIMILAR_ACCOUNTS_PRICE_BAND
+        nearby = await self._load(
+            db,
+            Account.game == account.game,
+            or_(
+                Account.id == account_id,
+                and_(
+                    Account.status == "active",
+                    Account.price.between(price * (1 - band), price * (1 + band)),
+                ),
+            ),
+            # The account itself sorts first so the limit never cuts it off
+            order_by=(Account.id != account_id, func.abs(Account.price - price)),
+            limit=settings.SIMILAR_ACCOUNTS_CANDIDATES + 1,
+        )
+        target = nearby[account_id]
+
+        neighbors = nearest_neighbors(
+            list(nearby.values()),
+            k=self.k,
+            targets=[target],
+        )
+        await self._store(neighbors)
+        return neighbors[account_id]
+
+    async def rebuild(self, db: AsyncSession, full: bool = False) -> Dict[str, int]:
+        """
+        Recompute neighbors of every active account in dirty games, or in all games.
+
+        Args:
+            db: Database session
+            full: Rebuild every game instead of only dirty ones
+
+        Returns:
+            Number of accounts indexed per game
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return {}
+
+        if full:
+            games = list(
+                (
+                    await db.execute(
+                        select(Account.game).where(Account.status == "active").distinct()
+                    )
+                ).scalars()
+            )
+            await redis_client.delete(self.DIRTY_KEY)
+        else:
+            popped = await awaitable(redis_client.spop(self.DIRTY_KEY, 1000))
+            games = cast(List[str], popped or [])
+
+        report = {}
+        for game in games:
+            accounts = await self._load(db, Account.game == game, Account.status == "active")
+            neighbors = nearest_neighbors(list(accounts.values()), k=self.k)
+            await self._store(neighbors)
+            report[game] = len(neighbors)
+
+        if report:
+            logger.info(f"Rebuilt similar accounts: {report}")
+        return report
+
+    async def _store(self, neighbors: Dict[UUID, List[UUID]]) -> None:
+        from app.core.redis import redis_client
+
+        if redis_client is None or not neighbors:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for account_id, neighbor_ids in neighbors.items():
+                pipe.set(
+                    self.KEY.format(account_id=account_id),
+                    ",".join(str(neighbor) for neighbor in neighbor_ids),
+                    ex=self.ttl_seconds,
+                )
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to store similar accounts: {e}")
+
+    @staticmethod
+    async def _load(
+        db: AsyncSession,
+        *criteria: Any,
+        order_by: Sequence[Any] = (),
+        limit: Optional[int] = None,
+    ) -> Dict[UUID, AccountVector]:
+        """Load accounts and their feature labels as vectors, in two queries."""
+        query = select(Account.id, Account.price, Account.rank, Account.created_at).where(*criteria)
+        if order_by:
+            query = query.order_by(*order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return {}
+
+        features: Dict[UUID, set] = {}
+        feature_rows = await db.execute(
+            select(AccountFeature.account_id, AccountFeature.label).where(
+                AccountFeature.account_id.in_([row.id for row in rows])
+            )
+        )
+        for account_id, label in feature_rows.all():
+            features.setdefault(account_id, set()).add(label.strip().lower())
+
+        return {
+            row.id: AccountVector(
+                id=row.id,
+                price=float(row.price),
+                rank=row.rank,
+                features=frozenset(features.get(row.id, ())),
+                created_at=row.created_at,
+            )
+            for row in rows
+        }
+
+
+# Global similar accounts index instance
+similar_accounts_index = SimilarAccountsIndex()
@@ -1,12 +1,12 @@
 """Redis caching service for home feed data."""
 
-import json
 from datetime import timedelta
 from typing import Any, List, Optional, cast
 
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import serialization
 from app.core.redis import get_redis
 
 
@@ -50,7 +50,7 @@ class CacheService:
         try:
             cached = await redis.get(self.FEATURED_ACCOUNTS_KEY)
             if cached:
-                return cast(List[dict], json.loads(cached))
+                return cast(List[dict], serialization.loads(cached))
         except Exception:
             # Fail silently - return None to fetch from DB
             pass
@@ -72,14 +72,16 @@ class CacheService:
             await redis.setex(
                 self.FEATURED_ACCOUNTS_KEY,
                 int(self.FEATURED_ACCOUNTS_TTL.total_seconds()),
-                json.dumps(accounts),
+                serialization.dumps(accounts),
             )
         except Exception:
             # Fail silently - cache miss is acceptable
             pass
 
     async def invalidate_featured_accounts(self) -> None:
-        """Invalidate featured accounts cache."""
+        """Invalidate featured accounts cache and schedule a home feed snapshot rebuild."""
+        from app.services.home.feed_snapshot import home_feed_snapshots
+
         redis = await self._get_redis()
         if not redis:
             return
@@ -89,6 +91,8 @@ class CacheService:
         except Exception:
             pass
 
+        await home_feed_snapshots.schedule_rebuild()
+
     async def get_cached_categories(self) -> list[dict[Any, Any]] | None:
         """
         Get cached categories.
@@ -103,7 +107,7 @@ class CacheService:
         try:
             cached = await redis.get(self.CATEGORIES_KEY)
             if cached:
-                result: list[dict[Any, Any]] = json.loads(cached)
+                result: list[dict[Any, Any]] = serialization.loads(cached)
                 return result
         except Exception:
             pass
@@ -125,7 +129,7 @@ class CacheService:
             await redis.setex(
                 self.CATEGORIES_KEY,
                 int(self.CATEGORIES_TTL.total_seconds()),
-                json.dumps(categories),
+                serialization.dumps(categories),
             )
         except Exception:
             pass
@@ -159,7 +163,7 @@ class CacheService:
             key = f"{self.GAMES_KEY}:{sort}"
             cached = await redis.get(key)
             if cached:
-                result: list[dict[Any, Any]] = json.loads(cached)
+                result: list[dict[Any, Any]] = serialization.loads(cached)
                 return result
         except Exception:
             pass
@@ -180,7 +184,7 @@ class CacheService:
 
         try:
             key = f"{self.GAMES_KEY}:{sort}"
-            await redis.setex(key, int(self.GAMES_TTL.total_seconds()), json.dumps(games))
+            await redis.setex(key, int(self.GAMES_TTL.total_seconds()), serialization.dumps(games))
         except Exception:
             pass
 
@@ -213,7 +217,7 @@ class CacheService:
         try:
             cached = await redis.get(self.PROMO_BANNERS_KEY)
             if cached:
-                result: list[dict[Any, Any]] = json.loads(cached)
+                result: list[dict[Any, Any]] = serialization.loads(cached)
                 return result
         except Exception:
             pass
@@ -235,7 +239,7 @@ class CacheService:
             await redis.setex(
                 self.PROMO_BANNERS_KEY,
                 int(self.PROMO_BANNERS_TTL.total_seconds()),
-                json.dumps(banners),
+                serialization.dumps(banners),
             )
         except Exception:
             pass
@@ -265,7 +269,7 @@ class CacheService:
         try:
             cached = await redis.get(self.FAQ_KEY)
             if cached:
-                result: list[dict[Any, Any]] = json.loads(cached)
+                result: list[dict[Any, Any]] = serialization.loads(cached)
                 return result
         except Exception:
             pass
@@ -285,7 +289,7 @@ class CacheService:
 
         try:
             await redis.setex(
-                self.FAQ_KEY, int(self.FAQ_TTL.total_seconds()), json.dumps(faq_items)
+                self.FAQ_KEY, int(self.FAQ_TTL.total_seconds()), serialization.dumps(faq_items)
             )
         except Exception:
             pass
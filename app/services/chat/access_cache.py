@@ -0,0 +1,305 @@
+"""
+Room membership authorization cache.
+
+Caches (user, room) -> role from ChatParticipant so access checks on hot
+paths (WebSocket frames, message list/send) cost a Redis lookup instead of
+a chat_participants query.
+
+Each user's memberships live in one Redis hash, loaded in bulk, and each
+room's active members in another:
+
+    chat:acl:{user_id}      -> {room_id: role, ..., "*": "1"}
+    chat:acl:room:{room_id} -> {user_id: role, ..., "*": "1"}
+
+The "*" marker field means the hash is complete, so a missing field is an
+authoritative "not a member". Hashes are dropped whenever membership
+changes and rebuilt on the next lookup.
+
+The sender snapshot stamped on sent messages is cached the same way, so
+sending does not load the sender's user and profile rows:
+
+    chat:sender:{user_id}   -> {"username": ..., "avatar_url": ..., "*": "1"}
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple, cast
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.chat import ChatParticipant
+from app.models.user import User, UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+class RoomAccessCache:
+    """
+    Redis-backed cache of chat room memberships per user.
+
+    Lookups fall back to the database when the hash is missing or Redis is
+    unavailable. Every method accepts an optional session; without one a
+    short-lived session is opened only when the database must be queried.
+    """
+
+    USER_ROOMS_KEY = "chat:acl:{user_id}"
+    ROOM_MEMBERS_KEY = "chat:acl:room:{room_id}"
+    SENDER_KEY = "chat:sender:{user_id}"
+    LOADED_FIELD = "*"
+
+    def __init__(self, ttl_seconds: int = settings.CHAT_ACCESS_CACHE_TTL_SECONDS) -> None:
+        """
+        Initialize access cache.
+
+        Args:
+            ttl_seconds: Expiry of a user's membership hash
+        """
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, user_id: Any) -> str:
+        return self.USER_ROOMS_KEY.format(user_id=user_id)
+
+    async def load_user_rooms(
+        self, user_id: Any, db: Optional[AsyncSession] = None
+    ) -> Dict[str, str]:
+        """
+        Load all active memberships of a user and cache them in one write.
+
+        Args:
+            user_id: User identifier
+            db: Optional database session
+
+        Returns:
+            Mapping of room ID string to participant role
+        """
+        roles = await self._fetch_roles(user_id, db)
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return roles
+
+        key = self._key(user_id)
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.delete(key)
+            pipe.hset(key, mapping={self.LOADED_FIELD: "1", **roles})
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to cache room access for {user_id}: {e}")
+
+        return roles
+
+    async def get_role(
+        self, user_id: Any, room_id: Any, db: Optional[AsyncSession] = None
+    ) -> Optional[str]:
+        """
+        Get a user's role in a room.
+
+        Args:
+            user_id: User identifier
+            room_id: Room identifier
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Participant role, or None if the user is not an active member
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is not None:
+            try:
+                role, loaded = await awaitable(
+                    redis_client.hmget(self._key(user_id), [str(room_id), self.LOADED_FIELD])
+                )
+                if loaded:
+                    return cast(Optional[str], role)
+            except Exception as e:
+                logger.error(f"Failed to read room access for {user_id}: {e}")
+
+        roles = await self.load_user_rooms(user_id, db)
+        return roles.get(str(room_id))
+
+    async def has_access(
+        self, user_id: Any, room_id: Any, db: Optional[AsyncSession] = None
+    ) -> bool:
+        """
+        Check whether a user is an active member of a room.
+
+        Args:
+            user_id: User identifier
+            room_id: Room identifier
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            True if the user is an active participant
+        """
+        return await self.get_role(user_id, room_id, db) is not None
+
+    async def get_room_members(
+        self, room_id: Any, db: Optional[AsyncSession] = None
+    ) -> Dict[str, str]:
+        """
+        Get the active members of a room.
+
+        Args:
+            room_id: Room identifier
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Mapping of user ID string to participant role
+        """
+        from app.core.redis import awaitable, redis_client
+
+        key = self.ROOM_MEMBERS_KEY.format(room_id=room_id)
+
+        if redis_client is not None:
+            try:
+                cached: Dict[str, str] = await awaitable(redis_client.hgetall(key))
+                if cached.pop(self.LOADED_FIELD, None):
+                    return cached
+            except Exception as e:
+                logger.error(f"Failed to read members of room {room_id}: {e}")
+
+        query = select(ChatParticipant.user_id, ChatParticipant.role).where(
+            and_(
+                ChatParticipant.room_id == room_id,
+                ChatParticipant.left_at.is_(None),
+            )
+        )
+        result = await self._execute(query, db)
+        members = {str(user_id): role or "member" for user_id, role in result.all()}
+
+        if redis_client is not None:
+            try:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.delete(key)
+                pipe.hset(key, mapping={self.LOADED_FIELD: "1", **members})
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to cache members of room {room_id}: {e}")
+
+        return members
+
+    async def get_sender(
+        self, user_id: Any, db: Optional[AsyncSession] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the username and avatar shown on a user's messages.
+
+        Args:
+            user_id: User identifier
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            (username, avatar_url), either None if unknown
+        """
+        from app.core.redis import awaitable, redis_client
+
+        key = self.SENDER_KEY.format(user_id=user_id)
+
+        if redis_client is not None:
+            try:
+                username, avatar_url, loaded = await awaitable(
+                    redis_client.hmget(key, ["username", "avatar_url", self.LOADED_FIELD])
+                )
+                if loaded:
+                    return username or None, avatar_url or None
+            except Exception as e:
+                logger.error(f"Failed to read sender snapshot of {user_id}: {e}")
+
+        query = (
+            select(User.username, UserProfile.avatar_url)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        result = await self._execute(query, db)
+        row = result.first()
+        username, avatar_url = (row[0], row[1]) if row else (None, None)
+
+        if redis_client is not None and row is not None:
+            try:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.hset(
+                    key,
+                    mapping={
+                        self.LOADED_FIELD: "1",
+                        "username": username or "",
+                        "avatar_url": avatar_url or "",
+                    },
+                )
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to cache sender snapshot of {user_id}: {e}")
+
+        return username, avatar_url
+
+    async def invalidate_sender(self, user_id: Any) -> None:
+        """
+        Drop a cached sender snapshot after the user's username or avatar changes.
+
+        Args:
+            user_id: User whose snapshot changed
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.delete(self.SENDER_KEY.format(user_id=user_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate sender snapshot of {user_id}: {e}")
+
+    async def invalidate(self, *user_ids: Any, room_id: Any = None) -> None:
+        """
+        Drop cached memberships after they change.
+
+        Must be called after the membership change is committed.
+
+        Args:
+            user_ids: Users whose memberships changed
+            room_id: Room whose member list changed
+        """
+        keys = [self._key(user_id) for user_id in user_ids]
+        if room_id is not None:
+            keys.append(self.ROOM_MEMBERS_KEY.format(room_id=room_id))
+        if not keys:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Failed to invalidate room access for {keys}: {e}")
+
+    async def _fetch_roles(self, user_id: Any, db: Optional[AsyncSession]) -> Dict[str, str]:
+        query = select(ChatParticipant.room_id, ChatParticipant.role).where(
+            and_(
+                ChatParticipant.user_id == user_id,
+                ChatParticipant.left_at.is_(None),
+            )
+        )
+
+        result = await self._execute(query, db)
+        return {str(room_id): role or "member" for room_id, role in result.all()}
+
+    async def _execute(self, query: Any, db: Optional[AsyncSession]) -> Any:
+        if db is not None:
+            return await db.execute(query)
+
+        from app.core.database import async_session_maker
+
+        async with async_session_maker() as session:
+            return await session.execute(query)
+
+
+# Global room access cache instance
+room_access_cache = RoomAccessCache()
@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import AppException
 from app.models.chat import MessageAttachment
 from app.schemas.chat import MessageAttachmentResponse
-from app.services.chat.base import verify_participant_access
+from app.services.chat.base import verify_room_membership
 from app.utils.storage import upload_file_to_storage
 
 
@@ -50,7 +50,7 @@ class AttachmentService:
             AppException: If upload fails or user not a participant
         """
         # Verify user is a participant
-        await verify_participant_access(self.db, room_id, user_id)
+        await verify_room_membership(self.db, room_id, user_id)
 
         # Upload file to storage
         try:
@@ -4,8 +4,6 @@ Base utilities and shared functionality for chat services.
 This module provides common helper functions used across all chat service modules.
 """
 
-from datetime import datetime, timezone
-from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import and_, select
@@ -13,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AppException
 from app.models.chat import ChatParticipant
+from app.services.chat.access_cache import room_access_cache
 
 
 async def verify_participant_access(
@@ -52,18 +51,31 @@ async def verify_participant_access(
     return participant
 
 
-def is_user_online(last_login_at: Optional[datetime]) -> bool:
+async def verify_room_membership(db: AsyncSession, room_id: UUID, user_id: UUID) -> str:
     """
-    Determine if a user is online based on their last login time.
+    Verify room membership through the access cache.
+
+    Use this instead of verify_participant_access when the participant
+    record itself is not needed; a warm cache answers without a query.
 
     Args:
-        last_login_at: User's last login timestamp
+        db: Database session (used only on a cache miss)
+        room_id: Chat room ID
+        user_id: User ID
 
     Returns:
-        bool: True if user is considered online (last login < 5 minutes ago)
+        str: The participant role
+
+    Raises:
+        AppException: If user is not a participant in the room
     """
-    if not last_login_at:
-        return False
+    role = await room_access_cache.get_role(user_id, room_id, db)
+
+    if role is None:
+        raise AppException(
+            error_code="NOT_PARTICIPANT",
+            message="You are not a participant in this chat room",
+            status_code=403
+        )
 
-    time_since_login = (datetime.now(timezone.utc) - last_login_at).total_seconds()
-    return time_since_login < 300  # Online if last login < 5 min ago
+    return role
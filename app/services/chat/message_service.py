@@ -6,19 +6,25 @@ Handles message retrieval, sending, and deletion.
 
 import html
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import and_, desc, select
+from sqlalchemy import and_, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import AppException
 from app.models.chat import ChatRoom, Message, MessageAttachment
+from app.models.user import User
 from app.schemas.chat import MessageAttachmentResponse, MessageResponse, MessagesListResponse, SendMessageRequest
-from app.services.chat.base import verify_participant_access
+from app.services.chat.access_cache import room_access_cache
+from app.services.chat.base import verify_room_membership
+from app.services.chat.unread_counter import unread_counter
 from app.utils.redis_pubsub import publish_to_channel
 
+# Characters of message content kept in the room's last-message snapshot
+LAST_MESSAGE_PREVIEW_LENGTH = 100
+
 
 class MessageService:
     """
@@ -55,7 +61,7 @@ class MessageService:
             AppException: If room not found or user not a participant
         """
         # Verify user is a participant
-        participant = await verify_participant_access(self.db, room_id, user_id)
+        await verify_room_membership(self.db, room_id, user_id)
 
         # Build messages query
         query = (
@@ -75,8 +81,8 @@ class MessageService:
 
         # Build response
         messages_data = []
-        # Get last_seen_at from user's last_login_at
-        last_seen_at = participant.user.last_login_at if participant.user else None
+        # Messages from others are read once the user's read marker has passed them
+        last_read_at = await unread_counter.get_last_read(user_id, room_id, self.db)
         for message in reversed(messages):  # Return in chronological order
             attachments = [
                 MessageAttachmentResponse(
@@ -106,9 +112,8 @@ class MessageService:
                     type=message.type,
                     timestamp=message.created_at,
                     is_read=(
-                        message.created_at <= last_seen_at
-                        if last_seen_at
-                        else False
+                        message.sender_id == user_id
+                        or (last_read_at is not None and message.created_at <= last_read_at)
                     ),
                     attachments=attachments,
                 )
@@ -140,9 +145,13 @@ class MessageService:
         content = html.escape(data.content)
 
         # Verify user is a participant
-        participant = await verify_participant_access(self.db, room_id, user_id)
+        await verify_room_membership(self.db, room_id, user_id)
+
+        # Cached like room access, so a warm send costs no lookups before the insert
+        sender_name, sender_avatar = await room_access_cache.get_sender(user_id, self.db)
 
         # Create message
+        now = datetime.now(timezone.utc)
         message = Message(
             id=uuid4(),
             room_id=room_id,
@@ -150,18 +159,37 @@ class MessageService:
             content=content,
             type=data.type,
             reply_to_message_id=data.reply_to_message_id,
+            created_at=now,
         )
 
         self.db.add(message)
 
-        # Update room timestamp
-        await self.db.execute(select(ChatRoom).where(ChatRoom.id == room_id))
-        room = await self.db.get(ChatRoom, room_id)
-        if room:
-            room.updated_at = datetime.now(timezone.utc)
+        # Update the room's last-message snapshot in the same transaction
+        await self.db.execute(
+            update(ChatRoom)
+            .where(
+                and_(
+                    ChatRoom.id == room_id,
+                    or_(ChatRoom.last_message_at.is_(None), ChatRoom.last_message_at <= now),
+                )
+            )
+            .values(
+                last_message_id=message.id,
+                last_message_sender_id=user_id,
+                last_message_sender_name=sender_name,
+                last_message_preview=content[:LAST_MESSAGE_PREVIEW_LENGTH],
+                last_message_type=data.type,
+                last_message_at=now,
+                last_activity_at=now,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         await self.db.commit()
-        await self.db.refresh(message)
+
+        # Bump unread counters of the other participants
+        await unread_counter.record_message(room_id, user_id, self.db)
 
         # Publish to Redis for WebSocket clients
         await publish_to_channel(
@@ -182,12 +210,8 @@ class MessageService:
         return MessageResponse(
             id=str(message.id),
             sender_id=str(user_id),
-            sender_name=participant.user.username if participant.user and participant.user.username else "Unknown",
-            sender_avatar=(
-                participant.user.profile.avatar_url
-                if participant.user and participant.user.profile
-                else None
-            ),
+            sender_name=sender_name or "Unknown",
+            sender_avatar=sender_avatar,
             content=content,
             type=data.type,
             timestamp=message.created_at,
@@ -219,6 +243,7 @@ class MessageService:
         # Soft delete
         message.is_deleted = True
         message.content = "[Message deleted]"
+        await self._replace_last_message(message.room_id, message_id)
         await self.db.commit()
 
         # Publish to Redis
@@ -233,3 +258,52 @@ class MessageService:
                 },
             },
         )
+
+    async def _replace_last_message(self, room_id: UUID, deleted_message_id: UUID) -> None:
+        """
+        Point the room snapshot at the newest remaining message.
+
+        One UPDATE that only matches if the deleted message is the room's
+        current snapshot; the newest remaining message is looked up in
+        correlated subqueries, so deleting any other message costs nothing.
+
+        Args:
+            room_id: Chat room ID
+            deleted_message_id: ID of the message being deleted
+        """
+        latest = (
+            select(Message.id)
+            .where(
+                and_(
+                    Message.room_id == ChatRoom.id,
+                    Message.id != deleted_message_id,
+                    Message.is_deleted.is_(False),
+                )
+            )
+            .order_by(desc(Message.created_at))
+            .limit(1)
+            .correlate(ChatRoom)
+        )
+
+        def latest_value(column: Any) -> Any:
+            return latest.with_only_columns(column).scalar_subquery()
+
+        await self.db.execute(
+            update(ChatRoom)
+            .where(
+                and_(ChatRoom.id == room_id, ChatRoom.last_message_id == deleted_message_id)
+            )
+            .values(
+                last_message_id=latest_value(Message.id),
+                last_message_sender_id=latest_value(Message.sender_id),
+                last_message_sender_name=select(User.username)
+                .where(User.id == latest_value(Message.sender_id))
+                .scalar_subquery(),
+                last_message_preview=latest_value(
+                    func.substr(Message.content, 1, LAST_MESSAGE_PREVIEW_LENGTH)
+                ),
+                last_message_type=latest_value(Message.type),
+                last_message_at=latest_value(Message.created_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,20 +1,22 @@
 """
 Participant service for chat operations.
 
-Handles participant operations like marking messages as read and leaving chats.
+Handles participant operations like adding members, marking messages as read
+and leaving chats.
 """
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AppException
-from app.models.chat import Message
+from app.models.chat import ChatParticipant
 from app.schemas.chat import MarkReadResponse
-from app.services.chat.base import verify_participant_access
+from app.services.chat.access_cache import room_access_cache
+from app.services.chat.base import verify_participant_access, verify_room_membership
+from app.services.chat.unread_counter import unread_counter
 from app.utils.redis_pubsub import publish_to_channel
 
 
@@ -22,7 +24,8 @@ class ParticipantService:
     """
     Service for participant operations.
 
-    Handles marking messages as read and leaving chat rooms.
+    Handles adding members, marking messages as read and leaving chat rooms.
+    Every membership change invalidates the room access cache.
     """
 
     def __init__(self, db: AsyncSession):
@@ -34,6 +37,33 @@ class ParticipantService:
         """
         self.db = db
 
+    async def add_participants(self, room_id: UUID, members: Dict[Any, str]) -> None:
+        """
+        Add members to a chat room and commit.
+
+        Commits the whole session, so callers creating the room in the same
+        transaction can rely on this as their final commit.
+
+        Args:
+            room_id: Chat room ID
+            members: Mapping of user ID to participant role
+
+        Raises:
+            AppException: If members is empty
+        """
+        if not members:
+            raise AppException("CHAT_ERROR", "No participants to add", status_code=400)
+
+        self.db.add_all(
+            [
+                ChatParticipant(room_id=room_id, user_id=member_id, role=role)
+                for member_id, role in members.items()
+            ]
+        )
+
+        await self.db.commit()
+        await room_access_cache.invalidate(*members, room_id=room_id)
+
     async def mark_chat_as_read(self, room_id: UUID, user_id: UUID) -> MarkReadResponse:
         """
         Mark all messages in a chat as read for a user.
@@ -48,28 +78,11 @@ class ParticipantService:
         Raises:
             AppException: If room not found or user not a participant
         """
-        # Get participant
-        participant = await verify_participant_access(self.db, room_id, user_id)
-
-        # Get last_seen_at from user's last_login_at
-        last_seen_at: Optional[datetime] = (
-            participant.user.last_login_at if participant.user else None
-        )
+        # Verify user is a participant
+        await verify_room_membership(self.db, room_id, user_id)
 
-        # Count unread messages
-        unread_query = (
-            select(func.count())
-            .select_from(Message)
-            .where(
-                and_(
-                    Message.room_id == room_id,
-                    Message.sender_id != user_id,
-                    Message.created_at > last_seen_at if last_seen_at else Message.created_at >= datetime.min
-                )
-            )
-        )
-        unread_result = await self.db.execute(unread_query)
-        unread_count = unread_result.scalar() or 0
+        # Reset the unread counter and move the read marker
+        unread_count = await unread_counter.mark_read(user_id, room_id)
 
         # Publish to Redis
         await publish_to_channel(
@@ -103,6 +116,7 @@ class ParticipantService:
         # Mark as left
         participant.left_at = datetime.now(timezone.utc)
         await self.db.commit()
+        await room_access_cache.invalidate(user_id, room_id=room_id)
 
         # Publish to Redis
         await publish_to_channel(
@@ -4,7 +4,6 @@ Chat room management service.
 Handles chat room retrieval, details, and listing operations.
 """
 
-from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -13,7 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import AppException
-from app.models.chat import ChatParticipant, ChatRoom, Message
+from app.models.chat import ChatParticipant, ChatRoom
+from app.models.user import User
 from app.schemas.chat import (
     ChatRoomDetailResponse,
     ChatRoomResponse,
@@ -22,7 +22,16 @@ from app.schemas.chat import (
     ParticipantResponse,
 )
 from app.schemas.common import APIResponse, PaginationSchema
-from app.services.chat.base import is_user_online, verify_participant_access
+from app.services.chat.base import verify_room_membership
+from app.services.chat.unread_counter import unread_counter
+from app.utils.presence import presence_tracker
+
+# Participants with the user and profile the responses read, so nothing lazy-loads
+_PARTICIPANT_PROFILES = (
+    selectinload(ChatRoom.participants)
+    .selectinload(ChatParticipant.user)
+    .selectinload(User.profile)
+)
 
 
 class RoomService:
@@ -72,38 +81,47 @@ class RoomService:
         total_result = await self.db.execute(count_query)
         total: int = total_result.scalar() or 0
 
-        # Apply pagination and ordering
-        query = query.order_by(desc(ChatRoom.updated_at))
+        # Apply pagination and ordering (by the maintained activity timestamp)
+        query = query.order_by(desc(ChatRoom.last_activity_at))
         query = query.offset((page - 1) * limit).limit(limit)
 
         # Execute query
-        result = await self.db.execute(
-            query.options(selectinload(ChatRoom.participants), selectinload(ChatRoom.messages))
-        )
+        result = await self.db.execute(query.options(_PARTICIPANT_PROFILES))
         rooms = result.scalars().all()
 
+        # Fetch online status for every visible participant in one round trip
+        presence = await presence_tracker.get_presence(
+            participant.user_id
+            for room in rooms
+            for participant in room.participants
+            if participant.left_at is None
+        )
+
+        # Unread counters for every room on the page in one round trip
+        unread_counts = await unread_counter.get_counts(
+            user_id, (room.id for room in rooms), self.db
+        )
+
         # Build response
         rooms_data = []
         for room in rooms:
-            # Get last message
+            # Get last message from the room's snapshot
             last_message = None
-            if room.messages:
-                msg = room.messages[0]
+            if room.last_message_id:
                 last_message = LastMessageResponse(
-                    id=str(msg.id),
-                    sender_id=str(msg.sender_id),
-                    sender_name=(
-                        room.messages[0].sender.username if room.messages[0].sender else "Unknown"
-                    ),
-                    content=msg.content[:100] if msg.content else "",
-                    type=msg.type,
-                    timestamp=msg.created_at,
+                    id=str(room.last_message_id),
+                    sender_id=str(room.last_message_sender_id),
+                    sender_name=room.last_message_sender_name or "Unknown",
+                    content=room.last_message_preview or "",
+                    type=room.last_message_type or "text",
+                    timestamp=room.last_message_at or room.last_activity_at,
                 )
 
             # Get participants (basic info)
             participants = []
             for participant in room.participants:
                 if participant.left_at is None:
+                    last_heartbeat = presence.get(str(participant.user_id))
                     user_profile = participant.user.profile if participant.user else None
                     display_name = (
                         user_profile.display_name
@@ -121,36 +139,12 @@ class RoomService:
                                 else None
                             ),
                             role=participant.role,
-                            is_online=is_user_online(participant.user.last_login_at),
-                            last_seen_at=participant.user.last_login_at,
+                            is_online=presence_tracker.is_online(last_heartbeat),
+                            last_seen_at=last_heartbeat or participant.user.last_login_at,
                         )
                     )
 
-            # Calculate unread count for the current user
-            # Find the current user's participant record
-            current_user_participant = None
-            for part in room.participants:
-                if part.user_id == user_id and part.left_at is None:
-                    current_user_participant = part
-                    break
-            user_last_seen = (
-                current_user_participant.user.last_login_at
-                if current_user_participant and current_user_participant.user
-                else None
-            )
-            unread_query = (
-                select(func.count())
-                .select_from(Message)
-                .where(
-                    and_(
-                        Message.room_id == room.id,
-                        Message.sender_id != user_id,
-                        Message.created_at > user_last_seen if user_last_seen else Message.created_at >= datetime.min,
-                    )
-                )
-            )
-            unread_result = await self.db.execute(unread_query)
-            unread_count = unread_result.scalar() or 0
+            unread_count = unread_counts.get(str(room.id), 0)
 
             rooms_data.append(
                 ChatRoomResponse(
@@ -161,9 +155,7 @@ class RoomService:
                     participants=participants,
                     last_message=last_message,
                     unread_count=unread_count,
-                    last_message_time=(
-                        room.messages[0].created_at if room.messages else room.created_at
-                    ),
+                    last_message_time=room.last_message_at or room.created_at,
                     is_active=room.is_active,
                     created_at=room.created_at,
                 )
@@ -191,24 +183,26 @@ class RoomService:
             AppException: If room not found or user not a participant
         """
         # Verify user is a participant
-        participant = await verify_participant_access(self.db, room_id, user_id)
+        await verify_room_membership(self.db, room_id, user_id)
 
         # Get room details
-        room_query = (
-            select(ChatRoom)
-            .where(ChatRoom.id == room_id)
-            .options(selectinload(ChatRoom.participants))
-        )
+        room_query = select(ChatRoom).where(ChatRoom.id == room_id).options(_PARTICIPANT_PROFILES)
         room_result = await self.db.execute(room_query)
         room = room_result.scalar_one_or_none()
 
         if not room:
             raise AppException("CHAT_ERROR", "Chat room not found", status_code=404)
 
+        # Fetch online status for all active participants in one round trip
+        presence = await presence_tracker.get_presence(
+            p.user_id for p in room.participants if p.left_at is None
+        )
+
         # Build participants list with full info
         participants = []
         for p in room.participants:
             if p.left_at is None:
+                p_last_heartbeat = presence.get(str(p.user_id))
                 p_user_profile = p.user.profile if p.user else None
                 p_display_name = (
                     p_user_profile.display_name
@@ -222,8 +216,8 @@ class RoomService:
                         display_name=p_display_name,
                         avatar_url=p_user_profile.avatar_url if p_user_profile else None,
                         role=p.role,
-                        is_online=is_user_online(p.user.last_login_at),
-                        last_seen_at=p.user.last_login_at,
+                        is_online=presence_tracker.is_online(p_last_heartbeat),
+                        last_seen_at=p_last_heartbeat or p.user.last_login_at,
                     )
                 )
 
@@ -0,0 +1,524 @@
+"""
+Counter-based unread tracking for chat rooms.
+
+Unread counts and read markers live in per-user Redis hashes:
+
+    chat:unread:{user_id} -> {room_id: count, ..., "*": "1"}
+    chat:read:{user_id}   -> {room_id: epoch of last read, ...}
+
+Sending a message increments the counter of every other participant and
+reading a room resets it, so room lists and badges are hash reads instead
+of COUNT(*) scans over messages. Touched users are recorded in a dirty set
+and reconciled to chat_participants (unread_count, last_seen_at) by a
+periodic task; a missing hash is rebuilt from those columns.
+
+Redis writes apply only while the "*" loaded marker exists. Without it the
+columns are authoritative: increments and resets go to chat_participants
+directly and the next read rebuilds the hash from them, so an evicted hash
+never turns into a counter that started from zero. Such direct writes are
+announced in chat:unread:guard:{user_id} ("busy" while in flight, "version"
+bumped on start and finish); a rebuild only caches what it selected when no
+direct write started or finished in between. Both hashes expire after
+CHAT_UNREAD_TTL_SECONDS without writes.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+
+from sqlalchemy import Table, and_, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatParticipant
+from app.services.chat.access_cache import room_access_cache
+
+logger = logging.getLogger(__name__)
+
+# HINCRBY a loaded counts hash and mark the user dirty; returns 0 on a miss,
+# after announcing the direct column write in the guard
+_RECORD_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 0 then
+    redis.call('HINCRBY', KEYS[4], 'busy', 1)
+    redis.call('HINCRBY', KEYS[4], 'version', 1)
+    redis.call('EXPIRE', KEYS[4], ARGV[5])
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+redis.call('SADD', KEYS[3], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+# Reset a room in a loaded counts hash and move the read marker; returns the
+# previous count, or nil on a miss after announcing the direct column write
+_MARK_READ_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 0 then
+    redis.call('HINCRBY', KEYS[4], 'busy', 1)
+    redis.call('HINCRBY', KEYS[4], 'version', 1)
+    redis.call('EXPIRE', KEYS[4], ARGV[6])
+    return nil
+end
+local previous = redis.call('HGET', KEYS[1], ARGV[1]) or 0
+redis.call('HSET', KEYS[1], ARGV[1], 0)
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return previous
+"""
+
+# Cache a rebuilt hash unless it is already loaded or a direct column write
+# started or finished since ARGV[1] (the guard version read before the SELECT);
+# ARGV[3] counts pairs follow, then the read marker pairs. Returns 1 if cached
+_LOAD_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], '*') == 1 then
+    return 0
+end
+local guard = redis.call('HMGET', KEYS[4], 'busy', 'version')
+if tonumber(guard[1] or '0') > 0 or (guard[2] or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('HSET', KEYS[1], '*', '1')
+local split = 4 + 2 * tonumber(ARGV[3])
+for i = 4, split - 1, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+for i = split, #ARGV, 2 do
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+class UnreadCounter:
+    """
+    Redis-backed per-(user, room) unread counters.
+
+    Reads fall back to the reconciled columns in chat_participants when a
+    user's hash is missing or Redis is unavailable.
+    """
+
+    COUNTS_KEY = "chat:unread:{user_id}"
+    READ_KEY = "chat:read:{user_id}"
+    GUARD_KEY = "chat:unread:guard:{user_id}"
+    DIRTY_KEY = "chat:unread:dirty"
+    LOADED_FIELD = "*"
+    GUARD_TTL_SECONDS = 60  # Outlives any direct column write
+
+    def __init__(self, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Initialize counter with lazily registered Lua scripts.
+
+        Args:
+            ttl_seconds: Idle lifetime of a user's hashes
+                (default: CHAT_UNREAD_TTL_SECONDS)
+        """
+        from app.core.config import settings
+
+        self.ttl_seconds = ttl_seconds or settings.CHAT_UNREAD_TTL_SECONDS
+        self._scripts: Dict[str, Any] = {}
+        self._script_client: Any = None
+
+    def _script(self, redis_client: Any, source: str) -> Any:
+        # Re-register when the client is replaced (tests, reconnects, workers)
+        if self._script_client is not redis_client:
+            self._scripts = {}
+            self._script_client = redis_client
+        if source not in self._scripts:
+            self._scripts[source] = redis_client.register_script(source)
+        return self._scripts[source]
+
+    def _keys(self, user_id: Any) -> List[str]:
+        return [
+            self.COUNTS_KEY.format(user_id=user_id),
+            self.READ_KEY.format(user_id=user_id),
+            self.DIRTY_KEY,
+            self.GUARD_KEY.format(user_id=user_id),
+        ]
+
+    async def _release(self, user_ids: List[str]) -> None:
+        """Finish the direct column writes announced by a miss."""
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in user_ids:
+                guard_key = self.GUARD_KEY.format(user_id=user_id)
+                pipe.hincrby(guard_key, "busy", -1)
+                pipe.hincrby(guard_key, "version", 1)
+                pipe.expire(guard_key, self.GUARD_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to release unread counter guards: {e}")
+
+    async def record_message(
+        self, room_id: Any, sender_id: Any, db: Optional[AsyncSession] = None
+    ) -> None:
+        """
+        Increment unread counters of every participant except the sender.
+
+        Recipients without a loaded hash are incremented in chat_participants,
+        as is everyone when Redis is unavailable.
+
+        Args:
+            room_id: Room the message was sent to
+            sender_id: Sender user ID
+            db: Optional database session, used only to load room members
+        """
+        members = await room_access_cache.get_room_members(room_id, db)
+        recipients = [user_id for user_id in members if user_id != str(sender_id)]
+        if not recipients:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            await self._persist_increment(room_id, recipients)
+            return
+
+        try:
+            script = self._script(redis_client, _RECORD_SCRIPT)
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in recipients:
+                await script(
+                    keys=self._keys(user_id),
+                    args=[
+                        str(room_id),
+                        self.LOADED_FIELD,
+                        user_id,
+                        self.ttl_seconds,
+                        self.GUARD_TTL_SECONDS,
+                    ],
+                    client=pipe,
+                )
+            applied = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Failed to increment unread counters for room {room_id}: {e}")
+            await self._persist_increment(room_id, recipients)
+            return
+
+        # A failed script wrote nothing, so its increment goes to the column
+        failed = [
+            user_id for user_id, hit in zip(recipients, applied) if isinstance(hit, Exception)
+        ]
+        if failed:
+            await self._persist_increment(room_id, failed)
+
+        missed = [user_id for user_id, hit in zip(recipients, applied) if hit == 0]
+        if missed:
+            try:
+                await self._persist_increment(room_id, missed)
+            finally:
+                await self._release(missed)
+
+    async def mark_read(self, user_id: Any, room_id: Any) -> int:
+        """
+        Reset a user's unread counter for a room and move their read marker.
+
+        Args:
+            user_id: User ID
+            room_id: Room ID
+
+        Returns:
+            Number of messages that were unread
+        """
+        from app.core.redis import redis_client
+
+        now = datetime.now(timezone.utc)
+
+        if redis_client is None:
+            return await self._persist_read(user_id, room_id, now)
+
+        try:
+            previous = await self._script(redis_client, _MARK_READ_SCRIPT)(
+                keys=self._keys(user_id),
+                args=[
+                    str(room_id),
+                    self.LOADED_FIELD,
+                    str(now.timestamp()),
+                    str(user_id),
+                    self.ttl_seconds,
+                    self.GUARD_TTL_SECONDS,
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Failed to reset unread counter for {user_id}: {e}")
+            return await self._persist_read(user_id, room_id, now)
+
+        if previous is None:
+            # Hash not loaded: the columns are authoritative
+            try:
+                return await self._persist_read(user_id, room_id, now)
+            finally:
+                await self._release([str(user_id)])
+
+        return int(previous)
+
+    async def get_counts(
+        self, user_id: Any, room_ids: Iterable[Any], db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """
+        Get unread counts for several rooms in one round trip.
+
+        Args:
+            user_id: User ID
+            room_ids: Rooms to look up
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Mapping of room ID string to unread count
+        """
+        rooms = [str(room_id) for room_id in room_ids]
+        if not rooms:
+            return {}
+
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is not None:
+            try:
+                loaded, *values = await awaitable(
+                    redis_client.hmget(
+                        self.COUNTS_KEY.format(user_id=user_id), [self.LOADED_FIELD, *rooms]
+                    )
+                )
+                if loaded:
+                    return {room: int(value or 0) for room, value in zip(rooms, values)}
+            except Exception as e:
+                logger.error(f"Failed to read unread counters for {user_id}: {e}")
+
+        counts, _ = await self._load(user_id, db)
+        return {room: counts.get(room, 0) for room in rooms}
+
+    async def get_total(self, user_id: Any, db: Optional[AsyncSession] = None) -> int:
+        """
+        Get the total unread count across all of a user's rooms.
+
+        Args:
+            user_id: User ID
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Total unread count
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is not None:
+            try:
+                cached: Dict[str, str] = await awaitable(
+                    redis_client.hgetall(self.COUNTS_KEY.format(user_id=user_id))
+                )
+                if cached.pop(self.LOADED_FIELD, None):
+                    return sum(int(value) for value in cached.values())
+            except Exception as e:
+                logger.error(f"Failed to read unread counters for {user_id}: {e}")
+
+        counts, _ = await self._load(user_id, db)
+        return sum(counts.values())
+
+    async def get_last_read(
+        self, user_id: Any, room_id: Any, db: Optional[AsyncSession] = None
+    ) -> Optional[datetime]:
+        """
+        Get when a user last read a room.
+
+        Args:
+            user_id: User ID
+            room_id: Room ID
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Last read timestamp, or None if the room was never read
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is not None:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hget(self.READ_KEY.format(user_id=user_id), str(room_id))
+                pipe.hexists(self.COUNTS_KEY.format(user_id=user_id), self.LOADED_FIELD)
+                read_at, loaded = await pipe.execute()
+                if loaded:
+                    return (
+                        datetime.fromtimestamp(float(read_at), tz=timezone.utc) if read_at else None
+                    )
+            except Exception as e:
+                logger.error(f"Failed to read read marker for {user_id}: {e}")
+
+        _, read_markers = await self._load(user_id, db)
+        return read_markers.get(str(room_id))
+
+    async def reconcile(self, db: AsyncSession, batch_size: int = 500) -> int:
+        """
+        Write counters of recently touched users back to chat_participants.
+
+        Args:
+            db: Database session
+            batch_size: Maximum number of users reconciled in this call
+
+        Returns:
+            Number of users reconciled
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return 0
+
+        popped = await awaitable(redis_client.spop(self.DIRTY_KEY, batch_size))
+        user_ids = cast(List[str], popped or [])
+        if not user_ids:
+            return 0
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.hgetall(self.COUNTS_KEY.format(user_id=user_id))
+                pipe.hgetall(self.READ_KEY.format(user_id=user_id))
+            hashes = await pipe.execute()
+
+            rows = []
+            for index, user_id in enumerate(user_ids):
+                counts, read_markers = hashes[2 * index], hashes[2 * index + 1]
+                # Evicted since it was touched; the columns already hold its writes
+                if not counts.pop(self.LOADED_FIELD, None):
+                    continue
+                for room_id in counts.keys() | read_markers.keys():
+                    read_at = read_markers.get(room_id)
+                    rows.append(
+                        {
+                            "b_user_id": user_id,
+                            "b_room_id": room_id,
+                            "b_unread_count": int(counts.get(room_id) or 0),
+                            "b_last_seen_at": (
+                                datetime.fromtimestamp(float(read_at), tz=timezone.utc)
+                                if read_at
+                                else None
+                            ),
+                        }
+                    )
+
+            if rows:
+                table = cast(Table, ChatParticipant.__table__)
+                statement = (
+                    update(table)
+                    .where(
+                        and_(
+                            table.c.user_id == bindparam("b_user_id"),
+                            table.c.room_id == bindparam("b_room_id"),
+                        )
+                    )
+                    .values(
+                        unread_count=bindparam("b_unread_count"),
+                        last_seen_at=func.coalesce(
+                            bindparam("b_last_seen_at"), table.c.last_seen_at
+                        ),
+                    )
+                )
+                await db.execute(statement, rows)
+                await db.commit()
+        except Exception:
+            # Retry these users on the next run
+            await awaitable(redis_client.sadd(self.DIRTY_KEY, *user_ids))
+            raise
+
+        return len(user_ids)
+
+    async def _load(
+        self, user_id: Any, db: Optional[AsyncSession]
+    ) -> Tuple[Dict[str, int], Dict[str, datetime]]:
+        """Rebuild a user's hashes from the reconciled columns."""
+        from app.core.redis import awaitable, redis_client
+
+        # Direct writes that land after this read change the version
+        version: Optional[str] = None
+        if redis_client is not None:
+            try:
+                version = await awaitable(
+                    redis_client.hget(self.GUARD_KEY.format(user_id=user_id), "version")
+                )
+                version = version or "0"
+            except Exception as e:
+                logger.error(f"Failed to read unread counter guard for {user_id}: {e}")
+
+        query = select(
+            ChatParticipant.room_id, ChatParticipant.unread_count, ChatParticipant.last_seen_at
+        ).where(and_(ChatParticipant.user_id == user_id, ChatParticipant.left_at.is_(None)))
+
+        if db is not None:
+            result = await db.execute(query)
+        else:
+            from app.core.database import async_session_maker
+
+            async with async_session_maker() as session:
+                result = await session.execute(query)
+
+        counts: Dict[str, int] = {}
+        read_markers: Dict[str, datetime] = {}
+        for room_id, unread_count, last_seen_at in result.all():
+            counts[str(room_id)] = unread_count or 0
+            if last_seen_at is not None:
+                read_markers[str(room_id)] = last_seen_at
+
+        if redis_client is not None and version is not None:
+            args: List[Any] = [version, self.ttl_seconds, len(counts)]
+            for room_id, count in counts.items():
+                args += [room_id, count]
+            for room_id, read_at in read_markers.items():
+                args += [room_id, str(read_at.timestamp())]
+            try:
+                await self._script(redis_client, _LOAD_SCRIPT)(
+                    keys=self._keys(user_id),
+                    args=args,
+                )
+            except Exception as e:
+                logger.error(f"Failed to rebuild unread counters for {user_id}: {e}")
+
+        return counts, read_markers
+
+    async def _persist_increment(self, room_id: Any, user_ids: List[str]) -> None:
+        """Increment the durable counters of users whose hash is not loaded."""
+        from app.core.database import async_session_maker
+
+        try:
+            # Own session: the caller's unit of work is not committed here
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(ChatParticipant)
+                    .where(
+                        and_(
+                            ChatParticipant.room_id == room_id,
+                            ChatParticipant.user_id.in_(user_ids),
+                            ChatParticipant.left_at.is_(None),
+                        )
+                    )
+                    .values(unread_count=func.coalesce(ChatParticipant.unread_count, 0) + 1)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to persist unread counters for room {room_id}: {e}")
+
+    async def _persist_read(self, user_id: Any, room_id: Any, read_at: datetime) -> int:
+        """Reset the durable counter of a user whose hash is not loaded."""
+        from app.core.database import async_session_maker
+
+        membership = and_(ChatParticipant.user_id == user_id, ChatParticipant.room_id == room_id)
+
+        async with async_session_maker() as session:
+            previous = await session.scalar(select(ChatParticipant.unread_count).where(membership))
+            await session.execute(
+                update(ChatParticipant)
+                .where(membership)
+                .values(unread_count=0, last_seen_at=read_at)
+            )
+            await session.commit()
+            return previous or 0
+
+
+# Global unread counter instance
+unread_counter = UnreadCounter()
@@ -6,18 +6,18 @@ Handles tracking and retrieving unread message counts.
 
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.chat import ChatParticipant, Message
 from app.schemas.chat import UnreadCountResponse
+from app.services.chat.unread_counter import unread_counter
 
 
 class UnreadService:
     """
     Service for unread message tracking.
 
-    Handles calculating and retrieving unread message counts for users.
+    Handles retrieving unread message counts for users from the
+    per-room unread counters.
     """
 
     def __init__(self, db: AsyncSession):
@@ -39,27 +39,6 @@ class UnreadService:
         Returns:
             Total unread count
         """
-        # Get all rooms user is participating in
-        participant_subquery = (
-            select(ChatParticipant.room_id, ChatParticipant.last_seen_at)
-            .where(and_(ChatParticipant.user_id == user_id, ChatParticipant.left_at.is_(None)))
-            .subquery()
-        )
-
-        # Count unread messages
-        unread_query = (
-            select(func.count())
-            .select_from(Message)
-            .join(participant_subquery, Message.room_id == participant_subquery.c.room_id)
-            .where(
-                and_(
-                    Message.sender_id != user_id,
-                    Message.created_at > participant_subquery.c.last_seen_at,
-                )
-            )
-        )
-
-        result = await self.db.execute(unread_query)
-        unread_count = result.scalar() or 0
+        unread_count = await unread_counter.get_total(user_id, self.db)
 
         return UnreadCountResponse(unread_count=unread_count)
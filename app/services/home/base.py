@@ -5,12 +5,15 @@ This module provides common helper functions used across home service modules.
 """
 
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+if TYPE_CHECKING:
+    from app.schemas.home import SearchFilters
+
 
 def build_pagination_metadata(total: int, page: int, limit: int) -> Dict[str, Any]:
     """
@@ -111,3 +114,40 @@ async def get_cached_or_fetch(
     await cache_service.set(cache_key, data, ttl=ttl)
 
     return data
+
+
+async def get_search_filters(
+    db: AsyncSession,
+    game: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+) -> "SearchFilters":
+    """
+    Get search filter metadata with per-facet counts.
+
+    Served from the cached facet counts of app.services.account_facets.
+
+    Args:
+        db: Database session
+        game: Selected game filter
+        price_min: Selected minimum price
+        price_max: Selected maximum price
+
+    Returns:
+        SearchFilters: Available games, price range, game counts and price buckets
+    """
+    from app.schemas.account import FacetCountSchema, PriceRangeSchema
+    from app.schemas.home import SearchFilters
+    from app.services.account_facets import account_facets
+
+    facets = await account_facets.get(db, game=game, price_min=price_min, price_max=price_max)
+
+    return SearchFilters(
+        available_games=[item["value"] for item in facets["games"]],
+        price_range={
+            "min": facets["price_min"] or 0,
+            "max": facets["price_max"] or 10000,
+        },
+        game_counts=[FacetCountSchema(**item) for item in facets["games"]],
+        price_buckets=[PriceRangeSchema(**bucket) for bucket in facets["price_buckets"]],
+    )
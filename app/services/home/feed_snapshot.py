@@ -0,0 +1,242 @@
+"""
+Materialized home feed snapshots.
+
+The first HOME_FEED_SNAPSHOT_PAGES pages of the home feed at the default
+page size are stored in Redis as the finished JSON response body, per
+(category, game, page). Serving one is a single GET written straight into
+the response; no queries run and no Pydantic models are built.
+
+Snapshots are built on first request and kept fresh by a rebuild task:
+account and featured changes schedule it through a debounce key, so a
+burst of changes costs one rebuild, and a beat task refreshes them
+periodically. Every built combination is tracked in an index set (capped
+at HOME_FEED_SNAPSHOT_MAX_KEYS) so the rebuild knows what to refresh.
+
+A rebuild keeps each snapshot's expiry, so a combination nobody requests
+expires HOME_FEED_SNAPSHOT_TTL_SECONDS after it was built and the next
+rebuild drops it from the index. Filtered combinations without any
+accounts are served but never stored, so junk filters cannot fill the
+index.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.common import APIResponse
+
+logger = logging.getLogger(__name__)
+
+# Separates category, game and page in index set members
+_SEPARATOR = "\x1f"
+
+
+class HomeFeedSnapshots:
+    """Redis store of ready-to-send home feed response bodies."""
+
+    KEY = "home:feed:snapshot:{category}:{game}:{page}"
+    INDEX_KEY = "home:feed:snapshots"
+    PENDING_KEY = "home:feed:snapshot:pending"
+
+    def __init__(
+        self,
+        pages: int = settings.HOME_FEED_SNAPSHOT_PAGES,
+        limit: int = settings.HOME_FEED_SNAPSHOT_LIMIT,
+        max_keys: int = settings.HOME_FEED_SNAPSHOT_MAX_KEYS,
+        ttl_seconds: int = settings.HOME_FEED_SNAPSHOT_TTL_SECONDS,
+        debounce_seconds: int = settings.HOME_FEED_SNAPSHOT_DEBOUNCE_SECONDS,
+    ) -> None:
+        """
+        Initialize home feed snapshots.
+
+        Args:
+            pages: Pages snapshotted per (category, game)
+            limit: The only page size that is snapshotted
+            max_keys: Most (category, game, page) combinations kept
+            ttl_seconds: Lifetime of a snapshot without a rebuild
+            debounce_seconds: Delay that coalesces rebuild requests
+        """
+        self.pages = pages
+        self.limit = limit
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self.debounce_seconds = debounce_seconds
+
+    def eligible(self, page: int, limit: int) -> bool:
+        """Whether a feed request can be served from a snapshot."""
+        return page <= self.pages and limit == self.limit
+
+    async def get_or_build(
+        self, db: AsyncSession, category: Optional[str], game: Optional[str], page: int
+    ) -> Optional[str]:
+        """
+        Get a snapshot body, building it on a miss.
+
+        Args:
+            db: Database session
+            category: Category filter
+            game: Game filter
+            page: Page number
+
+        Returns:
+            JSON response body, or None when snapshots are unavailable (no
+            Redis or the index is full) and the feed must be built normally
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return None
+
+        category, game = self._normalize(category, game)
+        key = self.KEY.format(category=category, game=game, page=page)
+        try:
+            body: Optional[str] = await redis_client.get(key)
+            if body is not None:
+                return body
+
+            member = _SEPARATOR.join((category, game, str(page)))
+            if not await awaitable(redis_client.sismember(self.INDEX_KEY, member)):
+                if await awaitable(redis_client.scard(self.INDEX_KEY)) >= self.max_keys:
+                    return None
+        except Exception as e:
+            logger.error(f"Failed to read home feed snapshot {key}: {e}")
+            return None
+
+        return await self.build(db, category, game, page)
+
+    async def build(
+        self, db: AsyncSession, category: str, game: str, page: int, refresh: bool = False
+    ) -> str:
+        """
+        Render and store one snapshot.
+
+        A filtered page without accounts is removed instead of stored.
+
+        Args:
+            db: Database session
+            category: Normalized category ("" for none)
+            game: Normalized game ("" for none)
+            page: Page number
+            refresh: Only overwrite a snapshot that still exists, keeping its expiry
+
+        Returns:
+            JSON response body
+        """
+        from app.core.redis import redis_client
+        from app.services.home.feed_service import HomeFeedService
+
+        feed = await HomeFeedService(db).get_home_feed(
+            category=category or None, game=game or None, page=page, limit=self.limit
+        )
+        body = APIResponse.success_response(data=feed).model_dump_json()
+
+        if redis_client is not None:
+            key = self.KEY.format(category=category, game=game, page=page)
+            member = _SEPARATOR.join((category, game, str(page)))
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                if feed.accounts or not (category or game):
+                    if refresh:
+                        pipe.set(key, body, xx=True, keepttl=True)
+                    else:
+                        pipe.set(key, body, ex=self.ttl_seconds)
+                        pipe.sadd(self.INDEX_KEY, member)
+                else:
+                    pipe.delete(key)
+                    pipe.srem(self.INDEX_KEY, member)
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to store home feed snapshot: {e}")
+        return body
+
+    async def rebuild_all(self, db: AsyncSession) -> int:
+        """
+        Rebuild every indexed snapshot and the unfiltered first pages.
+
+        Index members whose snapshot has expired are dropped instead.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of snapshots rebuilt
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return 0
+
+        # Changes from here on schedule another rebuild
+        await redis_client.delete(self.PENDING_KEY)
+
+        defaults = {("", "", page) for page in range(1, self.pages + 1)}
+        indexed = {}
+        for member in await awaitable(redis_client.smembers(self.INDEX_KEY)):
+            indexed[member] = self._parse(member)
+
+        pipe = redis_client.pipeline(transaction=False)
+        live = [(member, parsed) for member, parsed in indexed.items() if parsed is not None]
+        for _, (category, game, page) in live:
+            pipe.exists(self.KEY.format(category=category, game=game, page=page))
+        exists = await pipe.execute() if live else []
+
+        stale = [member for member, parsed in indexed.items() if parsed is None]
+        refresh = set()
+        for (member, parsed), found in zip(live, exists):
+            if not found:
+                stale.append(member)
+            elif parsed not in defaults:
+                refresh.add(parsed)
+        if stale:
+            await awaitable(redis_client.srem(self.INDEX_KEY, *stale))
+
+        rebuilt = 0
+        for category, game, page in sorted(defaults | refresh):
+            try:
+                await self.build(
+                    db, category, game, page, refresh=(category, game, page) in refresh
+                )
+                rebuilt += 1
+            except Exception as e:
+                logger.error(f"Failed to rebuild home feed snapshot {category}/{game}/{page}: {e}")
+        return rebuilt
+
+    async def schedule_rebuild(self) -> None:
+        """
+        Queue a rebuild after the debounce delay unless one is already queued.
+
+        Snapshots keep serving their previous content until it runs.
+        """
+        from app.core.redis import redis_client
+        from app.tasks.home_tasks import rebuild_home_feed_snapshots
+
+        if redis_client is None:
+            return
+
+        try:
+            if not await redis_client.set(self.PENDING_KEY, 1, nx=True, ex=self.debounce_seconds):
+                return
+            await asyncio.to_thread(
+                rebuild_home_feed_snapshots.apply_async, countdown=self.debounce_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to schedule home feed snapshot rebuild: {e}")
+
+    @staticmethod
+    def _normalize(category: Optional[str], game: Optional[str]) -> Tuple[str, str]:
+        # Both filters match case-insensitively
+        return (category or "").strip().lower(), (game or "").strip().lower()
+
+    @staticmethod
+    def _parse(member: str) -> Optional[Tuple[str, str, int]]:
+        parts = member.split(_SEPARATOR)
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+
+# Global home feed snapshots instance
+home_feed_snapshots = HomeFeedSnapshots()
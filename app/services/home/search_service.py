@@ -13,6 +13,7 @@ from app.models.user import User, UserProfile
 from app.schemas.common import PaginationSchema
 from app.schemas.home import AccountTier, SearchAccountCard, SearchFilters, SearchResponse
 from app.services.cache_service import CacheService
+from app.services.home.base import get_search_filters
 
 
 class SearchService:
@@ -125,7 +126,7 @@ class SearchService:
             # Get first image
             image_url = ""
             if account.images:
-                image_url = account.images[0].url
+                image_url = account.images[0].thumbnail_url or account.images[0].url
 
             # Get seller info
             seller_result = await self.db.execute(select(User).where(User.id == account.seller_id))
@@ -149,7 +150,7 @@ class SearchService:
             search_accounts.append(search_account)
 
         # Build filters metadata
-        filters = await self._get_search_filters()
+        filters = await self._get_search_filters(game, price_min, price_max)
 
         # Build pagination
         pagination = PaginationSchema.create(page=page, limit=limit, total=total)
@@ -162,34 +163,24 @@ class SearchService:
             pagination=pagination.model_dump(),
         )
 
-    async def _get_search_filters(self) -> SearchFilters:
+    async def _get_search_filters(
+        self,
+        game: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> SearchFilters:
         """
         Get available search filters.
 
+        Args:
+            game: Selected game filter
+            price_min: Selected minimum price
+            price_max: Selected maximum price
+
         Returns:
-            SearchFilters: Available games and price range for filtering
+            SearchFilters: Available games, price range and per-facet counts
         """
-        # Get available games
-        games_result = await self.db.execute(
-            select(Account.game).where(Account.status == "active").distinct().order_by(Account.game)
-        )
-        available_games = [game[0] for game in games_result.all()]
-
-        # Get price range
-        price_result = await self.db.execute(
-            select(
-                func.min(Account.price).label("min_price"),
-                func.max(Account.price).label("max_price"),
-            ).where(Account.status == "active")
-        )
-        price_data = price_result.first()
-
-        price_range = {
-            "min": float(price_data[0]) if price_data and price_data[0] else 0,
-            "max": float(price_data[1]) if price_data and price_data[1] else 10000,
-        }
-
-        return SearchFilters(available_games=available_games, price_range=price_range)
+        return await get_search_filters(self.db, game, price_min, price_max)
 
     def _generate_search_highlights(self, account: Account, query: str) -> List[str]:
         """
@@ -9,6 +9,7 @@ from sqlalchemy import and_, asc, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.database import fan_out
 from app.core.exceptions import NotFoundError, ValidationError
 from app.models.account import Account, AccountFeature, AccountImage
 from app.models.content import Category, FAQItem, Game, PromoBanner
@@ -39,6 +40,7 @@ from app.schemas.home import (
     SearchResponse,
 )
 from app.services.cache_service import CacheService
+from app.services.home.base import get_search_filters
 
 
 class HomeService:
@@ -67,17 +69,17 @@ class HomeService:
         Returns:
             HomeFeedResponse: Complete home feed with featured accounts, accounts, categories
         """
-        # Get featured accounts (cached separately)
-        featured_accounts = await self._get_featured_accounts_internal(limit=5)
-
-        # Get regular accounts with filters
-        accounts, total = await self._get_accounts_filtered(
-            category=category, game=game, page=page, limit=limit
+        # Featured accounts (cached separately), filtered accounts and the
+        # categories summary are independent, so they run concurrently
+        featured_accounts, (accounts, total), categories = await fan_out(
+            self.db,
+            lambda db: HomeService(db, self.cache)._get_featured_accounts_internal(limit=5),
+            lambda db: HomeService(db, self.cache)._get_accounts_filtered(
+                category=category, game=game, page=page, limit=limit
+            ),
+            lambda db: HomeService(db, self.cache)._get_categories_summary(),
         )
 
-        # Get categories summary
-        categories = await self._get_categories_summary()
-
         # Build pagination
         pagination = PaginationSchema.create(page=page, limit=limit, total=total)
 
@@ -339,7 +341,7 @@ class HomeService:
             # Get first image
             image_url = ""
             if account.images:
-                image_url = account.images[0].url
+                image_url = account.images[0].thumbnail_url or account.images[0].url
 
             # Get seller info
             seller_result = await self.db.execute(select(User).where(User.id == account.seller_id))
@@ -363,7 +365,7 @@ class HomeService:
             search_accounts.append(search_account)
 
         # Build filters metadata
-        filters = await self._get_search_filters()
+        filters = await self._get_search_filters(game, price_min, price_max)
 
         # Build pagination
         pagination = PaginationSchema.create(page=page, limit=limit, total=total)
@@ -494,7 +496,7 @@ class HomeService:
             # Get first image
             image_url = ""
             if account.images:
-                image_url = account.images[0].url
+                image_url = account.images[0].thumbnail_url or account.images[0].url
 
             # Get seller info
             seller_result = await self.db.execute(
@@ -553,7 +555,7 @@ class HomeService:
             # Get first image
             image_url = ""
             if account.images:
-                image_url = account.images[0].url
+                image_url = account.images[0].thumbnail_url or account.images[0].url
 
             # Get seller info
             seller_result = await self.db.execute(
@@ -632,7 +634,7 @@ class HomeService:
             # Get first image
             image_url = ""
             if account.images:
-                image_url = account.images[0].url
+                image_url = account.images[0].thumbnail_url or account.images[0].url
 
             # Get seller name
             seller_result = await self.db.execute(select(User).where(User.id == account.seller_id))
@@ -671,29 +673,14 @@ class HomeService:
             for cat in categories
         ]
 
-    async def _get_search_filters(self) -> SearchFilters:
-        """Get available search filters."""
-        # Get available games
-        games_result = await self.db.execute(
-            select(Account.game).where(Account.status == "active").distinct().order_by(Account.game)
-        )
-        available_games = [game[0] for game in games_result.all()]
-
-        # Get price range
-        price_result = await self.db.execute(
-            select(
-                func.min(Account.price).label("min_price"),
-                func.max(Account.price).label("max_price"),
-            ).where(Account.status == "active")
-        )
-        price_data = price_result.first()
-
-        price_range = {
-            "min": float(price_data.min_price) if price_data and price_data.min_price else 0,
-            "max": float(price_data.max_price) if price_data and price_data.max_price else 10000,
-        }
-
-        return SearchFilters(available_games=available_games, price_range=price_range)
+    async def _get_search_filters(
+        self,
+        game: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> SearchFilters:
+        """Get available search filters with per-facet counts."""
+        return await get_search_filters(self.db, game, price_min, price_max)
 
     def _generate_search_highlights(self, account: Account, query: str) -> List[str]:
         """Generate search highlight snippets."""
@@ -0,0 +1,148 @@
+"""
+Listing image variant service.
+
+Uploads only enqueue work; Celery workers download the original, render
+the thumbnail and responsive variants (app.utils.images) and store them
+next to it. AccountImage rows get their thumbnail_url, width and height
+filled in, either directly when processed with an image ID or by the
+periodic backfill of rows that have no thumbnail yet.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.account import AccountImage
+from app.utils.images import THUMBNAIL_SUFFIX, render_variants, variant_name
+from app.utils.storage import get_storage, object_name_from_url, public_url
+
+logger = logging.getLogger(__name__)
+
+# Variant names never change content, so clients may cache them forever
+VARIANT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ListingImageService:
+    """Schedules and runs listing image variant rendering."""
+
+    @staticmethod
+    async def enqueue(
+        urls: Sequence[str], account_image_ids: Optional[Sequence[Any]] = None
+    ) -> None:
+        """
+        Queue variant rendering for uploaded images.
+
+        Rendering never falls back to the request: if the broker is down the
+        periodic backfill picks the images up once they are attached to an
+        account.
+
+        Args:
+            urls: Public URLs of the originals
+            account_image_ids: Optional AccountImage ID per URL to fill in
+        """
+        from app.tasks.image_tasks import process_listing_image
+
+        ids = list(account_image_ids) if account_image_ids else [None] * len(urls)
+        for url, image_id in zip(urls, ids):
+            try:
+                await asyncio.to_thread(
+                    process_listing_image.delay, url, str(image_id) if image_id else None
+                )
+            except Exception as e:
+                logger.error(f"Failed to queue image processing for {url}: {e}")
+
+    @staticmethod
+    async def process(
+        db: AsyncSession, url: str, account_image_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Render and store the variants of one image.
+
+        Re-running is harmless: variants are overwritten under the same names.
+        An original that cannot be decoded falls back to itself as thumbnail.
+
+        Args:
+            db: Database session
+            url: Public URL of the original
+            account_image_id: Optional AccountImage to fill in
+
+        Returns:
+            Dict with thumbnail_url, width, height and the variant URLs
+        """
+        storage = get_storage()
+        name = object_name_from_url(url)
+        data = await storage.read(name)
+
+        result: Dict[str, Any]
+        try:
+            rendered = render_variants(data)
+        except Exception as e:
+            logger.warning(f"Cannot render variants of {url}: {e}")
+            result = {"thumbnail_url": url, "width": None, "height": None, "variants": []}
+        else:
+            variant_urls = await asyncio.gather(
+                *(
+                    storage.put_bytes(
+                        variant_name(name, variant.suffix, variant.extension),
+                        variant.data,
+                        variant.content_type,
+                        cache_control=VARIANT_CACHE_CONTROL,
+                    )
+                    for variant in rendered.variants
+                )
+            )
+            result = {
+                "thumbnail_url": public_url(
+                    settings.MINIO_BUCKET, variant_name(name, THUMBNAIL_SUFFIX)
+                ),
+                "width": rendered.width,
+                "height": rendered.height,
+                "variants": list(variant_urls),
+            }
+
+        if account_image_id is not None:
+            await db.execute(
+                update(AccountImage)
+                .where(AccountImage.id == account_image_id)
+                .values(
+                    thumbnail_url=result["thumbnail_url"],
+                    width=result["width"],
+                    height=result["height"],
+                    size_bytes=len(data),
+                )
+            )
+            await db.commit()
+
+        return result
+
+    @staticmethod
+    async def backfill(db: AsyncSession, limit: int = settings.IMAGE_BACKFILL_BATCH_SIZE) -> int:
+        """
+        Queue rendering for account images stored in the bucket without a thumbnail.
+
+        Args:
+            db: Database session
+            limit: Maximum number of images to queue
+
+        Returns:
+            Number of images queued
+        """
+        bucket_prefix = public_url(settings.MINIO_BUCKET, "")
+        result = await db.execute(
+            select(AccountImage.id, AccountImage.url)
+            .where(
+                AccountImage.thumbnail_url.is_(None),
+                AccountImage.url.startswith(bucket_prefix, autoescape=True),
+            )
+            .order_by(AccountImage.created_at.desc())
+            .limit(limit)
+        )
+        rows = result.all()
+        if rows:
+            await ListingImageService.enqueue([row.url for row in rows], [row.id for row in rows])
+        return len(rows)
@@ -1,14 +1,13 @@
 """Helper functions to trigger notifications from various events."""
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification
 from app.schemas.notification import NotificationType
-from app.services.notifications import NotificationService
+from app.services.notifications import NotificationDeliveryService, notification_event
 
 logger = logging.getLogger(__name__)
 
@@ -31,21 +30,25 @@ async def notify_new_message(
         conversation_id: ID of conversation
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=recipient_id,
-            title=f"New message from {sender_name}",
-            description=message_preview[:100],
-            notification_type=NotificationType.MESSAGE,
-            icon="message",
-            action_url=f"/chat/{conversation_id}",
-            metadata={
-                "sender_name": sender_name,
-                "conversation_id": str(conversation_id),
-                "type": "new_message",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=recipient_id,
+                    title=f"New message from {sender_name}",
+                    description=message_preview[:100],
+                    notification_type=NotificationType.MESSAGE,
+                    icon="message",
+                    action_url=f"/chat/{conversation_id}",
+                    metadata={
+                        "sender_name": sender_name,
+                        "conversation_id": str(conversation_id),
+                        "type": "new_message",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"New message notification sent to user {recipient_id}")
+        logger.info(f"New message notification queued for user {recipient_id}")
     except Exception as e:
         logger.error(f"Failed to send new message notification: {e}")
 
@@ -70,40 +73,42 @@ async def notify_deal_initiated(
         counterparty_name: Name of other party
     """
     try:
-        # Notify seller
-        await NotificationService.create_notification(
-            db=db,
-            user_id=seller_id,
-            title="New purchase request",
-            description=f"{counterparty_name} wants to buy '{listing_title}'",
-            notification_type=NotificationType.PURCHASE,
-            icon="shopping_cart",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "listing_title": listing_title,
-                "buyer_name": counterparty_name,
-                "type": "deal_initiated",
-            },
-        )
-
-        # Notify buyer
-        await NotificationService.create_notification(
-            db=db,
-            user_id=buyer_id,
-            title="Purchase request sent",
-            description=f"You've sent a purchase request for '{listing_title}'",
-            notification_type=NotificationType.PURCHASE,
-            icon="shopping_cart",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "listing_title": listing_title,
-                "type": "deal_initiated_buyer",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                # Notify seller
+                notification_event(
+                    user_id=seller_id,
+                    title="New purchase request",
+                    description=f"{counterparty_name} wants to buy '{listing_title}'",
+                    notification_type=NotificationType.PURCHASE,
+                    icon="shopping_cart",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "listing_title": listing_title,
+                        "buyer_name": counterparty_name,
+                        "type": "deal_initiated",
+                    },
+                ),
+                # Notify buyer
+                notification_event(
+                    user_id=buyer_id,
+                    title="Purchase request sent",
+                    description=f"You've sent a purchase request for '{listing_title}'",
+                    notification_type=NotificationType.PURCHASE,
+                    icon="shopping_cart",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "listing_title": listing_title,
+                        "type": "deal_initiated_buyer",
+                    },
+                ),
+            ],
+            db,
         )
 
-        logger.info(f"Deal initiated notifications sent for deal {deal_id}")
+        logger.info(f"Deal initiated notifications queued for deal {deal_id}")
     except Exception as e:
         logger.error(f"Failed to send deal initiated notifications: {e}")
 
@@ -128,23 +133,27 @@ async def notify_payment_confirmed(
         currency: Currency code
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=seller_id,
-            title="Payment received",
-            description=f"You've received {amount:.2f} {currency} for '{listing_title}'",
-            notification_type=NotificationType.PURCHASE,
-            icon="payment",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "listing_title": listing_title,
-                "amount": amount,
-                "currency": currency,
-                "type": "payment_confirmed",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=seller_id,
+                    title="Payment received",
+                    description=f"You've received {amount:.2f} {currency} for '{listing_title}'",
+                    notification_type=NotificationType.PURCHASE,
+                    icon="payment",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "listing_title": listing_title,
+                        "amount": amount,
+                        "currency": currency,
+                        "type": "payment_confirmed",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Payment confirmation notification sent to seller {seller_id}")
+        logger.info(f"Payment confirmation notification queued for seller {seller_id}")
     except Exception as e:
         logger.error(f"Failed to send payment confirmation notification: {e}")
 
@@ -158,17 +167,21 @@ async def notify_account_verified(db: AsyncSession, user_id: UUID) -> None:
         user_id: User ID
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=user_id,
-            title="Account verified",
-            description="Your account has been verified. You can now start selling!",
-            notification_type=NotificationType.ACCOUNT_UPDATE,
-            icon="verified",
-            action_url="/profile",
-            metadata={"type": "account_verified"},
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=user_id,
+                    title="Account verified",
+                    description="Your account has been verified. You can now start selling!",
+                    notification_type=NotificationType.ACCOUNT_UPDATE,
+                    icon="verified",
+                    action_url="/profile",
+                    metadata={"type": "account_verified"},
+                )
+            ],
+            db,
         )
-        logger.info(f"Account verification notification sent to user {user_id}")
+        logger.info(f"Account verification notification queued for user {user_id}")
     except Exception as e:
         logger.error(f"Failed to send account verification notification: {e}")
 
@@ -182,17 +195,21 @@ async def notify_password_changed(db: AsyncSession, user_id: UUID) -> None:
         user_id: User ID
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=user_id,
-            title="Password updated",
-            description="Your password was successfully changed",
-            notification_type=NotificationType.SECURITY_ALERT,
-            icon="security",
-            action_url="/security",
-            metadata={"type": "password_changed"},
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=user_id,
+                    title="Password updated",
+                    description="Your password was successfully changed",
+                    notification_type=NotificationType.SECURITY_ALERT,
+                    icon="security",
+                    action_url="/security",
+                    metadata={"type": "password_changed"},
+                )
+            ],
+            db,
         )
-        logger.info(f"Password change notification sent to user {user_id}")
+        logger.info(f"Password change notification queued for user {user_id}")
     except Exception as e:
         logger.error(f"Failed to send password change notification: {e}")
 
@@ -219,17 +236,25 @@ async def notify_new_login(
         if location:
             description += f" in {location}"
 
-        await NotificationService.create_notification(
-            db=db,
-            user_id=user_id,
-            title="New login detected",
-            description=description,
-            notification_type=NotificationType.SECURITY_ALERT,
-            icon="security",
-            action_url="/security",
-            metadata={"device_info": device_info, "location": location, "type": "new_login"},
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=user_id,
+                    title="New login detected",
+                    description=description,
+                    notification_type=NotificationType.SECURITY_ALERT,
+                    icon="security",
+                    action_url="/security",
+                    metadata={
+                        "device_info": device_info,
+                        "location": location,
+                        "type": "new_login",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"New login notification sent to user {user_id}")
+        logger.info(f"New login notification queued for user {user_id}")
     except Exception as e:
         logger.error(f"Failed to send new login notification: {e}")
 
@@ -246,24 +271,17 @@ async def notify_system_maintenance(
         affected_users: List of affected user IDs (None = all users)
     """
     try:
-        # If no specific users, this would need to be handled differently
-        # For now, we'll skip if no specific users provided
-        if not affected_users:
-            logger.warning("System maintenance notification with no specific users - skipping")
-            return
-
-        for user_id in affected_users:
-            await NotificationService.create_notification(
-                db=db,
-                user_id=user_id,
-                title="Scheduled maintenance",
-                description=f"System maintenance scheduled for {scheduled_time}",
-                notification_type=NotificationType.SYSTEM,
-                icon="notifications",
-                metadata={"scheduled_time": scheduled_time, "type": "maintenance"},
-            )
-
-        logger.info(f"System maintenance notifications sent to {len(affected_users)} users")
+        await NotificationDeliveryService.enqueue_broadcast(
+            title="Scheduled maintenance",
+            description=f"System maintenance scheduled for {scheduled_time}",
+            notification_type=NotificationType.SYSTEM,
+            user_ids=affected_users,
+            icon="notifications",
+            metadata={"scheduled_time": scheduled_time, "type": "maintenance"},
+            db=db,
+        )
+
+        logger.info("System maintenance notifications queued")
     except Exception as e:
         logger.error(f"Failed to send system maintenance notifications: {e}")
 
@@ -281,21 +299,25 @@ async def notify_mediator_assigned(
         mediator_name: Name of assigned mediator
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=user_id,
-            title="Mediator assigned",
-            description=f"{mediator_name} has been assigned to help with your deal",
-            notification_type=NotificationType.MESSAGE,
-            icon="support_agent",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "mediator_name": mediator_name,
-                "type": "mediator_assigned",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=user_id,
+                    title="Mediator assigned",
+                    description=f"{mediator_name} has been assigned to help with your deal",
+                    notification_type=NotificationType.MESSAGE,
+                    icon="support_agent",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "mediator_name": mediator_name,
+                        "type": "mediator_assigned",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Mediator assignment notification sent to user {user_id}")
+        logger.info(f"Mediator assignment notification queued for user {user_id}")
     except Exception as e:
         logger.error(f"Failed to send mediator assignment notification: {e}")
 
@@ -313,21 +335,25 @@ async def notify_dispute_created(
         creator_name: Name of user who created dispute
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=participant_id,
-            title="Dispute created",
-            description=f"{creator_name} has created a dispute for this deal",
-            notification_type=NotificationType.MESSAGE,
-            icon="gavel",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "creator_name": creator_name,
-                "type": "dispute_created",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=participant_id,
+                    title="Dispute created",
+                    description=f"{creator_name} has created a dispute for this deal",
+                    notification_type=NotificationType.MESSAGE,
+                    icon="gavel",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "creator_name": creator_name,
+                        "type": "dispute_created",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Dispute created notification sent to user {participant_id}")
+        logger.info(f"Dispute created notification queued for user {participant_id}")
     except Exception as e:
         logger.error(f"Failed to send dispute created notification: {e}")
 
@@ -347,22 +373,26 @@ async def notify_review_received(
     """
     try:
         stars = "⭐" * rating
-        await NotificationService.create_notification(
-            db=db,
-            user_id=recipient_id,
-            title=f"New review: {stars}",
-            description=f"{reviewer_name} left you a {rating}-star review",
-            notification_type=NotificationType.ACCOUNT_UPDATE,
-            icon="star",
-            action_url=f"/deals/{deal_id}",
-            metadata={
-                "deal_id": str(deal_id),
-                "reviewer_name": reviewer_name,
-                "rating": rating,
-                "type": "review_received",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=recipient_id,
+                    title=f"New review: {stars}",
+                    description=f"{reviewer_name} left you a {rating}-star review",
+                    notification_type=NotificationType.ACCOUNT_UPDATE,
+                    icon="star",
+                    action_url=f"/deals/{deal_id}",
+                    metadata={
+                        "deal_id": str(deal_id),
+                        "reviewer_name": reviewer_name,
+                        "rating": rating,
+                        "type": "review_received",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Review received notification sent to user {recipient_id}")
+        logger.info(f"Review received notification queued for user {recipient_id}")
     except Exception as e:
         logger.error(f"Failed to send review received notification: {e}")
 
@@ -380,21 +410,25 @@ async def notify_listing_approved(
         listing_title: Title of listing
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=seller_id,
-            title="Listing approved",
-            description=f"Your listing '{listing_title}' has been approved",
-            notification_type=NotificationType.ACCOUNT_UPDATE,
-            icon="check_circle",
-            action_url=f"/listings/{listing_id}",
-            metadata={
-                "listing_id": str(listing_id),
-                "listing_title": listing_title,
-                "type": "listing_approved",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=seller_id,
+                    title="Listing approved",
+                    description=f"Your listing '{listing_title}' has been approved",
+                    notification_type=NotificationType.ACCOUNT_UPDATE,
+                    icon="check_circle",
+                    action_url=f"/listings/{listing_id}",
+                    metadata={
+                        "listing_id": str(listing_id),
+                        "listing_title": listing_title,
+                        "type": "listing_approved",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Listing approval notification sent to user {seller_id}")
+        logger.info(f"Listing approval notification queued for user {seller_id}")
     except Exception as e:
         logger.error(f"Failed to send listing approval notification: {e}")
 
@@ -413,21 +447,25 @@ async def notify_listing_rejected(
         reason: Rejection reason
     """
     try:
-        await NotificationService.create_notification(
-            db=db,
-            user_id=seller_id,
-            title="Listing rejected",
-            description=f"Your listing '{listing_title}' was rejected: {reason}",
-            notification_type=NotificationType.ACCOUNT_UPDATE,
-            icon="error",
-            action_url=f"/listings/{listing_id}/edit",
-            metadata={
-                "listing_id": str(listing_id),
-                "listing_title": listing_title,
-                "reason": reason,
-                "type": "listing_rejected",
-            },
+        await NotificationDeliveryService.enqueue(
+            [
+                notification_event(
+                    user_id=seller_id,
+                    title="Listing rejected",
+                    description=f"Your listing '{listing_title}' was rejected: {reason}",
+                    notification_type=NotificationType.ACCOUNT_UPDATE,
+                    icon="error",
+                    action_url=f"/listings/{listing_id}/edit",
+                    metadata={
+                        "listing_id": str(listing_id),
+                        "listing_title": listing_title,
+                        "reason": reason,
+                        "type": "listing_rejected",
+                    },
+                )
+            ],
+            db,
         )
-        logger.info(f"Listing rejection notification sent to user {seller_id}")
+        logger.info(f"Listing rejection notification queued for user {seller_id}")
     except Exception as e:
         logger.error(f"Failed to send listing rejection notification: {e}")
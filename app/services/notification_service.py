@@ -1,6 +1,5 @@
 """Notification business logic service."""
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
@@ -11,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import ForbiddenException, NotFoundException
+from app.core import serialization
 from app.core.redis import get_redis
 from app.models.notification import Notification, NotificationPreference
 from app.models.user import User
@@ -472,7 +472,7 @@ class NotificationService:
                 "created_at": notification.created_at.isoformat(),
             }
 
-            await redis_client.publish(channel, json.dumps(message))
+            await redis_client.publish(channel, serialization.dumps(message))
             logger.info(f"Push notification sent to {channel}")
 
         except Exception as e:
@@ -562,7 +562,7 @@ class NotificationService:
             }
 
             channel = f"notifications:{notification.user_id}"
-            await redis_client.publish(channel, json.dumps(message))
+            await redis_client.publish(channel, serialization.dumps(message))
             logger.info(f"Published notification to {channel}")
 
         except Exception as e:
@@ -599,7 +599,7 @@ class NotificationService:
                 return
 
             channel = f"notifications:{user_id}"
-            await redis_client.publish(channel, json.dumps(message))
+            await redis_client.publish(channel, serialization.dumps(message))
 
             # Update badge count
             await NotificationService._publish_badge_update(user_id)
@@ -623,7 +623,7 @@ class NotificationService:
             message = {"event": "notifications_cleared", "data": {}}
 
             channel = f"notifications:{user_id}"
-            await redis_client.publish(channel, json.dumps(message))
+            await redis_client.publish(channel, serialization.dumps(message))
 
             # Update badge count
             await NotificationService._publish_badge_update(user_id)
@@ -656,7 +656,7 @@ class NotificationService:
             message = {"event": "badge_update", "data": {"count": int(cached_count)}}
 
             channel = f"notifications:{user_id}"
-            await redis_client.publish(channel, json.dumps(message))
+            await redis_client.publish(channel, serialization.dumps(message))
 
         except Exception as e:
             logger.error(f"Failed to publish badge update: {e}")
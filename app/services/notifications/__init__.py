@@ -6,22 +6,35 @@ This package maintains backward compatibility through the NotificationService fa
 
 Usage:
     # Direct import (recommended for new code):
-    from app.services.notifications import NotificationCrudService, NotificationPreferencesService
+    from app.services.notifications import (
+        NotificationBulkService,
+        NotificationCrudService,
+        NotificationDeliveryService,
+        NotificationPreferencesService,
+    )
 
     # Facade import (for backward compatibility):
     from app.services.notifications import NotificationService
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 from uuid import UUID
 
+from app.services.notifications.bulk_service import NotificationBulkService
 from app.services.notifications.crud_service import NotificationCrudService
+from app.services.notifications.delivery_service import (
+    NotificationDeliveryService,
+    notification_event,
+)
 from app.services.notifications.preferences_service import NotificationPreferencesService
 
 __all__ = [
+    "NotificationBulkService",
     "NotificationCrudService",
+    "NotificationDeliveryService",
     "NotificationPreferencesService",
     "NotificationService",  # Facade for backward compatibility
+    "notification_event",
 ]
 
 
@@ -207,6 +220,37 @@ class NotificationService:
             db, user_id, title, description, notification_type, icon, action_url, metadata
         )
 
+    @staticmethod
+    async def create_bulk_notifications(
+        db: Any,
+        title: str,
+        description: str,
+        notification_type: Any,
+        user_ids: Optional[Sequence[UUID]] = None,
+        icon: Optional[str] = None,
+        action_url: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Create the same notification for many users.
+
+        Args:
+            db: Database session
+            title: Notification title
+            description: Notification description
+            notification_type: Type of notification
+            user_ids: Target user IDs (None = every active user)
+            icon: Icon identifier (auto-selected if None)
+            action_url: Deep link URL
+            metadata: Additional data
+
+        Returns:
+            Number of notifications created
+        """
+        return await NotificationBulkService.create_notifications(
+            db, title, description, notification_type, user_ids, icon, action_url, metadata
+        )
+
     @staticmethod
     async def send_push_notification(user_id: UUID, notification: Any) -> None:
         """
@@ -5,15 +5,15 @@ This module provides common helper functions used across notification service mo
 including formatting utilities, Redis publishing, and response conversions.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Sequence
 from uuid import UUID
 
 if TYPE_CHECKING:
     from app.models.notification import Notification
 
+from app.core import serialization
 from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
@@ -78,7 +78,7 @@ async def publish_new_notification(notification: "Notification") -> None:
         }
 
         channel = f"notifications:{notification.user_id}"
-        await redis_client.publish(channel, json.dumps(message))
+        await redis_client.publish(channel, serialization.dumps(message))
         logger.info(f"Published notification to {channel}")
 
     except Exception as e:
@@ -115,7 +115,7 @@ async def publish_notification_update(
             return
 
         channel = f"notifications:{user_id}"
-        await redis_client.publish(channel, json.dumps(message))
+        await redis_client.publish(channel, serialization.dumps(message))
 
         # Update badge count
         await publish_badge_update(user_id)
@@ -139,7 +139,7 @@ async def publish_all_read_update(user_id: UUID) -> None:
         message = {"event": "notifications_cleared", "data": {}}
 
         channel = f"notifications:{user_id}"
-        await redis_client.publish(channel, json.dumps(message))
+        await redis_client.publish(channel, serialization.dumps(message))
 
         # Update badge count
         await publish_badge_update(user_id)
@@ -160,24 +160,94 @@ async def publish_badge_update(user_id: UUID) -> None:
         if not redis_client:
             return
 
-        # Get current unread count from Redis cache or database
-        # For now, we'll use a cached value
-        cache_key = f"unread_count:{user_id}"
-        cached_count = await redis_client.get(cache_key)
+        from app.services.notifications.unread_counter import notification_unread_counter
 
-        if cached_count is None:
-            # If not cached, will be updated by next GET request
-            cached_count = 0
+        count = await notification_unread_counter.get(user_id)
 
-        message = {"event": "badge_update", "data": {"count": int(cached_count)}}
+        message = {"event": "badge_update", "data": {"count": count}}
 
         channel = f"notifications:{user_id}"
-        await redis_client.publish(channel, json.dumps(message))
+        await redis_client.publish(channel, serialization.dumps(message))
 
     except Exception as e:
         logger.error(f"Failed to publish badge update: {e}")
 
 
+# Fields of a notification as sent to WebSocket clients
+CONTENT_FIELDS = ("title", "description", "type", "icon", "action_url", "metadata")
+
+
+async def publish_bulk_notifications(
+    notifications: Sequence[Dict[str, Any]], content: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Publish many new notifications in one pipeline.
+
+    Args:
+        notifications: Rows with "id", "user_id" and "created_at" of each notification
+        content: Shared fields (title, description, type, icon, action_url, metadata);
+            when None, each row carries its own content fields
+    """
+    if not notifications:
+        return
+
+    try:
+        redis_client = await get_redis()
+        if not redis_client:
+            return
+
+        pipe = redis_client.pipeline(transaction=False)
+        for row in notifications:
+            fields = content if content is not None else {k: row[k] for k in CONTENT_FIELDS}
+            message = {
+                "event": "notification",
+                "data": {
+                    "id": str(row["id"]),
+                    **fields,
+                    "read": False,
+                    "created_at": row["created_at"].isoformat(),
+                },
+            }
+            pipe.publish(f"notifications:{row['user_id']}", serialization.dumps(message))
+        await pipe.execute()
+        logger.info(f"Published {len(notifications)} notifications")
+
+        await publish_badge_updates(row["user_id"] for row in notifications)
+
+    except Exception as e:
+        logger.error(f"Failed to publish bulk notifications: {e}")
+
+
+async def publish_badge_updates(user_ids: Iterable[UUID]) -> None:
+    """
+    Publish badge counts for many users with one read and one pipelined write.
+
+    Args:
+        user_ids: User IDs
+    """
+    ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    if not ids:
+        return
+
+    try:
+        redis_client = await get_redis()
+        if not redis_client:
+            return
+
+        from app.services.notifications.unread_counter import notification_unread_counter
+
+        counts = await notification_unread_counter.get_many(ids)
+
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id in ids:
+            message = {"event": "badge_update", "data": {"count": counts[user_id]}}
+            pipe.publish(f"notifications:{user_id}", serialization.dumps(message))
+        await pipe.execute()
+
+    except Exception as e:
+        logger.error(f"Failed to publish badge updates: {e}")
+
+
 async def send_push_notification(user_id: UUID, notification: "Notification") -> None:
     """
     Send push notification via Redis pub/sub.
@@ -205,7 +275,7 @@ async def send_push_notification(user_id: UUID, notification: "Notification") ->
             "created_at": notification.created_at.isoformat(),
         }
 
-        await redis_client.publish(channel, json.dumps(message))
+        await redis_client.publish(channel, serialization.dumps(message))
         logger.info(f"Push notification sent to {channel}")
 
     except Exception as e:
@@ -0,0 +1,196 @@
+"""
+Bulk notification operations service.
+
+This module handles set-based notification writes: creating the same
+notification for many users with INSERT ... SELECT in keyset-paginated
+chunks, skipping users who disabled the notification type, and publishing
+the results through pipelined Redis commands.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import JSON, ColumnElement, and_, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.notification import NotificationType
+from app.services.notifications.base import publish_bulk_notifications
+from app.services.notifications.preference_engine import notification_preference_engine
+from app.services.notifications.unread_counter import notification_unread_counter
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationBulkService:
+    """
+    Service for bulk notification operations.
+
+    Each chunk is one INSERT ... SELECT statement over the users table,
+    committed on its own and published in one Redis pipeline, so
+    marketplace-wide announcements never hold ORM objects per user.
+    """
+
+    # Users per INSERT ... SELECT statement
+    CHUNK_SIZE = 5000
+
+    @staticmethod
+    async def create_notifications(
+        db: AsyncSession,
+        title: str,
+        description: str,
+        notification_type: NotificationType,
+        user_ids: Optional[Sequence[UUID]] = None,
+        icon: Optional[str] = None,
+        action_url: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> int:
+        """
+        Create the same notification for many users.
+
+        Args:
+            db: Database session
+            title: Notification title
+            description: Notification description
+            notification_type: Type of notification
+            user_ids: Target user IDs (None = every active user)
+            icon: Icon identifier (auto-selected if None)
+            action_url: Deep link URL
+            metadata: Additional data
+            chunk_size: Users per INSERT ... SELECT statement
+
+        Returns:
+            Number of notifications created
+        """
+        from app.services.notifications.crud_service import NotificationCrudService
+
+        if not icon:
+            icon = NotificationCrudService.ICONS.get(notification_type, "notifications")
+        metadata = metadata or {}
+
+        content = {
+            "title": title,
+            "description": description,
+            "type": notification_type.value,
+            "icon": icon,
+            "action_url": action_url,
+            "metadata": metadata,
+        }
+
+        created = 0
+        if user_ids is None:
+            # Keyset pagination over every active user
+            after: Optional[UUID] = None
+            while True:
+                condition: ColumnElement[bool] = User.is_active.is_(True)
+                if after is not None:
+                    condition = and_(condition, User.id > after)
+                result = await db.execute(
+                    select(User.id).where(condition).order_by(User.id).limit(chunk_size)
+                )
+                chunk = list(result.scalars().all())
+                created += await NotificationBulkService._deliver_chunk(
+                    db, chunk, notification_type, content
+                )
+                if len(chunk) < chunk_size:
+                    break
+                after = chunk[-1]
+        else:
+            unique_ids = list(dict.fromkeys(user_ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                end = start + chunk_size
+                chunk = unique_ids[start:end]
+                created += await NotificationBulkService._deliver_chunk(
+                    db, chunk, notification_type, content
+                )
+
+        logger.info(f"Created {created} '{notification_type.value}' notifications in bulk")
+        return created
+
+    @staticmethod
+    async def _deliver_chunk(
+        db: AsyncSession,
+        user_ids: Sequence[UUID],
+        notification_type: NotificationType,
+        content: Dict[str, Any],
+    ) -> int:
+        """
+        Notify the users of one chunk that accept this notification type.
+
+        Args:
+            db: Database session
+            user_ids: Candidate user IDs
+            notification_type: Type of notification
+            content: Shared notification fields
+
+        Returns:
+            Number of notifications created
+        """
+        accepted = await notification_preference_engine.filter_users(
+            user_ids, notification_type, db=db
+        )
+        if not accepted:
+            return 0
+
+        # Joining users drops IDs that do not exist instead of failing the chunk
+        users = select(User.id).where(User.id.in_(accepted))
+        rows = await NotificationBulkService._insert_chunk(db, users, content)
+        return len(rows)
+
+    @staticmethod
+    async def _insert_chunk(
+        db: AsyncSession, users: Any, content: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert one notification per selected user, commit, and publish.
+
+        Args:
+            db: Database session
+            users: SELECT of user IDs to notify
+            content: Shared notification fields
+
+        Returns:
+            Inserted rows with id, user_id and created_at
+        """
+        target = users.subquery()
+        statement = (
+            insert(Notification)
+            .from_select(
+                [
+                    Notification.id,
+                    Notification.user_id,
+                    Notification.title,
+                    Notification.description,
+                    Notification.type,
+                    Notification.is_read,
+                    Notification.icon,
+                    Notification.action_url,
+                    Notification.meta_data,
+                    Notification.created_at,
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    target.c.id,
+                    literal(content["title"]),
+                    literal(content["description"]),
+                    literal(content["type"]),
+                    literal(False),
+                    literal(content["icon"]),
+                    literal(content["action_url"]),
+                    literal(content["metadata"], type_=JSON),
+                    func.now(),
+                ),
+            )
+            .returning(Notification.id, Notification.user_id, Notification.created_at)
+        )
+
+        result = await db.execute(statement)
+        rows = [dict(row) for row in result.mappings().all()]
+        await db.commit()
+
+        await notification_unread_counter.increment_many({row["user_id"]: 1 for row in rows})
+        await publish_bulk_notifications(rows, content)
+        return rows
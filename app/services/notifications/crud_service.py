@@ -10,7 +10,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, false, func, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ForbiddenException, NotFoundException
@@ -28,6 +28,7 @@ from app.services.notifications.base import (
     publish_new_notification,
     publish_notification_update,
 )
+from app.services.notifications.unread_counter import notification_unread_counter
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,8 @@ class NotificationCrudService:
         if notification_type:
             query = query.where(Notification.type == notification_type)
         if is_read is not None:
-            query = query.where(Notification.is_read == is_read)
+            # Literal, not a bound parameter, so unread lists use the partial index
+            query = query.where(Notification.is_read == (true() if is_read else false()))
 
         # Get total count
         count_query = select(func.count()).select_from(query.subquery())
@@ -162,7 +164,7 @@ class NotificationCrudService:
 
     @staticmethod
     async def mark_as_read(
-        db: AsyncSession, notification_id: UUID, user_id: UUID
+        db: AsyncSession, notification_id: UUID, user_id: UUID, publish: bool = True
     ) -> Dict[str, Any]:
         """
         Mark a notification as read.
@@ -171,6 +173,7 @@ class NotificationCrudService:
             db: Database session
             notification_id: Notification ID
             user_id: User ID
+            publish: Publish the WebSocket update (False when the caller sends it)
 
         Returns:
             Dict with success status and message
@@ -193,45 +196,48 @@ class NotificationCrudService:
             notification.is_read = True
             notification.read_at = datetime.now(timezone.utc)
             await db.commit()
+            await notification_unread_counter.adjust(user_id, -1)
 
             # Publish to WebSocket for real-time update
-            await publish_notification_update(user_id, notification_id, "read")
+            if publish:
+                await publish_notification_update(user_id, notification_id, "read")
 
         return {"success": True, "message": "Notification marked as read"}
 
     @staticmethod
-    async def mark_all_as_read(db: AsyncSession, user_id: UUID) -> Dict[str, Any]:
+    async def mark_all_as_read(
+        db: AsyncSession, user_id: UUID, publish: bool = True
+    ) -> Dict[str, Any]:
         """
         Mark all unread notifications as read for a user.
 
         Args:
             db: Database session
             user_id: User ID
+            publish: Publish the WebSocket update (False when the caller sends it)
 
         Returns:
             Dict with success status and count of marked notifications
         """
         from app.services.notifications.base import publish_all_read_update
 
-        # Find all unread notifications
-        result = await db.execute(
-            select(Notification).where(
-                and_(Notification.user_id == user_id, Notification.is_read == False)
-            )
+        # One UPDATE ... RETURNING, counted in the database
+        updated = (
+            update(Notification)
+            .where(and_(Notification.user_id == user_id, Notification.is_read == false()))
+            .values(is_read=True, read_at=datetime.now(timezone.utc))
+            .returning(Notification.id)
+            .cte("updated")
         )
-        notifications = result.scalars().all()
-
-        marked_count = len(notifications)
-
-        # Mark all as read
-        for notification in notifications:
-            notification.is_read = True
-            notification.read_at = datetime.now(timezone.utc)
+        result = await db.execute(select(func.count()).select_from(updated))
+        marked_count = result.scalar() or 0
 
         await db.commit()
+        await notification_unread_counter.reset(user_id)
 
         # Publish WebSocket event
-        await publish_all_read_update(user_id)
+        if publish:
+            await publish_all_read_update(user_id)
 
         return {"success": True, "data": {"marked_count": marked_count}}
 
@@ -263,8 +269,11 @@ class NotificationCrudService:
         if notification.user_id != user_id:
             raise ForbiddenException("Access denied to this notification")
 
+        was_unread = not notification.is_read
         await db.delete(notification)
         await db.commit()
+        if was_unread:
+            await notification_unread_counter.adjust(user_id, -1)
 
         # Publish deletion update
         await publish_notification_update(user_id, notification_id, "deleted")
@@ -325,6 +334,7 @@ class NotificationCrudService:
         db.add(notification)
         await db.commit()
         await db.refresh(notification)
+        await notification_unread_counter.adjust(user_id, 1)
 
         # Publish to Redis for WebSocket delivery
         await publish_new_notification(notification)
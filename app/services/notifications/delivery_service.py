@@ -0,0 +1,245 @@
+"""
+Asynchronous notification delivery pipeline.
+
+Event helpers enqueue compact notification events instead of writing
+notifications inside the request. A Celery worker drops recipients that
+disabled the notification type, inserts the remaining rows in one
+statement, and publishes them to WebSocket channels in one Redis pipeline.
+When the broker cannot be reached the same delivery runs inline.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.notification import NotificationType
+from app.services.notifications.base import publish_bulk_notifications
+from app.services.notifications.preference_engine import (
+    notification_preference_engine,
+    preference_bit,
+)
+from app.services.notifications.unread_counter import notification_unread_counter
+
+logger = logging.getLogger(__name__)
+
+
+def notification_event(
+    user_id: UUID,
+    title: str,
+    description: str,
+    notification_type: NotificationType,
+    icon: Optional[str] = None,
+    action_url: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a JSON-serializable notification event for the delivery queue.
+
+    Args:
+        user_id: Target user ID
+        title: Notification title
+        description: Notification description
+        notification_type: Type of notification
+        icon: Icon identifier (auto-selected if None)
+        action_url: Deep link URL
+        metadata: Additional data (must be JSON-serializable)
+
+    Returns:
+        Notification event
+    """
+    from app.services.notifications.crud_service import NotificationCrudService
+
+    return {
+        "user_id": str(user_id),
+        "title": title,
+        "description": description,
+        "type": notification_type.value,
+        "icon": icon or NotificationCrudService.ICONS.get(notification_type, "notifications"),
+        "action_url": action_url,
+        "metadata": metadata or {},
+    }
+
+
+class NotificationDeliveryService:
+    """
+    Service for queued notification delivery.
+
+    Requests only pay for one broker publish; preference filtering,
+    inserts and WebSocket publishing happen in the worker.
+    """
+
+    @staticmethod
+    async def enqueue(events: Sequence[Dict[str, Any]], db: Optional[AsyncSession] = None) -> None:
+        """
+        Queue notification events for delivery.
+
+        Falls back to inline delivery when queued delivery is disabled or
+        the broker is unavailable.
+
+        Args:
+            events: Events built with notification_event()
+            db: Optional database session, used only for inline delivery
+        """
+        if not events:
+            return
+
+        events = list(events)
+        if settings.NOTIFICATION_DELIVERY_QUEUED:
+            try:
+                from app.tasks.notification_tasks import deliver_notifications
+
+                # Publishing to the broker is blocking I/O
+                await asyncio.to_thread(deliver_notifications.delay, events)
+                return
+            except Exception as e:
+                logger.error(f"Failed to queue notifications, delivering inline: {e}")
+
+        if db is not None:
+            await NotificationDeliveryService.deliver(db, events)
+            return
+
+        from app.core.database import async_session_maker
+
+        async with async_session_maker() as session:
+            await NotificationDeliveryService.deliver(session, events)
+
+    @staticmethod
+    async def enqueue_broadcast(
+        title: str,
+        description: str,
+        notification_type: NotificationType,
+        user_ids: Optional[Sequence[UUID]] = None,
+        icon: Optional[str] = None,
+        action_url: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        """
+        Queue the same notification for many users.
+
+        Args:
+            title: Notification title
+            description: Notification description
+            notification_type: Type of notification
+            user_ids: Target user IDs (None = every active user)
+            icon: Icon identifier (auto-selected if None)
+            action_url: Deep link URL
+            metadata: Additional data (must be JSON-serializable)
+            db: Optional database session, used only for inline delivery
+        """
+        if settings.NOTIFICATION_DELIVERY_QUEUED:
+            try:
+                from app.tasks.notification_tasks import broadcast_notification
+
+                await asyncio.to_thread(
+                    broadcast_notification.delay,
+                    title,
+                    description,
+                    notification_type.value,
+                    [str(user_id) for user_id in user_ids] if user_ids is not None else None,
+                    icon,
+                    action_url,
+                    metadata,
+                )
+                return
+            except Exception as e:
+                logger.error(f"Failed to queue broadcast, delivering inline: {e}")
+
+        from app.services.notifications.bulk_service import NotificationBulkService
+
+        async def broadcast(session: AsyncSession) -> None:
+            await NotificationBulkService.create_notifications(
+                session, title, description, notification_type, user_ids, icon, action_url, metadata
+            )
+
+        if db is not None:
+            await broadcast(db)
+            return
+
+        from app.core.database import async_session_maker
+
+        async with async_session_maker() as session:
+            await broadcast(session)
+
+    @staticmethod
+    async def deliver(db: AsyncSession, events: Sequence[Dict[str, Any]]) -> int:
+        """
+        Store and publish notification events.
+
+        Events for unknown or inactive users and for types the recipient
+        disabled are dropped.
+
+        Args:
+            db: Database session
+            events: Events built with notification_event()
+
+        Returns:
+            Number of notifications created
+        """
+        events = await NotificationDeliveryService._filter_recipients(db, events)
+        if not events:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": UUID(event["user_id"]),
+                "title": event["title"],
+                "description": event["description"],
+                "type": event["type"],
+                "is_read": False,
+                "icon": event["icon"],
+                "action_url": event["action_url"],
+                "meta_data": event["metadata"],
+                "created_at": now,
+            }
+            for event in events
+        ]
+
+        await db.execute(insert(Notification), rows)
+        await db.commit()
+
+        await notification_unread_counter.increment_many(Counter(row["user_id"] for row in rows))
+        await publish_bulk_notifications(
+            [
+                {**event, "id": row["id"], "created_at": row["created_at"]}
+                for event, row in zip(events, rows)
+            ]
+        )
+
+        logger.info(f"Delivered {len(rows)} notifications")
+        return len(rows)
+
+    @staticmethod
+    async def _filter_recipients(
+        db: AsyncSession, events: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Drop events for missing or inactive users and for types they disabled."""
+        user_ids = {UUID(event["user_id"]) for event in events}
+        result = await db.execute(
+            select(User.id).where(and_(User.id.in_(user_ids), User.is_active.is_(True)))
+        )
+        active = {str(user_id) for user_id in result.scalars().all()}
+        masks = await notification_preference_engine.get_masks(active, db)
+
+        delivered = [
+            event
+            for event in events
+            if event["user_id"] in active
+            and masks[event["user_id"]] & preference_bit(NotificationType(event["type"]))
+        ]
+
+        dropped = len(events) - len(delivered)
+        if dropped:
+            logger.info(f"Skipped {dropped} notifications for inactive users or disabled types")
+        return delivered
@@ -0,0 +1,294 @@
+"""
+Compiled notification preference evaluation.
+
+A user's NotificationPreference row (global push/email switches plus the
+per-type JSON blob) is compiled into one integer with a bit per
+(notification type, channel):
+
+    bit = type_index * len(CHANNELS) + channel_index
+
+Masks are cached in Redis at notification:prefs:{user_id} and in a small
+in-process map, and dropped from both when preferences change. Filtering
+a broadcast is one MGET plus an AND per user instead of a JSON walk per
+user.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.notification import NotificationPreference
+from app.schemas.notification import NotificationType
+
+logger = logging.getLogger(__name__)
+
+# Delivery channels; "in_app" is the per-type "enabled" switch
+CHANNELS = ("in_app", "push", "email")
+
+NOTIFICATION_TYPES = tuple(NotificationType)
+
+
+def preference_bit(notification_type: NotificationType, channel: str = "in_app") -> int:
+    """
+    Get the mask bit of a (notification type, channel) pair.
+
+    Args:
+        notification_type: Type of notification
+        channel: One of CHANNELS
+
+    Returns:
+        Single-bit mask
+
+    Raises:
+        ValueError: If the channel is unknown
+    """
+    return 1 << (
+        NOTIFICATION_TYPES.index(notification_type) * len(CHANNELS) + CHANNELS.index(channel)
+    )
+
+
+def compile_preferences(
+    push_notifications: bool = True,
+    email_notifications: bool = True,
+    types: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> int:
+    """
+    Compile notification preferences into a bitmask.
+
+    A type that is disabled gets no channel at all, and the global push and
+    email switches clear those channels for every type. Missing entries
+    default to enabled.
+
+    Args:
+        push_notifications: Global push switch
+        email_notifications: Global email switch
+        types: Per-type settings ({"enabled", "push", "email"} per type)
+
+    Returns:
+        Preference bitmask
+    """
+    types = types or {}
+    mask = 0
+    for notification_type in NOTIFICATION_TYPES:
+        type_settings = types.get(notification_type.value) or {}
+        if not type_settings.get("enabled", True):
+            continue
+        mask |= preference_bit(notification_type, "in_app")
+        if push_notifications and type_settings.get("push", True):
+            mask |= preference_bit(notification_type, "push")
+        if email_notifications and type_settings.get("email", True):
+            mask |= preference_bit(notification_type, "email")
+    return mask
+
+
+# Mask of users without a preferences row
+DEFAULT_MASK = compile_preferences()
+
+
+class NotificationPreferenceEngine:
+    """
+    Two-level cache of compiled preference masks.
+
+    The in-process level is bounded and short-lived so other processes
+    pick up changes quickly; Redis is the shared level and is invalidated
+    explicitly on update.
+    """
+
+    KEY = "notification:prefs:{user_id}"
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.NOTIFICATION_PREFERENCE_CACHE_TTL_SECONDS,
+        local_ttl_seconds: int = settings.NOTIFICATION_PREFERENCE_LOCAL_TTL_SECONDS,
+        local_max_size: int = 10000,
+    ) -> None:
+        """
+        Initialize preference engine.
+
+        Args:
+            ttl_seconds: Expiry of masks cached in Redis
+            local_ttl_seconds: Expiry of masks cached in this process
+            local_max_size: Maximum number of masks cached in this process
+        """
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local_max_size = local_max_size
+        self._local: Dict[str, Tuple[int, float]] = {}
+
+    def _key(self, user_id: Any) -> str:
+        return self.KEY.format(user_id=user_id)
+
+    async def get_mask(self, user_id: Any, db: Optional[AsyncSession] = None) -> int:
+        """
+        Get a user's compiled preference mask.
+
+        Args:
+            user_id: User ID
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Preference bitmask
+        """
+        masks = await self.get_masks([user_id], db)
+        return masks[str(user_id)]
+
+    async def get_masks(
+        self, user_ids: Iterable[Any], db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """
+        Get compiled preference masks for many users.
+
+        Checks the in-process cache, then one MGET, then loads the remaining
+        users with one query.
+
+        Args:
+            user_ids: User IDs
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Mapping of user ID string to preference bitmask
+        """
+        ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        now = time.monotonic()
+
+        masks: Dict[str, int] = {}
+        for user_id in ids:
+            cached = self._local.get(user_id)
+            if cached is not None and cached[1] > now:
+                masks[user_id] = cached[0]
+
+        missing = [user_id for user_id in ids if user_id not in masks]
+        if not missing:
+            return masks
+
+        from app.core.redis import redis_client
+
+        shared: Dict[str, int] = {}
+        if redis_client is not None:
+            try:
+                values = await redis_client.mget([self._key(user_id) for user_id in missing])
+                shared = {
+                    user_id: int(value)
+                    for user_id, value in zip(missing, values)
+                    if value is not None
+                }
+            except Exception as e:
+                logger.error(f"Failed to read notification preference masks: {e}")
+
+        missing = [user_id for user_id in missing if user_id not in shared]
+        if missing:
+            loaded = await self._load(missing, db)
+            await self._store(loaded)
+            shared.update(loaded)
+
+        self._remember(shared, now)
+        masks.update(shared)
+        return masks
+
+    async def filter_users(
+        self,
+        user_ids: Iterable[Any],
+        notification_type: NotificationType,
+        channel: str = "in_app",
+        db: Optional[AsyncSession] = None,
+    ) -> List[Any]:
+        """
+        Keep the users that accept a notification type on a channel.
+
+        Args:
+            user_ids: Candidate user IDs
+            notification_type: Type of notification
+            channel: One of CHANNELS
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Accepting user IDs, in input order
+        """
+        user_ids = list(user_ids)
+        bit = preference_bit(notification_type, channel)
+        masks = await self.get_masks(user_ids, db)
+        return [user_id for user_id in user_ids if masks[str(user_id)] & bit]
+
+    async def invalidate(self, user_id: Any) -> None:
+        """
+        Drop a user's cached mask after their preferences change.
+
+        Must be called after the change is committed.
+
+        Args:
+            user_id: User ID
+        """
+        self._local.pop(str(user_id), None)
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.delete(self._key(user_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate notification preferences for {user_id}: {e}")
+
+    async def _load(self, user_ids: List[str], db: Optional[AsyncSession]) -> Dict[str, int]:
+        """Compile masks from Postgres; users without a row get the default mask."""
+        query = select(
+            NotificationPreference.user_id,
+            NotificationPreference.push_notifications,
+            NotificationPreference.email_notifications,
+            NotificationPreference.types,
+        ).where(NotificationPreference.user_id.in_(user_ids))
+
+        if db is not None:
+            result = await db.execute(query)
+        else:
+            from app.core.database import async_session_maker
+
+            async with async_session_maker() as session:
+                result = await session.execute(query)
+
+        masks = {user_id: DEFAULT_MASK for user_id in user_ids}
+        for user_id, push, email, types in result.all():
+            masks[str(user_id)] = compile_preferences(push, email, types)
+        return masks
+
+    async def _store(self, masks: Dict[str, int]) -> None:
+        if not masks:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id, mask in masks.items():
+                pipe.set(self._key(user_id), mask, ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to cache notification preference masks: {e}")
+
+    def _remember(self, masks: Dict[str, int], now: float) -> None:
+        if len(masks) > self.local_max_size:
+            # Broadcast-sized lookups would only evict the hot entries
+            return
+        if len(self._local) + len(masks) > self.local_max_size:
+            # Drop expired entries first, then everything if still full
+            self._local = {
+                user_id: cached for user_id, cached in self._local.items() if cached[1] > now
+            }
+            if len(self._local) + len(masks) > self.local_max_size:
+                self._local.clear()
+
+        expires_at = now + self.local_ttl_seconds
+        for user_id, mask in masks.items():
+            self._local[user_id] = (mask, expires_at)
+
+
+# Global notification preference engine instance
+notification_preference_engine = NotificationPreferenceEngine()
@@ -10,11 +10,12 @@ import logging
 from typing import Dict, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification, NotificationPreference
+from app.models.notification import NotificationPreference
 from app.schemas.notification import NotificationSettingsResponse, NotificationTypeSettings
+from app.services.notifications.preference_engine import notification_preference_engine
 
 logger = logging.getLogger(__name__)
 
@@ -125,13 +126,20 @@ class NotificationPreferencesService:
             preference.email_notifications = email_notifications
 
         if types:
+            # Assign a new dict: in-place changes to a JSON column are not flushed
+            updated_types = {
+                type_name: dict(type_settings)
+                for type_name, type_settings in preference.types.items()
+            }
             for type_name, settings in types.items():
-                if type_name in preference.types:
+                if type_name in updated_types:
                     for key, value in settings.items():
                         if value is not None:
-                            preference.types[type_name][key] = value
+                            updated_types[type_name][key] = value
+            preference.types = updated_types
 
         await db.commit()
+        await notification_preference_engine.invalidate(user_id)
 
         return await NotificationPreferencesService.get_notification_settings(db, user_id)
 
@@ -147,9 +155,6 @@ class NotificationPreferencesService:
         Returns:
             Number of unread notifications
         """
-        result = await db.execute(
-            select(func.count())
-            .select_from(Notification)
-            .where(and_(Notification.user_id == user_id, Notification.is_read == False))
-        )
-        return result.scalar() or 0
+        from app.services.notifications.unread_counter import notification_unread_counter
+
+        return await notification_unread_counter.get(user_id, db)
@@ -0,0 +1,263 @@
+"""
+Maintained unread-notification counters.
+
+Each user's unread count is a Redis string at unread_count:{user_id}. Writes
+adjust it atomically only while the key exists, so a missing key always
+means "unknown" and is rebuilt from Postgres on the next read rather than
+starting from a wrong zero. A periodic task compares cached counters with
+Postgres and repairs drift.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, false, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+# INCRBY only if the counter is cached, never below zero; returns nil on a miss
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    return 0
+end
+return value
+"""
+
+
+class NotificationUnreadCounter:
+    """
+    Redis-backed unread notification counter per user.
+
+    Counters expire after a day without reads so inactive users cost no
+    memory; the next read rebuilds them with one indexed COUNT.
+    """
+
+    KEY = "unread_count:{user_id}"
+    TTL_SECONDS = 86400
+
+    def __init__(self) -> None:
+        """Initialize counter with lazily registered Lua script."""
+        self._adjust_script: Any = None
+        self._script_client: Any = None
+
+    def _key(self, user_id: Any) -> str:
+        return self.KEY.format(user_id=user_id)
+
+    def _script(self, redis_client: Any) -> Any:
+        # Re-register when the client is replaced (tests, reconnects, workers)
+        if self._adjust_script is None or self._script_client is not redis_client:
+            self._adjust_script = redis_client.register_script(_ADJUST_SCRIPT)
+            self._script_client = redis_client
+        return self._adjust_script
+
+    async def adjust(self, user_id: Any, delta: int) -> Optional[int]:
+        """
+        Add delta to a user's cached counter.
+
+        Args:
+            user_id: User ID
+            delta: Amount to add (negative to decrement)
+
+        Returns:
+            New count, or None if the counter is not cached
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return None
+
+        try:
+            value = await self._script(redis_client)(keys=[self._key(user_id)], args=[delta])
+            return int(value) if value is not None else None
+        except Exception as e:
+            logger.error(f"Failed to adjust unread notification count for {user_id}: {e}")
+            return None
+
+    async def increment_many(self, counts: Dict[Any, int]) -> None:
+        """
+        Increment many users' cached counters in one pipeline.
+
+        Args:
+            counts: Mapping of user ID to amount to add
+        """
+        if not counts:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            script = self._script(redis_client)
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id, delta in counts.items():
+                await script(keys=[self._key(user_id)], args=[delta], client=pipe)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to increment unread notification counts: {e}")
+
+    async def reset(self, user_id: Any) -> None:
+        """
+        Set a user's counter to zero after all notifications were read.
+
+        Args:
+            user_id: User ID
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.set(self._key(user_id), 0, ex=self.TTL_SECONDS)
+        except Exception as e:
+            logger.error(f"Failed to reset unread notification count for {user_id}: {e}")
+
+    async def get(self, user_id: Any, db: Optional[AsyncSession] = None) -> int:
+        """
+        Get a user's unread notification count.
+
+        Args:
+            user_id: User ID
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Number of unread notifications
+        """
+        counts = await self.get_many([user_id], db)
+        return counts[str(user_id)]
+
+    async def get_many(
+        self, user_ids: Iterable[Any], db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """
+        Get unread counts for many users with one MGET.
+
+        Misses are rebuilt together with one grouped COUNT.
+
+        Args:
+            user_ids: User IDs
+            db: Optional database session, used only on a cache miss
+
+        Returns:
+            Mapping of user ID string to unread count
+        """
+        ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        if not ids:
+            return {}
+
+        from app.core.redis import redis_client
+
+        counts: Dict[str, int] = {}
+        if redis_client is not None:
+            try:
+                values = await redis_client.mget([self._key(user_id) for user_id in ids])
+                counts = {
+                    user_id: int(value) for user_id, value in zip(ids, values) if value is not None
+                }
+            except Exception as e:
+                logger.error(f"Failed to read unread notification counts: {e}")
+
+        missing = [user_id for user_id in ids if user_id not in counts]
+        if missing:
+            rebuilt = await self._count(missing, db)
+            counts.update(rebuilt)
+            await self._store(rebuilt, only_if_missing=True)
+
+        return counts
+
+    async def reconcile(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Repair cached counters that drifted from Postgres.
+
+        Scans every cached counter in batches and overwrites those that
+        differ from an exact COUNT.
+
+        Args:
+            db: Database session
+            batch_size: Counters compared per grouped COUNT
+
+        Returns:
+            Number of counters corrected
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return 0
+
+        prefix = self.KEY.format(user_id="")
+        corrected = 0
+        batch: List[str] = []
+
+        async def flush() -> int:
+            values = await redis_client.mget([self._key(user_id) for user_id in batch])
+            actual = await self._count(batch, db)
+            drifted = {
+                user_id: actual[user_id]
+                for user_id, value in zip(batch, values)
+                if value is not None and int(value) != actual[user_id]
+            }
+            await self._store(drifted, only_if_missing=False)
+            batch.clear()
+            return len(drifted)
+
+        async for key in redis_client.scan_iter(match=f"{prefix}*", count=batch_size):
+            batch.append(key.removeprefix(prefix))
+            if len(batch) >= batch_size:
+                corrected += await flush()
+        if batch:
+            corrected += await flush()
+
+        if corrected:
+            logger.warning(f"Corrected {corrected} drifted unread notification counters")
+        return corrected
+
+    async def _count(self, user_ids: List[str], db: Optional[AsyncSession]) -> Dict[str, int]:
+        """Exact unread counts from Postgres for the given users."""
+        query = (
+            select(Notification.user_id, func.count())
+            .where(and_(Notification.user_id.in_(user_ids), Notification.is_read == false()))
+            .group_by(Notification.user_id)
+        )
+
+        if db is not None:
+            result = await db.execute(query)
+        else:
+            from app.core.database import async_session_maker
+
+            async with async_session_maker() as session:
+                result = await session.execute(query)
+
+        counts = {user_id: 0 for user_id in user_ids}
+        counts.update({str(user_id): count for user_id, count in result.all()})
+        return counts
+
+    async def _store(self, counts: Dict[str, int], only_if_missing: bool) -> None:
+        if not counts:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id, count in counts.items():
+                pipe.set(self._key(user_id), count, ex=self.TTL_SECONDS, nx=only_if_missing)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to store unread notification counts: {e}")
+
+
+# Global unread notification counter instance
+notification_unread_counter = NotificationUnreadCounter()
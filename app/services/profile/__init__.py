@@ -82,6 +82,14 @@ class ProfileService:
         """Upload user avatar."""
         return await self.profile_management.upload_avatar(user_id, file_data, filename)
 
+    async def create_avatar_upload(self, user_id: Any, data: Any) -> Any:
+        """Issue a presigned avatar upload."""
+        return await self.profile_management.create_avatar_upload(user_id, data)
+
+    async def complete_avatar_upload(self, user_id: Any, object_name: str) -> Any:
+        """Verify a direct avatar upload and set it."""
+        return await self.profile_management.complete_avatar_upload(user_id, object_name)
+
     async def get_public_profile(self, target_user_id: Any) -> Any:
         """Get public profile of another user."""
         return await self.profile_management.get_public_profile(target_user_id)
@@ -99,9 +107,9 @@ class ProfileService:
         """Create a new listing."""
         return await self.listing_management.create_listing(user_id, data)
 
-    async def get_listing_details(self, listing_id: Any) -> Any:
+    async def get_listing_details(self, listing_id: Any, viewer_id: Any = None) -> Any:
         """Get listing details."""
-        return await self.listing_management.get_listing_details(listing_id)
+        return await self.listing_management.get_listing_details(listing_id, viewer_id)
 
     async def update_listing(self, listing_id: Any, user_id: Any, data: Any) -> Any:
         """Update a listing."""
@@ -121,6 +129,14 @@ class ProfileService:
         """Upload a listing image."""
         return await self.listing_management.upload_listing_image(file_data, filename)
 
+    async def create_listing_image_upload(self, user_id: Any, data: Any) -> Any:
+        """Issue a presigned listing image upload."""
+        return await self.listing_management.create_listing_image_upload(user_id, data)
+
+    async def complete_listing_image_upload(self, user_id: Any, object_name: str) -> Any:
+        """Verify a direct listing image upload."""
+        return await self.listing_management.complete_listing_image_upload(user_id, object_name)
+
     # Helper methods - delegate to base utilities
     async def _get_user(self, user_id: Any) -> Any:
         """Get user by ID."""
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
 from app.models.listing import Listing
-from app.schemas.common import PaginationSchema
+from app.schemas.common import PaginationSchema, PresignedUploadRequest, PresignedUploadResponse
 from app.schemas.listing import (
     ProfileCreateListingRequest,
     ProfileUpdateListingRequest,
@@ -22,6 +22,9 @@ from app.schemas.listing import (
     UserListingResponse,
     UserListingsListResponse,
 )
+from app.services.image_service import ListingImageService
+from app.services.upload_service import DirectUploadService
+from app.services.view_counter import view_counter
 
 from .base import check_listing_rate_limit, get_listing
 
@@ -150,18 +153,28 @@ class ListingManagementService:
             updated_at=listing.updated_at,
         )
 
-    async def get_listing_details(self, listing_id: UUID) -> UserListingDetailResponse:
+    async def get_listing_details(
+        self, listing_id: UUID, viewer_id: Optional[UUID] = None
+    ) -> UserListingDetailResponse:
         """
         Get listing details.
 
+        Counts a view unless the viewer is the seller.
+
         Args:
             listing_id: Listing ID
+            viewer_id: Viewing user's ID, for view counting
 
         Returns:
             UserListingDetailResponse: Listing details
         """
         listing = await get_listing(self.db, listing_id)
 
+        if viewer_id != listing.seller_id:
+            await view_counter.record(
+                "listings", listing.id, str(viewer_id) if viewer_id else None
+            )
+
         return UserListingDetailResponse(
             id=listing.id,
             title=listing.title,
@@ -330,8 +343,44 @@ class ListingManagementService:
         )
         image_url = await upload_file_to_storage(upload_file, folder="listings")
         image_id = str(uuid4())
+        await ListingImageService.enqueue([image_url])
 
         # Note: Malware scanning should be implemented before production
         return UploadImageResponse(
             id=image_id, url=image_url, filename=filename, size=len(file_data)
         )
+
+    async def create_listing_image_upload(
+        self, user_id: UUID, data: PresignedUploadRequest
+    ) -> PresignedUploadResponse:
+        """
+        Issue a presigned direct-to-storage listing image upload.
+
+        Args:
+            user_id: User ID
+            data: Declared filename, content type and size
+
+        Returns:
+            PresignedUploadResponse: Upload URLs and object name
+        """
+        return DirectUploadService.create_upload(user_id, "listing_image", data)
+
+    async def complete_listing_image_upload(
+        self, user_id: UUID, object_name: str
+    ) -> UploadImageResponse:
+        """
+        Verify a direct listing image upload.
+
+        Args:
+            user_id: User ID
+            object_name: Object name returned by create_listing_image_upload
+
+        Returns:
+            UploadImageResponse: Uploaded image info
+        """
+        upload = await DirectUploadService.complete_upload(user_id, "listing_image", object_name)
+        await ListingImageService.enqueue([upload.url])
+
+        return UploadImageResponse(
+            id=str(uuid4()), url=upload.url, filename=upload.filename, size=upload.size
+        )
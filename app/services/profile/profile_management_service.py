@@ -6,18 +6,20 @@ Handles user profile CRUD operations, stats calculation, and trade history.
 
 import io
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi import UploadFile
-from sqlalchemy import desc, select
+from sqlalchemy import desc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.database import fan_out
 from app.core.exceptions import NotFoundError, ValidationError
 from app.models.deal import Deal
 from app.models.listing import Listing
 from app.models.user import User, UserProfile
-from app.schemas.common import PaginationSchema
+from app.schemas.common import PaginationSchema, PresignedUploadRequest, PresignedUploadResponse
 from app.schemas.profile import (
     ListingSummary,
     PublicProfileResponse,
@@ -29,6 +31,8 @@ from app.schemas.profile import (
     UserProfileStats,
     UserStatsResponse,
 )
+from app.services.chat.access_cache import room_access_cache
+from app.services.upload_service import DirectUploadService
 
 from .base import (
     build_trade_history_items,
@@ -71,29 +75,15 @@ class ProfileManagementService:
         Returns:
             UserProfileResponse: Full user profile with stats and recent activity
         """
-        # Fetch user and profile
-        user, profile = await get_user_and_profile(self.db, user_id)
-
-        # Get stats
-        stats = await calculate_user_stats(self.db, user_id)
-
-        # Get recent listings (last 5)
-        recent_listings_result = await self.db.execute(
-            select(Listing)
-            .where(Listing.seller_id == user_id)
-            .order_by(desc(Listing.created_at))
-            .limit(5)
+        # User and profile, stats, recent listings and recent trades are
+        # independent, so they run concurrently
+        (user, profile), stats, recent_listings, recent_deals = await fan_out(
+            self.db,
+            lambda db: get_user_and_profile(db, user_id),
+            lambda db: calculate_user_stats(db, user_id),
+            lambda db: self._get_recent_listings(db, user_id),
+            lambda db: self._get_recent_deals(db, user_id),
         )
-        recent_listings = recent_listings_result.scalars().all()
-
-        # Get recent trades (last 5)
-        recent_trades_result = await self.db.execute(
-            select(Deal)
-            .where(Deal.buyer_id == user_id, Deal.seller_id == user_id)
-            .order_by(desc(Deal.created_at))
-            .limit(5)
-        )
-        recent_deals = recent_trades_result.scalars().all()
 
         # Build response
         return UserProfileResponse(
@@ -126,6 +116,29 @@ class ProfileManagementService:
             recent_trades=await build_trade_history_items(self.db, recent_deals, user_id),
         )
 
+    @staticmethod
+    async def _get_recent_listings(db: AsyncSession, user_id: UUID) -> Sequence[Listing]:
+        """Get the user's last 5 listings."""
+        result = await db.execute(
+            select(Listing)
+            .where(Listing.seller_id == user_id)
+            .order_by(desc(Listing.created_at))
+            .limit(5)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def _get_recent_deals(db: AsyncSession, user_id: UUID) -> Sequence[Deal]:
+        """Get the user's last 5 trades as buyer or seller, with listing and account loaded."""
+        result = await db.execute(
+            select(Deal)
+            .options(selectinload(Deal.listing), selectinload(Deal.account))
+            .where(or_(Deal.buyer_id == user_id, Deal.seller_id == user_id))
+            .order_by(desc(Deal.created_at))
+            .limit(5)
+        )
+        return result.scalars().all()
+
     async def get_user_stats(self, user_id: UUID) -> UserStatsResponse:
         """
         Get detailed user statistics.
@@ -283,9 +296,47 @@ class ProfileManagementService:
         profile.updated_at = datetime.utcnow()
 
         await self.db.commit()
+        await room_access_cache.invalidate_sender(user_id)
 
         return UploadAvatarResponse(avatar_url=avatar_url)
 
+    async def create_avatar_upload(
+        self, user_id: UUID, data: PresignedUploadRequest
+    ) -> PresignedUploadResponse:
+        """
+        Issue a presigned direct-to-storage avatar upload.
+
+        Args:
+            user_id: User ID
+            data: Declared filename, content type and size
+
+        Returns:
+            PresignedUploadResponse: Upload URLs and object name
+        """
+        return DirectUploadService.create_upload(user_id, "avatar", data)
+
+    async def complete_avatar_upload(self, user_id: UUID, object_name: str) -> UploadAvatarResponse:
+        """
+        Verify a direct avatar upload and set it as the user's avatar.
+
+        Args:
+            user_id: User ID
+            object_name: Object name returned by create_avatar_upload
+
+        Returns:
+            UploadAvatarResponse: Avatar URL
+        """
+        upload = await DirectUploadService.complete_upload(user_id, "avatar", object_name)
+
+        profile = await get_profile(self.db, user_id)
+        profile.avatar_url = upload.url
+        profile.updated_at = datetime.utcnow()
+
+        await self.db.commit()
+        await room_access_cache.invalidate_sender(user_id)
+
+        return UploadAvatarResponse(avatar_url=upload.url)
+
     async def get_public_profile(self, target_user_id: UUID) -> PublicProfileResponse:
         """
         Get public profile of another user.
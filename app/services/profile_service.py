@@ -34,6 +34,7 @@ from app.schemas.profile import (
     UserProfileStats,
     UserStatsResponse,
 )
+from app.services.view_counter import view_counter
 from app.utils.storage import upload_file_to_storage
 from fastapi import UploadFile
 
@@ -406,18 +407,28 @@ class ProfileService:
             updated_at=listing.updated_at,
         )
 
-    async def get_listing_details(self, listing_id: UUID) -> UserListingDetailResponse:
+    async def get_listing_details(
+        self, listing_id: UUID, viewer_id: Optional[UUID] = None
+    ) -> UserListingDetailResponse:
         """
         Get listing details.
 
+        Counts a view unless the viewer is the seller.
+
         Args:
             listing_id: Listing ID
+            viewer_id: Viewing user's ID, for view counting
 
         Returns:
             UserListingDetailResponse: Listing details
         """
         listing = await self._get_listing(listing_id)
 
+        if viewer_id != listing.seller_id:
+            await view_counter.record(
+                "listings", listing.id, str(viewer_id) if viewer_id else None
+            )
+
         return UserListingDetailResponse(
             id=listing.id,
             title=listing.title,
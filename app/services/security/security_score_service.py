@@ -8,13 +8,18 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import fan_out
 from app.core.exceptions import NotFoundError
-from app.models.user import SecurityEvent, Session, User
+from app.models.user import SecurityEvent, Session
 from app.schemas.security import SecurityScoreResponse, SecurityVulnerability
-from app.services.security.base import get_active_sessions_count, get_failed_login_count
+from app.services.security.base import (
+    get_active_sessions_count,
+    get_failed_login_count,
+    get_user_by_id,
+)
 
 
 class SecurityScoreService:
@@ -46,8 +51,14 @@ class SecurityScoreService:
         Raises:
             NotFoundError: If user not found
         """
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        # The user and their session and failed login counts are independent,
+        # so they are fetched concurrently
+        user, active_sessions, failed_logins = await fan_out(
+            self.db,
+            lambda db: get_user_by_id(db, user_id),
+            lambda db: get_active_sessions_count(db, user_id),
+            lambda db: get_failed_login_count(db, user_id, days=7),
+        )
 
         if not user:
             raise NotFoundError("User not found")
@@ -110,8 +121,6 @@ class SecurityScoreService:
             recommendations.append("Enable login notifications for enhanced security")
 
         # Check active sessions
-        active_sessions = await get_active_sessions_count(self.db, user_id)
-
         if active_sessions > 5:
             score -= 5
             vulnerabilities.append(
@@ -124,8 +133,6 @@ class SecurityScoreService:
             recommendations.append("Review and manage active sessions")
 
         # Check failed login attempts (from security events)
-        failed_logins = await get_failed_login_count(self.db, user_id, days=7)
-
         if failed_logins > 5:
             score -= 10
             vulnerabilities.append(
@@ -9,12 +9,11 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-import io
-from PIL import Image
 from fastapi import UploadFile
 from sqlalchemy import and_, case, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import fan_out
 from app.core.exceptions import (
     ConflictException,
     ForbiddenException,
@@ -43,7 +42,11 @@ from app.schemas.listing import (
     TopPerformingListing,
     UpdateListingRequest,
 )
-from app.utils.storage import upload_file_to_storage
+from app.schemas.common import PresignedUploadBatchResponse, PresignedUploadRequest
+from app.services.image_service import ListingImageService
+from app.services.upload_service import DirectUploadService
+from app.utils.images import read_dimensions, thumbnail_url
+from app.utils.storage import upload_files_to_storage
 
 
 class SellService:
@@ -211,14 +214,14 @@ class SellService:
         ]
 
     async def upload_images(
-        self, user_id: UUID, files: List[tuple], filenames: List[str]
+        self, user_id: UUID, files: List[UploadFile], filenames: List[str]
     ) -> List[ImageResponse]:
         """
         Upload listing images.
 
         Args:
             user_id: User UUID
-            files: List of (filename, content, content_type) tuples
+            files: Uploaded image files, streamed to storage as-is
             filenames: List of original filenames
 
         Returns:
@@ -230,31 +233,28 @@ class SellService:
         if len(files) > 10:
             raise ValidationException("Maximum 10 images allowed")
 
-        images = []
-        for i, (file_data, filename) in enumerate(zip(files, filenames)):
-            # Get image dimensions using PIL
-            img = Image.open(io.BytesIO(file_data))
-            width, height = img.size
-
-            # Create UploadFile object for storage upload
-            file_obj = UploadFile(
-                filename=filename,
-                file=io.BytesIO(file_data),
-            )
+        # Read dimensions first so an invalid image fails before anything is uploaded
+        dimensions = []
+        for file, filename in zip(files, filenames):
+            # Header only; pixels are decoded by the variant pipeline
+            dimensions.append(read_dimensions(file.file))
+            file.filename = filename
 
-            # Upload to storage
-            url = await upload_file_to_storage(file_obj, folder="listings")
+        # Upload to storage in parallel
+        urls = await upload_files_to_storage(files, folder="listings")
 
-            # Generate thumbnail URL (same path with _thumb suffix)
-            thumbnail_url = url.rsplit(".", 1)[0] + "_thumb." + url.rsplit(".", 1)[1]
+        # Thumbnails and responsive variants are rendered by Celery workers
+        await ListingImageService.enqueue(urls)
 
+        images = []
+        for url, file, filename, (width, height) in zip(urls, files, filenames, dimensions):
             images.append(
                 ImageResponse(
                     id=uuid4(),
                     url=url,
-                    thumbnail_url=thumbnail_url,
+                    thumbnail_url=thumbnail_url(url),
                     filename=filename,
-                    size=len(file_data),
+                    size=file.size or 0,
                     width=width,
                     height=height,
                 )
@@ -262,6 +262,73 @@ class SellService:
 
         return images
 
+    async def create_image_uploads(
+        self, user_id: UUID, files: List[PresignedUploadRequest]
+    ) -> PresignedUploadBatchResponse:
+        """
+        Issue presigned direct-to-storage uploads for listing images.
+
+        Args:
+            user_id: User UUID
+            files: Declared filename, content type and size per image
+
+        Returns:
+            PresignedUploadBatchResponse: Upload URLs and object names, in order
+
+        Raises:
+            ValidationException: If validation fails
+        """
+        if len(files) > 10:
+            raise ValidationException("Maximum 10 images allowed")
+
+        return PresignedUploadBatchResponse(
+            uploads=[
+                DirectUploadService.create_upload(user_id, "listing_image", file) for file in files
+            ]
+        )
+
+    async def complete_image_uploads(
+        self, user_id: UUID, object_names: List[str]
+    ) -> List[ImageResponse]:
+        """
+        Verify direct listing image uploads.
+
+        Args:
+            user_id: User UUID
+            object_names: Object names returned by create_image_uploads
+
+        Returns:
+            List[ImageResponse]: Uploaded image data
+
+        Raises:
+            ValidationException: If validation fails
+        """
+        if len(object_names) > 10:
+            raise ValidationException("Maximum 10 images allowed")
+
+        uploads = await DirectUploadService.complete_uploads(
+            user_id, "listing_image", object_names
+        )
+
+        # Thumbnails and responsive variants are rendered by Celery workers
+        await ListingImageService.enqueue([upload.url for upload in uploads])
+
+        images = []
+        for upload in uploads:
+            images.append(
+                ImageResponse(
+                    id=uuid4(),
+                    url=upload.url,
+                    thumbnail_url=thumbnail_url(upload.url),
+                    filename=upload.filename,
+                    size=upload.size,
+                    width=upload.width,
+                    height=upload.height,
+                )
+            )
+
+        return images
+
     async def update_listing(
         self, listing_id: UUID, user_id: UUID, data: UpdateListingRequest
     ) -> ListingResponse:
@@ -393,23 +460,28 @@ class SellService:
         Returns:
             SellAnalyticsResponse: Analytics data
         """
-        # Get listing stats
-        total_listings = await self._count_user_listings(user_id)
-        active_listings = await self._count_user_listings(user_id, status="active")
-        sold_listings = await self._count_user_listings(user_id, status="sold")
-
-        # Get views and revenue
-        total_views = await self._get_total_views(user_id)
-        total_revenue = await self._get_total_revenue(user_id)
-
-        # Get avg time to sell
-        avg_time_to_sell = await self._get_avg_time_to_sell(user_id)
-
-        # Get top performing listing
-        top_listing = await self._get_top_performing_listing(user_id)
-
-        # Get recent activity
-        recent_activity = await self._get_recent_activity(user_id)
+        # Listing counts, views, revenue, time to sell, top listing and recent
+        # activity are independent queries, so they run concurrently
+        (
+            total_listings,
+            active_listings,
+            sold_listings,
+            total_views,
+            total_revenue,
+            avg_time_to_sell,
+            top_listing,
+            recent_activity,
+        ) = await fan_out(
+            self.db,
+            lambda db: SellService(db)._count_user_listings(user_id),
+            lambda db: SellService(db)._count_user_listings(user_id, status="active"),
+            lambda db: SellService(db)._count_user_listings(user_id, status="sold"),
+            lambda db: SellService(db)._get_total_views(user_id),
+            lambda db: SellService(db)._get_total_revenue(user_id),
+            lambda db: SellService(db)._get_avg_time_to_sell(user_id),
+            lambda db: SellService(db)._get_top_performing_listing(user_id),
+            lambda db: SellService(db)._get_recent_activity(user_id),
+        )
 
         analytics_data = SellAnalyticsData(
             total_listings=total_listings,
@@ -0,0 +1,192 @@
+"""
+Direct-to-storage upload service.
+
+Clients ask for a presigned upload, send the bytes straight to MinIO, then
+call back with the object name. The API never handles the file body: the
+completion step only checks the object's size and content type and reads
+its first bytes to confirm it is an image and get its dimensions.
+
+Object names are {folder}/{user_id}/..., so a completion callback can only
+claim objects uploaded under the caller's own prefix.
+"""
+
+import asyncio
+import io
+import os
+import re
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Tuple
+from uuid import UUID
+
+from PIL import Image
+
+from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
+from app.schemas.common import PresignedUploadRequest, PresignedUploadResponse
+from app.utils.storage import build_object_name, get_storage, public_url
+
+# Enough of the file for PIL to read the header of any JPEG/PNG/WebP
+IMAGE_HEADER_BYTES = 128 * 1024
+
+JPEG_PNG = frozenset({"image/jpeg", "image/jpg", "image/png"})
+
+
+class UploadTarget(NamedTuple):
+    """Where and what a client may upload directly."""
+
+    folder: str
+    max_size: int
+    content_types: FrozenSet[str]
+
+
+UPLOAD_TARGETS: Dict[str, UploadTarget] = {
+    "avatar": UploadTarget("avatars", 2 * 1024 * 1024, JPEG_PNG),
+    "listing_image": UploadTarget("listings", 5 * 1024 * 1024, JPEG_PNG | {"image/webp"}),
+}
+
+
+class VerifiedUpload(NamedTuple):
+    """A completed direct upload that passed verification."""
+
+    object_name: str
+    url: str
+    filename: str
+    size: int
+    content_type: str
+    width: int
+    height: int
+
+
+def _safe_filename(filename: str) -> str:
+    name = os.path.basename(filename or "").strip()
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name)[-100:] or "upload"
+
+
+class DirectUploadService:
+    """Issues presigned uploads and verifies them on completion."""
+
+    @staticmethod
+    def create_upload(
+        user_id: UUID, target_name: str, data: PresignedUploadRequest
+    ) -> PresignedUploadResponse:
+        """
+        Issue a presigned upload for one file.
+
+        Args:
+            user_id: Uploading user's ID
+            target_name: Key of UPLOAD_TARGETS
+            data: Declared filename, content type and size
+
+        Returns:
+            PresignedUploadResponse: POST form, PUT URL and the object name
+
+        Raises:
+            ValidationException: If the content type or size is not allowed
+        """
+        target = UPLOAD_TARGETS[target_name]
+        if data.content_type not in target.content_types:
+            raise ValidationException(f"Invalid file type: {data.content_type}", "content_type")
+        if data.size > target.max_size:
+            raise ValidationException(
+                f"File exceeds {target.max_size // (1024 * 1024)}MB limit", "size"
+            )
+
+        object_name = build_object_name(f"{target.folder}/{user_id}", _safe_filename(data.filename))
+        presigned = get_storage().presign_upload(object_name, data.content_type, target.max_size)
+
+        return PresignedUploadResponse(
+            object_name=object_name,
+            upload_url=presigned["url"],
+            fields=presigned["fields"],
+            put_url=presigned["put_url"],
+            expires_at=presigned["expires_at"],
+        )
+
+    @staticmethod
+    async def complete_upload(user_id: UUID, target_name: str, object_name: str) -> VerifiedUpload:
+        """
+        Verify a finished direct upload.
+
+        An object that fails verification is deleted.
+
+        Args:
+            user_id: Uploading user's ID
+            target_name: Key of UPLOAD_TARGETS
+            object_name: Object name returned by create_upload
+
+        Returns:
+            VerifiedUpload: Object URL and metadata
+
+        Raises:
+            ForbiddenException: If the object is outside the user's upload prefix
+            NotFoundException: If nothing was uploaded
+            ValidationException: If the object is too large or not an allowed image
+        """
+        target = UPLOAD_TARGETS[target_name]
+        prefix = f"{target.folder}/{user_id}/"
+        if not object_name.startswith(prefix) or ".." in object_name:
+            raise ForbiddenException("claim this upload")
+
+        storage = get_storage()
+        stat = await storage.stat(object_name)
+        if stat is None:
+            raise NotFoundException(object_name, "Upload")
+
+        try:
+            width, height = await DirectUploadService._verify(storage, target, stat)
+        except ValidationException:
+            await storage.delete(stat.bucket_name, object_name)
+            raise
+
+        # build_object_name prefixes "<timestamp>_<id>_" to the original filename
+        filename = object_name.removeprefix(prefix).split("_", 3)[-1]
+        return VerifiedUpload(
+            object_name=object_name,
+            url=public_url(stat.bucket_name, object_name),
+            filename=filename,
+            size=stat.size,
+            content_type=stat.content_type,
+            width=width,
+            height=height,
+        )
+
+    @staticmethod
+    async def complete_uploads(
+        user_id: UUID, target_name: str, object_names: List[str]
+    ) -> List[VerifiedUpload]:
+        """
+        Verify several finished direct uploads in parallel.
+
+        Args:
+            user_id: Uploading user's ID
+            target_name: Key of UPLOAD_TARGETS
+            object_names: Object names returned by create_upload
+
+        Returns:
+            List[VerifiedUpload]: Verified uploads, in input order
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    DirectUploadService.complete_upload(user_id, target_name, name)
+                    for name in object_names
+                )
+            )
+        )
+
+    @staticmethod
+    async def _verify(storage: Any, target: UploadTarget, stat: Any) -> Tuple[int, int]:
+        """Check an uploaded object against its target and return its dimensions."""
+        if stat.size > target.max_size:
+            raise ValidationException(
+                f"File exceeds {target.max_size // (1024 * 1024)}MB limit", "size"
+            )
+        if stat.content_type not in target.content_types:
+            raise ValidationException(f"Invalid file type: {stat.content_type}", "content_type")
+
+        header = await storage.read_head(stat.object_name, IMAGE_HEADER_BYTES)
+        try:
+            image = Image.open(io.BytesIO(header))
+        except Exception:
+            raise ValidationException("Uploaded file is not a valid image")
+        if Image.MIME.get(image.format or "") not in target.content_types:
+            raise ValidationException(f"Invalid image format: {image.format}")
+        return image.size
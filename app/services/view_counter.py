@@ -0,0 +1,275 @@
+"""
+Write-behind view counters for accounts and listings.
+
+Detail views never write to Postgres. Each view is an HINCRBY on a Redis
+hash of pending deltas (views:{kind}, field = item ID); with
+VIEW_COUNT_UNIQUE on, a per-item HyperLogLog of viewers first drops repeat
+views from the same viewer within VIEW_UNIQUE_WINDOW_SECONDS.
+
+A Celery beat task flushes the pending deltas into views_count with one
+UPDATE ... FROM (VALUES ...) per chunk, so popularity sorts keep reading a
+plain indexed column.
+
+Flushes are applied exactly once. Only one runs at a time (a SET NX lock),
+and each set of deltas taken aside carries a token that is recorded in
+view_flushes in the same transaction as the updates, so deltas retried
+after a commit whose cleanup failed are dropped instead of counted again.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import Integer, Uuid, column, delete, insert, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.account import Account
+from app.models.listing import Listing
+from app.models.view import ViewFlush
+
+logger = logging.getLogger(__name__)
+
+# Counted item kinds and their models
+VIEW_MODELS = {"accounts": Account, "listings": Listing}
+
+# Count a view unless the viewer is already in the item's HyperLogLog
+_RECORD_SCRIPT = """
+if ARGV[2] ~= '' then
+    local added = redis.call('PFADD', KEYS[2], ARGV[2])
+    if redis.call('TTL', KEYS[2]) < 0 then
+        redis.call('EXPIRE', KEYS[2], ARGV[3])
+    end
+    if added == 0 then
+        return 0
+    end
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+return 1
+"""
+
+# Move pending views aside under a new flush token, or return the token of
+# deltas a previous flush left behind; nil when there is nothing to flush
+_TAKE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return nil
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('SET', KEYS[3], ARGV[1])
+end
+local token = redis.call('GET', KEYS[3])
+if not token then
+    token = ARGV[1]
+    redis.call('SET', KEYS[3], token)
+end
+return token
+"""
+
+# Release the flush lock only if this flush still holds it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class ViewCounter:
+    """
+    Redis-buffered view counting with periodic batch flush.
+
+    A flush first renames the pending hash so new views keep accumulating
+    while it runs; a hash left over from a failed flush is retried before
+    the next one, and skipped if its token shows it was already applied.
+    """
+
+    KEY = "views:{kind}"
+    FLUSHING_KEY = "views:{kind}:flushing"
+    TOKEN_KEY = "views:{kind}:flushing:token"
+    LOCK_KEY = "views:flush:lock"
+    UNIQUE_KEY = "views:unique:{kind}:{item_id}"
+
+    def __init__(
+        self,
+        unique: bool = settings.VIEW_COUNT_UNIQUE,
+        unique_window_seconds: int = settings.VIEW_UNIQUE_WINDOW_SECONDS,
+        flush_batch_size: int = settings.VIEW_FLUSH_BATCH_SIZE,
+        lock_seconds: int = settings.VIEW_FLUSH_LOCK_SECONDS,
+        retention_days: int = settings.VIEW_FLUSH_RETENTION_DAYS,
+    ) -> None:
+        """
+        Initialize view counter.
+
+        Args:
+            unique: Whether to count each viewer once per window
+            unique_window_seconds: Lifetime of an item's viewer HyperLogLog
+            flush_batch_size: Rows per flush UPDATE
+            lock_seconds: Expiry of the flush lock
+            retention_days: Days applied flush tokens are kept
+        """
+        self.unique = unique
+        self.unique_window_seconds = unique_window_seconds
+        self.flush_batch_size = flush_batch_size
+        self.lock_seconds = lock_seconds
+        self.retention_days = retention_days
+        self._scripts: Dict[str, Any] = {}
+        self._script_client: Any = None
+
+    def _script(self, redis_client: Any, source: str) -> Any:
+        # Re-register when the client is replaced (tests, reconnects, workers)
+        if self._script_client is not redis_client:
+            self._scripts = {}
+            self._script_client = redis_client
+        if source not in self._scripts:
+            self._scripts[source] = redis_client.register_script(source)
+        return self._scripts[source]
+
+    async def record(self, kind: str, item_id: Any, viewer: Optional[str] = None) -> bool:
+        """
+        Count a view of an item.
+
+        Args:
+            kind: Key of VIEW_MODELS
+            item_id: Account or listing ID
+            viewer: Viewer identity for unique counting (user ID or "ip:<address>")
+
+        Returns:
+            True if the view was counted
+        """
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return False
+
+        viewer = viewer if self.unique and viewer else ""
+        try:
+            counted = await self._script(redis_client, _RECORD_SCRIPT)(
+                keys=[
+                    self.KEY.format(kind=kind),
+                    self.UNIQUE_KEY.format(kind=kind, item_id=item_id),
+                ],
+                args=[str(item_id), viewer, self.unique_window_seconds],
+            )
+            return bool(counted)
+        except Exception as e:
+            logger.error(f"Failed to record view of {kind} {item_id}: {e}")
+            return False
+
+    async def flush(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Add pending views of every kind to views_count.
+
+        Does nothing while another flush holds the lock.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rows updated per kind
+        """
+        from app.core.redis import awaitable, redis_client
+
+        if redis_client is None:
+            return {}
+
+        lock = uuid4().hex
+        if not await redis_client.set(self.LOCK_KEY, lock, nx=True, ex=self.lock_seconds):
+            logger.info("Skipping view flush: another flush is running")
+            return {}
+
+        report = {}
+        try:
+            for kind, model in VIEW_MODELS.items():
+                flushing_key = self.FLUSHING_KEY.format(kind=kind)
+                token_key = self.TOKEN_KEY.format(kind=kind)
+
+                # Finish a previous failed flush before taking new views
+                token = await self._script(redis_client, _TAKE_SCRIPT)(
+                    keys=[self.KEY.format(kind=kind), flushing_key, token_key],
+                    args=[uuid4().hex],
+                )
+                if token is None:
+                    continue
+
+                deltas = self._parse(await awaitable(redis_client.hgetall(flushing_key)))
+                report[kind] = await self.apply(db, model, deltas, token)
+                await redis_client.delete(flushing_key, token_key)
+        finally:
+            try:
+                await self._script(redis_client, _RELEASE_SCRIPT)(keys=[self.LOCK_KEY], args=[lock])
+            except Exception as e:
+                logger.error(f"Failed to release view flush lock: {e}")
+
+        if report:
+            logger.info(f"Flushed views: {report}")
+        return report
+
+    async def apply(
+        self,
+        db: AsyncSession,
+        model: Any,
+        deltas: List[Tuple[UUID, int]],
+        token: Optional[str] = None,
+    ) -> int:
+        """
+        Add view deltas to a table in batched UPDATE ... FROM (VALUES ...) statements.
+
+        Args:
+            db: Database session
+            model: Account or Listing
+            deltas: (item ID, views) pairs
+            token: Flush token recorded with the updates; deltas whose token
+                was already recorded are skipped
+
+        Returns:
+            Number of rows updated
+        """
+        if token is not None:
+            applied = await db.scalar(select(ViewFlush.token).where(ViewFlush.token == token))
+            if applied is not None:
+                logger.warning(f"Skipping view flush {token}: already applied")
+                return 0
+
+        updated = 0
+        # Sorted so concurrent flushes lock rows in the same order
+        deltas = sorted(deltas)
+        for start in range(0, len(deltas), self.flush_batch_size):
+            end = start + self.flush_batch_size
+            chunk = values(column("id", Uuid), column("delta", Integer), name="view_deltas").data(
+                deltas[start:end]
+            )
+            result = await db.execute(
+                update(model)
+                .where(model.id == chunk.c.id)
+                # A view is not an edit: keep updated_at out of the onupdate default
+                .values(views_count=model.views_count + chunk.c.delta, updated_at=model.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+
+        if token is not None:
+            now = datetime.now(timezone.utc)
+            await db.execute(insert(ViewFlush).values(token=token, applied_at=now))
+            await db.execute(
+                delete(ViewFlush).where(
+                    ViewFlush.applied_at < now - timedelta(days=self.retention_days)
+                )
+            )
+        await db.commit()
+        return updated
+
+    @staticmethod
+    def _parse(raw: Dict[str, str]) -> List[Tuple[UUID, int]]:
+        deltas = []
+        for field, value in raw.items():
+            try:
+                deltas.append((UUID(field), int(value)))
+            except ValueError:
+                logger.warning(f"Skipping malformed view counter field {field!r}")
+        return deltas
+
+
+# Global view counter instance
+view_counter = ViewCounter()
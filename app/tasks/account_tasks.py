@@ -0,0 +1,30 @@
+"""
+Account background tasks.
+
+Rebuilds the precomputed similar-accounts index: games whose accounts
+changed on a short interval, every game on a long one.
+"""
+
+import logging
+from typing import Dict
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.account_tasks.rebuild_similar_accounts")
+def rebuild_similar_accounts(full: bool = False) -> Dict[str, int]:
+    """
+    Recompute similar-account neighbor lists.
+
+    Args:
+        full: Rebuild every game instead of only those marked dirty
+
+    Returns:
+        Number of accounts indexed per game
+    """
+    from app.services.buy.similar_accounts import similar_accounts_index
+
+    return run_with_session(lambda db: similar_accounts_index.rebuild(db, full=full))
@@ -0,0 +1,45 @@
+"""
+Shared helpers for Celery tasks.
+
+Celery workers are synchronous, so tasks that reuse the async services run
+their coroutine on a fresh event loop. Each run gets its own engine without
+a connection pool (pooled asyncpg connections cannot outlive the loop that
+opened them) and its own Redis client.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def run_with_session(func: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """
+    Run an async function with a database session from a synchronous task.
+
+    Args:
+        func: Async function receiving the session
+
+    Returns:
+        The function's result
+    """
+    return asyncio.run(_run_with_session(func))
+
+
+async def _run_with_session(func: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    from app.core import redis as redis_module
+
+    await redis_module.init_redis()
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_maker() as session:
+            return await func(session)
+    finally:
+        await engine.dispose()
+        await redis_module.close_redis()
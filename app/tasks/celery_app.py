@@ -15,6 +15,13 @@ celery_app = Celery(
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
     include=[
+        "app.tasks.account_tasks",
+        "app.tasks.chat_tasks",
+        "app.tasks.home_tasks",
+        "app.tasks.image_tasks",
+        "app.tasks.maintenance_tasks",
+        "app.tasks.notification_tasks",
+        "app.tasks.view_tasks",
         # Task modules will be added here as they are created
         # "app.tasks.email_tasks",
         # "app.tasks.payment_tasks",
@@ -55,6 +62,39 @@ celery_app.conf.update(
 from celery.schedules import crontab
 
 celery_app.conf.beat_schedule = {
+    "reconcile-unread-counters": {
+        "task": "app.tasks.chat_tasks.reconcile_unread_counters",
+        "schedule": settings.CHAT_UNREAD_RECONCILE_SECONDS,
+    },
+    "reconcile-notification-counters": {
+        "task": "app.tasks.notification_tasks.reconcile_unread_counters",
+        "schedule": settings.NOTIFICATION_COUNTER_RECONCILE_SECONDS,
+    },
+    "backfill-account-images": {
+        "task": "app.tasks.image_tasks.backfill_account_images",
+        "schedule": settings.IMAGE_BACKFILL_SECONDS,
+    },
+    "maintain-partitions": {
+        "task": "app.tasks.maintenance_tasks.maintain_partitions",
+        "schedule": settings.PARTITION_MAINTENANCE_SECONDS,
+    },
+    "flush-view-counts": {
+        "task": "app.tasks.view_tasks.flush_view_counts",
+        "schedule": settings.VIEW_FLUSH_SECONDS,
+    },
+    "refresh-similar-accounts": {
+        "task": "app.tasks.account_tasks.rebuild_similar_accounts",
+        "schedule": settings.SIMILAR_ACCOUNTS_REFRESH_SECONDS,
+    },
+    "refresh-home-feed-snapshots": {
+        "task": "app.tasks.home_tasks.rebuild_home_feed_snapshots",
+        "schedule": settings.HOME_FEED_SNAPSHOT_REFRESH_SECONDS,
+    },
+    "rebuild-similar-accounts": {
+        "task": "app.tasks.account_tasks.rebuild_similar_accounts",
+        "schedule": settings.SIMILAR_ACCOUNTS_REBUILD_SECONDS,
+        "kwargs": {"full": True},
+    },
     # Example periodic tasks (will be expanded)
     # "cleanup-expired-tokens": {
     #     "task": "app.tasks.cleanup_tasks.cleanup_expired_tokens",
@@ -0,0 +1,41 @@
+"""
+Chat background tasks.
+
+Reconciles Redis unread counters back to chat_participants.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.chat_tasks.reconcile_unread_counters")
+def reconcile_unread_counters() -> int:
+    """
+    Persist unread counters of every user touched since the last run.
+
+    Returns:
+        Number of users reconciled
+    """
+    return run_with_session(_reconcile_unread_counters)
+
+
+async def _reconcile_unread_counters(db: AsyncSession) -> int:
+    from app.services.chat.unread_counter import unread_counter
+
+    batch_size = settings.CHAT_UNREAD_RECONCILE_BATCH_SIZE
+    total = 0
+    while True:
+        reconciled = await unread_counter.reconcile(db, batch_size)
+        total += reconciled
+        if reconciled < batch_size:
+            break
+
+    logger.info(f"Reconciled unread counters for {total} users")
+    return total
@@ -0,0 +1,26 @@
+"""
+Home feed background tasks.
+
+Rebuilds the materialized home feed snapshots after account or featured
+changes (debounced) and on a fixed interval.
+"""
+
+import logging
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.home_tasks.rebuild_home_feed_snapshots")
+def rebuild_home_feed_snapshots() -> int:
+    """
+    Re-render every tracked home feed snapshot.
+
+    Returns:
+        Number of snapshots rebuilt
+    """
+    from app.services.home.feed_snapshot import home_feed_snapshots
+
+    return run_with_session(home_feed_snapshots.rebuild_all)
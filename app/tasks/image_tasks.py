@@ -0,0 +1,51 @@
+"""
+Listing image background tasks.
+
+Renders thumbnails and responsive variants of uploaded images off the API
+workers, and backfills account images that have none yet.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="app.tasks.image_tasks.process_listing_image",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def process_listing_image(url: str, account_image_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Render and store the variants of an uploaded listing image.
+
+    Args:
+        url: Public URL of the original
+        account_image_id: Optional AccountImage ID to fill in
+
+    Returns:
+        Thumbnail URL, dimensions and variant URLs
+    """
+    from app.services.image_service import ListingImageService
+
+    image_id = UUID(account_image_id) if account_image_id else None
+    return run_with_session(lambda db: ListingImageService.process(db, url, image_id))
+
+
+@celery_app.task(name="app.tasks.image_tasks.backfill_account_images")
+def backfill_account_images() -> int:
+    """
+    Queue rendering for account images without a thumbnail.
+
+    Returns:
+        Number of images queued
+    """
+    from app.services.image_service import ListingImageService
+
+    return run_with_session(ListingImageService.backfill)
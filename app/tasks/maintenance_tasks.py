@@ -0,0 +1,33 @@
+"""
+Database maintenance tasks.
+
+Keeps monthly partitions of append-heavy tables ahead of time and retires
+partitions past their retention.
+"""
+
+import logging
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.maintenance_tasks.maintain_partitions")
+def maintain_partitions() -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create upcoming monthly partitions and retire expired ones.
+
+    Returns:
+        Per table, the partitions that were created and retired
+    """
+    return run_with_session(_maintain_partitions)
+
+
+async def _maintain_partitions(db: AsyncSession) -> Dict[str, Dict[str, List[str]]]:
+    from app.core.partitions import partition_manager
+
+    return await partition_manager.maintain(db)
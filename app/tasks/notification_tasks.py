@@ -0,0 +1,98 @@
+"""
+Notification background tasks.
+
+Delivers queued notification events and repairs drift between Redis
+unread-notification counters and Postgres.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.notification_tasks.reconcile_unread_counters")
+def reconcile_unread_counters() -> int:
+    """
+    Compare every cached unread counter with Postgres and fix mismatches.
+
+    Returns:
+        Number of counters corrected
+    """
+    return run_with_session(_reconcile_unread_counters)
+
+
+async def _reconcile_unread_counters(db: AsyncSession) -> int:
+    from app.services.notifications.unread_counter import notification_unread_counter
+
+    return await notification_unread_counter.reconcile(db)
+
+
+@celery_app.task(
+    name="app.tasks.notification_tasks.deliver_notifications",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def deliver_notifications(events: List[Dict[str, Any]]) -> int:
+    """
+    Store and publish queued notification events.
+
+    Args:
+        events: Events built with notification_event()
+
+    Returns:
+        Number of notifications created
+    """
+    from app.services.notifications.delivery_service import NotificationDeliveryService
+
+    return run_with_session(lambda db: NotificationDeliveryService.deliver(db, events))
+
+
+# Not retried: chunks are committed one by one, so a retry would duplicate them
+@celery_app.task(name="app.tasks.notification_tasks.broadcast_notification")
+def broadcast_notification(
+    title: str,
+    description: str,
+    notification_type: str,
+    user_ids: Optional[List[str]] = None,
+    icon: Optional[str] = None,
+    action_url: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Create the same notification for many users.
+
+    Args:
+        title: Notification title
+        description: Notification description
+        notification_type: NotificationType value
+        user_ids: Target user IDs (None = every active user)
+        icon: Icon identifier (auto-selected if None)
+        action_url: Deep link URL
+        metadata: Additional data
+
+    Returns:
+        Number of notifications created
+    """
+    from app.schemas.notification import NotificationType
+    from app.services.notifications.bulk_service import NotificationBulkService
+
+    return run_with_session(
+        lambda db: NotificationBulkService.create_notifications(
+            db,
+            title,
+            description,
+            NotificationType(notification_type),
+            [UUID(user_id) for user_id in user_ids] if user_ids is not None else None,
+            icon,
+            action_url,
+            metadata,
+        )
+    )
@@ -0,0 +1,33 @@
+"""
+View counter background tasks.
+
+Flushes view counts buffered in Redis into accounts.views_count and
+listings.views_count.
+"""
+
+import logging
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tasks.base import run_with_session
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.view_tasks.flush_view_counts")
+def flush_view_counts() -> Dict[str, int]:
+    """
+    Add buffered views to Postgres in batched updates.
+
+    Returns:
+        Number of rows updated per item kind
+    """
+    return run_with_session(_flush_view_counts)
+
+
+async def _flush_view_counts(db: AsyncSession) -> Dict[str, int]:
+    from app.services.view_counter import view_counter
+
+    return await view_counter.flush(db)
@@ -0,0 +1,90 @@
+"""
+HTTP conditional GET helpers for cacheable read-only endpoints.
+
+Responses carry a strong ETag (a hash of the exact body bytes) and a
+Cache-Control policy with stale-while-revalidate, so CDNs and clients can
+serve them from cache and revalidate in the background. A request whose
+If-None-Match matches the current ETag gets an empty 304.
+"""
+
+import hashlib
+from typing import Any, NamedTuple, Optional, Union
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+class CachePolicy(NamedTuple):
+    """Cache-Control policy of an endpoint."""
+
+    max_age: int
+    stale_while_revalidate: int = 0
+    public: bool = True
+
+    @property
+    def header(self) -> str:
+        """Cache-Control header value."""
+        parts = ["public" if self.public else "private", f"max-age={self.max_age}"]
+        if self.stale_while_revalidate:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(parts)
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag for a response body.
+
+    Args:
+        body: Exact response bytes
+
+    Returns:
+        Quoted ETag
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, per RFC 9110).
+
+    Args:
+        if_none_match: Request header value
+        etag: Current ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+def cached_json_response(
+    request: Request, payload: Union[BaseModel, bytes, str], policy: CachePolicy
+) -> Response:
+    """
+    Build a JSON response with ETag and Cache-Control, or a 304 if the client is current.
+
+    Args:
+        request: Incoming request
+        payload: Response model or already serialized JSON body
+        policy: Cache policy of the endpoint
+
+    Returns:
+        200 response with the body, or empty 304
+    """
+    if isinstance(payload, BaseModel):
+        body = payload.model_dump_json().encode()
+    elif isinstance(payload, str):
+        body = payload.encode()
+    else:
+        body = payload
+
+    etag = compute_etag(body)
+    headers: dict[str, Any] = {"ETag": etag, "Cache-Control": policy.header}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
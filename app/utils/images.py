@@ -0,0 +1,185 @@
+"""
+Listing image variant rendering.
+
+Each uploaded original gets a feed card thumbnail plus one variant per
+responsive width, in WebP and (where Pillow supports it) AVIF:
+
+    listings/<name>.jpg         original
+    listings/<name>_thumb.webp  thumbnail (IMAGE_THUMBNAIL_SIZE box)
+    listings/<name>_640w.webp   responsive widths (IMAGE_VARIANT_WIDTHS)
+    listings/<name>_640w.avif
+
+Variants carry no EXIF/ICC metadata. JPEG originals are decoded at a
+reduced DCT scale (Image.draft) and every resize uses reducing_gap, so a
+12 MP photo never has to be fully decoded at full size.
+
+Rendering is CPU-bound and runs on Celery workers (app.tasks.image_tasks).
+"""
+
+import io
+from typing import BinaryIO, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from PIL import Image, ImageOps, features
+
+from app.core.config import settings
+
+THUMBNAIL_SUFFIX = "thumb"
+
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+# EXIF orientations that rotate the image by 90 or 270 degrees
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class ImageVariant(NamedTuple):
+    """One encoded variant of an image."""
+
+    suffix: str
+    extension: str
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def content_type(self) -> str:
+        """MIME type of the encoded data."""
+        return CONTENT_TYPES[self.extension]
+
+
+class RenderedImage(NamedTuple):
+    """Upright dimensions of an original and its encoded variants."""
+
+    width: int
+    height: int
+    variants: List[ImageVariant]
+
+
+def variant_name(name: str, suffix: str, extension: str = "webp") -> str:
+    """
+    Get the object name or URL of an image variant.
+
+    Args:
+        name: Object name or URL of the original
+        suffix: Variant suffix ("thumb" or "<width>w")
+        extension: Variant file extension
+
+    Returns:
+        Variant object name or URL
+    """
+    base = name.rsplit(".", 1)[0] if "." in name.rsplit("/", 1)[-1] else name
+    return f"{base}_{suffix}.{extension}"
+
+
+def thumbnail_url(url: str) -> str:
+    """
+    Get the URL of an image's feed card thumbnail.
+
+    Args:
+        url: URL of the original
+
+    Returns:
+        Thumbnail URL
+    """
+    return variant_name(url, THUMBNAIL_SUFFIX)
+
+
+def read_dimensions(data: Union[bytes, BinaryIO]) -> Tuple[int, int]:
+    """
+    Read an image's upright dimensions from its header without decoding pixels.
+
+    Args:
+        data: Encoded image, or a file positioned at its start (rewound afterwards)
+
+    Returns:
+        (width, height) after applying the EXIF orientation
+    """
+    if isinstance(data, bytes):
+        return _upright_size(Image.open(io.BytesIO(data)))
+
+    try:
+        return _upright_size(Image.open(data))
+    finally:
+        data.seek(0)
+
+
+def output_formats() -> Tuple[str, ...]:
+    """Variant formats supported by this Pillow build."""
+    if settings.IMAGE_AVIF_ENABLED and features.check("avif"):
+        return ("webp", "avif")
+    return ("webp",)
+
+
+def render_variants(
+    data: bytes,
+    thumbnail_size: int = settings.IMAGE_THUMBNAIL_SIZE,
+    widths: Sequence[int] = settings.IMAGE_VARIANT_WIDTHS,
+    formats: Optional[Sequence[str]] = None,
+) -> RenderedImage:
+    """
+    Render the thumbnail and responsive variants of an image.
+
+    Widths at or above the original width are skipped; the thumbnail is
+    always rendered (WebP only, since it is what feed cards load).
+
+    Args:
+        data: Encoded original
+        thumbnail_size: Bounding box of the thumbnail
+        widths: Responsive variant widths
+        formats: Encodings of the responsive variants (defaults to output_formats())
+
+    Returns:
+        RenderedImage: Upright original dimensions and encoded variants
+    """
+    formats = formats or output_formats()
+    image: Image.Image = Image.open(io.BytesIO(data))
+    width, height = _upright_size(image)
+
+    # JPEG only: let libjpeg decode at the smallest 1/2..1/8 scale that still
+    # covers the largest variant
+    largest = max([thumbnail_size, *widths])
+    image.draft("RGB", (largest, largest))
+
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+    image.info = {}
+
+    variants = []
+    # Largest first, each resized from the previous one
+    source = image
+    for target in sorted((w for w in widths if w < width), reverse=True):
+        source = _resize(source, target)
+        for extension in formats:
+            variants.append(_encode(source, f"{target}w", extension))
+
+    thumbnail = source.copy()
+    thumbnail.thumbnail((thumbnail_size, thumbnail_size), reducing_gap=3.0)
+    variants.append(_encode(thumbnail, THUMBNAIL_SUFFIX, "webp"))
+
+    return RenderedImage(width=width, height=height, variants=variants)
+
+
+def _upright_size(image: Image.Image) -> Tuple[int, int]:
+    width, height = image.size
+    if image.getexif().get(0x0112) in _TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def _encode(image: Image.Image, suffix: str, extension: str) -> ImageVariant:
+    buffer = io.BytesIO()
+    if extension == "avif":
+        image.save(buffer, "AVIF", quality=settings.IMAGE_AVIF_QUALITY, speed=8)
+    else:
+        image.save(buffer, "WEBP", quality=settings.IMAGE_WEBP_QUALITY, method=4)
+    return ImageVariant(suffix, extension, image.width, image.height, buffer.getvalue())
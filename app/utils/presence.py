@@ -0,0 +1,312 @@
+"""
+Presence tracking and ephemeral signal coalescing for real-time chat.
+
+Online status lives in a Redis sorted set scored by last heartbeat, so any
+instance can answer "is this user online" with a single ZMSCORE.
+Typing indicators and join/leave events are throttled per (user, room) and
+coalesced into one room update per interval instead of one fan-out per frame.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Flush callback signature: async def flush(room_id: str, payload: dict) -> None
+FlushCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class PresenceTracker:
+    """
+    Tracks online users in a Redis sorted set with heartbeats.
+
+    Each member is a user ID scored by the epoch of its last heartbeat.
+    A user is online while their last heartbeat is newer than the online window.
+    Heartbeat writes are throttled per user on this instance.
+    """
+
+    ONLINE_KEY = "presence:online"
+
+    def __init__(
+        self,
+        online_window_seconds: int = settings.PRESENCE_ONLINE_WINDOW_SECONDS,
+        heartbeat_interval_seconds: int = settings.PRESENCE_HEARTBEAT_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Initialize presence tracker.
+
+        Args:
+            online_window_seconds: Seconds since last heartbeat a user counts as online
+            heartbeat_interval_seconds: Minimum seconds between heartbeat writes per user
+        """
+        self.online_window_seconds = online_window_seconds
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        # user_id -> monotonic time of last heartbeat written from this instance
+        self._last_written: Dict[str, float] = {}
+
+    async def heartbeat(self, user_id: str, force: bool = False) -> None:
+        """
+        Record a heartbeat for a user.
+
+        Args:
+            user_id: User identifier
+            force: Write even if a heartbeat was written recently
+        """
+        now = time.monotonic()
+        last = self._last_written.get(user_id)
+        if not force and last is not None and now - last < self.heartbeat_interval_seconds:
+            return
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        self._last_written[user_id] = now
+        epoch = time.time()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zadd(self.ONLINE_KEY, {user_id: epoch})
+            # Trim members that stopped heart-beating so the set stays bounded
+            pipe.zremrangebyscore(self.ONLINE_KEY, "-inf", epoch - self.online_window_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to record heartbeat for {user_id}: {e}")
+
+    async def mark_offline(self, user_id: str) -> None:
+        """
+        Remove a user from the online set.
+
+        Should only be called once the user has no connection on any
+        instance, otherwise they show offline until that instance's next
+        heartbeat for them.
+
+        Args:
+            user_id: User identifier
+        """
+        self._last_written.pop(user_id, None)
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.zrem(self.ONLINE_KEY, user_id)
+        except Exception as e:
+            logger.error(f"Failed to mark {user_id} offline: {e}")
+
+    async def get_presence(self, user_ids: Iterable[Any]) -> Dict[str, Optional[datetime]]:
+        """
+        Get last heartbeat timestamps for many users in one round trip.
+
+        Args:
+            user_ids: User identifiers (UUID or str)
+
+        Returns:
+            Mapping of user ID string to last heartbeat (None if never seen)
+        """
+        ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        if not ids:
+            return {}
+
+        from app.core.redis import redis_client
+
+        if redis_client is None:
+            return {user_id: None for user_id in ids}
+
+        try:
+            scores = await redis_client.zmscore(self.ONLINE_KEY, ids)
+        except Exception as e:
+            logger.error(f"Failed to fetch presence: {e}")
+            return {user_id: None for user_id in ids}
+
+        return {
+            user_id: (datetime.fromtimestamp(score, tz=timezone.utc) if score is not None else None)
+            for user_id, score in zip(ids, scores)
+        }
+
+    def is_online(self, last_heartbeat: Optional[datetime]) -> bool:
+        """
+        Determine if a user is online from their last heartbeat.
+
+        Args:
+            last_heartbeat: Timestamp returned by get_presence
+
+        Returns:
+            True if the heartbeat is within the online window
+        """
+        if last_heartbeat is None:
+            return False
+
+        elapsed = (datetime.now(timezone.utc) - last_heartbeat).total_seconds()
+        return elapsed < self.online_window_seconds
+
+
+class _PendingSignals:
+    """Signals accumulated for one room between flushes."""
+
+    __slots__ = ("typing", "joined", "left")
+
+    def __init__(self) -> None:
+        self.typing: Set[str] = set()
+        self.joined: Set[str] = set()
+        self.left: Set[str] = set()
+
+    def is_empty(self) -> bool:
+        return not (self.typing or self.joined or self.left)
+
+
+class RoomSignalCoalescer:
+    """
+    Throttles and coalesces ephemeral room signals.
+
+    Typing frames are accepted at most once per throttle window per (user, room).
+    Typing, join and leave signals for a room are buffered and flushed as a
+    single payload once per interval:
+
+        {"room_id": "...", "typing": [...], "joined": [...], "left": [...], "timestamp": "..."}
+
+    A join followed by a leave (or vice versa) inside one interval cancels out.
+    """
+
+    def __init__(
+        self,
+        flush_callback: FlushCallback,
+        interval_seconds: float = settings.PRESENCE_COALESCE_INTERVAL_MS / 1000,
+        typing_throttle_seconds: float = settings.TYPING_THROTTLE_SECONDS,
+    ) -> None:
+        """
+        Initialize coalescer.
+
+        Args:
+            flush_callback: Async function receiving (room_id, payload) on flush
+            interval_seconds: Coalescing window per room
+            typing_throttle_seconds: Minimum seconds between typing signals per (user, room)
+        """
+        self._flush_callback = flush_callback
+        self.interval_seconds = interval_seconds
+        self.typing_throttle_seconds = typing_throttle_seconds
+        self._pending: Dict[str, _PendingSignals] = {}
+        # room_id -> {user_id: monotonic time of last accepted typing signal}
+        self._last_typing: Dict[str, Dict[str, float]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+
+    def typing(self, user_id: str, room_id: str) -> bool:
+        """
+        Register a typing signal.
+
+        Args:
+            user_id: Typing user ID
+            room_id: Room ID
+
+        Returns:
+            True if accepted, False if throttled
+        """
+        now = time.monotonic()
+        room_typing = self._last_typing.setdefault(room_id, {})
+        last = room_typing.get(user_id)
+        if last is not None and now - last < self.typing_throttle_seconds:
+            return False
+
+        room_typing[user_id] = now
+        self._pending_for(room_id).typing.add(user_id)
+        self._schedule(room_id)
+        return True
+
+    def joined(self, user_id: str, room_id: str) -> None:
+        """
+        Register a user joining a room.
+
+        Args:
+            user_id: User ID
+            room_id: Room ID
+        """
+        pending = self._pending_for(room_id)
+        if user_id in pending.left:
+            pending.left.discard(user_id)
+        else:
+            pending.joined.add(user_id)
+        self._schedule(room_id)
+
+    def left(self, user_id: str, room_id: str) -> None:
+        """
+        Register a user leaving a room.
+
+        Args:
+            user_id: User ID
+            room_id: Room ID
+        """
+        pending = self._pending_for(room_id)
+        pending.typing.discard(user_id)
+        self._last_typing.get(room_id, {}).pop(user_id, None)
+        if user_id in pending.joined:
+            pending.joined.discard(user_id)
+        else:
+            pending.left.add(user_id)
+        self._schedule(room_id)
+
+    async def flush_all(self) -> None:
+        """Flush every pending room immediately (used on shutdown)."""
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+
+        for room_id in list(self._pending):
+            await self._flush(room_id)
+
+    def _pending_for(self, room_id: str) -> _PendingSignals:
+        pending = self._pending.get(room_id)
+        if pending is None:
+            pending = self._pending[room_id] = _PendingSignals()
+        return pending
+
+    def _schedule(self, room_id: str) -> None:
+        if room_id in self._flush_tasks:
+            return
+        self._flush_tasks[room_id] = asyncio.create_task(self._flush_after(room_id))
+
+    async def _flush_after(self, room_id: str) -> None:
+        await asyncio.sleep(self.interval_seconds)
+        self._flush_tasks.pop(room_id, None)
+        await self._flush(room_id)
+
+    async def _flush(self, room_id: str) -> None:
+        pending = self._pending.pop(room_id, None)
+        self._prune_typing(room_id)
+        if pending is None or pending.is_empty():
+            return
+
+        payload = {
+            "room_id": room_id,
+            "typing": sorted(pending.typing),
+            "joined": sorted(pending.joined),
+            "left": sorted(pending.left),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            await self._flush_callback(room_id, payload)
+        except Exception as e:
+            logger.error(f"Error flushing signals for room {room_id}: {e}")
+
+    def _prune_typing(self, room_id: str) -> None:
+        room_typing = self._last_typing.get(room_id)
+        if not room_typing:
+            self._last_typing.pop(room_id, None)
+            return
+
+        cutoff = time.monotonic() - self.typing_throttle_seconds
+        stale: List[str] = [user_id for user_id, ts in room_typing.items() if ts < cutoff]
+        for user_id in stale:
+            del room_typing[user_id]
+        if not room_typing:
+            del self._last_typing[room_id]
+
+
+# Global presence tracker instance
+presence_tracker = PresenceTracker()
@@ -3,45 +3,70 @@ Redis pub/sub manager for multi-instance WebSocket synchronization.
 Handles message broadcasting across multiple application instances.
 """
 
-import json
 import logging
 from datetime import datetime
 from typing import Any, Callable, Dict, Optional
+from uuid import uuid4
 
-from app.core.redis import redis_client
+from app.core import serialization
+from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
+# Notification stream events forwarded to WebSocket clients
+NOTIFICATION_EVENTS = frozenset(
+    {
+        "notification",
+        "badge_update",
+        "notification_read",
+        "notification_deleted",
+        "notifications_cleared",
+    }
+)
+
 
 class RedisPubSubManager:
     """
     Manages Redis pub/sub connections for real-time messaging.
     Bridges Redis channels to WebSocket broadcasts.
+
+    Publishers that already broadcast to their local sockets publish with
+    skip_local; the message is stamped with this instance's origin and the
+    listener here drops it, so every socket receives it exactly once.
     """
 
     def __init__(self) -> None:
         self.pubsub: Any = None
         self._subscribed_channels: set = set()
         self._running = False
+        # Identifies messages published by this instance
+        self.origin = uuid4().hex
 
-    async def publish_to_channel(self, channel: str, message: dict) -> bool:
+    async def publish_to_channel(
+        self, channel: str, message: dict, skip_local: bool = False
+    ) -> bool:
         """
         Publish message to Redis channel.
 
         Args:
             channel: Redis channel name (e.g., "chat:room_123")
             message: Message dictionary to publish
+            skip_local: The caller already delivered it to this instance's sockets
 
         Returns:
             True if published successfully
         """
         try:
+            redis_client = await get_redis()
             if redis_client is None:
                 logger.error("Redis client is not initialized")
                 return False
 
+            if skip_local:
+                message = {**message, "origin": self.origin}
+
             # Serialize message
-            payload = json.dumps(message)
+            payload = serialization.dumps(message)
 
             # Publish to Redis
             result = await redis_client.publish(channel, payload)
@@ -61,6 +86,7 @@ class RedisPubSubManager:
             channel: Channel name to subscribe
         """
         try:
+            redis_client = await get_redis()
             if redis_client is None:
                 logger.error("Redis client is not initialized")
                 return
@@ -95,6 +121,9 @@ class RedisPubSubManager:
         """
         Listen for Redis pub/sub messages and pass to handler.
 
+        Handles both channel ("message") and pattern ("pmessage") deliveries.
+        Messages this instance published with skip_local are dropped.
+
         Args:
             message_handler: Async function to handle received messages
                            Signature: async def handler(channel: str, message: dict)
@@ -112,16 +141,24 @@ class RedisPubSubManager:
                     # Get message with timeout
                     message = await self.pubsub.get_message(timeout=1.0)
 
-                    if message and message["type"] == "message":
-                        channel = message["channel"].decode("utf-8")
+                    if message and message["type"] in ("message", "pmessage"):
+                        channel = message["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode("utf-8")
                         data = message["data"]
 
                         # Parse JSON payload
                         try:
-                            payload = json.loads(data)
-                            await message_handler(channel, payload)
-                        except json.JSONDecodeError as e:
+                            payload = serialization.loads(data)
+                        except serialization.JSONDecodeError as e:
                             logger.error(f"Invalid JSON in message from {channel}: {e}")
+                            continue
+
+                        # Already delivered locally by the publisher
+                        if isinstance(payload, dict) and payload.get("origin") == self.origin:
+                            continue
+
+                        await message_handler(channel, payload)
 
                 except Exception as e:
                     logger.error(f"Error processing pub/sub message: {e}")
@@ -154,18 +191,19 @@ class RedisPubSubManager:
 pubsub_manager = RedisPubSubManager()
 
 
-async def publish_to_channel(channel: str, message: dict) -> bool:
+async def publish_to_channel(channel: str, message: dict, skip_local: bool = False) -> bool:
     """
     Convenience function to publish to Redis channel.
 
     Args:
         channel: Channel name
         message: Message dictionary
+        skip_local: The caller already delivered it to this instance's sockets
 
     Returns:
         True if published successfully
     """
-    return await pubsub_manager.publish_to_channel(channel, message)
+    return await pubsub_manager.publish_to_channel(channel, message, skip_local=skip_local)
 
 
 async def subscribe_to_channels(patterns: list[str]) -> None:
@@ -178,6 +216,7 @@ async def subscribe_to_channels(patterns: list[str]) -> None:
     """
     for pattern in patterns:
         try:
+            redis_client = await get_redis()
             if redis_client is None:
                 logger.error("Redis client is not initialized")
                 return
@@ -242,6 +281,9 @@ async def handle_chat_message(channel: str, event: str, data: dict) -> None:
     if event == "message":
         await manager.broadcast_to_room({"event": "message", "data": data}, room_id)
 
+    elif event == "presence":
+        await manager.broadcast_to_room({"event": "presence", "data": data}, room_id)
+
     elif event == "typing":
         await manager.broadcast_to_room({"event": "typing", "data": data}, room_id)
 
@@ -264,7 +306,7 @@ async def handle_notification_message(channel: str, event: str, data: dict) -> N
         event: Event type
         data: Event data
     """
-    from app.api.v1.chat.websocket import manager
+    from app.api.v1.chat.websocket import manager, notification_stream
 
     # Extract user ID from channel
     try:
@@ -273,12 +315,11 @@ async def handle_notification_message(channel: str, event: str, data: dict) -> N
         logger.error(f"Invalid channel format: {channel}")
         return
 
-    # Send to user's WebSocket connections
-    if event == "notification":
-        await manager.broadcast_to_user({"event": "notification", "data": data}, user_id)
-
-    elif event == "badge_update":
-        await manager.broadcast_to_user({"event": "badge_update", "data": data}, user_id)
+    # Send to the user's connections subscribed to the notification stream
+    if event in NOTIFICATION_EVENTS:
+        await manager.broadcast_to_room(
+            {"event": event, "data": data}, notification_stream(user_id)
+        )
 
 
 async def start_redis_listener() -> None:
@@ -1,86 +1,459 @@
 """
 Storage utility for file uploads to MinIO/S3.
+
+One MinIO client with a pooled HTTP connection manager is shared by the
+whole process and created at startup. The MinIO SDK is blocking, so every
+call runs in a bounded thread pool instead of on the event loop. Uploads
+are streamed from the upload's file object in STORAGE_PART_SIZE chunks
+(multipart for large files) without reading the whole file into memory.
+
+Clients can also upload straight to storage with presigned POST/PUT URLs
+(see presign_upload); the API then only verifies the finished object.
 """
 
+import asyncio
 import io
-from typing import Optional
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, cast
 
+import urllib3
 from fastapi import UploadFile
 from minio import Minio
+from minio.datatypes import PostPolicy
 from minio.error import S3Error
 
 from app.core.config import settings
 
+T = TypeVar("T")
 
-async def upload_file_to_storage(file: UploadFile, folder: str = "uploads") -> str:
-    """
-    Upload a file to MinIO/S3 storage.
+# Smallest part size S3 accepts for multipart uploads
+MIN_PART_SIZE = 5 * 1024 * 1024
 
-    Args:
-        file: File to upload
-        folder: Folder path in bucket
 
-    Returns:
-        Public URL of uploaded file
+class StorageClient:
+    """
+    Shared MinIO client running blocking calls in a thread pool.
 
-    Raises:
-        Exception: If upload fails
+    Bucket existence is checked once per bucket for the life of the client.
     """
-    try:
-        # Initialize MinIO client
-        client = Minio(
+
+    def __init__(
+        self,
+        max_connections: int = settings.STORAGE_MAX_CONNECTIONS,
+        upload_workers: int = settings.STORAGE_UPLOAD_WORKERS,
+        part_size: int = settings.STORAGE_PART_SIZE,
+    ) -> None:
+        """
+        Initialize storage client.
+
+        Args:
+            max_connections: Size of the HTTP connection pool
+            upload_workers: Number of threads running storage calls
+            part_size: Multipart chunk size in bytes
+        """
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.http_client = urllib3.PoolManager(
+            maxsize=max_connections,
+            block=True,
+            timeout=urllib3.Timeout(connect=5, read=60),
+            retries=urllib3.Retry(
+                total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+            ),
+        )
+        self.client = Minio(
             endpoint=settings.MINIO_ENDPOINT,
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
             secure=settings.MINIO_SECURE,
+            region=settings.MINIO_REGION,
+            http_client=self.http_client,
         )
+        self.executor = ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix="storage")
+        self._ready_buckets: set = set()
 
-        # Ensure bucket exists
-        bucket_name = settings.MINIO_BUCKET
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+
+    async def ensure_bucket(self, bucket_name: str) -> None:
+        """
+        Create a bucket if it does not exist, checking only once per bucket.
+
+        Args:
+            bucket_name: Bucket name
+        """
+        if bucket_name in self._ready_buckets:
+            return
+
+        # Concurrent first uploads may both check; creating twice is tolerated below
         try:
-            if not client.bucket_exists(bucket_name):
-                client.make_bucket(bucket_name)
+            if not await self._run(self.client.bucket_exists, bucket_name):
+                await self._run(self.client.make_bucket, bucket_name)
         except S3Error as e:
-            if e.code != "BucketAlreadyOwnedByYou":
+            if e.code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
                 raise
+        self._ready_buckets.add(bucket_name)
 
-        # Generate unique filename
-        import uuid
-        from datetime import datetime
+    async def upload(self, file: UploadFile, folder: str = "uploads") -> str:
+        """
+        Stream a file to storage.
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"{folder}/{timestamp}_{unique_id}_{file.filename}"
+        Args:
+            file: File to upload
+            folder: Folder path in bucket
 
-        # Read file content
-        content = await file.read()
-        file_stream = io.BytesIO(content)
-        file_stream.seek(0)
+        Returns:
+            Public URL of uploaded file
+        """
+        bucket_name = settings.MINIO_BUCKET
+        await self.ensure_bucket(bucket_name)
 
-        # Determine content type
+        filename = build_object_name(folder, file.filename)
         content_type = file.content_type or "application/octet-stream"
+        stream = file.file
+        length = _stream_length(file)
+        if length >= 0:
+            stream.seek(0)
 
-        # Upload file
-        client.put_object(
+        await self._run(
+            self.client.put_object,
             bucket_name=bucket_name,
             object_name=filename,
-            data=file_stream,
-            length=len(content),
+            data=stream,
+            length=length,
             content_type=content_type,
+            part_size=self.part_size,
         )
+        return public_url(bucket_name, filename)
+
+    async def upload_many(self, files: Sequence[UploadFile], folder: str = "uploads") -> List[str]:
+        """
+        Upload several files in parallel.
+
+        Concurrency is bounded by the thread pool size.
+
+        Args:
+            files: Files to upload
+            folder: Folder path in bucket
+
+        Returns:
+            Public URLs, in input order
+        """
+        return list(await asyncio.gather(*(self.upload(file, folder) for file in files)))
+
+    def presign_upload(
+        self,
+        name: str,
+        content_type: str,
+        max_size: int,
+        expires_seconds: int = settings.STORAGE_UPLOAD_URL_EXPIRE_SECONDS,
+    ) -> Dict[str, Any]:
+        """
+        Create presigned URLs for uploading one object directly to storage.
+
+        The POST policy pins the object name and content type and limits the
+        size; a presigned PUT cannot carry those constraints, so they must be
+        checked again once the upload completes.
+
+        Signing is local, so this does not touch the network.
 
-        # Generate public URL
-        protocol = "https" if settings.MINIO_SECURE else "http"
-        url = f"{protocol}://{settings.MINIO_ENDPOINT}/{bucket_name}/{filename}"
+        Args:
+            name: Object name the client must upload to
+            content_type: Required Content-Type
+            max_size: Maximum object size in bytes
+            expires_seconds: URL lifetime
+
+        Returns:
+            Dict with the POST "url" and form "fields", "put_url" and "expires_at"
+        """
+        bucket_name = settings.MINIO_BUCKET
+        expires_at = datetime.utcnow() + timedelta(seconds=expires_seconds)
+
+        policy = PostPolicy(bucket_name, expires_at)
+        policy.add_equals_condition("key", name)
+        policy.add_equals_condition("Content-Type", content_type)
+        policy.add_content_length_range_condition(1, max_size)
+        fields = self.client.presigned_post_policy(policy)
+        fields["key"] = name
+        fields["Content-Type"] = content_type
+
+        put_url = self.client.presigned_put_object(
+            bucket_name, name, expires=timedelta(seconds=expires_seconds)
+        )
+        return {
+            "url": public_url(bucket_name, "").rstrip("/"),
+            "fields": fields,
+            "put_url": put_url,
+            "expires_at": expires_at,
+        }
+
+    async def stat(self, name: str) -> Optional[Any]:
+        """
+        Get an object's metadata.
+
+        Args:
+            name: Object name
+
+        Returns:
+            MinIO object stat (size, content_type, etag...) or None if it does not exist
+        """
+        try:
+            return await self._run(self.client.stat_object, settings.MINIO_BUCKET, name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise
+
+    async def read_head(self, name: str, length: int) -> bytes:
+        """
+        Read the first bytes of an object.
+
+        Args:
+            name: Object name
+            length: Number of bytes to read
+
+        Returns:
+            Object prefix
+        """
+
+        def read() -> bytes:
+            response = self.client.get_object(settings.MINIO_BUCKET, name, offset=0, length=length)
+            try:
+                return cast(bytes, response.read())
+            finally:
+                response.close()
+                response.release_conn()
+
+        return await self._run(read)
+
+    async def read(self, name: str) -> bytes:
+        """
+        Read a whole object.
+
+        Args:
+            name: Object name
+
+        Returns:
+            Object content
+        """
+
+        def read() -> bytes:
+            response = self.client.get_object(settings.MINIO_BUCKET, name)
+            try:
+                return cast(bytes, response.read())
+            finally:
+                response.close()
+                response.release_conn()
+
+        return await self._run(read)
+
+    async def put_bytes(
+        self, name: str, data: bytes, content_type: str, cache_control: Optional[str] = None
+    ) -> str:
+        """
+        Store a small in-memory object.
+
+        Args:
+            name: Object name
+            data: Object content
+            content_type: Content-Type
+            cache_control: Optional Cache-Control header served with the object
+
+        Returns:
+            Public URL of the object
+        """
+        bucket_name = settings.MINIO_BUCKET
+        await self.ensure_bucket(bucket_name)
+        metadata = {"Cache-Control": cache_control} if cache_control else None
+        await self._run(
+            self.client.put_object,
+            bucket_name,
+            name,
+            io.BytesIO(data),
+            len(data),
+            content_type=content_type,
+            metadata=metadata,
+        )
+        return public_url(bucket_name, name)
+
+    async def delete(self, bucket_name: str, name: str) -> None:
+        """
+        Delete an object.
+
+        Args:
+            bucket_name: Bucket name
+            name: Object name
+        """
+        await self._run(self.client.remove_object, bucket_name, name)
+
+    def close(self) -> None:
+        """Stop the worker threads and close pooled connections."""
+        self.executor.shutdown(wait=True)
+        self.http_client.clear()
+
+
+def build_object_name(folder: str, filename: Optional[str]) -> str:
+    """
+    Build a unique object name for an upload.
+
+    Args:
+        folder: Folder path in bucket
+        filename: Original filename
+
+    Returns:
+        Object name
+    """
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    unique_id = str(uuid.uuid4())[:8]
+    return f"{folder}/{timestamp}_{unique_id}_{filename}"
+
+
+def public_url(bucket_name: str, name: str) -> str:
+    """
+    Get the public URL of an object.
+
+    Args:
+        bucket_name: Bucket name
+        name: Object name
+
+    Returns:
+        Public URL
+    """
+    protocol = "https" if settings.MINIO_SECURE else "http"
+    return f"{protocol}://{settings.MINIO_ENDPOINT}/{bucket_name}/{name}"
 
-        return url
 
+def _stream_length(file: UploadFile) -> int:
+    """Size of an upload, or -1 (unknown, multipart upload) if it cannot be measured."""
+    if file.size is not None:
+        return file.size
+    try:
+        position = file.file.tell()
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return -1
+
+
+def object_name_from_url(file_url: str) -> str:
+    """
+    Get the object name of a file URL in the bucket.
+
+    Args:
+        file_url: Full URL of the file
+
+    Returns:
+        Object name
+
+    Raises:
+        ValueError: If the URL is malformed
+    """
+    # URL format: http://localhost:9000/bucket/folder/file.ext
+    parts = file_url.split("/", 3)  # Split into [http:, '', endpoint, rest]
+    if len(parts) < 4:
+        raise ValueError("Invalid file URL format")
+
+    rest = parts[3]
+    object_name = rest.split("/", 1)[1] if "/" in rest else rest
+
+    # Remove bucket name from path if present
+    bucket_name = settings.MINIO_BUCKET
+    if object_name.startswith(bucket_name + "/"):
+        object_name = object_name[len(bucket_name + "/") :]
+    return object_name
+
+
+# Global storage client instance
+storage_client: Optional[StorageClient] = None
+
+
+def init_storage() -> StorageClient:
+    """
+    Create the shared storage client.
+    Should be called on application startup.
+
+    Returns:
+        Storage client
+    """
+    global storage_client
+
+    if storage_client is None:
+        storage_client = StorageClient()
+    return storage_client
+
+
+def close_storage() -> None:
+    """
+    Close the shared storage client.
+    Should be called on application shutdown.
+    """
+    global storage_client
+
+    if storage_client is not None:
+        storage_client.close()
+        storage_client = None
+
+
+def get_storage() -> StorageClient:
+    """
+    Get the shared storage client, creating it on first use (workers, scripts).
+
+    Returns:
+        Storage client
+    """
+    return storage_client or init_storage()
+
+
+async def upload_file_to_storage(file: UploadFile, folder: str = "uploads") -> str:
+    """
+    Upload a file to MinIO/S3 storage.
+
+    Args:
+        file: File to upload
+        folder: Folder path in bucket
+
+    Returns:
+        Public URL of uploaded file
+
+    Raises:
+        Exception: If upload fails
+    """
+    try:
+        return await get_storage().upload(file, folder)
     except S3Error as e:
         raise Exception(f"Storage error: {str(e)}")
     except Exception as e:
         raise Exception(f"Failed to upload file: {str(e)}")
 
 
+async def upload_files_to_storage(
+    files: Sequence[UploadFile], folder: str = "uploads"
+) -> List[str]:
+    """
+    Upload several files to MinIO/S3 storage in parallel.
+
+    Args:
+        files: Files to upload
+        folder: Folder path in bucket
+
+    Returns:
+        Public URLs of uploaded files, in input order
+
+    Raises:
+        Exception: If any upload fails
+    """
+    try:
+        return await get_storage().upload_many(files, folder)
+    except S3Error as e:
+        raise Exception(f"Storage error: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to upload files: {str(e)}")
+
+
 async def delete_file_from_storage(file_url: str) -> bool:
     """
     Delete a file from MinIO/S3 storage.
@@ -95,30 +468,11 @@ async def delete_file_from_storage(file_url: str) -> bool:
         Exception: If deletion fails
     """
     try:
-        # Initialize MinIO client
-        client = Minio(
-            endpoint=settings.MINIO_ENDPOINT,
-            access_key=settings.MINIO_ACCESS_KEY,
-            secret_key=settings.MINIO_SECRET_KEY,
-            secure=settings.MINIO_SECURE,
-        )
-
-        # Extract object name from URL
-        # URL format: http://localhost:9000/bucket/folder/file.ext
-        parts = file_url.split("/", 3)  # Split into [http:, '', endpoint, rest]
-        if len(parts) < 4:
-            raise ValueError("Invalid file URL format")
-
-        rest = parts[3]
-        object_name = rest.split("/", 1)[1] if "/" in rest else rest
-
-        # Remove bucket name from path if present
         bucket_name = settings.MINIO_BUCKET
-        if object_name.startswith(bucket_name + "/"):
-            object_name = object_name[len(bucket_name + "/") :]
+        object_name = object_name_from_url(file_url)
 
         # Delete object
-        client.remove_object(bucket_name, object_name)
+        await get_storage().delete(bucket_name, object_name)
 
         return True
 
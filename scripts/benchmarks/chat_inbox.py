@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chat inbox query: full-history loading vs last-message snapshot.
+
+Seeds rooms with a large message history into the configured database,
+then times the legacy room list (selectinload of every message) against the
+snapshot-based query used by RoomService.get_user_chat_rooms.
+
+Run against a scratch database:
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python scripts/benchmarks/chat_inbox.py \
+        --rooms 5 --messages 100000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import and_, desc, select, text  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.database import async_session_maker, engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.chat import ChatParticipant, ChatRoom  # noqa: E402
+
+
+async def seed(rooms: int, messages: int) -> tuple[list[uuid.UUID], list[uuid.UUID]]:
+    """Create two users sharing `rooms` rooms with `messages` messages each."""
+    import app.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    tag = uuid.uuid4().hex[:8]
+    user_ids = [uuid.uuid4(), uuid.uuid4()]
+    room_ids = [uuid.uuid4() for _ in range(rooms)]
+
+    async with engine.begin() as conn:
+        for index, user_id in enumerate(user_ids):
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, username, email, phone, password_hash, "
+                    "is_email_verified, is_active, is_suspended, requires_password_change, "
+                    "two_factor_enabled, login_notifications, is_frozen, created_at, updated_at) "
+                    "VALUES (:id, :username, :email, :phone, 'x', false, true, false, false, "
+                    "false, true, false, now(), now())"
+                ),
+                {
+                    "id": user_id,
+                    "username": f"bench_{tag}_{index}",
+                    "email": f"bench_{tag}_{index}@example.com",
+                    "phone": f"+1{tag[:6]}{index:04d}",
+                },
+            )
+
+        for room_id in room_ids:
+            await conn.execute(
+                text(
+                    "INSERT INTO chat_rooms (id, type, is_active, created_at, updated_at, "
+                    "last_activity_at) VALUES (:id, 'private', true, now(), now(), now())"
+                ),
+                {"id": room_id},
+            )
+            for user_id in user_ids:
+                await conn.execute(
+                    text(
+                        "INSERT INTO chat_participants (id, room_id, user_id, role, joined_at, "
+                        "unread_count) VALUES (:id, :room_id, :user_id, 'member', now(), 0)"
+                    ),
+                    {"id": uuid.uuid4(), "room_id": room_id, "user_id": user_id},
+                )
+            await conn.execute(
+                text(
+                    "INSERT INTO messages (id, room_id, sender_id, content, type, is_deleted, "
+                    "created_at) "
+                    "SELECT gen_random_uuid(), :room_id, "
+                    "CASE WHEN n % 2 = 0 THEN CAST(:a AS uuid) ELSE CAST(:b AS uuid) END, "
+                    "repeat('message body ', 8) || n, 'text', false, "
+                    "now() - make_interval(secs => :n - n) "
+                    "FROM generate_series(1, :n) AS n"
+                ),
+                {"room_id": room_id, "a": user_ids[0], "b": user_ids[1], "n": messages},
+            )
+
+        # Same backfill as the snapshot migration
+        await conn.execute(
+            text(
+                "UPDATE chat_rooms AS r SET last_message_id = m.id, "
+                "last_message_sender_id = m.sender_id, last_message_preview = LEFT(m.content, 100), "
+                "last_message_type = m.type, last_message_at = m.created_at, "
+                "last_activity_at = m.created_at "
+                "FROM chat_rooms AS src CROSS JOIN LATERAL ("
+                "  SELECT id, sender_id, content, type, created_at FROM messages "
+                "  WHERE room_id = src.id AND is_deleted = false "
+                "  ORDER BY created_at DESC LIMIT 1) AS m "
+                "WHERE r.id = src.id AND src.id = ANY(:room_ids)"
+            ),
+            {"room_ids": room_ids},
+        )
+        await conn.execute(text("ANALYZE messages"))
+
+    return user_ids, room_ids
+
+
+async def cleanup(user_ids: list[uuid.UUID], room_ids: list[uuid.UUID]) -> None:
+    """Remove seeded rows (messages and participants cascade with rooms)."""
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM chat_rooms WHERE id = ANY(:ids)"), {"ids": room_ids})
+        await conn.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": user_ids})
+
+
+def room_list_query(user_id: uuid.UUID, limit: int):
+    return (
+        select(ChatRoom)
+        .join(ChatParticipant, ChatParticipant.room_id == ChatRoom.id)
+        .where(and_(ChatParticipant.user_id == user_id, ChatParticipant.left_at.is_(None)))
+        .limit(limit)
+    )
+
+
+async def legacy_inbox(user_id: uuid.UUID, limit: int) -> int:
+    """Room list as built before the snapshot: every message of every room."""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            room_list_query(user_id, limit)
+            .order_by(desc(ChatRoom.updated_at))
+            .options(selectinload(ChatRoom.participants), selectinload(ChatRoom.messages))
+        )
+        rooms = result.scalars().all()
+        return sum(1 for room in rooms if room.messages)
+
+
+async def snapshot_inbox(user_id: uuid.UUID, limit: int) -> int:
+    """Room list from the maintained last-message snapshot."""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            room_list_query(user_id, limit)
+            .order_by(desc(ChatRoom.last_activity_at))
+            .options(selectinload(ChatRoom.participants))
+        )
+        rooms = result.scalars().all()
+        return sum(1 for room in rooms if room.last_message_id)
+
+
+async def measure(name: str, func, user_id: uuid.UUID, limit: int, runs: int) -> None:
+    timings = []
+    peak = 0
+    for _ in range(runs):
+        tracemalloc.start()
+        started = time.perf_counter()
+        await func(user_id, limit)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    print(
+        f"{name:<10} median {statistics.median(timings) * 1000:9.1f} ms   "
+        f"max {max(timings) * 1000:9.1f} ms   peak mem {peak / 1024 / 1024:8.1f} MiB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=100_000, help="Messages per room")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded rows")
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rooms} rooms x {args.messages} messages...")
+    user_ids, room_ids = await seed(args.rooms, args.messages)
+    try:
+        await measure("legacy", legacy_inbox, user_ids[0], args.rooms, args.runs)
+        await measure("snapshot", snapshot_inbox, user_ids[0], args.rooms, args.runs)
+    finally:
+        if not args.keep:
+            await cleanup(user_ids, room_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
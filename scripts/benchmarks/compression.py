@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression: bandwidth saved against latency added.
+
+Builds typical HomeFeedResponse and SearchResponse bodies (20 and 50 cards
+with nested seller and image data) and, for every installed encoding,
+reports the compressed size, the CPU time to compress, the latency of a
+request through CompressionMiddleware, and the resulting time to deliver
+the body at each --bandwidth (compression + transfer).
+
+No database or Redis is needed:
+
+    python scripts/benchmarks/compression.py --requests 500 --bandwidth 5 50 500
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi.responses import Response  # noqa: E402
+
+from app.core.compression import available_encodings  # noqa: E402
+from app.core.middleware import CompressionMiddleware  # noqa: E402
+from app.schemas.common import APIResponse  # noqa: E402
+from app.schemas.home import (  # noqa: E402
+    AccountCard,
+    AccountTier,
+    CategoryItem,
+    FeaturedAccountCard,
+    FeaturedSellerInfo,
+    HomeFeedResponse,
+    SearchAccountCard,
+    SearchFilters,
+    SearchResponse,
+)
+
+GAMES = ["Valorant", "PUBG Mobile", "Fortnite", "League of Legends", "Free Fire"]
+
+
+def card(n: int) -> dict:
+    game = GAMES[n % len(GAMES)]
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"{game} account #{n} - rare skins, ranked ready, full email access",
+        "game": game,
+        "price": 120.0 + n * 7.5,
+        "image_url": f"https://cdn.example.com/listings/{uuid.uuid4()}/card.webp",
+        "rating": 4.0 + (n % 10) / 10,
+        "reviews": 5 + n,
+        "seller_name": f"seller_{n % 7}",
+        "rank": ["Gold 2", "Diamond 1", "Immortal 3", "Conqueror"][n % 4],
+    }
+
+
+def home_feed_body(items: int) -> bytes:
+    feed = HomeFeedResponse(
+        featured_accounts=[
+            FeaturedAccountCard(
+                **card(n),
+                is_premium=True,
+                tier=AccountTier.GOLD,
+                seller=FeaturedSellerInfo(
+                    username=f"seller_{n % 7}",
+                    avatar_url=f"https://cdn.example.com/avatars/{n % 7}.webp",
+                    rating=4.8,
+                ),
+            )
+            for n in range(5)
+        ],
+        accounts=[AccountCard(**card(n)) for n in range(items)],
+        categories=[
+            CategoryItem(id=str(n), name=game, icon="gamepad", count=100 + n)
+            for n, game in enumerate(GAMES)
+        ],
+        pagination={"page": 1, "limit": items, "total": 500, "total_pages": 500 // items},
+    )
+    return APIResponse.success_response(data=feed).model_dump_json().encode()
+
+
+def search_body(items: int) -> bytes:
+    results = SearchResponse(
+        query="valorant immortal",
+        total_results=240,
+        accounts=[
+            SearchAccountCard(**card(n), highlights=[f"<em>Valorant</em> account #{n}"])
+            for n in range(items)
+        ],
+        filters=SearchFilters(
+            available_games=GAMES,
+            price_range={"min": 20.0, "max": 2500.0},
+            game_counts=[{"value": game, "count": 40 + n} for n, game in enumerate(GAMES)],
+            price_buckets=[
+                {"label": "Under $100", "min": 0, "max": 100, "count": 31},
+                {"label": "$100 - $300", "min": 100, "max": 300, "count": 102},
+                {"label": "$300 - $500", "min": 300, "max": 500, "count": 64},
+                {"label": "Over $500", "min": 500, "max": None, "count": 43},
+            ],
+        ),
+        pagination={"page": 1, "limit": items, "total": 240, "total_pages": 240 // items},
+    )
+    return APIResponse.success_response(data=results).model_dump_json().encode()
+
+
+def compress_cpu(factory, body: bytes, requests: int) -> tuple[int, float]:
+    """Compressed size and CPU microseconds per body."""
+    size = len(factory().compress(body, final=True))
+    started = time.process_time()
+    for _ in range(requests):
+        factory().compress(body, final=True)
+    return size, (time.process_time() - started) / requests * 1_000_000
+
+
+async def middleware_latency(body: bytes, encoding: str, requests: int) -> float:
+    """Median wall milliseconds of one request through CompressionMiddleware."""
+    app = CompressionMiddleware(Response(body, media_type="application/json"))
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--feed-items", type=int, default=20, help="Accounts per feed page")
+    parser.add_argument("--search-items", type=int, default=50, help="Results per search page")
+    parser.add_argument("--requests", type=int, default=500, help="Iterations per measurement")
+    parser.add_argument(
+        "--bandwidth", type=float, nargs="+", default=[5, 50, 500], help="Client Mbit/s"
+    )
+    args = parser.parse_args()
+
+    encodings = {"identity": None, **available_encodings()}
+    print(f"Encodings: {', '.join(encodings)}")
+    payloads = [
+        ("HomeFeedResponse", home_feed_body(args.feed_items)),
+        ("SearchResponse", search_body(args.search_items)),
+    ]
+
+    for name, body in payloads:
+        print(f"\n{name} ({len(body)} bytes)")
+        header = "  ".join(f"@{mbps:g}Mbps".rjust(10) for mbps in args.bandwidth)
+        print(
+            f"  {'encoding':9s} {'bytes':>7s} {'ratio':>6s} {'cpu us':>8s} {'mw ms':>7s}  {header}"
+        )
+        for encoding, factory in encodings.items():
+            if factory is None:
+                size, cpu_us = len(body), 0.0
+            else:
+                size, cpu_us = compress_cpu(factory, body, args.requests)
+            latency = await middleware_latency(body, encoding, args.requests)
+            delivery = "  ".join(
+                f"{cpu_us / 1000 + size * 8 / (mbps * 1000):8.2f}ms" for mbps in args.bandwidth
+            )
+            print(
+                f"  {encoding:9s} {size:7d} {len(body) / size:6.2f} {cpu_us:8.1f} "
+                f"{latency:7.3f}  {delivery}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark deal creation under contention: many buyers racing for one account.
+
+Seeds a seller, a mediator, a pool of buyers and one active account per
+round into the configured database, then fires --buyers concurrent
+BuyDealService.create_deal calls at the same account. Each round must end
+with exactly one deal; every other buyer should get a fast 409.
+
+The legacy mode replays the old check-then-insert flow (read the status,
+then write) to show how many deals it lets through for one account.
+
+Run against a scratch database:
+
+    DATABASE_URL=postgresql+asyncpg://.../bench python scripts/benchmarks/deal_reservation.py \
+        --buyers 500 --rounds 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import select, text, update  # noqa: E402
+
+from app.core.database import async_session_maker, engine  # noqa: E402
+from app.core.exceptions import AppException  # noqa: E402
+from app.models.account import Account  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.mediator import Mediator  # noqa: E402
+from app.services.buy.deal_service import BuyDealService  # noqa: E402
+
+
+async def seed(buyers: int, rounds: int) -> tuple[list[uuid.UUID], uuid.UUID, list[uuid.UUID]]:
+    """Create the users, a mediator and one active account per round."""
+    import app.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    tag = uuid.uuid4().hex[:8]
+    user_ids = [uuid.uuid4() for _ in range(buyers + 2)]
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO users (id, username, email, phone, password_hash, "
+                "is_email_verified, is_active, is_suspended, requires_password_change, "
+                "two_factor_enabled, login_notifications, is_frozen, created_at, updated_at) "
+                "VALUES (:id, :username, :email, :phone, 'x', false, true, false, false, "
+                "false, true, false, now(), now())"
+            ),
+            [
+                {
+                    "id": user_id,
+                    "username": f"bench_{tag}_{index}",
+                    "email": f"bench_{tag}_{index}@example.com",
+                    "phone": f"+1{tag[:6]}{index:05d}",
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+
+    seller_id, mediator_id = user_ids[0], user_ids[1]
+    async with async_session_maker() as db:
+        db.add(Mediator(user_id=mediator_id))
+        accounts = [
+            Account(seller_id=seller_id, title=f"Bench account {n}", game="Bench", price=100)
+            for n in range(rounds)
+        ]
+        db.add_all(accounts)
+        await db.commit()
+        account_ids = [account.id for account in accounts]
+
+    return user_ids, mediator_id, account_ids
+
+
+async def cleanup(user_ids: list[uuid.UUID]) -> None:
+    """Remove seeded rows (deals go first; accounts, rooms and mediators cascade)."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "DELETE FROM chat_rooms WHERE deal_id IN "
+                "(SELECT id FROM deals WHERE buyer_id = ANY(:ids))"
+            ),
+            {"ids": user_ids},
+        )
+        await conn.execute(text("DELETE FROM deals WHERE buyer_id = ANY(:ids)"), {"ids": user_ids})
+        await conn.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": user_ids})
+
+
+async def reserve(buyer_id: uuid.UUID, account_id: uuid.UUID, mediator_id: uuid.UUID) -> str:
+    """One buyer going through the real create_deal."""
+    async with async_session_maker() as db:
+        try:
+            await BuyDealService(db).create_deal(str(buyer_id), str(account_id), str(mediator_id))
+            return "won"
+        except AppException as e:
+            return "conflict" if e.status_code == 409 else "error"
+        except Exception:
+            return "error"
+
+
+async def legacy(buyer_id: uuid.UUID, account_id: uuid.UUID, mediator_id: uuid.UUID) -> str:
+    """One buyer going through the old read-then-write flow (deal rows omitted)."""
+    async with async_session_maker() as db:
+        status = await db.scalar(select(Account.status).where(Account.id == account_id))
+        if status != "active":
+            return "conflict"
+        # Time the old flow spent creating the chat room and deal
+        await asyncio.sleep(0.005)
+        await db.execute(update(Account).where(Account.id == account_id).values(status="reserved"))
+        await db.commit()
+        return "won"
+
+
+async def race(func, buyer_ids, account_id, mediator_id) -> tuple[dict, list[float]]:
+    async def timed(buyer_id):
+        started = time.perf_counter()
+        outcome = await func(buyer_id, account_id, mediator_id)
+        return outcome, time.perf_counter() - started
+
+    results = await asyncio.gather(*(timed(buyer_id) for buyer_id in buyer_ids))
+    counts: dict = {}
+    for outcome, _ in results:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return counts, [elapsed for _, elapsed in results]
+
+
+def percentile(timings: list[float], pct: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--buyers", type=int, default=500, help="Concurrent buyers per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--legacy", action="store_true", help="Use the old read-then-write flow")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded rows")
+    args = parser.parse_args()
+
+    print(f"Seeding {args.buyers} buyers and {args.rounds} accounts...")
+    user_ids, mediator_id, account_ids = await seed(args.buyers, args.rounds)
+    buyer_ids = user_ids[2:]
+    func = legacy if args.legacy else reserve
+    try:
+        for account_id in account_ids:
+            started = time.perf_counter()
+            counts, timings = await race(func, buyer_ids, account_id, mediator_id)
+            wall = time.perf_counter() - started
+            print(
+                f"won {counts.get('won', 0):3d}   409 {counts.get('conflict', 0):4d}   "
+                f"errors {counts.get('error', 0):3d}   "
+                f"p50 {statistics.median(timings) * 1000:7.1f} ms   "
+                f"p99 {percentile(timings, 0.99):7.1f} ms   wall {wall * 1000:7.1f} ms"
+            )
+    finally:
+        if not args.keep:
+            await cleanup(user_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization CPU per request on the home feed and chat message list.
+
+Builds a home feed page and a chat message page the way the services do
+(Pydantic models) and times, with process CPU time, what each response
+path costs once the route has its result:
+
+- stdlib:  response_model validation + jsonable_encoder + stdlib json
+           (the framework defaults before ORJSONResponse)
+- orjson:  response_model validation + jsonable_encoder + orjson
+           (routes that still return models)
+- fast:    model_dump_json() via ModelResponse, no re-validation
+           (trusted service outputs)
+
+No database or Redis is needed:
+
+    python scripts/benchmarks/serialization.py --items 20 --messages 50 --requests 2000
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.serialization import ModelResponse, ORJSONResponse  # noqa: E402
+from app.schemas.chat import (  # noqa: E402
+    MessageAttachmentResponse,
+    MessageResponse,
+    MessagesListResponse,
+)
+from app.schemas.common import APIResponse  # noqa: E402
+from app.schemas.home import (  # noqa: E402
+    AccountCard,
+    AccountTier,
+    CategoryItem,
+    FeaturedAccountCard,
+    FeaturedSellerInfo,
+    HomeFeedResponse,
+)
+
+
+def home_feed(items: int) -> APIResponse:
+    """A home feed page with `items` regular and 5 featured accounts."""
+
+    def card(n: int) -> dict:
+        return {
+            "id": str(uuid.uuid4()),
+            "title": f"Immortal account #{n} with 120 skins and all agents unlocked",
+            "game": "Valorant",
+            "price": 150.0 + n,
+            "image_url": f"https://cdn.example.com/accounts/{n}/main.webp",
+            "rating": 4.5,
+            "reviews": 10 + n,
+            "seller_name": f"seller_{n}",
+            "rank": "Immortal 2",
+        }
+
+    feed = HomeFeedResponse(
+        featured_accounts=[
+            FeaturedAccountCard(
+                **card(n),
+                is_premium=True,
+                tier=AccountTier.ELITE,
+                seller=FeaturedSellerInfo(username=f"seller_{n}", rating=4.9),
+            )
+            for n in range(5)
+        ],
+        accounts=[AccountCard(**card(n)) for n in range(items)],
+        categories=[
+            CategoryItem(id=str(n), name=f"Category {n}", icon="gamepad", count=100 + n)
+            for n in range(8)
+        ],
+        pagination={"page": 1, "limit": items, "total": 500, "total_pages": 25},
+    )
+    return APIResponse.success_response(data=feed)
+
+
+def message_list(messages: int) -> APIResponse:
+    """A chat message page with an attachment on every fifth message."""
+    started = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    sender_ids = [str(uuid.uuid4()) for _ in range(3)]
+    page = MessagesListResponse(
+        messages=[
+            MessageResponse(
+                id=str(uuid.uuid4()),
+                sender_id=sender_ids[n % 3],
+                sender_name=f"user_{n % 3}",
+                sender_avatar="https://cdn.example.com/avatars/user.webp",
+                content="Sent the payment screenshot, please confirm the account details. " * 2,
+                type="text",
+                timestamp=started + timedelta(seconds=30 * n),
+                is_read=n < messages - 5,
+                attachments=(
+                    [
+                        MessageAttachmentResponse(
+                            id=str(uuid.uuid4()),
+                            url=f"https://cdn.example.com/chat/{n}.png",
+                            filename=f"{n}.png",
+                            size=184_320,
+                            mime_type="image/png",
+                        )
+                    ]
+                    if n % 5 == 0
+                    else []
+                ),
+            )
+            for n in range(messages)
+        ],
+        has_more=True,
+    )
+    return APIResponse.success_response(data=page)
+
+
+async def framework(field, payload: APIResponse, response_class) -> bytes:
+    """What FastAPI does with a returned model: validate, encode, render."""
+    content = await serialize_response(field=field, response_content=payload, is_coroutine=True)
+    return response_class(content).body
+
+
+async def fast(field, payload: APIResponse, response_class) -> bytes:
+    return ModelResponse(payload).body
+
+
+async def measure(path, field, payload: APIResponse, response_class, requests: int) -> tuple:
+    body = await path(field, payload, response_class)
+    started = time.process_time()
+    for _ in range(requests):
+        await path(field, payload, response_class)
+    return (time.process_time() - started) / requests * 1_000_000, len(body)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=20, help="Accounts per feed page")
+    parser.add_argument("--messages", type=int, default=50, help="Messages per chat page")
+    parser.add_argument("--requests", type=int, default=2000, help="Iterations per path")
+    args = parser.parse_args()
+
+    endpoints = [
+        ("home feed", HomeFeedResponse, home_feed(args.items)),
+        ("chat messages", MessagesListResponse, message_list(args.messages)),
+    ]
+    paths = [
+        ("stdlib", framework, JSONResponse),
+        ("orjson", framework, ORJSONResponse),
+        ("fast", fast, None),
+    ]
+
+    for name, schema, payload in endpoints:
+        field = create_response_field(
+            name="Response", type_=APIResponse[schema], mode="serialization"
+        )
+        print(f"{name}:")
+        baseline = None
+        for label, path, response_class in paths:
+            cpu_us, size = await measure(path, field, payload, response_class, args.requests)
+            baseline = baseline or cpu_us
+            print(
+                f"  {label:7s} {cpu_us:9.1f} us CPU/request   {size:7d} bytes   "
+                f"x{baseline / cpu_us:5.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
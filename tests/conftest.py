@@ -154,15 +154,17 @@ def mock_redis() -> AsyncMock:
 
 @pytest.fixture
 def patch_get_db(mock_db_session: AsyncMock):
-    """Override get_db dependency with mock session."""
-    from app.api.deps import get_db
+    """Override get_db and get_read_db dependencies with mock session."""
+    from app.api.deps import get_db, get_read_db
     
     async def override():
         yield mock_db_session
     
     app.dependency_overrides[get_db] = override
+    app.dependency_overrides[get_read_db] = override
     yield mock_db_session
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
 
 
 @pytest.fixture
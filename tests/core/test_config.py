@@ -191,3 +191,48 @@ class TestJWTTokens:
         token = create_access_token(data)
         payload = decode_token(token)
         assert "exp" in payload
+
+
+class TestPartitionManager:
+    """Test monthly partition maintenance."""
+
+    def test_month_start_crosses_year_boundaries(self):
+        """Test month arithmetic in both directions."""
+        from datetime import datetime, timezone
+
+        from app.core.partitions import month_start, partition_name
+
+        now = datetime(2026, 1, 15, 12, 30, tzinfo=timezone.utc)
+
+        assert month_start(now) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert month_start(now, -1) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+        assert month_start(now, 12) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert partition_name("messages", month_start(now, -1)) == "messages_p202512"
+
+    @pytest.mark.asyncio
+    async def test_retire_detaches_only_months_past_retention(self):
+        """Test partitions that end after the cutoff are kept."""
+        from datetime import datetime, timezone
+
+        from app.core.partitions import PartitionedTable, PartitionManager
+
+        manager = PartitionManager(tables=(), archive_schema="")
+        table = PartitionedTable(
+            "messages", "created_at", 2, on_drop="DELETE FROM a WHERE id IN ({partition})"
+        )
+        months = [datetime(2026, month, 1, tzinfo=timezone.utc) for month in (7, 8, 9, 10)]
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        with patch.object(manager, "_partition_months", AsyncMock(return_value=months)):
+            retired = await manager.retire_partitions(
+                db, table, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+            )
+
+        assert retired == ["messages_p202607"]
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert statements == [
+            "ALTER TABLE messages DETACH PARTITION messages_p202607",
+            "DELETE FROM a WHERE id IN (messages_p202607)",
+            "DROP TABLE messages_p202607",
+        ]
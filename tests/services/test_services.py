@@ -131,6 +131,22 @@ class TestChatService:
         assert chat_service.db is not None
 
 
+class TestMessageSnapshot:
+    """Test the room last-message snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_delete_replaces_snapshot_in_one_conditional_update(self, mock_db_session):
+        """Test the latest-message lookup runs inside the UPDATE guarded by the snapshot."""
+        from app.services.chat.message_service import MessageService
+
+        await MessageService(mock_db_session)._replace_last_message(uuid4(), uuid4())
+
+        statement = str(mock_db_session.execute.await_args.args[0])
+        assert mock_db_session.execute.await_count == 1
+        assert statement.startswith("UPDATE chat_rooms SET last_message_id=(SELECT")
+        assert "WHERE chat_rooms.id = :id_2 AND chat_rooms.last_message_id = " in statement
+
+
 @pytest.mark.skip(reason="Requires PostgreSQL database")
 class TestNotificationService:
     """Test notification service."""
@@ -144,3 +160,981 @@ class TestNotificationService:
         """Test notification service initializes correctly."""
         assert notification_service is not None
         assert notification_service.db is not None
+
+
+class TestNotificationBulkService:
+    """Test set-based bulk notification creation."""
+
+    @pytest.mark.asyncio
+    async def test_explicit_users_are_deduplicated_and_chunked(self, mock_db_session):
+        """Test one INSERT ... SELECT per chunk of distinct user IDs."""
+        from app.schemas.notification import NotificationType
+        from app.services.notifications.bulk_service import NotificationBulkService
+
+        user_ids = [uuid4() for _ in range(5)]
+        insert_chunk = AsyncMock(side_effect=lambda db, users, content: [{}] * 2)
+
+        engine = "app.services.notifications.bulk_service.notification_preference_engine"
+        with (
+            patch.object(NotificationBulkService, "_insert_chunk", insert_chunk),
+            patch(
+                f"{engine}.filter_users", AsyncMock(side_effect=lambda ids, *args, **kwargs: ids)
+            ),
+        ):
+            created = await NotificationBulkService.create_notifications(
+                mock_db_session,
+                title="Scheduled maintenance",
+                description="Tonight",
+                notification_type=NotificationType.SYSTEM,
+                user_ids=user_ids + user_ids[:2],
+                chunk_size=2,
+            )
+
+        assert insert_chunk.await_count == 3
+        assert created == 6
+        content = insert_chunk.await_args.args[2]
+        assert content["type"] == NotificationType.SYSTEM.value
+        assert content["icon"] == "notifications"
+
+
+class TestNotificationDeliveryService:
+    """Test queued notification delivery."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_falls_back_to_inline_delivery(self, mock_db_session):
+        """Test events are delivered in the request when the broker is unreachable."""
+        from app.schemas.notification import NotificationType
+        from app.services.notifications.delivery_service import (
+            NotificationDeliveryService,
+            notification_event,
+        )
+
+        event = notification_event(uuid4(), "Payment received", "Paid", NotificationType.PURCHASE)
+        task = MagicMock()
+        task.delay.side_effect = ConnectionError("broker down")
+
+        with (
+            patch("app.tasks.notification_tasks.deliver_notifications", task),
+            patch.object(
+                NotificationDeliveryService, "deliver", AsyncMock(return_value=1)
+            ) as deliver,
+        ):
+            await NotificationDeliveryService.enqueue([event], mock_db_session)
+
+        deliver.assert_awaited_once_with(mock_db_session, [event])
+        assert event["icon"] == "shopping_cart"
+
+    @pytest.mark.asyncio
+    async def test_filter_drops_disabled_types_and_unknown_users(self, mock_db_session):
+        """Test recipients are filtered by preferences loaded in one query."""
+        from app.schemas.notification import NotificationType
+        from app.services.notifications.delivery_service import (
+            NotificationDeliveryService,
+            notification_event,
+        )
+
+        from app.services.notifications.preference_engine import (
+            DEFAULT_MASK,
+            compile_preferences,
+        )
+
+        muted, default, missing = uuid4(), uuid4(), uuid4()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [muted, default]
+        mock_db_session.execute = AsyncMock(return_value=result)
+        masks = {
+            str(muted): compile_preferences(types={"message": {"enabled": False}}),
+            str(default): DEFAULT_MASK,
+        }
+
+        events = [
+            notification_event(user_id, "New message", "Hi", NotificationType.MESSAGE)
+            for user_id in (muted, default, missing)
+        ]
+        with patch(
+            "app.services.notifications.delivery_service.notification_preference_engine"
+            ".get_masks",
+            AsyncMock(return_value=masks),
+        ):
+            delivered = await NotificationDeliveryService._filter_recipients(
+                mock_db_session, events
+            )
+
+        assert [event["user_id"] for event in delivered] == [str(default)]
+        mock_db_session.execute.assert_awaited_once()
+
+
+class TestNotificationPreferenceEngine:
+    """Test compiled notification preference masks."""
+
+    def test_compile_applies_type_and_global_switches(self):
+        """Test disabled types lose every channel and global switches clear channels."""
+        from app.schemas.notification import NotificationType
+        from app.services.notifications.preference_engine import (
+            compile_preferences,
+            preference_bit,
+        )
+
+        mask = compile_preferences(
+            push_notifications=False,
+            types={"system": {"enabled": False, "push": True, "email": True}},
+        )
+
+        assert not mask & preference_bit(NotificationType.SYSTEM, "in_app")
+        assert not mask & preference_bit(NotificationType.SYSTEM, "email")
+        assert mask & preference_bit(NotificationType.MESSAGE, "in_app")
+        assert mask & preference_bit(NotificationType.MESSAGE, "email")
+        assert not mask & preference_bit(NotificationType.MESSAGE, "push")
+
+    @pytest.mark.asyncio
+    async def test_batch_lookup_checks_local_then_redis_then_database(self):
+        """Test only users missing from both caches are loaded from Postgres."""
+        from app.schemas.notification import NotificationType
+        from app.services.notifications.preference_engine import (
+            DEFAULT_MASK,
+            NotificationPreferenceEngine,
+            compile_preferences,
+        )
+
+        engine = NotificationPreferenceEngine()
+        muted = compile_preferences(types={"purchase": {"enabled": False}})
+        redis = MagicMock()
+        redis.mget = AsyncMock(return_value=[str(muted), None])
+        redis.pipeline.return_value.execute = AsyncMock()
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(engine, "_load", AsyncMock(return_value={"user_3": DEFAULT_MASK})) as load,
+        ):
+            engine._local["user_1"] = (DEFAULT_MASK, float("inf"))
+            accepted = await engine.filter_users(
+                ["user_1", "user_2", "user_3"], NotificationType.PURCHASE
+            )
+
+        assert accepted == ["user_1", "user_3"]
+        redis.mget.assert_awaited_once_with(
+            ["notification:prefs:user_2", "notification:prefs:user_3"]
+        )
+        load.assert_awaited_once_with(["user_3"], None)
+
+
+class TestNotificationUnreadCounter:
+    """Test maintained unread-notification counters."""
+
+    @pytest.mark.asyncio
+    async def test_misses_are_rebuilt_without_overwriting_hits(self):
+        """Test cached counts are used as-is and only misses hit Postgres."""
+        from app.services.notifications.unread_counter import NotificationUnreadCounter
+
+        counter = NotificationUnreadCounter()
+        redis = MagicMock()
+        redis.mget = AsyncMock(return_value=["4", None])
+        pipe = redis.pipeline.return_value
+        pipe.execute = AsyncMock()
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(counter, "_count", AsyncMock(return_value={"user_2": 7})) as count,
+        ):
+            counts = await counter.get_many(["user_1", "user_2"])
+
+        assert counts == {"user_1": 4, "user_2": 7}
+        count.assert_awaited_once_with(["user_2"], None)
+        pipe.set.assert_called_once_with("unread_count:user_2", 7, ex=counter.TTL_SECONDS, nx=True)
+
+    @pytest.mark.asyncio
+    async def test_adjust_reports_uncached_counter(self):
+        """Test adjusting a missing counter leaves it for a lazy rebuild."""
+        from app.services.notifications.unread_counter import NotificationUnreadCounter
+
+        counter = NotificationUnreadCounter()
+        redis = MagicMock()
+        redis.register_script.return_value = AsyncMock(return_value=None)
+
+        with patch("app.core.redis.redis_client", redis):
+            assert await counter.adjust("user_1", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_socket_mark_read_acks_locally(self):
+        """Test a socket mark_read is acknowledged on the stream without relying on Redis."""
+        from app.api.v1.chat import websocket
+        from app.api.v1.notifications import websocket as notifications_websocket
+
+        user_id, notification_id = str(uuid4()), str(uuid4())
+        manager = websocket.ConnectionManager()
+        socket = AsyncMock()
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch.object(notifications_websocket, "manager", manager),
+            patch("app.core.database.async_session_maker", MagicMock(return_value=session)),
+            patch(
+                "app.services.notifications.NotificationCrudService.mark_as_read", AsyncMock()
+            ) as mark_as_read,
+            patch.object(
+                notifications_websocket, "get_unread_notification_count", AsyncMock(return_value=3)
+            ),
+            patch("app.core.redis.redis_client", None),
+        ):
+            await manager.connect(socket, user_id, websocket.notification_stream(user_id))
+            await notifications_websocket.handle_mark_read(user_id, notification_id)
+
+        assert mark_as_read.await_args.kwargs == {"publish": False}
+        assert [c.args[0] for c in socket.send_json.await_args_list] == [
+            {"event": "notification_read", "data": {"notification_id": notification_id}},
+            {"event": "badge_update", "data": {"count": 3}},
+        ]
+
+
+class TestDirectUploadService:
+    """Test presigned direct-to-storage uploads."""
+
+    @pytest.fixture
+    def storage(self):
+        """Mock shared storage client."""
+        storage = MagicMock()
+        storage.presign_upload.return_value = {
+            "url": "http://localhost:9000/gamemarket",
+            "fields": {"policy": "p"},
+            "put_url": "http://localhost:9000/gamemarket/put",
+            "expires_at": datetime(2030, 1, 1),
+        }
+        storage.delete = AsyncMock()
+        with patch("app.services.upload_service.get_storage", return_value=storage):
+            yield storage
+
+    def _stat(self, name, size, content_type):
+        stat = MagicMock()
+        stat.bucket_name, stat.object_name = "gamemarket", name
+        stat.size, stat.content_type = size, content_type
+        return stat
+
+    def test_create_upload_scopes_object_to_user(self, storage):
+        """Test the object name sits under the user's prefix and the limits are signed."""
+        from app.schemas.common import PresignedUploadRequest
+        from app.services.upload_service import DirectUploadService
+
+        user_id = uuid4()
+        data = PresignedUploadRequest(filename="../me.png", content_type="image/png", size=100)
+
+        upload = DirectUploadService.create_upload(user_id, "avatar", data)
+
+        assert upload.object_name.startswith(f"avatars/{user_id}/")
+        assert upload.object_name.endswith("_me.png")
+        storage.presign_upload.assert_called_once_with(
+            upload.object_name, "image/png", 2 * 1024 * 1024
+        )
+
+    def test_create_upload_rejects_oversized_file(self, storage):
+        """Test declared size is checked before any URL is issued."""
+        from app.core.exceptions import ValidationException
+        from app.schemas.common import PresignedUploadRequest
+        from app.services.upload_service import DirectUploadService
+
+        data = PresignedUploadRequest(
+            filename="me.png", content_type="image/png", size=3 * 1024 * 1024
+        )
+
+        with pytest.raises(ValidationException):
+            DirectUploadService.create_upload(uuid4(), "avatar", data)
+        storage.presign_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_complete_upload_rejects_foreign_object(self, storage):
+        """Test users cannot claim objects outside their own prefix."""
+        from app.core.exceptions import ForbiddenException
+        from app.services.upload_service import DirectUploadService
+
+        with pytest.raises(ForbiddenException):
+            await DirectUploadService.complete_upload(
+                uuid4(), "avatar", f"avatars/{uuid4()}/20260101_000000_abcd1234_me.png"
+            )
+
+    @pytest.mark.asyncio
+    async def test_complete_upload_reads_dimensions(self, storage):
+        """Test a valid image is verified from its first bytes only."""
+        from io import BytesIO
+
+        from PIL import Image
+
+        from app.services.upload_service import IMAGE_HEADER_BYTES, DirectUploadService
+
+        user_id = uuid4()
+        name = f"listings/{user_id}/20260101_000000_abcd1234_shot_1.png"
+        png = BytesIO()
+        Image.new("RGB", (40, 30)).save(png, "PNG")
+        storage.stat = AsyncMock(return_value=self._stat(name, len(png.getvalue()), "image/png"))
+        storage.read_head = AsyncMock(return_value=png.getvalue())
+
+        upload = await DirectUploadService.complete_upload(user_id, "listing_image", name)
+
+        assert (upload.width, upload.height) == (40, 30)
+        assert upload.filename == "shot_1.png"
+        assert upload.url.endswith(name)
+        storage.read_head.assert_awaited_once_with(name, IMAGE_HEADER_BYTES)
+
+    @pytest.mark.asyncio
+    async def test_complete_upload_deletes_invalid_image(self, storage):
+        """Test an object that is not an image is deleted and rejected."""
+        from app.core.exceptions import ValidationException
+        from app.services.upload_service import DirectUploadService
+
+        user_id = uuid4()
+        name = f"avatars/{user_id}/20260101_000000_abcd1234_me.png"
+        storage.stat = AsyncMock(return_value=self._stat(name, 10, "image/png"))
+        storage.read_head = AsyncMock(return_value=b"not an image")
+
+        with pytest.raises(ValidationException):
+            await DirectUploadService.complete_upload(user_id, "avatar", name)
+        storage.delete.assert_awaited_once_with("gamemarket", name)
+
+
+class TestListingImageService:
+    """Test listing image variant processing."""
+
+    @pytest.mark.asyncio
+    async def test_process_stores_variants_and_fills_account_image(self, mock_db_session):
+        """Test variants are uploaded next to the original and the row is updated."""
+        from io import BytesIO
+
+        from PIL import Image
+
+        from app.services.image_service import ListingImageService
+
+        png = BytesIO()
+        Image.new("RGB", (800, 600)).save(png, "PNG")
+        storage = MagicMock()
+        storage.read = AsyncMock(return_value=png.getvalue())
+        storage.put_bytes = AsyncMock(side_effect=lambda name, *args, **kwargs: name)
+        url = "http://localhost:9000/gamemarket/listings/20260101_000000_abcd1234_a.png"
+
+        with patch("app.services.image_service.get_storage", return_value=storage):
+            result = await ListingImageService.process(mock_db_session, url, uuid4())
+
+        assert result["thumbnail_url"].endswith("listings/20260101_000000_abcd1234_a_thumb.webp")
+        assert (result["width"], result["height"]) == (800, 600)
+        assert "listings/20260101_000000_abcd1234_a_640w.webp" in result["variants"]
+        mock_db_session.execute.assert_awaited_once()
+        mock_db_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_undecodable_original_falls_back_to_itself(self, mock_db_session):
+        """Test a broken original is not retried forever by the backfill."""
+        from app.services.image_service import ListingImageService
+
+        storage = MagicMock()
+        storage.read = AsyncMock(return_value=b"not an image")
+        storage.put_bytes = AsyncMock()
+        url = "http://localhost:9000/gamemarket/listings/broken.jpg"
+
+        with patch("app.services.image_service.get_storage", return_value=storage):
+            result = await ListingImageService.process(mock_db_session, url)
+
+        assert result["thumbnail_url"] == url
+        storage.put_bytes.assert_not_called()
+        mock_db_session.execute.assert_not_called()
+
+
+class TestViewCounter:
+    """Test write-behind view counting."""
+
+    @pytest.mark.asyncio
+    async def test_record_passes_viewer_only_when_unique(self):
+        """Test the HyperLogLog viewer is skipped when unique counting is off."""
+        from app.services.view_counter import ViewCounter
+
+        redis = MagicMock()
+        script = AsyncMock(return_value=1)
+        redis.register_script.return_value = script
+        item_id = uuid4()
+
+        with patch("app.core.redis.redis_client", redis):
+            assert await ViewCounter(unique=True).record("accounts", item_id, "ip:1.2.3.4")
+            assert await ViewCounter(unique=False).record("accounts", item_id, "ip:1.2.3.4")
+
+        unique_call, plain_call = script.await_args_list
+        assert unique_call.kwargs["keys"] == [
+            "views:accounts",
+            f"views:unique:accounts:{item_id}",
+        ]
+        assert unique_call.kwargs["args"][1] == "ip:1.2.3.4"
+        assert plain_call.kwargs["args"][1] == ""
+
+    def _flush_redis(self, token="t1"):
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=True)
+        take = AsyncMock(
+            side_effect=lambda keys, args: token if keys[0] == "views:accounts" else None
+        )
+        release = AsyncMock()
+        redis.register_script = MagicMock(
+            side_effect=lambda source: release if "DEL" in source else take
+        )
+        redis.delete = AsyncMock()
+        return redis, take, release
+
+    @pytest.mark.asyncio
+    async def test_flush_moves_deltas_in_batched_updates(self, mock_db_session):
+        """Test pending deltas are taken aside, applied in chunks with their token and cleared."""
+        from app.services.view_counter import ViewCounter
+
+        counter = ViewCounter(flush_batch_size=2)
+        ids = [uuid4() for _ in range(3)]
+        redis, take, release = self._flush_redis()
+        redis.hgetall = AsyncMock(return_value={str(i): "2" for i in ids} | {"bad": "1"})
+        mock_db_session.scalar = AsyncMock(return_value=None)
+        mock_db_session.execute = AsyncMock(return_value=MagicMock(rowcount=2))
+
+        with patch("app.core.redis.redis_client", redis):
+            report = await counter.flush(mock_db_session)
+
+        assert report == {"accounts": 4}
+        assert redis.set.await_args.kwargs == {"nx": True, "ex": 300}
+        assert take.await_args_list[0].kwargs["keys"] == [
+            "views:accounts",
+            "views:accounts:flushing",
+            "views:accounts:flushing:token",
+        ]
+        redis.delete.assert_awaited_once_with(
+            "views:accounts:flushing", "views:accounts:flushing:token"
+        )
+        statements = [str(call.args[0]) for call in mock_db_session.execute.await_args_list]
+        assert len(statements) == 4
+        assert all("FROM (VALUES" in statement for statement in statements[:2])
+        assert "INSERT INTO view_flushes" in statements[2]
+        mock_db_session.commit.assert_awaited_once()
+        release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_skips_while_another_flush_holds_the_lock(self, mock_db_session):
+        """Test overlapping flushes do not read the same deltas."""
+        from app.services.view_counter import ViewCounter
+
+        redis, take, release = self._flush_redis()
+        redis.set = AsyncMock(return_value=None)
+
+        with patch("app.core.redis.redis_client", redis):
+            report = await ViewCounter().flush(mock_db_session)
+
+        assert report == {}
+        take.assert_not_awaited()
+        release.assert_not_awaited()
+        mock_db_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_flush_does_not_reapply_committed_deltas(self, mock_db_session):
+        """Test deltas left behind after their commit are cleared without being counted again."""
+        from app.services.view_counter import ViewCounter
+
+        redis, _, _ = self._flush_redis(token="done")
+        redis.hgetall = AsyncMock(return_value={str(uuid4()): "5"})
+        mock_db_session.scalar = AsyncMock(return_value="done")
+
+        with patch("app.core.redis.redis_client", redis):
+            report = await ViewCounter().flush(mock_db_session)
+
+        assert report == {"accounts": 0}
+        mock_db_session.execute.assert_not_awaited()
+        mock_db_session.commit.assert_not_awaited()
+        redis.delete.assert_awaited_once_with(
+            "views:accounts:flushing", "views:accounts:flushing:token"
+        )
+
+
+class TestDealReservation:
+    """Test contention-safe deal creation."""
+
+    def _mediator(self):
+        mediator = MagicMock(user_id=uuid4(), rating=4.5)
+        mediator.user.profile = MagicMock(display_name="Mediator", avatar_url=None)
+        return mediator
+
+    @pytest.mark.asyncio
+    async def test_winner_inserts_deal_graph_in_one_statement(self, mock_db_session):
+        """Test the reserving buyer creates deal, room and participants in one execute."""
+        from app.services.buy.deal_service import BuyDealService
+
+        mediator = self._mediator()
+        account = MagicMock(id=uuid4(), seller_id=uuid4(), price=100, title="Acc", game="PUBG")
+        mock_db_session.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=mediator)),
+                MagicMock(one_or_none=MagicMock(return_value=account)),
+                MagicMock(),
+            ]
+        )
+
+        with (
+            patch(
+                "app.services.buy.deal_service.room_access_cache.invalidate", new=AsyncMock()
+            ) as invalidate,
+            patch(
+                "app.services.buy.deal_service.account_status_changed", new=AsyncMock()
+            ) as status_changed,
+        ):
+            deal = await BuyDealService(mock_db_session).create_deal(
+                str(uuid4()), str(account.id), str(mediator.user_id), quantity=2
+            )
+
+        from sqlalchemy.dialects import postgresql
+
+        reserve = str(
+            mock_db_session.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "UPDATE accounts SET status" in reserve
+        assert "SKIP LOCKED" in reserve
+        graph = str(mock_db_session.execute.await_args_list[2].args[0])
+        assert "WITH new_deal AS" in graph and "new_room AS" in graph
+        assert "INSERT INTO chat_participants" in graph
+        mock_db_session.commit.assert_awaited_once()
+        invalidate.assert_awaited_once()
+        status_changed.assert_awaited_once_with("PUBG")
+        assert deal.total_amount == 200.0
+        assert deal.seller_id == str(account.seller_id)
+
+    @pytest.mark.asyncio
+    async def test_loser_gets_conflict_without_writing(self, mock_db_session):
+        """Test a buyer losing the reservation gets a 409 and inserts nothing."""
+        from app.core.exceptions import AppException
+        from app.services.buy.deal_service import BuyDealService
+
+        mock_db_session.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=self._mediator())),
+                MagicMock(one_or_none=MagicMock(return_value=None)),
+            ]
+        )
+        mock_db_session.scalar = AsyncMock(return_value=uuid4())
+
+        with pytest.raises(AppException) as exc_info:
+            await BuyDealService(mock_db_session).create_deal(
+                str(uuid4()), str(uuid4()), str(uuid4())
+            )
+
+        assert exc_info.value.status_code == 409
+        assert mock_db_session.execute.await_count == 2
+        mock_db_session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_account_is_not_a_conflict(self, mock_db_session):
+        """Test a missing account still raises ValueError."""
+        from app.services.buy.deal_service import BuyDealService
+
+        mock_db_session.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=self._mediator())),
+                MagicMock(one_or_none=MagicMock(return_value=None)),
+            ]
+        )
+        mock_db_session.scalar = AsyncMock(return_value=None)
+
+        with pytest.raises(ValueError):
+            await BuyDealService(mock_db_session).create_deal(
+                str(uuid4()), str(uuid4()), str(uuid4())
+            )
+
+    @pytest.mark.asyncio
+    async def test_buyer_cannot_mediate_own_purchase(self, mock_db_session):
+        """Test a deal whose mediator is the buyer is rejected before any query."""
+        from app.core.exceptions import AppException
+        from app.services.buy.deal_service import BuyDealService
+
+        buyer_id = str(uuid4())
+
+        with pytest.raises(AppException) as exc_info:
+            await BuyDealService(mock_db_session).create_deal(buyer_id, str(uuid4()), buyer_id)
+
+        assert exc_info.value.status_code == 400
+        mock_db_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_own_account_is_not_reserved(self, mock_db_session):
+        """Test buying one's own account is a 400 and the reservation matches no row."""
+        from app.core.exceptions import AppException
+        from app.services.buy.deal_service import BuyDealService
+
+        buyer_id = uuid4()
+        mock_db_session.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=self._mediator())),
+                MagicMock(one_or_none=MagicMock(return_value=None)),
+            ]
+        )
+        mock_db_session.scalar = AsyncMock(return_value=buyer_id)
+
+        with pytest.raises(AppException) as exc_info:
+            await BuyDealService(mock_db_session).create_deal(
+                str(buyer_id), str(uuid4()), str(uuid4())
+            )
+
+        assert exc_info.value.status_code == 400
+        reserve = str(mock_db_session.execute.await_args_list[1].args[0])
+        assert "accounts.seller_id NOT IN" in reserve
+        mock_db_session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_settle_releases_or_sells_reserved_account(self, mock_db_session):
+        """Test ending a deal moves only a reserved account to its final status."""
+        from app.schemas.deal import DealStatus
+        from app.services.buy.deal_service import settle_account_reservation
+
+        await settle_account_reservation(mock_db_session, uuid4(), DealStatus.PENDING)
+        mock_db_session.execute.assert_not_awaited()
+
+        mock_db_session.execute.return_value = MagicMock(
+            scalar_one_or_none=MagicMock(return_value=None)
+        )
+        await settle_account_reservation(mock_db_session, uuid4(), "cancelled")
+        statement = mock_db_session.execute.await_args.args[0]
+        assert "accounts.status = :status_1" in str(statement)
+        assert statement.compile().params["status"] == "active"
+
+
+class TestSimilarAccounts:
+    """Test the precomputed similar accounts index."""
+
+    def _vector(self, price, rank=None, features=()):
+        from app.services.buy.similar_accounts import AccountVector
+
+        return AccountVector(uuid4(), float(price), rank, frozenset(features), None)
+
+    def test_neighbors_ranked_by_price_rank_and_features(self):
+        """Test closer price, same rank and shared features rank first; out-of-band is dropped."""
+        from app.services.buy.similar_accounts import nearest_neighbors
+
+        target = self._vector(100, "Diamond", {"skins", "rare"})
+        twin = self._vector(105, "diamond", {"skins", "rare"})
+        same_price = self._vector(100, "Gold")
+        far = self._vector(125, "Diamond")
+        out_of_band = self._vector(200, "Diamond", {"skins", "rare"})
+
+        neighbors = nearest_neighbors(
+            [target, twin, same_price, far, out_of_band], k=5, price_band=0.3
+        )
+
+        assert neighbors[target.id] == [twin.id, same_price.id, far.id]
+        assert target.id not in neighbors[target.id]
+        assert neighbors[out_of_band.id] == []
+
+    def test_candidates_cap_scores_only_price_nearest(self):
+        """Test only the price-nearest candidates are considered per account."""
+        from app.services.buy.similar_accounts import nearest_neighbors
+
+        accounts = [self._vector(100 + offset) for offset in range(0, 20)]
+        target = accounts[10]
+
+        neighbors = nearest_neighbors(accounts, k=10, candidates=4, targets=[target])
+
+        assert set(neighbors[target.id]) == {a.id for a in accounts[8:13]} - {target.id}
+
+    @pytest.mark.asyncio
+    async def test_detail_page_reads_neighbors_by_key(self, mock_db_session):
+        """Test indexed neighbors are loaded by ID in index order, skipping inactive ones."""
+        from app.services.buy.account_browsing_service import AccountBrowsingService
+
+        first, second, gone = uuid4(), uuid4(), uuid4()
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=f"{second},{gone},{first}")
+        rows = []
+        for account_id in (first, second):
+            row = MagicMock(id=account_id, price=10, currency="EGP", views_count=0, seller=None)
+            row.configure_mock(images=[], features=[], description="", rank=None)
+            row.configure_mock(title="Acc", game="PUBG", seller_id=uuid4())
+            row.configure_mock(is_verified=False, is_featured=False)
+            row.created_at = datetime.now(timezone.utc)
+            rows.append(row)
+        mock_db_session.execute = AsyncMock(
+            return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=lambda: rows)))
+        )
+
+        with patch("app.core.redis.redis_client", redis):
+            response = await AccountBrowsingService(mock_db_session).get_similar_accounts(
+                str(uuid4()), limit=10
+            )
+
+        assert [a.id for a in response.accounts] == [str(second), str(first)]
+        assert mock_db_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_account_loads_target_before_nearest_prices(self, mock_db_session):
+        """Test the account itself is ordered first so the candidate limit cannot drop it."""
+        from app.services.buy.similar_accounts import SimilarAccountsIndex
+
+        target, neighbor = uuid4(), uuid4()
+        rows = [
+            MagicMock(id=target, price=100, rank=None, created_at=None),
+            MagicMock(id=neighbor, price=101, rank=None, created_at=None),
+        ]
+        mock_db_session.execute = AsyncMock(
+            side_effect=[
+                MagicMock(one_or_none=MagicMock(return_value=MagicMock(game="PUBG", price=100))),
+                MagicMock(all=MagicMock(return_value=rows)),
+                MagicMock(all=MagicMock(return_value=[])),
+            ]
+        )
+
+        with patch("app.core.redis.redis_client", None):
+            neighbors = await SimilarAccountsIndex().refresh_account(mock_db_session, target)
+
+        assert neighbors == [neighbor]
+        query = str(mock_db_session.execute.await_args_list[1].args[0])
+        assert "ORDER BY accounts.id != :id_2, abs(accounts.price - :price_3)" in query
+
+
+class TestAccountFacets:
+    """Test faceted filter counts."""
+
+    def test_equivalent_filters_share_a_signature(self):
+        """Test case, whitespace and unset filters do not change the signature."""
+        from app.services.account_facets import AccountFacets, filter_signature
+
+        a = filter_signature(game=" PUBG ", level=None, price_min=100)
+        b = filter_signature(game="pubg", level="  ", price_min=100.0)
+
+        assert a == b == {"game": "pubg", "price_min": 100.0}
+        assert AccountFacets._digest(a) == AccountFacets._digest(b)
+
+    @pytest.mark.asyncio
+    async def test_compute_splits_grouping_sets_into_facets(self, mock_db_session):
+        """Test one grouped query yields game, rank, price bucket and total facets."""
+        from app.services.account_facets import AccountFacets
+
+        def row(grouping_set, **values):
+            fields = {
+                "game": None,
+                "rank": None,
+                "bucket": None,
+                "game_count": 0,
+                "level_count": 0,
+                "bucket_count": 0,
+                "total": 0,
+                "price_min": None,
+                "price_max": None,
+            }
+            return MagicMock(grouping_set=grouping_set, **{**fields, **values})
+
+        rows = [
+            row(0b011, game="Valorant", game_count=2),
+            row(0b011, game="PUBG", game_count=5),
+            row(0b011, game="Empty", game_count=0),
+            row(0b101, rank="Diamond", level_count=3),
+            row(0b101, rank=None, level_count=4),
+            row(0b110, bucket=1, bucket_count=6),
+            row(0b111, total=7, price_min=50, price_max=450),
+        ]
+        mock_db_session.execute = AsyncMock(return_value=MagicMock(all=lambda: rows))
+
+        facets = await AccountFacets.compute(mock_db_session, {"game": "pubg"})
+
+        mock_db_session.execute.assert_awaited_once()
+        assert "GROUPING SETS" in str(mock_db_session.execute.await_args.args[0])
+        assert facets["games"] == [
+            {"value": "PUBG", "count": 5},
+            {"value": "Valorant", "count": 2},
+        ]
+        assert facets["levels"] == [{"value": "Diamond", "count": 3}]
+        assert [b["count"] for b in facets["price_buckets"]] == [0, 6, 0, 0]
+        assert facets["total"] == 7
+        assert (facets["price_min"], facets["price_max"]) == (50.0, 450.0)
+
+    @pytest.mark.asyncio
+    async def test_cached_per_version_and_signature(self, mock_db_session):
+        """Test results are cached under the current version and reused."""
+        from app.services.account_facets import AccountFacets
+
+        store = {"facets:accounts:version": "3"}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.set = AsyncMock(side_effect=lambda key, value, ex: store.__setitem__(key, value))
+        facets = AccountFacets(ttl_seconds=60)
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(
+                AccountFacets, "compute", AsyncMock(return_value={"games": []})
+            ) as compute,
+        ):
+            await facets.get(mock_db_session, game="PUBG")
+            assert await facets.get(mock_db_session, game="pubg ") == {"games": []}
+
+        compute.assert_awaited_once()
+        assert any(key.startswith("facets:accounts:3:") for key in store)
+
+
+class TestHomeFeedSnapshots:
+    """Test materialized home feed snapshots."""
+
+    def _redis(self, store=None, members=()):
+        store = {} if store is None else store
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.sismember = AsyncMock(return_value=False)
+        redis.scard = AsyncMock(return_value=len(members))
+        redis.smembers = AsyncMock(return_value=set(members))
+        redis.delete = AsyncMock()
+        redis.srem = AsyncMock()
+        pipe = MagicMock()
+        pipe.set = MagicMock(side_effect=lambda key, value, **kwargs: store.__setitem__(key, value))
+        pipe.execute = AsyncMock()
+        redis.pipeline.return_value = pipe
+        return redis
+
+    def _feed(self, accounts=1, page=1):
+        from app.schemas.home import AccountCard, HomeFeedResponse
+
+        card = AccountCard(
+            id="1", title="Acc", game="PUBG", price=10, image_url="x", rating=5, reviews=1
+        )
+        return HomeFeedResponse(accounts=[card] * accounts, pagination={"page": page})
+
+    @pytest.mark.asyncio
+    async def test_hit_is_a_single_get(self, mock_db_session):
+        """Test a stored snapshot is returned as-is without touching the database."""
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        redis = self._redis({"home:feed:snapshot:::1": '{"success":true}'})
+
+        with patch("app.core.redis.redis_client", redis):
+            body = await HomeFeedSnapshots().get_or_build(mock_db_session, None, " ", 1)
+
+        assert body == '{"success":true}'
+        redis.get.assert_awaited_once()
+        mock_db_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_renders_and_stores_response_body(self, mock_db_session):
+        """Test a miss builds the feed once and stores the serialized response."""
+        import json
+
+        from app.services.home.feed_service import HomeFeedService
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        store = {}
+        redis = self._redis(store)
+        feed = self._feed(page=2)
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(
+                HomeFeedService, "get_home_feed", AsyncMock(return_value=feed)
+            ) as get_home_feed,
+        ):
+            body = await HomeFeedSnapshots().get_or_build(mock_db_session, None, "PUBG", 2)
+
+        get_home_feed.assert_awaited_once_with(category=None, game="pubg", page=2, limit=20)
+        assert json.loads(body)["data"]["pagination"] == {"page": 2}
+        assert store["home:feed:snapshot::pubg:2"] == body
+        redis.pipeline.return_value.sadd.assert_called_once_with(
+            "home:feed:snapshots", "\x1fpubg\x1f2"
+        )
+
+    @pytest.mark.asyncio
+    async def test_empty_filtered_page_is_not_stored(self, mock_db_session):
+        """Test filters matching no accounts are served but never take an index slot."""
+        from app.services.home.feed_service import HomeFeedService
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        store = {}
+        redis = self._redis(store)
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(
+                HomeFeedService, "get_home_feed", AsyncMock(return_value=self._feed(accounts=0))
+            ),
+        ):
+            body = await HomeFeedSnapshots().get_or_build(mock_db_session, None, "junk", 1)
+
+        assert body is not None
+        assert store == {}
+        pipe = redis.pipeline.return_value
+        pipe.sadd.assert_not_called()
+        pipe.srem.assert_called_once_with("home:feed:snapshots", "\x1fjunk\x1f1")
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_snapshot_expiry(self, mock_db_session):
+        """Test a rebuild only overwrites a live snapshot and does not extend its TTL."""
+        from app.services.home.feed_service import HomeFeedService
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        redis = self._redis()
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(HomeFeedService, "get_home_feed", AsyncMock(return_value=self._feed())),
+        ):
+            await HomeFeedSnapshots().build(mock_db_session, "", "pubg", 1, refresh=True)
+
+        pipe = redis.pipeline.return_value
+        assert pipe.set.call_args.kwargs == {"xx": True, "keepttl": True}
+        pipe.sadd.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_full_index_falls_back_to_normal_feed(self, mock_db_session):
+        """Test new combinations are not snapshotted once the index is full."""
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        redis = self._redis(members=["a\x1fb\x1f1", "c\x1fd\x1f1"])
+
+        with patch("app.core.redis.redis_client", redis):
+            body = await HomeFeedSnapshots(max_keys=2).get_or_build(mock_db_session, None, "new", 1)
+
+        assert body is None
+
+    def test_only_first_pages_at_default_size_are_eligible(self):
+        """Test eligibility is limited to the snapshotted pages and page size."""
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        snapshots = HomeFeedSnapshots(pages=3, limit=20)
+
+        assert snapshots.eligible(3, 20)
+        assert not snapshots.eligible(4, 20)
+        assert not snapshots.eligible(1, 50)
+
+    @pytest.mark.asyncio
+    async def test_schedule_rebuild_is_debounced(self):
+        """Test only the first change within the debounce window queues a rebuild."""
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        redis = MagicMock()
+        redis.set = AsyncMock(side_effect=[True, None])
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch("app.tasks.home_tasks.rebuild_home_feed_snapshots.apply_async") as apply_async,
+        ):
+            snapshots = HomeFeedSnapshots(debounce_seconds=10)
+            await snapshots.schedule_rebuild()
+            await snapshots.schedule_rebuild()
+
+        apply_async.assert_called_once_with(countdown=10)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_all_covers_index_and_default_pages(self, mock_db_session):
+        """Test a rebuild renders every indexed combination plus the unfiltered pages."""
+        from app.services.home.feed_snapshot import HomeFeedSnapshots
+
+        redis = self._redis(members=["\x1fpubg\x1f2", "\x1fcs\x1f1", "garbage"])
+        live = {"home:feed:snapshot::pubg:2"}
+        exists = []
+        pipe = redis.pipeline.return_value
+        pipe.exists = MagicMock(side_effect=lambda key: exists.append(key in live))
+        pipe.execute = AsyncMock(side_effect=lambda: exists)
+        snapshots = HomeFeedSnapshots(pages=2)
+
+        with (
+            patch("app.core.redis.redis_client", redis),
+            patch.object(HomeFeedSnapshots, "build", AsyncMock()) as build,
+        ):
+            rebuilt = await snapshots.rebuild_all(mock_db_session)
+
+        assert rebuilt == 3
+        assert {(call.args[1:], call.kwargs["refresh"]) for call in build.await_args_list} == {
+            (("", "", 1), False),
+            (("", "", 2), False),
+            (("", "pubg", 2), True),
+        }
+        redis.delete.assert_awaited_once_with("home:feed:snapshot:pending")
+        assert set(redis.srem.await_args.args[1:]) == {"\x1fcs\x1f1", "garbage"}
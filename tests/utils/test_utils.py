@@ -6,6 +6,8 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from io import BytesIO
 
+from fastapi import UploadFile
+
 from app.utils.storage import upload_file_to_storage
 from app.utils.redis_pubsub import RedisPubSubManager, publish_to_channel
 
@@ -13,31 +15,61 @@ from app.utils.redis_pubsub import RedisPubSubManager, publish_to_channel
 class TestStorage:
     """Test storage utilities."""
 
-    @pytest.mark.asyncio
-    async def test_upload_file_returns_url(self):
-        """Test upload file returns URL."""
-        import asyncio
-        
-        # Create a proper async mock for file.read()
-        async def mock_read():
-            return b"test content"
-        
-        # Mock the Minio client
+    @pytest.fixture(autouse=True)
+    def storage(self):
+        """Give every test a fresh shared client backed by a mocked Minio."""
+        from app.utils import storage
+
+        storage.close_storage()
         with patch("app.utils.storage.Minio") as mock_minio:
             mock_client = MagicMock()
             mock_minio.return_value = mock_client
             mock_client.bucket_exists.return_value = True
-            mock_client.put_object = MagicMock()
+            yield mock_client
+        storage.close_storage()
+
+    @pytest.mark.asyncio
+    async def test_upload_file_returns_url(self, storage):
+        """Test upload file returns URL."""
+        file = UploadFile(filename="test.jpg", file=BytesIO(b"test content"))
+
+        result = await upload_file_to_storage(file, folder="test")
+        assert isinstance(result, str)
+        assert "http" in result.lower()
+
+    @pytest.mark.asyncio
+    async def test_upload_streams_file_object(self, storage):
+        """Test the file object is handed to put_object instead of a buffered copy."""
+        stream = BytesIO(b"test content")
+        file = UploadFile(filename="test.jpg", file=stream)
+
+        await upload_file_to_storage(file, folder="test")
+
+        kwargs = storage.put_object.call_args.kwargs
+        assert kwargs["data"] is stream
+        assert kwargs["length"] == len(b"test content")
+        assert kwargs["object_name"].startswith("test/")
+
+    @pytest.mark.asyncio
+    async def test_bucket_checked_once(self, storage):
+        """Test the bucket existence check is cached across uploads."""
+        for _ in range(3):
+            await upload_file_to_storage(UploadFile(filename="a.jpg", file=BytesIO(b"x")))
+
+        assert storage.bucket_exists.call_count == 1
+        assert storage.put_object.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_upload_many_keeps_order(self, storage):
+        """Test batch upload returns one URL per file in input order."""
+        from app.utils.storage import upload_files_to_storage
+
+        files = [UploadFile(filename=f"{i}.jpg", file=BytesIO(b"x")) for i in range(5)]
 
-            # Create a proper mock UploadFile
-            file = MagicMock()
-            file.filename = "test.jpg"
-            file.content_type = "image/jpeg"
-            file.read = mock_read  # Async function
+        urls = await upload_files_to_storage(files, folder="listings")
 
-            result = await upload_file_to_storage(file, folder="test")
-            assert isinstance(result, str)
-            assert "http" in result.lower()
+        assert [url.rsplit("_", 1)[1] for url in urls] == [f"{i}.jpg" for i in range(5)]
+        assert storage.put_object.call_count == 5
 
 
 class TestRedisPubSub:
@@ -67,6 +99,135 @@ class TestRedisPubSub:
         manager.stop_listening()
         assert manager._running is False
 
+    @pytest.mark.asyncio
+    async def test_listener_delivers_pattern_messages(self):
+        """Test psubscribe deliveries reach the handler and own publications are skipped."""
+        from app.core import serialization
+
+        manager = RedisPubSubManager()
+        payload = {"event": "presence", "data": {"room_id": "room_1"}}
+        frames = [
+            {"type": "psubscribe", "channel": "chat:*", "data": 1},
+            {
+                "type": "pmessage",
+                "pattern": "chat:*",
+                "channel": "chat:room_1",
+                "data": serialization.dumps(payload),
+            },
+            {
+                "type": "pmessage",
+                "pattern": "chat:*",
+                "channel": "chat:room_1",
+                "data": serialization.dumps({**payload, "origin": manager.origin}),
+            },
+        ]
+
+        async def get_message(timeout):
+            if not frames:
+                manager.stop_listening()
+                return None
+            return frames.pop(0)
+
+        manager.pubsub = MagicMock(get_message=get_message)
+        handler = AsyncMock()
+
+        await manager.listen_to_messages(handler)
+
+        handler.assert_awaited_once_with("chat:room_1", payload)
+
+    @pytest.mark.asyncio
+    async def test_publish_skip_local_stamps_origin(self):
+        """Test skip_local publications carry this instance's origin."""
+        from app.core import serialization
+
+        manager = RedisPubSubManager()
+        redis = AsyncMock()
+        with patch("app.core.redis.redis_client", redis):
+            assert await manager.publish_to_channel("chat:room_1", {"event": "x"}) is True
+            await manager.publish_to_channel("chat:room_1", {"event": "x"}, skip_local=True)
+
+        plain, stamped = [serialization.loads(c.args[1]) for c in redis.publish.await_args_list]
+        assert "origin" not in plain
+        assert stamped["origin"] == manager.origin
+
+    @pytest.mark.asyncio
+    async def test_flush_room_signals_broadcasts_locally_and_publishes(self):
+        """Test coalesced presence reaches local sockets and other instances."""
+        from app.api.v1.chat import websocket_routes
+        from app.api.v1.chat.websocket import ConnectionManager
+
+        manager = ConnectionManager()
+        websocket = AsyncMock()
+        payload = {"room_id": "room_1", "typing": ["user_2"], "joined": [], "left": []}
+        with patch.object(websocket_routes, "manager", manager), patch.object(
+            websocket_routes, "publish_to_channel", AsyncMock(return_value=True)
+        ) as publish:
+            await manager.connect(websocket, "user_1", "room_1")
+            await websocket_routes.flush_room_signals("room_1", payload)
+
+        message = {"event": "presence", "data": payload}
+        websocket.send_json.assert_awaited_once_with(message)
+        publish.assert_awaited_once_with("chat:room_1", message, skip_local=True)
+
+    @pytest.mark.asyncio
+    async def test_published_notification_reaches_multiplexed_socket(self):
+        """Test a service publication travels through the listener to a /ws socket."""
+        import fnmatch
+        import uuid
+
+        from app.api.v1.chat import websocket
+        from app.services.notifications.base import publish_notification_update
+        from app.utils.redis_pubsub import handle_redis_message
+
+        class FakePubSub:
+            def __init__(self):
+                self.patterns = []
+                self.frames = []
+
+            async def psubscribe(self, pattern):
+                self.patterns.append(pattern)
+
+            async def get_message(self, timeout):
+                if not self.frames:
+                    listener.stop_listening()
+                    return None
+                return self.frames.pop(0)
+
+        pubsub = FakePubSub()
+
+        async def publish(channel, data):
+            for pattern in pubsub.patterns:
+                if fnmatch.fnmatch(channel, pattern):
+                    pubsub.frames.append(
+                        {"type": "pmessage", "pattern": pattern, "channel": channel, "data": data}
+                    )
+            return 1
+
+        redis = AsyncMock()
+        redis.publish.side_effect = publish
+        redis.register_script = MagicMock(return_value=AsyncMock())
+        user_id, notification_id = uuid.uuid4(), uuid.uuid4()
+        manager = websocket.ConnectionManager()
+        socket = AsyncMock()
+        listener = RedisPubSubManager()
+        listener.pubsub = pubsub
+        await pubsub.psubscribe("notifications:*")
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            websocket, "manager", manager
+        ), patch(
+            "app.services.notifications.unread_counter.notification_unread_counter.get",
+            AsyncMock(return_value=2),
+        ):
+            await manager.connect(socket, str(user_id), websocket.notification_stream(str(user_id)))
+            await publish_notification_update(user_id, notification_id, "read")
+            await listener.listen_to_messages(handle_redis_message)
+
+        assert [c.args[0] for c in socket.send_json.await_args_list] == [
+            {"event": "notification_read", "data": {"notification_id": str(notification_id)}},
+            {"event": "badge_update", "data": {"count": 2}},
+        ]
+
 
 class TestRateLimit:
     """Test rate limiting utilities."""
@@ -75,3 +236,803 @@ class TestRateLimit:
         """Test rate limit module imports."""
         from app.utils import rate_limit
         assert rate_limit is not None
+
+
+class TestRoomSignalCoalescer:
+    """Test typing throttling and presence coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_typing_is_throttled_per_user_and_room(self):
+        """Test repeated typing frames inside the throttle window are dropped."""
+        from app.utils.presence import RoomSignalCoalescer
+
+        coalescer = RoomSignalCoalescer(AsyncMock(), interval_seconds=10, typing_throttle_seconds=5)
+        assert coalescer.typing("user_1", "room_1") is True
+        assert coalescer.typing("user_1", "room_1") is False
+        assert coalescer.typing("user_1", "room_2") is True
+        await coalescer.flush_all()
+
+    @pytest.mark.asyncio
+    async def test_signals_are_coalesced_into_one_flush(self):
+        """Test several typers and a join produce one payload per room."""
+        from app.utils.presence import RoomSignalCoalescer
+
+        flush = AsyncMock()
+        coalescer = RoomSignalCoalescer(flush, interval_seconds=10, typing_throttle_seconds=5)
+        coalescer.typing("user_1", "room_1")
+        coalescer.typing("user_2", "room_1")
+        coalescer.joined("user_3", "room_1")
+        await coalescer.flush_all()
+
+        flush.assert_awaited_once()
+        room_id, payload = flush.await_args.args
+        assert room_id == "room_1"
+        assert payload["typing"] == ["user_1", "user_2"]
+        assert payload["joined"] == ["user_3"]
+        assert payload["left"] == []
+
+    @pytest.mark.asyncio
+    async def test_join_then_leave_cancels_out(self):
+        """Test a join followed by a leave in one interval sends nothing."""
+        from app.utils.presence import RoomSignalCoalescer
+
+        flush = AsyncMock()
+        coalescer = RoomSignalCoalescer(flush, interval_seconds=10)
+        coalescer.joined("user_1", "room_1")
+        coalescer.left("user_1", "room_1")
+        await coalescer.flush_all()
+
+        flush.assert_not_awaited()
+
+
+class TestConnectionManager:
+    """Test WebSocket connection registry."""
+
+    @pytest.mark.asyncio
+    async def test_membership_refcounts_across_connections(self):
+        """Test a user stays in a room until their last connection leaves it."""
+        from app.api.v1.chat.websocket import ConnectionManager
+
+        manager = ConnectionManager()
+        first = await manager.connect(AsyncMock(), "user_1", "room_1")
+        second = await manager.connect(AsyncMock(), "user_1", "room_1")
+
+        assert manager.is_user_in_room("user_1", "room_1")
+        assert manager.room_users["room_1"]["user_1"] == 2
+
+        await manager.disconnect(first)
+        assert manager.is_user_in_room("user_1", "room_1")
+
+        await manager.disconnect(second)
+        assert not manager.is_user_in_room("user_1", "room_1")
+        assert "room_1" not in manager.room_users
+        assert "user_1" not in manager.user_connections
+
+    @pytest.mark.asyncio
+    async def test_join_and_leave_additional_room(self):
+        """Test joining a second room re-keys the connection."""
+        from app.api.v1.chat.websocket import ConnectionManager
+
+        manager = ConnectionManager()
+        conn_id = await manager.connect(AsyncMock(), "user_1", "room_1")
+
+        assert await manager.join_room(conn_id, "room_2") is True
+        assert await manager.join_room(conn_id, "room_2") is False
+        assert manager.get_active_users_in_room("room_2") == {"user_1"}
+
+        assert await manager.leave_room(conn_id, "room_2") is True
+        assert manager.get_active_users_in_room("room_2") == set()
+        assert manager.active_connections[conn_id].rooms == {"room_1"}
+
+    @pytest.mark.asyncio
+    async def test_frame_routing_requires_subscription(self):
+        """Test room-scoped frames only route to subscribed rooms."""
+        from app.api.v1.chat import websocket_routes
+        from app.api.v1.chat.websocket import ConnectionManager
+
+        manager = ConnectionManager()
+        with patch.object(websocket_routes, "manager", manager):
+            conn_id = await manager.connect(AsyncMock(), "user_1", "room_1")
+            assert websocket_routes.resolve_frame_room(conn_id, None) == "room_1"
+            assert websocket_routes.resolve_frame_room(conn_id, "room_2") is None
+
+            await manager.join_room(conn_id, "room_2")
+            assert websocket_routes.resolve_frame_room(conn_id, "room_2") == "room_2"
+            assert websocket_routes.resolve_frame_room(conn_id, None) is None
+
+    @pytest.mark.asyncio
+    async def test_user_connected_on_another_instance(self):
+        """Test a user whose last local socket closed is still connected via another node."""
+        from app.api.v1.chat.websocket import CONNECTED_ROOM, ConnectionManager
+
+        manager = ConnectionManager()
+        redis = AsyncMock()
+        redis.hexists.return_value = True
+        script = AsyncMock()
+        redis.register_script = MagicMock(return_value=script)
+        with patch("app.core.redis.redis_client", redis):
+            conn_id = await manager.connect(AsyncMock(), "user_1")
+            await manager.disconnect(conn_id)
+
+            assert await manager.is_user_connected_cluster("user_1") is True
+            redis.hexists.assert_awaited_with("ws:room:connected:users", "user_1")
+
+            redis.hexists.return_value = False
+            assert await manager.is_user_connected_cluster("user_1") is False
+
+        joined, left = script.await_args_list
+        assert joined.kwargs["args"] == ["user_1", f"{CONNECTED_ROOM}|user_1"]
+        assert left.kwargs["args"] == ["user_1", f"{CONNECTED_ROOM}|user_1"]
+
+
+class TestRoomAccessCache:
+    """Test chat room membership cache."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_hash_answers_without_database(self):
+        """Test a loaded membership hash is authoritative for hits and misses."""
+        from app.services.chat.access_cache import RoomAccessCache
+
+        cache = RoomAccessCache()
+        redis = AsyncMock()
+        redis.hmget.side_effect = [["buyer", "1"], [None, "1"]]
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            cache, "_fetch_roles", AsyncMock()
+        ) as fetch_roles:
+            assert await cache.get_role("user_1", "room_1") == "buyer"
+            assert await cache.has_access("user_1", "room_2") is False
+
+        fetch_roles.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_all_memberships(self):
+        """Test a cold hash is rebuilt in bulk from the database."""
+        from app.services.chat.access_cache import RoomAccessCache
+
+        cache = RoomAccessCache()
+        redis = MagicMock()
+        redis.hmget = AsyncMock(return_value=[None, None])
+        pipe = redis.pipeline.return_value
+        pipe.execute = AsyncMock()
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            cache, "_fetch_roles", AsyncMock(return_value={"room_1": "seller"})
+        ):
+            assert await cache.get_role("user_1", "room_1") == "seller"
+
+        pipe.hset.assert_called_once_with(
+            "chat:acl:user_1", mapping={"*": "1", "room_1": "seller"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_sender_snapshot_answers_without_database(self):
+        """Test a cached sender snapshot is used as-is, with blanks meaning unset."""
+        from app.services.chat.access_cache import RoomAccessCache
+
+        cache = RoomAccessCache()
+        redis = AsyncMock()
+        redis.hmget.return_value = ["alice", "", "1"]
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            cache, "_execute", AsyncMock()
+        ) as execute:
+            assert await cache.get_sender("user_1") == ("alice", None)
+
+        redis.hmget.assert_awaited_once_with(
+            "chat:sender:user_1", ["username", "avatar_url", "*"]
+        )
+        execute.assert_not_awaited()
+
+
+class TestUnreadCounter:
+    """Test Redis-backed chat unread counters."""
+
+    @pytest.mark.asyncio
+    async def test_record_message_skips_sender(self):
+        """Test only the other participants' counters are incremented."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        script = redis.register_script.return_value = AsyncMock()
+        pipe = redis.pipeline.return_value
+        pipe.execute = AsyncMock(return_value=[1])
+        members = AsyncMock(return_value={"sender": "buyer", "other": "seller"})
+
+        with patch("app.core.redis.redis_client", redis), patch(
+            "app.services.chat.unread_counter.room_access_cache.get_room_members", members
+        ), patch.object(counter, "_persist_increment", AsyncMock()) as persist:
+            await counter.record_message("room_1", "sender")
+
+        script.assert_awaited_once_with(
+            keys=[
+                "chat:unread:other",
+                "chat:read:other",
+                "chat:unread:dirty",
+                "chat:unread:guard:other",
+            ],
+            args=["room_1", "*", "other", counter.ttl_seconds, counter.GUARD_TTL_SECONDS],
+            client=pipe,
+        )
+        persist.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_record_message_persists_unloaded_recipients(self):
+        """Test recipients whose hash was evicted are incremented in Postgres instead."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        redis.register_script.return_value = AsyncMock()
+        redis.pipeline.return_value.execute = AsyncMock(return_value=[1, 0])
+        members = AsyncMock(return_value={"sender": "buyer", "loaded": "seller", "evicted": "x"})
+
+        with patch("app.core.redis.redis_client", redis), patch(
+            "app.services.chat.unread_counter.room_access_cache.get_room_members", members
+        ), patch.object(counter, "_persist_increment", AsyncMock()) as persist, patch.object(
+            counter, "_release", AsyncMock()
+        ) as release:
+            await counter.record_message("room_1", "sender")
+
+        persist.assert_awaited_once_with("room_1", ["evicted"])
+        release.assert_awaited_once_with(["evicted"])
+
+    @pytest.mark.asyncio
+    async def test_record_message_persists_everyone_when_redis_fails(self):
+        """Test a failed pipeline sends every recipient's increment to Postgres."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        redis.register_script.return_value = AsyncMock()
+        redis.pipeline.return_value.execute = AsyncMock(side_effect=ConnectionError("down"))
+        members = AsyncMock(return_value={"sender": "buyer", "a": "seller", "b": "mediator"})
+
+        with patch("app.core.redis.redis_client", redis), patch(
+            "app.services.chat.unread_counter.room_access_cache.get_room_members", members
+        ), patch.object(counter, "_persist_increment", AsyncMock()) as persist:
+            await counter.record_message("room_1", "sender")
+
+        persist.assert_awaited_once_with("room_1", ["a", "b"])
+
+    @pytest.mark.asyncio
+    async def test_load_does_not_cache_across_a_direct_write(self):
+        """Test a rebuild is cached only against the guard version read before the SELECT."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        redis.hget = AsyncMock(return_value="3")
+        load = redis.register_script.return_value = AsyncMock(return_value=0)
+        db = AsyncMock()
+        db.execute.return_value.all = MagicMock(return_value=[("room_1", 2, None)])
+
+        with patch("app.core.redis.redis_client", redis):
+            counts, read_markers = await counter._load("user_1", db)
+
+        assert counts == {"room_1": 2} and read_markers == {}
+        redis.hget.assert_awaited_once_with("chat:unread:guard:user_1", "version")
+        assert load.await_args.kwargs["args"] == ["3", counter.ttl_seconds, 1, "room_1", 2]
+
+    @pytest.mark.asyncio
+    async def test_mark_read_of_unloaded_hash_goes_to_postgres(self):
+        """Test a reset on a missing hash is persisted rather than creating a partial hash."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        redis.register_script.return_value = AsyncMock(return_value=None)
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            counter, "_persist_read", AsyncMock(return_value=4)
+        ) as persist, patch.object(counter, "_release", AsyncMock()) as release:
+            assert await counter.mark_read("user_1", "room_1") == 4
+
+        persist.assert_awaited_once()
+        release.assert_awaited_once_with(["user_1"])
+
+    @pytest.mark.asyncio
+    async def test_reconcile_skips_unloaded_hashes(self):
+        """Test users whose hash lost its loaded marker are not written back."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = MagicMock()
+        redis.spop = AsyncMock(return_value=["loaded", "evicted"])
+        redis.pipeline.return_value.execute = AsyncMock(
+            return_value=[{"*": "1", "room_1": "2"}, {}, {"room_1": "1"}, {}]
+        )
+        db = AsyncMock()
+
+        with patch("app.core.redis.redis_client", redis):
+            assert await counter.reconcile(db) == 2
+
+        rows = db.execute.await_args.args[1]
+        assert rows == [
+            {
+                "b_user_id": "loaded",
+                "b_room_id": "room_1",
+                "b_unread_count": 2,
+                "b_last_seen_at": None,
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_counts_read_from_loaded_hash(self):
+        """Test room counts come from one HMGET when the hash is loaded."""
+        from app.services.chat.unread_counter import UnreadCounter
+
+        counter = UnreadCounter()
+        redis = AsyncMock()
+        redis.hmget.return_value = ["1", "3", None]
+
+        with patch("app.core.redis.redis_client", redis), patch.object(
+            counter, "_load", AsyncMock()
+        ) as load:
+            counts = await counter.get_counts("user_1", ["room_1", "room_2"])
+
+        assert counts == {"room_1": 3, "room_2": 0}
+        load.assert_not_awaited()
+
+
+class TestImageVariants:
+    """Test listing image variant rendering."""
+
+    def _jpeg(self, size, orientation=None):
+        from PIL import Image
+
+        image = Image.new("RGB", size, (200, 40, 40))
+        exif = image.getexif()
+        if orientation:
+            exif[0x0112] = orientation
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", exif=exif.tobytes())
+        return buffer.getvalue()
+
+    def test_renders_thumbnail_and_smaller_widths_only(self):
+        """Test widths at or above the original are skipped and the thumbnail fits its box."""
+        from app.utils.images import render_variants
+
+        rendered = render_variants(
+            self._jpeg((1000, 500)), thumbnail_size=320, widths=[640, 1280], formats=["webp"]
+        )
+
+        assert (rendered.width, rendered.height) == (1000, 500)
+        assert [(v.suffix, v.width, v.height) for v in rendered.variants] == [
+            ("640w", 640, 320),
+            ("thumb", 320, 160),
+        ]
+        assert all(v.content_type == "image/webp" for v in rendered.variants)
+
+    def test_variants_are_upright_and_stripped(self):
+        """Test EXIF orientation is applied and no metadata is kept."""
+        from PIL import Image
+
+        from app.utils.images import render_variants
+
+        rendered = render_variants(
+            self._jpeg((800, 400), orientation=6), widths=[200], formats=["webp"]
+        )
+
+        assert (rendered.width, rendered.height) == (400, 800)
+        variant = Image.open(BytesIO(rendered.variants[0].data))
+        assert variant.size == (200, 400)
+        assert not variant.getexif()
+        assert "icc_profile" not in variant.info
+
+    def test_read_dimensions_applies_orientation(self):
+        """Test upload dimensions match the upright size the variants report."""
+        from app.utils.images import read_dimensions
+
+        assert read_dimensions(self._jpeg((800, 400))) == (800, 400)
+        assert read_dimensions(self._jpeg((800, 400), orientation=6)) == (400, 800)
+
+    def test_read_dimensions_rewinds_uploaded_file(self):
+        """Test a streamed upload is left at its start for the storage upload."""
+        from app.utils.images import read_dimensions
+
+        upload = BytesIO(self._jpeg((800, 400)))
+
+        assert read_dimensions(upload) == (800, 400)
+        assert upload.tell() == 0
+
+    def test_variant_names(self):
+        """Test variant names sit next to the original."""
+        from app.utils.images import thumbnail_url, variant_name
+
+        assert variant_name("listings/a_b.jpg", "640w", "avif") == "listings/a_b_640w.avif"
+        assert thumbnail_url("http://s:9000/bucket/listings/a.png") == (
+            "http://s:9000/bucket/listings/a_thumb.webp"
+        )
+
+
+class TestHttpCache:
+    """Test conditional GET helpers."""
+
+    def _request(self, if_none_match=None):
+        headers = {"if-none-match": if_none_match} if if_none_match else {}
+        return MagicMock(headers=headers)
+
+    def test_policy_header(self):
+        """Test Cache-Control rendering with and without stale-while-revalidate."""
+        from app.utils.http_cache import CachePolicy
+
+        assert CachePolicy(60, 300).header == "public, max-age=60, stale-while-revalidate=300"
+        assert CachePolicy(0, public=False).header == "private, max-age=0"
+
+    def test_etag_matching(self):
+        """Test If-None-Match lists, weak tags and wildcards."""
+        from app.utils.http_cache import compute_etag, etag_matches
+
+        etag = compute_etag(b'{"a":1}')
+
+        assert etag == compute_etag(b'{"a":1}') != compute_etag(b'{"a":2}')
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_current_client_gets_empty_304(self):
+        """Test a matching If-None-Match returns 304 with the same validators."""
+        from app.schemas.common import APIResponse
+        from app.utils.http_cache import CachePolicy, cached_json_response
+
+        policy = CachePolicy(60, 300)
+        payload = APIResponse.success_response(data={"games": []})
+
+        first = cached_json_response(self._request(), payload, policy)
+        second = cached_json_response(self._request(first.headers["etag"]), payload, policy)
+
+        assert first.status_code == 200
+        assert first.body == payload.model_dump_json().encode()
+        assert second.status_code == 304
+        assert second.body == b""
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"] == policy.header
+
+
+class TestSerialization:
+    """Test the orjson codec and response classes."""
+
+    def test_round_trips_datetime_uuid_and_decimal(self):
+        """Test datetimes and UUIDs encode as strings and Decimals as numbers."""
+        from datetime import datetime, timezone
+        from decimal import Decimal
+        from uuid import uuid4
+
+        from app.core import serialization
+
+        account_id = uuid4()
+        created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        encoded = serialization.dumps(
+            {"id": account_id, "created_at": created, "price": Decimal("19.99"), "qty": Decimal(3)}
+        )
+
+        assert isinstance(encoded, bytes)
+        assert serialization.loads(encoded) == {
+            "id": str(account_id),
+            "created_at": "2024-05-01T12:30:00+00:00",
+            "price": 19.99,
+            "qty": 3,
+        }
+        assert serialization.loads(encoded.decode()) == serialization.loads(encoded)
+
+    def test_non_finite_decimals_encode_as_null(self):
+        """Test Decimal NaN and Infinity encode instead of raising."""
+        from decimal import Decimal
+
+        from app.core import serialization
+
+        encoded = serialization.dumps([Decimal("NaN"), Decimal("Infinity"), Decimal("-Infinity")])
+
+        assert serialization.loads(encoded) == [None, None, None]
+
+    def test_rejects_unknown_types(self):
+        """Test unsupported objects raise TypeError like the stdlib encoder."""
+        from app.core import serialization
+
+        with pytest.raises(TypeError):
+            serialization.dumps({"value": object()})
+
+    def test_model_response_skips_revalidation(self):
+        """Test ModelResponse writes model_dump_json() output unchanged."""
+        from app.core.serialization import ModelResponse, ORJSONResponse
+        from app.schemas.common import APIResponse
+
+        payload = APIResponse.success_response(data={"games": ["Valorant"]})
+        response = ModelResponse(payload)
+
+        assert response.body == payload.model_dump_json().encode()
+        assert response.media_type == "application/json"
+        assert ORJSONResponse({"ok": True}).body == b'{"ok":true}'
+
+
+class TestCompression:
+    """Test content negotiation and the compression middleware."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi import FastAPI
+        from fastapi.responses import JSONResponse, StreamingResponse
+        from fastapi.testclient import TestClient
+
+        from app.core.middleware import CompressionMiddleware
+
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=500, thread_threshold=4096)
+        rows = [{"id": n, "seller": {"username": "seller"}} for n in range(500)]
+
+        @app.get("/large")
+        async def large():
+            return JSONResponse(rows, headers={"ETag": '"abc"'})
+
+        @app.get("/small")
+        async def small():
+            return JSONResponse({"ok": True})
+
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                for n in range(3):
+                    yield b'{"chunk": %d}\n' % n * 200
+
+            return StreamingResponse(chunks(), media_type="application/json")
+
+        return TestClient(app)
+
+    def test_negotiate_encoding(self):
+        """Test q-values, refusals, wildcards and server preference."""
+        from app.core.compression import negotiate_encoding
+
+        offered = ["zstd", "br", "gzip"]
+        assert negotiate_encoding("gzip, br", offered) == "br"
+        assert negotiate_encoding("br;q=0.5, gzip", offered) == "gzip"
+        assert negotiate_encoding("*, zstd;q=0", offered) == "br"
+        assert negotiate_encoding("identity", offered) is None
+        assert negotiate_encoding(None, offered) is None
+
+    def test_gzip_stream_round_trip(self):
+        """Test chunked gzip output decompresses to the original body."""
+        import gzip
+
+        from app.core.compression import GzipStream
+
+        stream = GzipStream()
+        data = stream.compress(b"a" * 1000, final=False) + stream.compress(b"b" * 1000, final=True)
+        assert gzip.decompress(data) == b"a" * 1000 + b"b" * 1000
+
+    def test_large_body_is_compressed(self, client):
+        """Test bodies above the threshold are gzipped with a weak ETag."""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.json()[499]["id"] == 499
+
+    def test_small_or_unaccepted_bodies_pass_through(self, client):
+        """Test small bodies and clients without gzip get identity encoding."""
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] == '"abc"'
+        assert identity.headers["vary"] == "Accept-Encoding"
+
+    def test_streamed_body_is_compressed_per_chunk(self, client):
+        """Test streamed responses are compressed without a Content-Length."""
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.content == b"".join(b'{"chunk": %d}\n' % n * 200 for n in range(3))
+
+
+class TestFanOut:
+    """Test concurrent read fan-out over pooled sessions."""
+
+    @pytest.fixture
+    def pooled_sessions(self):
+        """Patch the session factory with distinct mock sessions and allow fan-out."""
+        sessions = []
+
+        def factory():
+            session = MagicMock()
+            session.__aenter__ = AsyncMock(return_value=session)
+            session.__aexit__ = AsyncMock(return_value=False)
+            sessions.append(session)
+            return session
+
+        with patch("app.core.database.async_session_maker", factory), patch(
+            "app.core.database._can_fan_out", return_value=True
+        ):
+            yield sessions
+
+    @pytest.mark.asyncio
+    async def test_mock_session_runs_sequentially_on_request_session(self, mock_db_session):
+        """Test queries fall back to the request session when it is not an engine session."""
+        from app.core.database import fan_out
+
+        seen = []
+
+        async def query(db, value):
+            seen.append(db)
+            return value
+
+        results = await fan_out(mock_db_session, lambda db: query(db, 1), lambda db: query(db, 2))
+
+        assert results == [1, 2]
+        assert seen == [mock_db_session, mock_db_session]
+
+    def test_uncommitted_writes_keep_queries_on_request_session(self):
+        """Test flushed or executed writes block fan-out until the transaction ends."""
+        from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select
+        from sqlalchemy.orm import Session
+
+        from app.core.database import UNCOMMITTED_WRITES_KEY
+
+        table = Table("fan_out_rows", MetaData(), Column("id", Integer, primary_key=True))
+        sqlite = create_engine("sqlite://")
+        table.metadata.create_all(sqlite)
+
+        with Session(sqlite) as session:
+            session.execute(select(table))
+            assert not session.info.get(UNCOMMITTED_WRITES_KEY)
+
+            session.execute(table.insert().values(id=1))
+            assert session.info.get(UNCOMMITTED_WRITES_KEY)
+
+            session.commit()
+            assert not session.info.get(UNCOMMITTED_WRITES_KEY)
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_with_cap(self, mock_db_session, pooled_sessions):
+        """Test each query gets its own session, at most max_concurrency at once."""
+        import asyncio
+
+        from app.core.database import fan_out
+
+        in_flight, peak = 0, 0
+
+        async def query(db, value):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return value, db
+
+        results = await fan_out(
+            mock_db_session, *(lambda db, n=n: query(db, n) for n in range(5)), max_concurrency=2
+        )
+
+        assert [value for value, _ in results] == [0, 1, 2, 3, 4]
+        assert peak == 2
+        assert len({id(db) for _, db in results}) == 5
+        assert all(session.__aexit__.await_count == 1 for session in pooled_sessions)
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_queries(self, mock_db_session, pooled_sessions):
+        """Test the first failure propagates and the slower queries are cancelled."""
+        import asyncio
+
+        from app.core.database import fan_out
+
+        finished = []
+
+        async def slow(db):
+            await asyncio.sleep(1)
+            finished.append(db)
+
+        async def failing(db):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await fan_out(mock_db_session, slow, failing)
+        await asyncio.sleep(0)
+
+        assert finished == []
+
+
+class TestReplicaRouting:
+    """Test read-replica routing and read-your-writes marking."""
+
+    @pytest.fixture
+    def replica(self):
+        """Configure a fake replica whose lag the test controls."""
+        replica_maker = MagicMock(name="replica_session_maker")
+        with patch("app.core.database.replica_engine", MagicMock()), patch(
+            "app.core.database.replica_session_maker", replica_maker
+        ):
+            yield replica_maker
+
+    @pytest.fixture
+    def redis(self):
+        redis = AsyncMock()
+        redis.exists.return_value = 0
+        with patch("app.core.redis.redis_client", redis):
+            yield redis
+
+    @pytest.mark.asyncio
+    async def test_without_replica_reads_use_primary(self):
+        """Test every read goes to the primary when no replica is configured."""
+        from app.core.database import ReplicaRouter, async_session_maker
+
+        router = ReplicaRouter()
+
+        assert not router.enabled
+        assert await router.session_maker("user-1") is async_session_maker
+
+    @pytest.mark.asyncio
+    async def test_current_replica_serves_reads_until_user_writes(self, replica, redis):
+        """Test the replica is used unless the user is inside the sticky window."""
+        from app.core.database import ReplicaRouter, async_session_maker
+
+        router = ReplicaRouter(max_lag_seconds=5, lag_check_seconds=60, sticky_seconds=10)
+        with patch.object(ReplicaRouter, "_measure_lag", AsyncMock(return_value=0.5)):
+            assert await router.session_maker("user-1") is replica
+
+            await router.mark_write("user-1")
+            redis.set.assert_awaited_once_with("db:recent_write:user-1", 1, ex=10)
+            redis.exists.return_value = 1
+
+            assert await router.session_maker("user-1") is async_session_maker
+            assert await router.session_maker(None) is replica
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(self, replica, redis):
+        """Test lag over the limit or a failed measurement routes reads to the primary."""
+        from app.core.database import ReplicaRouter, async_session_maker
+
+        router = ReplicaRouter(max_lag_seconds=5, lag_check_seconds=60)
+        measure = AsyncMock(return_value=12.0)
+        with patch.object(ReplicaRouter, "_measure_lag", measure):
+            assert await router.session_maker() is async_session_maker
+            assert await router.session_maker() is async_session_maker
+        assert measure.await_count == 1
+
+        router = ReplicaRouter(lag_check_seconds=0)
+        with patch.object(ReplicaRouter, "_measure_lag", AsyncMock(side_effect=OSError)):
+            assert await router.session_maker() is async_session_maker
+
+    @pytest.mark.asyncio
+    async def test_without_redis_users_read_from_primary(self, replica):
+        """Test the read-your-writes window is assumed when Redis is unavailable."""
+        from app.core.database import ReplicaRouter
+
+        with patch("app.core.redis.redis_client", None):
+            assert await ReplicaRouter().recently_wrote("user-1")
+
+    @pytest.mark.asyncio
+    async def test_middleware_marks_successful_writes(self, replica):
+        """Test only successful mutating requests with a valid token mark the user."""
+        from app.core.middleware import ReadYourWritesMiddleware
+        from app.core.security import create_access_token
+
+        token = create_access_token({"sub": "user-1"})
+
+        def app_with_status(status):
+            async def app(scope, receive, send):
+                await send({"type": "http.response.start", "status": status, "headers": []})
+                await send({"type": "http.response.body", "body": b""})
+
+            return app
+
+        async def call(method, status, authorization=f"Bearer {token}"):
+            scope = {
+                "type": "http",
+                "method": method,
+                "headers": [(b"authorization", authorization.encode())],
+            }
+            await ReadYourWritesMiddleware(app_with_status(status))(scope, AsyncMock(), AsyncMock())
+
+        with patch("app.core.database.replica_router.mark_write", AsyncMock()) as mark_write:
+            await call("POST", 201)
+            await call("GET", 200)
+            await call("PATCH", 422)
+            await call("DELETE", 204, authorization="Bearer invalid")
+
+        mark_write.assert_awaited_once_with("user-1")